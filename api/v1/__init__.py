@@ -5,6 +5,8 @@ from .monitoring import monitoring_router
 from .users import users_router
 from .datasets import datasets_router
 from .conversations import conversation_router
+from .profiles import profiles_router
+from .results import results_router
 from .workspace import workspaces_router
 
 v1_router = APIRouter()
@@ -18,3 +20,5 @@ v1_router.include_router(
 v1_router.include_router(
     workspaces_router, prefix="/workspace", tags=["Workspace"]
 )
+v1_router.include_router(results_router, prefix="/results", tags=["Results"])
+v1_router.include_router(profiles_router, prefix="/profiles", tags=["Profiles"])
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header
 
 from app.controllers.chat import ChatController
 from app.schemas.requests.chat import ChatRequest
 from app.schemas.responses import APIResponse
 from app.schemas.responses.chat import ChatResponse
 from app.schemas.responses.users import UserInfo
+from app.utils.profiling import PROFILE_HEADER, profile_sampler
 from core.factory import Factory
 from core.fastapi.dependencies.current_user import get_current_user
 
@@ -16,7 +19,8 @@ async def chat(
     chat_request: ChatRequest,
     chat_controller: ChatController = Depends(Factory().get_chat_controller),
     user: UserInfo = Depends(get_current_user),
+    profile_header: Optional[str] = Header(None, alias=PROFILE_HEADER),
 ) -> APIResponse[ChatResponse]:
-    response = await chat_controller.chat(user, chat_request)
-    print("API response data:", response)
+    profile = profile_sampler.sample(profile_header)
+    response = await chat_controller.chat(user, chat_request, profile=profile)
     return APIResponse(data=response, message="Chat response returned successfully!")
@@ -21,9 +21,15 @@ async def conversations(
     user: UserInfo = Depends(get_current_user),
     skip: Optional[int] = Query(0, description="Number of items to skip"),
     limit: Optional[int] = Query(10, description="Number of items to retrieve"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor of the next page, replaces skip when set"
+    ),
+    with_count: bool = Query(
+        True, description="Whether to return the total count on the first page"
+    ),
 ) -> APIResponse[ConversationList]:
     response = await conversation_controller.get_workspace_conversations(
-        user.id, user.space.id, skip, limit
+        user.id, user.space.id, skip, limit, cursor, with_count
     )
     return APIResponse(
         data=response, message="User conversations returned successfully!"
@@ -38,9 +44,15 @@ async def conversation_messages(
     ),
     skip: Optional[int] = Query(0, description="Number of items to skip"),
     limit: Optional[int] = Query(10, description="Number of items to retrieve"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor of the next page, replaces skip when set"
+    ),
+    with_count: bool = Query(
+        True, description="Whether to return the total count on the first page"
+    ),
 ) -> APIResponse[ConversationMessageList]:
     response = await conversation_controller.get_conversation_messages(
-        conv_id, skip, limit
+        conv_id, skip, limit, cursor, with_count
     )
     return APIResponse(
         data=response, message="User conversation messages returned successfully!"
@@ -1,8 +1,14 @@
 from fastapi import APIRouter
 
 from .health import health_router
+from .metrics import metrics_router
+from .profiling import profiling_router
 
 monitoring_router = APIRouter()
 monitoring_router.include_router(health_router, prefix="/health", tags=["Health"])
+monitoring_router.include_router(metrics_router, prefix="/metrics", tags=["Metrics"])
+monitoring_router.include_router(
+    profiling_router, prefix="/profiling", tags=["Profiling"]
+)
 
 __all__ = ["monitoring_router"]
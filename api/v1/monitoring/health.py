@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends
 
-from app.schemas.extras.health import Health
+from app.schemas.extras.health import ChatDatabasePoolStatus, Health
 from core.config import config
+from core.database.chat_session import chat_pool
 from core.fastapi.dependencies.authentication import AuthenticationRequired
 
 health_router = APIRouter()
@@ -10,3 +11,8 @@ health_router = APIRouter()
 @health_router.get("/", dependencies=[Depends(AuthenticationRequired)])
 async def health() -> Health:
     return Health(version=config.RELEASE_VERSION, status="Healthy")
+
+
+@health_router.get("/chat-db-pool", dependencies=[Depends(AuthenticationRequired)])
+async def chat_db_pool() -> ChatDatabasePoolStatus:
+    return ChatDatabasePoolStatus(**chat_pool.get_status())
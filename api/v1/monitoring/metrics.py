@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Response
+
+from core.config import config
+from core.exceptions import NotFoundException
+from core.utils.metrics import generate_metrics
+
+metrics_router = APIRouter()
+
+
+# Not authenticated, so Prometheus can scrape it, hence disabled by default
+@metrics_router.get("/")
+async def metrics() -> Response:
+    if not config.METRICS_ENABLED:
+        raise NotFoundException("Metrics are disabled")
+
+    content, media_type = generate_metrics()
+    return Response(content=content, media_type=media_type)
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+
+from app.schemas.extras.profiling import ProfilingSettings
+from app.utils.profiling import profile_sampler
+from core.fastapi.dependencies import AdminRequired
+
+profiling_router = APIRouter(dependencies=[Depends(AdminRequired)])
+
+
+@profiling_router.get("/")
+async def get_profiling() -> ProfilingSettings:
+    return ProfilingSettings(
+        enabled=profile_sampler.enabled, sample_rate=profile_sampler.sample_rate
+    )
+
+
+# The settings are kept in memory, by each worker process
+@profiling_router.put("/")
+async def update_profiling(settings: ProfilingSettings) -> ProfilingSettings:
+    profile_sampler.enabled = settings.enabled
+    profile_sampler.sample_rate = settings.sample_rate
+    return settings
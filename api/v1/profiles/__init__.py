@@ -0,0 +1,5 @@
+from fastapi import APIRouter
+
+from .profiles import profiles_router
+
+__all__ = ["profiles_router"]
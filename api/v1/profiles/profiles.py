@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Path, Response
+
+from app.utils.profiling import profile_store
+from core.exceptions import NotFoundException
+from core.fastapi.dependencies import AdminRequired
+
+# The profiles show the code and the data of the chats of every user
+profiles_router = APIRouter(dependencies=[Depends(AdminRequired)])
+
+
+@profiles_router.get("/{profile_id}/{name}")
+async def profile_file(
+    profile_id: str = Path(..., description="Id of the profile"),
+    name: str = Path(
+        ..., description="stacks.folded, profile.pstats or sections.json"
+    ),
+) -> Response:
+    try:
+        content, media_type = profile_store.load(profile_id, name)
+    except KeyError:
+        raise NotFoundException(f"Profile file {name} of {profile_id} was not found")
+
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.{name}"'},
+    )
@@ -0,0 +1,5 @@
+from fastapi import APIRouter
+
+from .results import results_router
+
+__all__ = ["results_router"]
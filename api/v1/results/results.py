@@ -0,0 +1,38 @@
+from typing import Optional
+
+from fastapi import APIRouter, Path, Query, Request, Response
+
+from app.utils.result_store import result_store
+from core.exceptions import NotFoundException
+from core.fastapi.dependencies.authentication import AuthenticationRequiredException
+
+results_router = APIRouter()
+
+
+@results_router.get("/{key}")
+async def result(
+    request: Request,
+    key: str = Path(..., description="Key of the dataframe or plot"),
+    expires: Optional[int] = Query(None, description="Expiry of the signed URL"),
+    signature: Optional[str] = Query(None, description="Signature of the URL"),
+) -> Response:
+    if result_store is None:
+        raise NotFoundException("Result store is disabled")
+
+    # The signed URLs are used where the authorization header can't be sent,
+    # e.g. by the images of the conversation history
+    signed = result_store.verify_url(key, expires, signature)
+    if not signed and not request.auth:
+        raise AuthenticationRequiredException()
+
+    try:
+        content, media_type = result_store.load(key)
+    except KeyError:
+        raise NotFoundException(f"Result with key: {key} was not found")
+
+    # The content of a key never changes
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Cache-Control": "private, max-age=31536000, immutable"},
+    )
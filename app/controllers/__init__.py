@@ -4,6 +4,7 @@ from .user import UserController
 from .conversation import ConversationController
 from .datasets import DatasetController
 from .chat import ChatController
+from .dataset_stats import DatasetStatsController
 
 __all__ = [
     "AuthController",
@@ -12,4 +13,5 @@ __all__ = [
     "ConversationController",
     "DatasetController",
     "ChatController",
+    "DatasetStatsController",
 ]
@@ -1,12 +1,18 @@
+import asyncio
 import os
 import shutil
-from typing import List
+from functools import partial
+from typing import List, Optional, Tuple
 
 import pandas as pd
 from pandasai import Agent
 from pandasai.connectors.pandas import PandasConnector
+from pandasai.helpers.debug_trace import trace
+from pandasai.helpers.memory import Memory
 from pandasai.helpers.path import find_project_root
+from pandasai.helpers.profiler import Profile, profiling
 from pandasai.llm.openai import OpenAI
+from starlette.concurrency import run_in_threadpool
   # Import the function
 from app.models import Dataset, User
 from app.repositories import UserRepository
@@ -15,14 +21,20 @@ from app.repositories.workspace import WorkspaceRepository
 from app.schemas.requests.chat import ChatRequest
 from app.schemas.responses.chat import ChatResponse
 from app.schemas.responses.users import UserInfo
+from app.utils.connector import get_dataset_connector
 from app.utils.memory import prepare_conv_memory
+from app.utils.message_writer import message_writer
+from app.utils.profiling import profile_store
+from app.utils.result_store import result_store
+from app.utils.vectorstore import get_vectorstore
 from core.constants import CHAT_FALLBACK_MESSAGE
 from core.controller import BaseController
-from core.utils.database_utils import load_data_from_db
+from core.utils.database_utils import load_data_from_db_threadsafe
 from core.database.transactional import Propagation, Transactional
 from core.utils.dataframe import load_df
 from core.utils.json_encoder import jsonable_encoder
 from core.utils.response_parser import JsonResponseParser
+from core.utils.telemetry import tracer
 from core.config import config as env_config
 from core.database.session import session
 from sqlalchemy.sql import text
@@ -49,12 +61,17 @@ class ChatController(BaseController[User]):
         )
 
     @Transactional(propagation=Propagation.REQUIRED)
-    async def chat(self, user: UserInfo, chat_request: ChatRequest) -> ChatResponse:
+    async def prepare_chat(
+        self, user: UserInfo, chat_request: ChatRequest
+    ) -> Tuple[List[Dataset], str, Optional[Memory]]:
+        """
+        Reads what the chat needs in a short transaction, which is committed
+        before the agent runs so no connection is held during the LLM calls.
+        """
         datasets: List[Dataset] = await self.space_repository.get_space_datasets(
             chat_request.workspace_id
         )
         conversation_id = chat_request.conversation_id
-        conversation_messages = []
         memory = None
 
         if not chat_request.conversation_id:
@@ -62,13 +79,31 @@ class ChatController(BaseController[User]):
             conversation_id = user_conversation.id
 
         else:
-            conversation_messages = (
+            conversation_messages = list(
                 await self.conversation_repository.get_conversation_messages(
                     conversation_id
                 )
             )
+            # Only the messages pending in this worker, see CHAT_WRITE_BEHIND
+            if env_config.CHAT_WRITE_BEHIND:
+                conversation_messages += message_writer.get_pending_messages(
+                    conversation_id
+                )
             memory = prepare_conv_memory(conversation_messages)
 
+        return datasets, conversation_id, memory
+
+    async def chat(
+        self,
+        user: UserInfo,
+        chat_request: ChatRequest,
+        profile: Optional[Profile] = None,
+    ) -> ChatResponse:
+        with tracer.start_as_current_span("chat.prepare"):
+            datasets, conversation_id, memory = await self.prepare_chat(
+                user, chat_request
+            )
+
         #if the init_database in server.js uses the CSV method then use this connector
         #connectors = []
         #for dataset in datasets:
@@ -84,35 +119,10 @@ class ChatController(BaseController[User]):
         #    connectors.append(connector)
 
         #if the init_database in server.js uses the POSTGRES method then use this connector
-        connectors = []
-        for dataset in datasets:
-            query = f"SELECT * FROM {dataset.table_name}"
-            print(query)
-            try:
-                df = await load_data_from_db(query)
-                print("data loaded")
-                custom_head = load_df(dataset.head) if dataset.head else None
-                # Print the custom head, if available
-                if custom_head is not None:
-                    print("Custom Head (from dataset.head):")
-                    print(custom_head)
-                else:
-                    print("No Custom Head available (dataset.head is None)")
-                print(f"Dataset Name: {dataset.name}")
-                print(f"Dataset Description: {dataset.description}")
-                print(f"Field Descriptions: {dataset.field_descriptions}")
-                print(df)
-                connector = PandasConnector(
-                    {"original_df": df},
-                    name=dataset.name,
-                    description=dataset.description,
-                    #custom_head=(load_df(dataset.head) if dataset.head else None),
-                    field_descriptions=dataset.field_descriptions,
-                )
-                print(f"Connector loaded with DataFrame of shape: {connector.pandas_df.shape}")
-                connectors.append(connector)
-            except Exception as e:
-                print(f"Failed to load data for table {dataset.table_name}: {e}")
+        # Datasets are loaded lazily, only when the generated code needs them
+        loop = asyncio.get_running_loop()
+        loader = partial(load_data_from_db_threadsafe, loop=loop)
+        connectors = [get_dataset_connector(dataset, loader) for dataset in datasets]
 
         path_plot_directory = find_project_root() + "/exports/" + str(conversation_id)
 
@@ -127,17 +137,20 @@ class ChatController(BaseController[User]):
             llm = OpenAI(env_config.OPENAI_API_KEY)
             config["llm"] = llm
 
-        agent = Agent(connectors, config=config)
-        print("Agent initialized. Processing query...")
-        print(connectors)
+        agent = Agent(connectors, config=config, vectorstore=get_vectorstore())
 
         if memory:
             agent.context.memory = memory
-        print("Agent initialized. Processing query...")
 
-        response = agent.chat(chat_request.query)
-        print("Agent response:", response)
+        # The agent loads the datasets through the event loop, so it must run in
+        # a worker thread, which gets a copy of the context and so the profile
+        with tracer.start_as_current_span("chat.agent"), profiling(profile):
+            response = await run_in_threadpool(agent.chat, chat_request.query)
+        trace("chat.response", "Agent response: %s", response)
 
+        profile_id = None
+        if profile is not None:
+            profile_id = await run_in_threadpool(profile_store.save, profile)
 
         if os.path.exists(path_plot_directory):
             shutil.rmtree(path_plot_directory)
@@ -154,16 +167,39 @@ class ChatController(BaseController[User]):
             ]
 
         response = jsonable_encoder([response])
-        conversation_message = await self.conversation_repository.add_conversation_message(
-            conversation_id=conversation_id,
-            query=chat_request.query,
-            response=response,
-            code_generated=agent.last_code_executed,
-        )
+
+        # The message keeps references to the dataframes and plots
+        stored_response = response
+        if result_store is not None:
+            with tracer.start_as_current_span("result_store.offload"):
+                stored_response = await run_in_threadpool(
+                    result_store.offload, response
+                )
+
+        with tracer.start_as_current_span(
+            "chat.persist", attributes={"write_behind": env_config.CHAT_WRITE_BEHIND}
+        ):
+            if env_config.CHAT_WRITE_BEHIND:
+                conversation_message = await message_writer.enqueue(
+                    conversation_id=conversation_id,
+                    query=chat_request.query,
+                    response=stored_response,
+                    code_generated=agent.last_code_executed,
+                )
+            else:
+                conversation_message = (
+                    await self.conversation_repository.add_conversation_message(
+                        conversation_id=conversation_id,
+                        query=chat_request.query,
+                        response=stored_response,
+                        code_generated=agent.last_code_executed,
+                    )
+                )
 
         return ChatResponse(
             response=response,
             conversation_id=str(conversation_id),
             message_id = str(conversation_message.id),
-            query = str(conversation_message.query)
+            query = str(conversation_message.query),
+            profile_id=profile_id,
         )
\ No newline at end of file
@@ -3,8 +3,14 @@ from app.models import User, UserConversation
 from app.repositories import UserRepository
 from app.repositories.conversation import ConversationRepository
 
-from app.schemas.responses.conversation import ConversationList, ConversationMessageList
+from app.schemas.responses.conversation import (
+    ConversationList,
+    ConversationMessageDTO,
+    ConversationMessageList,
+)
+from app.utils.result_store import result_store
 from core.controller import BaseController
+from core.repository.pagination import get_next_cursor
 
 
 class ConversationController(BaseController[UserConversation]):
@@ -18,27 +24,66 @@ class ConversationController(BaseController[UserConversation]):
         self.conversation_repository = conversation_repository
 
     async def get_workspace_conversations(
-        self, user_id: str, workspace_id: str, skip: int = 0, limit: int = 100
+        self,
+        user_id: str,
+        workspace_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        with_count: bool = True,
     ) -> ConversationList:
         conversations = await self.conversation_repository.get_conversations(
-            user_id, workspace_id, skip, limit
+            user_id, workspace_id, skip, limit + 1, cursor
         )
+        conversations, next_cursor = get_next_cursor(conversations, limit)
 
-        count = await self.conversation_repository.get_count(user_id, workspace_id)
-        return ConversationList(count=count, conversations=conversations)
+        # The total only changes with new conversations, so it is counted on
+        # the first page and the clients keep it for the next ones
+        count = None
+        if with_count and cursor is None:
+            count = await self.conversation_repository.get_count(
+                user_id, workspace_id
+            )
+
+        return ConversationList(
+            count=count, conversations=conversations, next_cursor=next_cursor
+        )
 
     async def get_conversation_messages(
-        self, conversation_id: str, skip: int = 0, limit: int = 100
+        self,
+        conversation_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        with_count: bool = True,
     ):
         conversation_messages = (
             await self.conversation_repository.get_conversation_messages(
-                conversation_id, skip, limit, "desc"
+                conversation_id, skip, limit + 1, "desc", cursor
             )
         )
+        conversation_messages, next_cursor = get_next_cursor(
+            conversation_messages, limit
+        )
+
+        count = None
+        if with_count and cursor is None:
+            count = await self.conversation_repository.get_messages_count(
+                conversation_id
+            )
 
-        count = await self.conversation_repository.get_messages_count(conversation_id)
+        messages = [
+            ConversationMessageDTO.from_orm(message)
+            for message in reversed(conversation_messages)
+        ]
+        # The offloaded plots and dataframes are returned with signed URLs
+        if result_store is not None:
+            for message in messages:
+                message.response = result_store.resolve(message.response)
 
-        return ConversationMessageList(count=count, messages=list(reversed(conversation_messages)))
+        return ConversationMessageList(
+            count=count, messages=messages, next_cursor=next_cursor
+        )
     
     async def archive_conversation(
         self, conversation_id: str, user_id: str
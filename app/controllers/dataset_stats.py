@@ -0,0 +1,107 @@
+import datetime
+import logging
+from uuid import UUID
+
+from app.models import Dataset, DatasetStats
+from app.repositories.dataset_stats import DatasetStatsRepository
+from app.utils.dataset_stats import compute_dataset_stats, get_change_marker
+from core.config import config
+from core.controller import BaseController
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetStatsController(BaseController[DatasetStats]):
+    def __init__(self, dataset_stats_repository: DatasetStatsRepository):
+        super().__init__(model=DatasetStats, repository=dataset_stats_repository)
+        self.dataset_stats_repository = dataset_stats_repository
+
+    async def refresh_dataset_stats(
+        self, dataset: Dataset, force: bool = False
+    ) -> bool:
+        """
+        Computes the statistics of the dataset again if its data changed.
+
+        :param dataset: The dataset, with its stats loaded.
+        :param force: Whether to compute the statistics even if the data didn't change.
+        :return: Whether the statistics were refreshed.
+        """
+        return await self._refresh(
+            dataset.id, dataset.table_name, dataset.stats, force=force
+        )
+
+    async def refresh_all(self, force: bool = False) -> int:
+        """
+        Refreshes the statistics of all the datasets whose data changed.
+
+        :param force: Whether to compute the statistics even if the data didn't change.
+        :return: The number of refreshed datasets.
+        """
+        # The rollback after a failure expires the loaded objects, which can't
+        # be lazy loaded again in async, so the loop only uses copies of them
+        datasets = [
+            (dataset.id, dataset.table_name, self._copy_stats(dataset.stats))
+            for dataset in await self.dataset_stats_repository.get_datasets_with_stats()
+        ]
+
+        refreshed = 0
+        for dataset_id, table_name, stats in datasets:
+            try:
+                refreshed += await self._refresh(
+                    dataset_id, table_name, stats, force=force
+                )
+            except Exception:
+                logger.exception(
+                    f"Failed to refresh the stats of the dataset {dataset_id}"
+                )
+                await self.dataset_stats_repository.session.rollback()
+
+        return refreshed
+
+    async def _refresh(
+        self, dataset_id: UUID, table_name: str, stats: DatasetStats, force: bool
+    ) -> bool:
+        change_marker = await get_change_marker(table_name)
+        if not force and not self._is_outdated(stats, change_marker):
+            return False
+
+        computed = await compute_dataset_stats(
+            table_name, config.DATASET_STATS_SAMPLE_SIZE
+        )
+        await self.dataset_stats_repository.upsert(
+            dataset_id, change_marker=change_marker, **computed
+        )
+        await self.dataset_stats_repository.session.commit()
+        return True
+
+    @staticmethod
+    def _copy_stats(stats: DatasetStats) -> DatasetStats:
+        """
+        Copies the fields of the stats needed by _is_outdated, the copy isn't
+        part of the session.
+        """
+        if stats is None:
+            return None
+
+        return DatasetStats(
+            change_marker=stats.change_marker, refreshed_at=stats.refreshed_at
+        )
+
+    @staticmethod
+    def _is_outdated(stats: DatasetStats, change_marker: str) -> bool:
+        """
+        Whether the statistics must be computed again: they are missing, the
+        data changed or, when the changes of the table can't be tracked, they
+        are older than DATASET_STATS_MAX_AGE.
+        """
+        if stats is None:
+            return True
+
+        if change_marker is not None:
+            return stats.change_marker != change_marker
+
+        max_age = datetime.timedelta(seconds=config.DATASET_STATS_MAX_AGE)
+        return (
+            stats.refreshed_at is None
+            or datetime.datetime.now() - stats.refreshed_at > max_age
+        )
@@ -24,8 +24,10 @@ class UserController(BaseController[User]):
     async def get_by_email(self, email: str) -> User:
         return await self.user_repository.get_by_email(email)
 
-    async def me(self) -> UserInfo:
-        users = await self.get_all(limit=1)
+    async def me(self, user_id: str | None = None) -> UserInfo:
+        users = await self.user_repository.get_by("id", user_id) if user_id else []
+        if not users:
+            users = await self.get_all(limit=1)
         if not users:
             raise NotFoundException(
                 "No user found. Please restart the server and try again"
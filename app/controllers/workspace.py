@@ -47,9 +47,11 @@ class WorkspaceController(BaseController[Workspace]):
     @Transactional(propagation=Propagation.REQUIRED_NEW)
     async def add_datasets_from_db(self, datasets: List[dict], user: User, workspace_id: str):
         if datasets:
-            # Extract headers and rows for the head of the dataset
-            headers = list(datasets[0].keys())
-            rows = [list(dataset.values()) for dataset in datasets[:5]]  # Only take the first 5 rows for the head
+            # Extract headers and rows for the head of the dataset, it's used by the
+            # chat to describe the dataset without loading it
+            head_records = datasets[0]["head"]
+            headers = list(head_records[0].keys()) if head_records else []
+            rows = [list(record.values()) for record in head_records[:5]]  # Only take the first 5 rows for the head
 
             head = {
                 "headers": headers,
@@ -4,10 +4,13 @@ from enum import Enum
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     ForeignKey,
+    Index,
+    Integer,
     String,
     UniqueConstraint,
 )
@@ -108,6 +111,25 @@ class Dataset(Base):
     organization = relationship("Organization", back_populates="datasets")
     connector = relationship("Connector", back_populates="datasets", lazy="joined")
     dataset_spaces = relationship("DatasetSpace", back_populates="dataset")
+    stats = relationship("DatasetStats", back_populates="dataset", uselist=False)
+
+
+class DatasetStats(Base):
+    __tablename__ = "dataset_stats"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    dataset_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("dataset.id", ondelete="CASCADE"),
+        index=True,
+        unique=True,
+    )
+    rows_count = Column(BigInteger, nullable=True)
+    columns = Column(JSON, nullable=True)
+    sample = Column(JSON, nullable=True)
+    change_marker = Column(String, nullable=True)
+    refreshed_at = Column(DateTime, default=datetime.datetime.now)
+
+    dataset = relationship("Dataset", back_populates="stats")
 
 
 class Connector(Base):
@@ -152,6 +174,16 @@ class UserSpace(Base):
 
 class UserConversation(Base):
     __tablename__ = "user_conversation"
+    __table_args__ = (
+        Index(
+            "ix_user_conversation_user_workspace_created_at",
+            "user_id",
+            "workspace_id",
+            "valid",
+            "created_at",
+            "id",
+        ),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     workspace_id = Column(UUID(as_uuid=True), ForeignKey("workspace.id"))
     user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"))
@@ -169,6 +201,14 @@ class UserConversation(Base):
 
 class ConversationMessage(Base):
     __tablename__ = "conversation_message"
+    __table_args__ = (
+        Index(
+            "ix_conversation_message_conversation_created_at",
+            "conversation_id",
+            "created_at",
+            "id",
+        ),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     conversation_id = Column(UUID(as_uuid=True), ForeignKey("user_conversation.id"))
     created_at = Column(DateTime, default=datetime.datetime.now)
@@ -184,9 +224,26 @@ class ConversationMessage(Base):
 
 class DatasetSpace(Base):
     __tablename__ = "dataset_space"
+    __table_args__ = (
+        Index("ix_dataset_space_workspace_dataset", "workspace_id", "dataset_id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     dataset_id = Column(UUID(as_uuid=True), ForeignKey("dataset.id"))
     workspace_id = Column(UUID(as_uuid=True), ForeignKey("workspace.id"))
 
     dataset = relationship("Dataset", back_populates="dataset_spaces")
     workspace = relationship("Workspace", back_populates="dataset_spaces")
+
+
+class SemanticSchema(Base):
+    __tablename__ = "semantic_schema"
+    __table_args__ = (
+        UniqueConstraint(
+            "fingerprint", "version", name="uq_semantic_schema_fingerprint_version"
+        ),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    fingerprint = Column(String(64), nullable=False, index=True)
+    version = Column(Integer, nullable=False, default=1)
+    definition = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.now)
@@ -1,7 +1,9 @@
 from .api_key import APIKeyRepository
 from .dataset import DatasetRepository
+from .dataset_stats import DatasetStatsRepository
 from .organization import OrganizationRepository
 from .organization_membership import OrganizationMembershipRepository
+from .semantic_schema import SemanticSchemaRepository
 from .workspace import WorkspaceRepository
 from .user import UserRepository
 from .conversation import ConversationRepository
@@ -10,9 +12,11 @@ __all__ = [
     "UserRepository",
     "APIKeyRepository",
     "DatasetRepository",
+    "DatasetStatsRepository",
     "OrganizationMembership",
     "OrganizationMembershipRepository",
     "OrganizationRepository",
+    "SemanticSchemaRepository",
     "WorkspaceRepository",
     "ConversationRepository",
 ]
@@ -1,10 +1,13 @@
 from typing import Any, Dict, List
 
-from sqlalchemy import and_, asc, desc, func
+from sqlalchemy import and_, asc, func, true
+from sqlalchemy.dialects.postgresql import insert
 from app.models import ConversationMessage, UserConversation
 from core.repository import BaseRepository
+from core.repository.pagination import keyset_paginate
 from sqlalchemy.sql.expression import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, load_only
+from sqlalchemy.orm.attributes import set_committed_value
 from core.database.transactional import Propagation, Transactional
 
 
@@ -33,30 +36,68 @@ class ConversationRepository(BaseRepository[UserConversation]):
 
         return conversation_message
 
+    async def add_conversation_messages(self, messages: List[Dict]) -> None:
+        """
+        Inserts the messages with multi-row inserts. The messages already
+        inserted are skipped, so a batch can be inserted again.
+
+        :param messages: The attributes of the messages.
+        """
+        await self.session.execute(
+            insert(ConversationMessage).on_conflict_do_nothing(
+                index_elements=[ConversationMessage.id]
+            ),
+            messages,
+        )
+
     async def get_conversation_messages(
-        self, conversation_id: str, skip: int = 0, limit: int = 100, order: str = "asc"
+        self,
+        conversation_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        order: str = "asc",
+        cursor: str | None = None,
     ):
-        order_by_clause = (
-            desc(ConversationMessage.created_at)
-            if order == "desc"
-            else asc(ConversationMessage.created_at)
+        query = select(ConversationMessage).where(
+            ConversationMessage.conversation_id == conversation_id
         )
-
-        query = (
-            select(ConversationMessage)
-            .where(ConversationMessage.conversation_id == conversation_id)
-            .order_by(order_by_clause)
-            .offset(skip)
-            .limit(limit)
+        query = keyset_paginate(
+            query,
+            ConversationMessage.id,
+            ConversationMessage.created_at,
+            cursor,
+            order,
         )
+        if cursor is None:
+            query = query.offset(skip)
+        query = query.limit(limit)
+
         result = await self.session.execute(query)
         return result.scalars().all()
 
     async def get_conversations(
-        self, user_id: str, workspace_id: str, skip: int = 0, limit: int = 100
+        self,
+        user_id: str,
+        workspace_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
     ) -> List[UserConversation]:
+        # The first message of each conversation of the page is read with a
+        # lateral subquery, a single row from the (conversation_id, created_at)
+        # index, instead of loading every message of every conversation
+        first_message_query = (
+            select(ConversationMessage)
+            .where(ConversationMessage.conversation_id == UserConversation.id)
+            .order_by(asc(ConversationMessage.created_at))
+            .limit(1)
+            .lateral("first_message")
+        )
+        first_message = aliased(ConversationMessage, first_message_query)
+
         query = (
-            select(UserConversation)
+            select(UserConversation, first_message)
+            .outerjoin(first_message_query, true())
             .where(
                 and_(
                     UserConversation.user_id == user_id,
@@ -64,25 +105,35 @@ class ConversationRepository(BaseRepository[UserConversation]):
                     UserConversation.workspace_id == workspace_id,
                 )
             )
-            .order_by(desc(UserConversation.created_at))
             .options(
-                selectinload(UserConversation.messages).load_only(
-                    ConversationMessage.id,
-                    ConversationMessage.query,
-                    ConversationMessage.created_at,
-                ),
+                load_only(
+                    first_message.id,
+                    first_message.query,
+                    first_message.created_at,
+                )
             )
-            .offset(skip)
-            .limit(limit)
         )
+        query = keyset_paginate(
+            query,
+            UserConversation.id,
+            UserConversation.created_at,
+            cursor,
+            "desc",
+        )
+        if cursor is None:
+            query = query.offset(skip)
+        query = query.limit(limit)
 
         result = await self.session.execute(query)
-        conversations = result.scalars().all()
 
-        for conversation in conversations:
-            if conversation.messages:
-                conversation.messages.sort(key=lambda msg: msg.created_at)
-                conversation.messages = conversation.messages[:1]
+        conversations = []
+        for conversation, message in result.all():
+            # Set without marking the collection as modified, so the other
+            # messages of the conversation are not orphaned on flush
+            set_committed_value(
+                conversation, "messages", [message] if message is not None else []
+            )
+            conversations.append(conversation)
 
         return conversations
 
@@ -0,0 +1,37 @@
+import datetime
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.models import Dataset, DatasetStats
+from core.repository import BaseRepository
+
+
+class DatasetStatsRepository(BaseRepository[DatasetStats]):
+    """
+    DatasetStats repository provides all the database operations for the DatasetStats model.
+    """
+
+    async def get_datasets_with_stats(self) -> List[Dataset]:
+        result = await self.session.execute(
+            select(Dataset).options(joinedload(Dataset.stats))
+        )
+        return result.unique().scalars().all()
+
+    async def upsert(self, dataset_id: UUID, **attributes) -> DatasetStats:
+        result = await self.session.execute(
+            select(DatasetStats).where(DatasetStats.dataset_id == dataset_id)
+        )
+        stats = result.scalars().first()
+        if stats is None:
+            stats = DatasetStats(dataset_id=dataset_id)
+            self.session.add(stats)
+
+        for key, value in attributes.items():
+            setattr(stats, key, value)
+        stats.refreshed_at = datetime.datetime.now()
+
+        await self.session.flush()
+        return stats
@@ -0,0 +1,84 @@
+from typing import List, Optional
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.models import SemanticSchema
+from core.database.session import use_primary
+from core.repository import BaseRepository
+
+# Attempts to add a version when other workers add versions of the same
+# fingerprint concurrently
+ADD_VERSION_ATTEMPTS = 3
+
+
+class SemanticSchemaRepository(BaseRepository[SemanticSchema]):
+    """
+    SemanticSchema repository provides all the database operations for the SemanticSchema model.
+    """
+
+    async def get_latest_schemas(self) -> List[SemanticSchema]:
+        """
+        Returns the latest version of the schema of each fingerprint.
+        """
+        latest = (
+            select(
+                SemanticSchema.fingerprint,
+                func.max(SemanticSchema.version).label("version"),
+            )
+            .group_by(SemanticSchema.fingerprint)
+            .subquery()
+        )
+        result = await self.session.execute(
+            select(SemanticSchema).join(
+                latest,
+                and_(
+                    SemanticSchema.fingerprint == latest.c.fingerprint,
+                    SemanticSchema.version == latest.c.version,
+                ),
+            )
+        )
+        return result.scalars().all()
+
+    async def get_latest_schema(self, fingerprint: str) -> Optional[SemanticSchema]:
+        result = await self.session.execute(
+            select(SemanticSchema)
+            .where(SemanticSchema.fingerprint == fingerprint)
+            .order_by(SemanticSchema.version.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    async def add_version(self, fingerprint: str, definition: list) -> SemanticSchema:
+        """
+        Adds the schema as the next version of the fingerprint.
+
+        The latest version is read from the primary, a replica could lag
+        behind it. When another worker adds the same version first, the unique
+        (fingerprint, version) constraint rejects it: the schema it added is
+        returned if it is the same one, otherwise the next version is tried.
+        """
+        # Routed to the primary until the session is closed
+        use_primary(self.session)
+
+        for attempt in range(ADD_VERSION_ATTEMPTS):
+            result = await self.session.execute(
+                select(func.max(SemanticSchema.version)).where(
+                    SemanticSchema.fingerprint == fingerprint
+                )
+            )
+            version = (result.scalar() or 0) + 1
+            schema = SemanticSchema(
+                fingerprint=fingerprint, version=version, definition=definition
+            )
+            try:
+                async with self.session.begin_nested():
+                    self.session.add(schema)
+                    await self.session.flush()
+                return schema
+            except IntegrityError:
+                latest = await self.get_latest_schema(fingerprint)
+                if latest is not None and latest.definition == definition:
+                    return latest
+                if attempt == ADD_VERSION_ATTEMPTS - 1:
+                    raise
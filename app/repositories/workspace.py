@@ -92,7 +92,7 @@ class WorkspaceRepository(BaseRepository[Workspace]):
         result = await self.session.execute(
             select(Dataset)
             .join(DatasetSpace)
-            .options(joinedload(Dataset.dataset_spaces))
+            .options(joinedload(Dataset.dataset_spaces), joinedload(Dataset.stats))
             .filter(DatasetSpace.workspace_id == workspace_id)
         )
         return result.unique().scalars().all()
@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field
 
 
 class CurrentUser(BaseModel):
-    id: int = Field(None, description="User ID")
+    id: str = Field(None, description="User ID")
 
     class Config:
         validate_assignment = True
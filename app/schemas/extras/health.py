@@ -4,3 +4,16 @@ from pydantic import BaseModel, Field
 class Health(BaseModel):
     version: str = Field(..., example="1.0.0")
     status: str = Field(..., example="OK")
+
+
+class ChatDatabasePoolStatus(BaseModel):
+    size: int = Field(..., example=10)
+    checked_out: int = Field(..., example=4)
+    checked_in: int = Field(..., example=6)
+    overflow: int = Field(..., example=0)
+    waiting: int = Field(..., example=0)
+    saturation: float = Field(..., example=0.2)
+    checkouts: int = Field(..., example=1250)
+    timeouts: int = Field(..., example=0)
+    average_wait: float = Field(..., example=0.002)
+    max_wait: float = Field(..., example=0.15)
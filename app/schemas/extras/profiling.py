@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+
+class ProfilingSettings(BaseModel):
+    enabled: bool = Field(..., example=True)
+    sample_rate: float = Field(..., ge=0, le=1, example=0.01)
@@ -1,4 +1,4 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
 from pydantic import BaseModel
 
@@ -14,3 +14,5 @@ class ChatResponse(BaseModel):
     conversation_id: str
     message_id: str
     query: str
+    # Id of the profile of the chat, when it was profiled
+    profile_id: Optional[str] = None
@@ -33,10 +33,12 @@ class UserConversationBase(BaseModel):
 
 
 class ConversationList(BaseModel):
-    count: int
+    count: Optional[int] = None
     conversations: List[UserConversationBase]
+    next_cursor: Optional[str] = None
 
 
 class ConversationMessageList(BaseModel):
-    count: int
+    count: Optional[int] = None
     messages: List[ConversationMessageDTO]
+    next_cursor: Optional[str] = None
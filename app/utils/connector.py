@@ -0,0 +1,162 @@
+import hashlib
+from functools import cached_property
+from typing import Callable, Optional
+
+import pandas as pd
+from pandasai.connectors.base import BaseConnector
+from pandasai.connectors.pandas import PandasConnector
+from pandasai.helpers.metrics import record_cache_lookup
+from pydantic import BaseModel
+
+from app.models import Dataset, DatasetStats
+from core.utils.dataframe import load_df
+from core.utils.telemetry import tracer
+
+
+class DatasetConnectorConfig(BaseModel):
+    table: str
+
+
+class DatasetConnector(PandasConnector):
+    """
+    Connector for the datasets of a workspace.
+
+    The prompt only needs the head and the size of each dataset, so these are
+    served from the stored dataset head and the full table is loaded only when
+    the generated code asks for it.
+    """
+
+    def __init__(
+        self,
+        config: DatasetConnectorConfig | dict,
+        loader: Callable[[str], pd.DataFrame],
+        head: Optional[pd.DataFrame] = None,
+        rows_count: Optional[int] = None,
+        **kwargs,
+    ):
+        """
+        :param config: The table of the dataset.
+        :param loader: Runs a query on the chat database and returns the result.
+        :param head: The stored head of the dataset.
+        :param rows_count: The rows count from the statistics catalog.
+        """
+        BaseConnector.__init__(self, config, **kwargs)
+
+        self._loader = loader
+        self._head = head
+        self._rows_count = rows_count
+        self._df = None
+        self._heads = {}
+        self.sql_enabled = False
+
+    def _load_connector_config(self, config: dict) -> DatasetConnectorConfig:
+        return DatasetConnectorConfig(**config)
+
+    @property
+    def pandas_df(self) -> pd.DataFrame:
+        if self._df is None:
+            with tracer.start_as_current_span(
+                "connector.load", attributes={"table": self.config.table}
+            ):
+                self._df = self._loader(f"SELECT * FROM {self.config.table}")
+        return self._df
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._df is not None
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        record_cache_lookup("schema", hit=n in self._heads)
+        if n not in self._heads:
+            self._heads[n] = self._load_head(n)
+        return self._heads[n]
+
+    def _load_head(self, n: int) -> pd.DataFrame:
+        if self._head is not None:
+            return self._head.head(n)
+
+        if self.is_loaded:
+            return self._df.head(n)
+
+        return self._loader(f"SELECT * FROM {self.config.table} LIMIT {int(n)}")
+
+    def execute(self) -> pd.DataFrame:
+        # Recorded once per run of the code, pandas_df is accessed many times
+        record_cache_lookup("connector", hit=self.is_loaded)
+        return self.pandas_df
+
+    @cached_property
+    def rows_count(self) -> int:
+        if self._rows_count is not None:
+            return self._rows_count
+
+        if self.is_loaded:
+            return len(self._df)
+
+        result = self._loader(f"SELECT COUNT(*) FROM {self.config.table}")
+        return int(result.iloc[0, 0])
+
+    @cached_property
+    def columns_count(self) -> int:
+        return len(self.get_head().columns)
+
+    @property
+    def column_hash(self) -> str:
+        columns_str = "".join(self.get_head().columns)
+        hash_object = hashlib.sha256(columns_str.encode())
+        return hash_object.hexdigest()
+
+    def equals(self, other: BaseConnector) -> bool:
+        return (
+            isinstance(other, DatasetConnector)
+            and self.config.table == other.config.table
+        )
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} table={self.config.table}>"
+
+
+def _load_sample(stats: DatasetStats) -> pd.DataFrame:
+    sample = load_df(stats.sample)
+
+    # Restore the column types lost in the JSON serialization
+    for column in stats.columns or []:
+        if column["name"] not in sample.columns:
+            continue
+        try:
+            sample[column["name"]] = sample[column["name"]].astype(column["type"])
+        except (TypeError, ValueError):
+            continue
+
+    return sample
+
+
+def get_dataset_connector(
+    dataset: Dataset, loader: Callable[[str], pd.DataFrame]
+) -> DatasetConnector:
+    """
+    Returns a lazy connector for the dataset, described by its statistics when
+    they are available in the catalog.
+
+    :param dataset: The dataset, with its stats loaded.
+    :param loader: Runs a query on the chat database and returns the result.
+    :return: The connector.
+    """
+    stats = dataset.stats
+
+    if stats is not None and stats.sample:
+        head = _load_sample(stats)
+    elif dataset.head:
+        head = load_df(dataset.head)
+    else:
+        head = None
+
+    return DatasetConnector(
+        {"table": dataset.table_name},
+        loader=loader,
+        head=head,
+        rows_count=stats.rows_count if stats is not None else None,
+        name=dataset.name,
+        description=dataset.description,
+        field_descriptions=dataset.field_descriptions,
+    )
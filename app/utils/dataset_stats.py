@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import heapq
+import random
+from typing import Any, Iterable, List, Optional, Sequence
+
+import pandas as pd
+from sqlalchemy.sql import text
+
+from core.utils.database_utils import load_data_from_db, stream_data_from_db
+from core.utils.dataframe import convert_dataframe_to_dict
+
+# Number of hashes kept to estimate the number of distinct values of a column
+DISTINCT_SKETCH_SIZE = 1024
+
+
+def _hash_value(value: Any) -> int:
+    digest = hashlib.blake2b(repr(value).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class ColumnStatsCollector:
+    """
+    Collects the null count and a distinct count estimate of a column in a
+    single pass, using a K-minimum values sketch for the distinct count.
+    """
+
+    def __init__(self, sketch_size: int = DISTINCT_SKETCH_SIZE):
+        self.sketch_size = sketch_size
+        self.nulls_count = 0
+        # Max-heap (negated) of the smallest hashes seen so far
+        self._sketch: List[int] = []
+        self._sketch_hashes = set()
+
+    def add(self, value: Any) -> None:
+        if value is None:
+            self.nulls_count += 1
+            return
+
+        value_hash = _hash_value(value)
+        if value_hash in self._sketch_hashes:
+            return
+
+        if len(self._sketch) < self.sketch_size:
+            heapq.heappush(self._sketch, -value_hash)
+            self._sketch_hashes.add(value_hash)
+        elif value_hash < -self._sketch[0]:
+            removed = -heapq.heapreplace(self._sketch, -value_hash)
+            self._sketch_hashes.discard(removed)
+            self._sketch_hashes.add(value_hash)
+
+    def distinct_count(self) -> int:
+        if len(self._sketch) < self.sketch_size:
+            return len(self._sketch)
+
+        kth_smallest = -self._sketch[0] / 2**64
+        return int((self.sketch_size - 1) / kth_smallest)
+
+
+class DatasetStatsCollector:
+    """
+    Collects the statistics of a dataset while its rows are streamed: the rows
+    count, the null fraction and distinct count estimate of each column and a
+    uniform reservoir sample of the rows.
+    """
+
+    def __init__(self, columns: Sequence[str], sample_size: int, seed: int = None):
+        self.columns = list(columns)
+        self.sample_size = sample_size
+        self.rows_count = 0
+        self.sample: List[Sequence[Any]] = []
+        self._columns_stats = [ColumnStatsCollector() for _ in self.columns]
+        self._random = random.Random(seed)
+
+    def add_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        for row in rows:
+            self.rows_count += 1
+
+            for column_stats, value in zip(self._columns_stats, row):
+                column_stats.add(value)
+
+            # Reservoir sampling (algorithm R)
+            if len(self.sample) < self.sample_size:
+                self.sample.append(tuple(row))
+            else:
+                index = self._random.randrange(self.rows_count)
+                if index < self.sample_size:
+                    self.sample[index] = tuple(row)
+
+    def to_dict(self) -> dict:
+        sample_df = pd.DataFrame(self.sample, columns=self.columns).infer_objects()
+
+        return {
+            "rows_count": self.rows_count,
+            "columns": [
+                {
+                    "name": name,
+                    "type": str(sample_df[name].dtype),
+                    "null_fraction": (
+                        column_stats.nulls_count / self.rows_count
+                        if self.rows_count
+                        else 0.0
+                    ),
+                    "distinct_count": column_stats.distinct_count(),
+                }
+                for name, column_stats in zip(self.columns, self._columns_stats)
+            ],
+            "sample": convert_dataframe_to_dict(sample_df),
+        }
+
+
+async def compute_dataset_stats(table_name: str, sample_size: int) -> dict:
+    """
+    Computes the statistics of a table of the chat database in a single scan,
+    the batches are hashed and sampled in a thread to keep the event loop free.
+
+    :param table_name: The table of the dataset.
+    :param sample_size: The number of rows of the sample.
+    :return: The rows count, the columns statistics and the sample.
+    """
+    collector = None
+    async for columns, rows in stream_data_from_db(f"SELECT * FROM {table_name}"):
+        if collector is None:
+            collector = DatasetStatsCollector(columns, sample_size)
+        await asyncio.to_thread(collector.add_rows, rows)
+
+    if collector is None:
+        return {"rows_count": 0, "columns": [], "sample": None}
+
+    return collector.to_dict()
+
+
+async def get_change_marker(table_name: str) -> Optional[str]:
+    """
+    Returns a marker that changes when rows of the table are inserted, updated
+    or deleted, so statistics are only computed again when the data changed.
+
+    :param table_name: The table of the dataset.
+    :return: The change marker, or None if it can't be determined.
+    """
+    # The table is resolved as in the queries, so schema qualified and quoted
+    # names match their statistics
+    query = text(
+        "SELECT n_tup_ins + n_tup_upd + n_tup_del FROM pg_stat_user_tables "
+        "WHERE relid = to_regclass(:table_name)"
+    ).bindparams(table_name=table_name)
+    try:
+        result = await load_data_from_db(query)
+    except Exception:
+        return None
+
+    if result.empty:
+        return None
+
+    return str(result.iloc[0, 0])
@@ -0,0 +1,372 @@
+import asyncio
+import datetime
+import glob
+import json
+import logging
+import os
+import threading
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.models import ConversationMessage, UserConversation
+from app.repositories.conversation import ConversationRepository
+from core.config import config
+from core.database.session import async_session_factory
+from core.utils.json_encoder import CustomEncoder
+from core.utils.telemetry import tracer
+
+logger = logging.getLogger(__name__)
+
+# Errors which inserting the messages again won't fix
+PERMANENT_ERRORS = (DataError, IntegrityError, TypeError, ValueError)
+
+
+class MessageEncoder(CustomEncoder):
+    def default(self, obj):
+        if isinstance(obj, uuid.UUID):
+            return str(obj)
+
+        return super().default(obj)
+
+
+class ConversationMessageWriter:
+    """
+    Write-behind queue of the conversation messages.
+
+    The messages are appended to a journal file and inserted in batches, with
+    multi-row inserts, by a background task, so the chat requests don't wait
+    for the database. A batch which fails to be inserted is retried with a
+    backoff, and the messages of the journal which were not inserted before a
+    restart are inserted on start. The inserts skip the messages already
+    inserted, so replaying the journal is safe, and the messages which can
+    never be inserted are moved to a dead letter file.
+
+    Each process has its own journal, suffixed with its pid, and takes over
+    the journals of the processes which are not running anymore.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        journal_path: Optional[str] = None,
+        max_backoff: float = 60,
+    ):
+        """
+        :param batch_size: The maximum number of messages of an insert.
+        :param flush_interval: The seconds between two inserts.
+        :param journal_path: The path of the journals keeping the messages
+            until they are inserted, or None to only keep them in memory.
+        :param max_backoff: The maximum seconds between two retries.
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.journal_path = journal_path
+        self.max_backoff = max_backoff
+        self._pending: List[Dict] = []
+        self._flush_event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._failures = 0
+        # Messages waiting to be appended to the journal, appended together
+        self._journal_queue: List[Tuple[Dict, asyncio.Future]] = []
+        self._journal_task: Optional[asyncio.Task] = None
+        self._journal_lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def process_journal_path(self) -> Optional[str]:
+        """The journal of this process."""
+        if not self.journal_path:
+            return None
+        root, extension = os.path.splitext(self.journal_path)
+        return f"{root}-{os.getpid()}{extension}"
+
+    @property
+    def dead_letter_path(self) -> Optional[str]:
+        """The file of the messages which can't be inserted."""
+        if not self.journal_path:
+            return None
+        root, extension = os.path.splitext(self.journal_path)
+        return f"{root}.dead{extension}"
+
+    async def start(self) -> None:
+        """Inserts the messages left in the journals and starts the writer."""
+        if self.journal_path:
+            os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+
+        self._pending = await asyncio.to_thread(self._recover_journals)
+        if self._pending:
+            logger.info(f"Recovered {len(self._pending)} messages from the journal")
+
+        self._flush_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the writer, after inserting the pending messages."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._journal_task is not None:
+            await self._journal_task
+
+        try:
+            while self._pending:
+                await self.flush()
+        except Exception:
+            logger.exception(
+                f"Failed to insert {len(self._pending)} messages, "
+                "they are kept in the journal"
+            )
+
+    async def enqueue(
+        self,
+        conversation_id: str,
+        query: str,
+        response: List[Dict],
+        code_generated: str,
+        **attributes,
+    ) -> ConversationMessage:
+        """
+        Queues the message to be inserted, once it is in the journal.
+
+        :return: The message, with its id and creation date.
+        """
+        message = {
+            "id": uuid.uuid4(),
+            "conversation_id": conversation_id,
+            "created_at": datetime.datetime.now(),
+            "query": query,
+            "response": response,
+            "code_generated": code_generated,
+            **attributes,
+        }
+
+        self._pending.append(message)
+        try:
+            await self._append_journal(message)
+        except Exception:
+            self._pending.remove(message)
+            raise
+        if len(self._pending) >= self.batch_size:
+            self._flush_event.set()
+
+        return ConversationMessage(**message)
+
+    def get_pending_messages(self, conversation_id: str) -> List[ConversationMessage]:
+        """
+        Returns the queued messages of the conversation, not inserted yet.
+        """
+        return [
+            ConversationMessage(**message)
+            for message in self._pending
+            if str(message["conversation_id"]) == str(conversation_id)
+        ]
+
+    async def flush(self) -> None:
+        """Inserts the next batch of the pending messages."""
+        batch = self._pending[: self.batch_size]
+        if not batch:
+            return
+
+        with tracer.start_as_current_span(
+            "message_writer.flush", attributes={"messages_count": len(batch)}
+        ):
+            try:
+                await self._insert(batch)
+            except PERMANENT_ERRORS:
+                # A message of the batch can't be inserted, the others are
+                # inserted one by one
+                logger.exception("Failed to insert a batch, inserting one by one")
+                for message in batch:
+                    try:
+                        await self._insert([message])
+                    except PERMANENT_ERRORS:
+                        logger.exception(
+                            f"Moving the message {message['id']} to the dead "
+                            "letter file"
+                        )
+                        await asyncio.to_thread(self._write_dead_letter, message)
+
+        del self._pending[: len(batch)]
+        await asyncio.to_thread(self._write_journal)
+
+    async def _insert(self, messages: List[Dict]) -> None:
+        async with async_session_factory() as session:
+            repository = ConversationRepository(UserConversation, db_session=session)
+            await repository.add_conversation_messages(messages)
+            await session.commit()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), self._get_delay())
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+
+            try:
+                while self._pending:
+                    await self.flush()
+                self._failures = 0
+            except Exception:
+                self._failures += 1
+                logger.exception(
+                    f"Failed to insert {len(self._pending)} messages, "
+                    f"retrying in {self._get_delay():.1f}s"
+                )
+
+    def _get_delay(self) -> float:
+        if not self._failures:
+            return self.flush_interval
+        return min(self.flush_interval * 2**self._failures, self.max_backoff)
+
+    async def _append_journal(self, message: Dict) -> None:
+        if not self.journal_path:
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._journal_queue.append((message, future))
+        if self._journal_task is None:
+            self._journal_task = asyncio.create_task(self._drain_journal_queue())
+        await future
+
+    async def _drain_journal_queue(self) -> None:
+        """
+        Appends the queued messages to the journal in a thread, with a single
+        fsync for the messages queued while the previous append ran.
+        """
+        try:
+            while self._journal_queue:
+                queue, self._journal_queue = self._journal_queue, []
+                try:
+                    await asyncio.to_thread(
+                        self._append_journal_lines, [message for message, _ in queue]
+                    )
+                except Exception as e:
+                    for _, future in queue:
+                        future.set_exception(e)
+                else:
+                    for _, future in queue:
+                        future.set_result(None)
+        finally:
+            self._journal_task = None
+
+    def _append_journal_lines(self, messages: List[Dict]) -> None:
+        # The appends don't interleave with the rewrites of the journal
+        with self._journal_lock:
+            self._write_lines(self.process_journal_path, messages, "a")
+
+    def _write_journal(self) -> None:
+        """Rewrites the journal with the pending messages."""
+        journal_path = self.process_journal_path
+        if not journal_path:
+            return
+
+        with self._journal_lock:
+            self._write_lines(f"{journal_path}.tmp", list(self._pending), "w")
+            os.replace(f"{journal_path}.tmp", journal_path)
+
+    def _write_dead_letter(self, message: Dict) -> None:
+        if self.dead_letter_path:
+            self._write_lines(self.dead_letter_path, [message], "a")
+
+    @staticmethod
+    def _write_lines(path: str, messages: List[Dict], mode: str) -> None:
+        with open(path, mode, encoding="utf-8") as file:
+            for message in messages:
+                file.write(json.dumps(message, cls=MessageEncoder) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _recover_journals(self) -> List[Dict]:
+        """
+        Returns the messages of the journal of this process and of the
+        journals of the processes not running anymore, which are merged into
+        the journal of this process.
+        """
+        if not self.journal_path:
+            return []
+
+        root, extension = os.path.splitext(self.journal_path)
+        journal_path = self.process_journal_path
+        paths = [self.journal_path] + glob.glob(f"{glob.escape(root)}-*{extension}")
+
+        claimed = []
+        for path in paths:
+            if path == journal_path or not os.path.exists(path):
+                continue
+            pid = os.path.basename(path)[len(os.path.basename(root)) + 1 :]
+            pid = pid[: -len(extension) or None].split("-")[0]
+            if path != self.journal_path and _is_running(pid):
+                continue
+
+            # Renamed first, so a single process takes over the journal
+            claimed_path = f"{root}-{os.getpid()}-{uuid.uuid4().hex}{extension}"
+            try:
+                os.rename(path, claimed_path)
+            except FileNotFoundError:
+                continue
+            claimed.append(claimed_path)
+
+        messages = {}
+        for path in [journal_path] + claimed:
+            for message in self._read_journal(path):
+                messages[message["id"]] = message
+        messages = sorted(messages.values(), key=lambda message: message["created_at"])
+
+        self._pending = messages
+        self._write_journal()
+        for path in claimed:
+            os.remove(path)
+
+        return messages
+
+    def _read_journal(self, path: Optional[str] = None) -> List[Dict]:
+        path = path or self.process_journal_path
+        if not path or not os.path.exists(path):
+            return []
+
+        messages = []
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    # The last line is incomplete if the process was killed
+                    continue
+                message["id"] = uuid.UUID(message["id"])
+                message["conversation_id"] = uuid.UUID(message["conversation_id"])
+                message["created_at"] = datetime.datetime.fromisoformat(
+                    message["created_at"]
+                )
+                messages.append(message)
+
+        return messages
+
+
+def _is_running(pid: str) -> bool:
+    """Whether the process of the pid is running."""
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+message_writer = ConversationMessageWriter(
+    batch_size=config.CHAT_WRITE_BEHIND_BATCH_SIZE,
+    flush_interval=config.CHAT_WRITE_BEHIND_FLUSH_INTERVAL,
+    journal_path=config.CHAT_WRITE_BEHIND_JOURNAL_PATH,
+)
@@ -0,0 +1,98 @@
+import json
+import random
+import re
+import uuid
+from typing import Optional, Tuple
+
+from pandasai.helpers.profiler import Profile
+
+from app.utils.result_store import BlobStore, LocalBlobStore
+from core.config import config
+
+PROFILE_HEADER = "X-Profile"
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# Files of a profile and their media types
+PROFILE_FILES = {
+    # Collapsed stacks, for flamegraph.pl or speedscope
+    "stacks.folded": "text/plain",
+    # CPU profile, for pstats or snakeviz
+    "profile.pstats": "application/octet-stream",
+    # Sections of the run with their top allocations
+    "sections.json": "application/json",
+}
+
+
+class ProfileSampler:
+    """
+    Decides which chats are profiled: the ones requesting it with the
+    X-Profile header, and a sample of the others.
+    """
+
+    def __init__(self, enabled: bool, sample_rate: float):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+
+    def sample(self, header: Optional[str] = None) -> Optional[Profile]:
+        """
+        Returns a new profile if the chat is profiled.
+
+        :param header: The value of the X-Profile header of the request.
+        :return: The profile to record, or None.
+        """
+        if not self.enabled:
+            return None
+
+        requested = header is not None and header.lower() in ("1", "true")
+        if requested or random.random() < self.sample_rate:
+            return Profile()
+        return None
+
+
+class ProfileStore:
+    """Stores the files of the profiles in a blob store."""
+
+    def __init__(self, blob_store: BlobStore):
+        self.blob_store = blob_store
+
+    def save(self, profile: Profile) -> str:
+        """
+        Stores the files of the profile.
+
+        :param profile: The recorded profile.
+        :return: The id of the profile.
+        """
+        profile_id = uuid.uuid4().hex
+        files = {
+            "stacks.folded": profile.collapsed_stacks().encode(),
+            "profile.pstats": profile.dump_stats(),
+            "sections.json": json.dumps(
+                {
+                    "sections": profile.sections,
+                    "top_functions": profile.top_functions(),
+                }
+            ).encode(),
+        }
+        for name, data in files.items():
+            self.blob_store.put(f"{profile_id}.{name}", data)
+
+        return profile_id
+
+    def load(self, profile_id: str, name: str) -> Tuple[bytes, str]:
+        """
+        Returns a file of the profile and its media type, or raises a KeyError
+        if it doesn't exist.
+
+        :param profile_id: The id of the profile.
+        :param name: The name of the file, e.g. "stacks.folded".
+        :return: The content and the media type.
+        """
+        if not PROFILE_ID_PATTERN.match(profile_id) or name not in PROFILE_FILES:
+            raise KeyError(f"{profile_id}.{name}")
+
+        return self.blob_store.get(f"{profile_id}.{name}"), PROFILE_FILES[name]
+
+
+profile_sampler = ProfileSampler(config.PROFILING_ENABLED, config.PROFILING_SAMPLE_RATE)
+profile_store = ProfileStore(LocalBlobStore(config.PROFILE_STORE_PATH))
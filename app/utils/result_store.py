@@ -0,0 +1,353 @@
+import base64
+import gzip
+import hashlib
+import hmac
+import io
+import json
+import os
+import re
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from core.config import config
+from core.utils.dataframe import convert_dataframe_to_dict, load_df
+
+PLOT_DATA_URI_PREFIX = "data:image/png;base64,"
+
+# Content-addressed keys: the sha256 of the blob and its format
+BLOB_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}\.(parquet|json\.gz|png|webp)$")
+
+BLOB_MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "json.gz": "application/json",
+    "png": "image/png",
+    "webp": "image/webp",
+}
+
+
+class BlobStore(ABC):
+    """Storage of the result blobs, e.g. a local directory or an object store."""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """
+        Returns the blob, or raises a KeyError if it doesn't exist.
+        """
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """
+        Returns whether the blob exists, marking it as used.
+        """
+        ...
+
+    @abstractmethod
+    def cleanup(self, max_age: float) -> int:
+        """
+        Deletes the blobs not used for max_age seconds.
+
+        :return: The number of deleted blobs.
+        """
+        ...
+
+
+class LocalBlobStore(BlobStore):
+    """Stores the blobs in a local directory."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def put(self, key: str, data: bytes) -> None:
+        # The keys are content-addressed, an existing blob has the same data
+        if self.exists(key):
+            return
+
+        path = self._get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Unique to the call, the threads and workers can put the same blob
+        descriptor, temporary_path = tempfile.mkstemp(
+            suffix=".tmp", dir=os.path.dirname(path)
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def get(self, key: str) -> bytes:
+        try:
+            with open(self._get_path(key), "rb") as file:
+                data = file.read()
+            os.utime(self._get_path(key))
+            return data
+        except FileNotFoundError as e:
+            raise KeyError(key) from e
+
+    def exists(self, key: str) -> bool:
+        try:
+            # The modification time is the last use of the blob
+            os.utime(self._get_path(key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def cleanup(self, max_age: float) -> int:
+        deleted = 0
+        limit = time.time() - max_age
+        for directory, _, files in os.walk(self.path):
+            for file in files:
+                path = os.path.join(directory, file)
+                try:
+                    if os.path.getmtime(path) < limit:
+                        os.remove(path)
+                        deleted += 1
+                except FileNotFoundError:
+                    pass
+        return deleted
+
+
+class ResultStore:
+    """
+    Offloads the dataframes and the plots of the chat responses to a blob
+    store, so the stored messages only keep a reference and a small preview.
+
+    The blobs are served from signed URLs expiring after url_ttl to
+    url_ttl * 2 seconds, so the plots of the history can be displayed
+    without the authorization header. The URLs of a blob are the same
+    during url_ttl seconds, so they can be cached by the clients.
+    """
+
+    def __init__(
+        self,
+        blob_store: BlobStore,
+        preview_rows: int = 20,
+        secret_key: str = "",
+        url_ttl: int = 3600,
+    ):
+        """
+        :param blob_store: The store of the blobs.
+        :param preview_rows: The rows of the dataframes kept in the message,
+            the dataframes with more rows are offloaded.
+        :param secret_key: The key signing the URLs.
+        :param url_ttl: The minimum seconds the signed URLs are valid.
+        """
+        self.blob_store = blob_store
+        self.preview_rows = preview_rows
+        self.secret_key = secret_key
+        self.url_ttl = url_ttl
+
+    def offload(self, response: List[Dict]) -> List[Dict]:
+        """
+        Returns the response with the large values replaced by references.
+
+        :param response: The serialized chat response.
+        :return: The response to store in the message.
+        """
+        return [self._offload_item(item) for item in response]
+
+    def resolve(self, response: Any) -> Any:
+        """
+        Returns the stored response with signed URLs of the offloaded blobs:
+        the URL of the image for the plots, and the URL of the full table for
+        the truncated dataframes.
+
+        :param response: The response stored in the message.
+        :return: The response to return to the clients.
+        """
+        if not isinstance(response, list):
+            return response
+
+        return [self._resolve_item(item) for item in response]
+
+    def get_url(self, key: str) -> str:
+        """
+        Returns the signed URL of the blob.
+
+        :param key: The key of the blob.
+        :return: The URL.
+        """
+        expires = (int(time.time()) // self.url_ttl + 2) * self.url_ttl
+        return (
+            f"/v1/results/{key}?expires={expires}"
+            f"&signature={self._sign(key, expires)}"
+        )
+
+    def verify_url(
+        self, key: str, expires: Optional[int], signature: Optional[str]
+    ) -> bool:
+        """
+        Returns whether the signature of the URL of the blob is valid and not
+        expired.
+        """
+        if expires is None or signature is None or expires < time.time():
+            return False
+
+        return hmac.compare_digest(self._sign(key, expires), signature)
+
+    def _sign(self, key: str, expires: int) -> str:
+        message = f"{key}:{expires}".encode()
+        return hmac.new(self.secret_key.encode(), message, hashlib.sha256).hexdigest()
+
+    def cleanup(self, max_age: float) -> int:
+        """
+        Deletes the blobs not stored or loaded for max_age seconds. The
+        messages referencing them keep their preview.
+
+        :return: The number of deleted blobs.
+        """
+        return self.blob_store.cleanup(max_age)
+
+    def load(self, key: str) -> Tuple[bytes, str]:
+        """
+        Returns the blob and its media type, the tables being returned as JSON.
+
+        :param key: The key of the blob.
+        :return: The content and the media type.
+        """
+        if not BLOB_KEY_PATTERN.match(key):
+            raise KeyError(key)
+
+        data = self.blob_store.get(key)
+        blob_format = key.split(".", 1)[1]
+
+        if blob_format == "parquet":
+            df = pd.read_parquet(io.BytesIO(data))
+            data = json.dumps(convert_dataframe_to_dict(df)).encode()
+            return data, BLOB_MEDIA_TYPES["json.gz"]
+
+        if blob_format == "json.gz":
+            return gzip.decompress(data), BLOB_MEDIA_TYPES[blob_format]
+
+        return data, BLOB_MEDIA_TYPES[blob_format]
+
+    def _resolve_item(self, item: Any) -> Any:
+        if not isinstance(item, dict) or not isinstance(item.get("blob"), dict):
+            return item
+
+        url = self.get_url(item["blob"]["key"])
+        if item.get("type") == "plot":
+            return {**item, "value": url}
+
+        return {**item, "truncated": True, "blob": {**item["blob"], "url": url}}
+
+    def _offload_item(self, item: Any) -> Any:
+        if not isinstance(item, dict) or "blob" in item:
+            return item
+
+        if item.get("type") == "dataframe":
+            return self._offload_dataframe(item)
+
+        if item.get("type") == "plot":
+            return self._offload_plot(item)
+
+        return item
+
+    def _offload_dataframe(self, item: Dict) -> Dict:
+        value = item.get("value")
+        if not isinstance(value, dict):
+            return item
+
+        rows = value.get("rows", [])
+        if len(rows) <= self.preview_rows:
+            return item
+
+        data, blob_format = _encode_table(value)
+        key = self._put(data, blob_format)
+
+        return {
+            **item,
+            "value": {"headers": value["headers"], "rows": rows[: self.preview_rows]},
+            "truncated": True,
+            "blob": {"key": key, "format": blob_format, "rows_count": len(rows)},
+        }
+
+    def _offload_plot(self, item: Dict) -> Dict:
+        value = item.get("value")
+        if not isinstance(value, str) or not value.startswith(PLOT_DATA_URI_PREFIX):
+            return item
+
+        data, blob_format = _encode_image(
+            base64.b64decode(value[len(PLOT_DATA_URI_PREFIX) :])
+        )
+        key = self._put(data, blob_format)
+
+        return {
+            **item,
+            "value": f"/v1/results/{key}",
+            "blob": {"key": key, "format": blob_format},
+        }
+
+    def _put(self, data: bytes, blob_format: str) -> str:
+        key = f"{hashlib.sha256(data).hexdigest()}.{blob_format}"
+        if not self.blob_store.exists(key):
+            self.blob_store.put(key, data)
+        return key
+
+
+def _encode_table(value: Dict) -> Tuple[bytes, str]:
+    """
+    Encodes the table to Parquet, or to compressed JSON if no Parquet engine
+    is installed or the columns mix types Parquet can't store.
+    """
+    try:
+        buffer = io.BytesIO()
+        load_df(value).to_parquet(buffer, index=False)
+        return buffer.getvalue(), "parquet"
+    except (ImportError, TypeError, ValueError):
+        pass
+
+    # Fixed mtime, so the same table gives the same blob
+    data = gzip.compress(json.dumps(value).encode(), mtime=0)
+    return data, "json.gz"
+
+
+def _encode_image(data: bytes) -> Tuple[bytes, str]:
+    """
+    Encodes the PNG image to lossless WebP, if it is smaller.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return data, "png"
+
+    buffer = io.BytesIO()
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.save(buffer, format="WEBP", lossless=True)
+    except (OSError, ValueError):
+        return data, "png"
+
+    if buffer.tell() >= len(data):
+        return data, "png"
+
+    return buffer.getvalue(), "webp"
+
+
+def get_result_store() -> Optional[ResultStore]:
+    if not config.RESULT_STORE_PATH:
+        return None
+
+    return ResultStore(
+        LocalBlobStore(config.RESULT_STORE_PATH),
+        preview_rows=config.RESULT_PREVIEW_ROWS,
+        secret_key=config.SECRET_KEY,
+        url_ttl=config.RESULT_URL_TTL,
+    )
+
+
+result_store = get_result_store()
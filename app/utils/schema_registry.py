@@ -0,0 +1,91 @@
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import anyio
+from sqlalchemy.exc import IntegrityError
+
+from app.models import SemanticSchema
+from app.repositories.semantic_schema import SemanticSchemaRepository
+from core.database.session import async_session_factory
+from pandasai.ee.helpers.schema_registry import SchemaRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseSchemaRegistry(SchemaRegistry):
+    """
+    Registry of the semantic schemas stored in the database, so they are
+    generated once for all the workers and kept across restarts.
+
+    The latest versions are loaded in memory on startup, so creating a
+    SemanticAgent is a dictionary lookup. The schemas generated since, e.g.
+    by other workers, are loaded on the first miss. The agents are created
+    in worker threads, so the database is reached through the event loop.
+    """
+
+    def __init__(self):
+        self._schemas: Dict[str, List[dict]] = {}
+        self._lock = threading.Lock()
+
+    async def warm(self) -> int:
+        """
+        Loads the latest version of each schema.
+
+        :return: The number of schemas loaded.
+        """
+        async with async_session_factory() as session:
+            repository = SemanticSchemaRepository(SemanticSchema, db_session=session)
+            schemas = await repository.get_latest_schemas()
+
+        with self._lock:
+            for schema in schemas:
+                self._schemas[schema.fingerprint] = schema.definition
+        return len(schemas)
+
+    def get(self, fingerprint: str) -> Optional[List[dict]]:
+        schema = self._schemas.get(fingerprint)
+        if schema is None:
+            schema = self._run(self.load, fingerprint)
+        return schema
+
+    def set(self, fingerprint: str, schema: List[dict]) -> None:
+        with self._lock:
+            self._schemas[fingerprint] = schema
+        self._run(self.save, fingerprint, schema)
+
+    async def load(self, fingerprint: str) -> Optional[List[dict]]:
+        async with async_session_factory() as session:
+            repository = SemanticSchemaRepository(SemanticSchema, db_session=session)
+            schema = await repository.get_latest_schema(fingerprint)
+
+        if schema is None:
+            return None
+
+        with self._lock:
+            self._schemas[fingerprint] = schema.definition
+        return schema.definition
+
+    async def save(self, fingerprint: str, schema: List[dict]) -> None:
+        async with async_session_factory() as session:
+            repository = SemanticSchemaRepository(SemanticSchema, db_session=session)
+            try:
+                await repository.add_version(fingerprint, schema)
+                await session.commit()
+            except IntegrityError:
+                # Another worker saved the same version first
+                await session.rollback()
+                logger.info("Schema %s was saved concurrently", fingerprint)
+
+    def _run(self, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        try:
+            return anyio.from_thread.run(func, *args)
+        except RuntimeError:
+            # Not called from a worker thread, the registry is only in memory
+            logger.warning("Schema registry used outside of a worker thread")
+        except Exception:
+            logger.exception("Failed to reach the schema registry")
+        return None
+
+
+schema_registry = DatabaseSchemaRegistry()
@@ -0,0 +1,97 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.models import Organization, OrganizationMembership, User, UserSpace, Workspace
+from app.schemas.responses.users import UserInfo
+from core.config import config
+
+# Key of the user resolved for requests without a JWT
+ANONYMOUS_USER_KEY = "anonymous"
+
+
+class UserInfoCache:
+    """
+    Per-process cache of the resolved user information, keyed by the user id
+    of the JWT, so authenticated requests don't query the database.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, UserInfo]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[UserInfo]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if entry[0] < time.time() - self.ttl:
+                del self._entries[key]
+                return None
+
+            return entry[1]
+
+    def set(self, key: str, user_info: UserInfo) -> None:
+        if self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.time(), user_info)
+
+    def invalidate_user(self, user_id) -> None:
+        """Removes the entries of the user."""
+        with self._lock:
+            for key, (_, user_info) in list(self._entries.items()):
+                if str(user_info.id) == str(user_id):
+                    del self._entries[key]
+
+    def invalidate_workspace(self, workspace_id) -> None:
+        """Removes the entries of the users of the workspace."""
+        with self._lock:
+            for key, (_, user_info) in list(self._entries.items()):
+                if str(user_info.space.id) == str(workspace_id):
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_info_cache = UserInfoCache(ttl=config.USER_INFO_CACHE_TTL)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _on_user_change(mapper, connection, target: User) -> None:
+    user_info_cache.invalidate_user(target.id)
+
+
+@event.listens_for(OrganizationMembership, "after_insert")
+@event.listens_for(OrganizationMembership, "after_update")
+@event.listens_for(OrganizationMembership, "after_delete")
+def _on_membership_change(mapper, connection, target: OrganizationMembership) -> None:
+    user_info_cache.invalidate_user(target.user_id)
+
+
+@event.listens_for(UserSpace, "after_insert")
+@event.listens_for(UserSpace, "after_delete")
+def _on_user_space_change(mapper, connection, target: UserSpace) -> None:
+    user_info_cache.invalidate_user(target.user_id)
+
+
+@event.listens_for(Workspace, "after_update")
+@event.listens_for(Workspace, "after_delete")
+def _on_workspace_change(mapper, connection, target: Workspace) -> None:
+    user_info_cache.invalidate_workspace(target.id)
+
+
+@event.listens_for(Workspace, "after_insert")
+@event.listens_for(Organization, "after_update")
+@event.listens_for(Organization, "after_delete")
+def _on_organization_change(mapper, connection, target) -> None:
+    # The workspace of a user is resolved from its organizations
+    user_info_cache.clear()
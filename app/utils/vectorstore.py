@@ -0,0 +1,18 @@
+from functools import cache
+from typing import Optional
+
+from pandasai.vectorstores import LocalVectorStore, VectorStore
+
+from core.config import config
+
+
+@cache
+def get_vectorstore() -> Optional[VectorStore]:
+    """
+    Returns the local vector store shared by the agents of the process, when
+    a path is configured for it.
+    """
+    if not config.VECTORSTORE_PATH:
+        return None
+
+    return LocalVectorStore(persist_path=config.VECTORSTORE_PATH)
@@ -0,0 +1,44 @@
+"""
+Benchmarks of `ChatController.chat`, with the repositories, the chat database
+and the LLM replaced by the fakes of `benchmarks.server`.
+"""
+
+import asyncio
+
+import pytest
+
+from app.schemas.requests.chat import ChatRequest
+from benchmarks.datasets import SHAPES, dataset_sizes
+from benchmarks.llm import QUERIES
+from benchmarks.server import (
+    WORKSPACE_ID,
+    make_chat_controller,
+    make_user,
+    session_context,
+    stub_chat_backends,
+)
+
+
+@pytest.mark.benchmark(group="chat_controller")
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("rows", dataset_sizes())
+def test_chat_controller(benchmark, rows, shape, query):
+    controller = make_chat_controller(rows, shape)
+    user = make_user()
+    chat_request = ChatRequest(workspace_id=WORKSPACE_ID, query=QUERIES[query])
+    loop = asyncio.new_event_loop()
+
+    async def chat():
+        with session_context():
+            return await controller.chat(user, chat_request)
+
+    benchmark.extra_info.update(rows=rows, shape=shape, query=query)
+    try:
+        with stub_chat_backends():
+            response = benchmark(lambda: loop.run_until_complete(chat()))
+    finally:
+        loop.close()
+
+    # The fallback message is the only string response
+    assert response.response[0].type != "string"
@@ -0,0 +1,97 @@
+"""
+Benchmarks of the stages of the chat pipeline, on the synthetic datasets.
+"""
+
+import uuid
+
+import pytest
+from pandasai.helpers.anonymizer import Anonymizer, classification_cache
+from pandasai.helpers.code_cache import code_cache
+from pandasai.helpers.dataframe_serializer import (
+    DataframeSerializer,
+    DataframeSerializerType,
+)
+from pandasai.pipelines.chat.code_cleaning import CodeCleaning
+
+from benchmarks.datasets import SHAPES, dataset_sizes
+from benchmarks.llm import CANNED_CODE, QUERIES
+
+pytestmark = [
+    pytest.mark.parametrize("shape", SHAPES),
+    pytest.mark.parametrize("rows", dataset_sizes()),
+]
+
+
+@pytest.mark.benchmark(group="generate_chat_pipeline")
+@pytest.mark.parametrize("query", QUERIES)
+def test_generate_chat_pipeline(benchmark, agent, rows, shape, query):
+    def chat():
+        # A new conversation, so the prompt doesn't grow with the rounds
+        agent.start_new_conversation()
+        return agent.chat(QUERIES[query])
+
+    benchmark.extra_info.update(rows=rows, shape=shape, query=query)
+    response = benchmark(chat)
+
+    assert agent.last_error is None, agent.last_error
+    assert response
+
+
+@pytest.mark.benchmark(group="dataframe_serializer")
+# CSV is the default of the prompts, YML is used with field descriptions
+@pytest.mark.parametrize("serializer", ["CSV", "YML"])
+def test_dataframe_serializer(benchmark, agent, rows, shape, serializer):
+    connector = agent.context.dfs[0]
+    # The head is sampled once per connector, the serialization per prompt
+    connector.get_head()
+
+    benchmark.extra_info.update(rows=rows, shape=shape, serializer=serializer)
+    benchmark(
+        DataframeSerializer().serialize,
+        connector,
+        extras={"index": 0, "type": "pd.DataFrame"},
+        type_=DataframeSerializerType[serializer],
+    )
+
+
+@pytest.mark.benchmark(group="code_cleaning")
+@pytest.mark.parametrize("cached", [False, True], ids=["cold", "warm"])
+@pytest.mark.parametrize("query", CANNED_CODE)
+def test_code_cleaning(benchmark, agent, rows, shape, query, cached):
+    context = agent.context
+    context.add("last_prompt_id", uuid.uuid4())
+    code_cleaning = CodeCleaning()
+
+    def clean():
+        if not cached:
+            code_cache.clear()
+        return code_cleaning.execute(
+            CANNED_CODE[query], context=context, logger=agent.logger
+        )
+
+    benchmark.extra_info.update(rows=rows, shape=shape, query=query, cached=cached)
+    output = benchmark(clean)
+
+    assert output.success
+
+
+@pytest.mark.benchmark(group="anonymizer")
+@pytest.mark.parametrize("cached", [False, True], ids=["cold", "warm"])
+def test_anonymizer(benchmark, dataset, rows, shape, cached):
+    # Privacy mode on a full result frame, with personal information in
+    # some of the values of the label column
+    df = dataset.copy()
+    df["email"] = df["label"] + "@example.com"
+    df.loc[df.index % 3 == 0, "label"] = "+1 555-010-" + df["quantity"].astype(
+        str
+    ).str.zfill(4)
+
+    def anonymize():
+        if not cached:
+            classification_cache.clear()
+        return Anonymizer(seed=0).anonymize_dataframe(df)
+
+    benchmark.extra_info.update(rows=rows, shape=shape, cached=cached)
+    anonymized = benchmark(anonymize)
+
+    assert not anonymized["email"].isin(df["email"]).any()
@@ -0,0 +1,70 @@
+"""
+Compares two benchmark reports, e.g. of two commits.
+
+Reads the reports of pytest-benchmark (`--benchmark-json`) and of
+`benchmarks.load`, and compares the median of each benchmark. Exits with 1 if
+a benchmark is slower than the threshold.
+
+Usage:
+    python -m benchmarks.compare base.json head.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict
+
+
+def load_medians(path: str) -> Dict[str, float]:
+    with open(path, encoding="utf-8") as file:
+        report = json.load(file)
+
+    return {
+        benchmark["fullname"]: benchmark["stats"]["median"]
+        for benchmark in report["benchmarks"]
+    }
+
+
+def compare(base: Dict[str, float], head: Dict[str, float], threshold: float) -> int:
+    """
+    Prints the change of the median of each benchmark.
+
+    :return: The number of regressions.
+    """
+    regressions = 0
+    width = max(map(len, base.keys() | head.keys()), default=0)
+
+    print(f"{'benchmark':<{width}}  {'base (ms)':>10}  {'head (ms)':>10}  change")
+    for name in sorted(base.keys() | head.keys()):
+        if name not in base or name not in head:
+            status = "added" if name in head else "removed"
+            print(f"{name:<{width}}  {status}")
+            continue
+
+        change = head[name] / base[name] - 1
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(
+            f"{name:<{width}}  {base[name] * 1000:10.2f}  {head[name] * 1000:10.2f}"
+            f"  {change:+.1%}{flag}"
+        )
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("base", help="Report of the reference, e.g. main")
+    parser.add_argument("head", help="Report of the change")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Slowdown of the median reported as a regression (default: 10%%)",
+    )
+    args = parser.parse_args()
+
+    if compare(load_medians(args.base), load_medians(args.head), args.threshold):
+        sys.exit(1)
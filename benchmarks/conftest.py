@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+from pandasai import Agent
+from pandasai.connectors.pandas import PandasConnector
+
+from benchmarks.datasets import make_dataset
+from benchmarks.llm import StubLLM
+from core.utils.response_parser import JsonResponseParser
+
+
+def make_agent(df: pd.DataFrame, charts_path: str) -> Agent:
+    """
+    Returns an agent configured like the chat controller, with the stub LLM.
+    """
+    return Agent(
+        [PandasConnector({"original_df": df}, name="bench")],
+        config={
+            "llm": StubLLM(),
+            "response_parser": JsonResponseParser,
+            "enable_cache": False,
+            "save_logs": False,
+            "save_charts": True,
+            "save_charts_path": charts_path,
+        },
+    )
+
+
+@pytest.fixture
+def dataset(rows: int, shape: str) -> pd.DataFrame:
+    return make_dataset(rows, shape)
+
+
+@pytest.fixture
+def agent(dataset: pd.DataFrame, tmp_path) -> Agent:
+    return make_agent(dataset, str(tmp_path))
@@ -0,0 +1,72 @@
+"""
+Synthetic datasets of the benchmarks.
+
+The datasets are generated from a fixed seed, so a benchmark sees the same
+data on every run and the reports of two commits can be compared.
+"""
+
+import os
+from functools import cache
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+SHAPES = ("narrow", "wide")
+
+# Columns repeated to build the wide datasets, on top of the narrow ones
+WIDE_COLUMNS = 60
+
+# The sizes are set with BENCHMARK_ROWS, e.g. "1000,1000000,10000000". The
+# largest datasets take several GB of memory, so they are opt-in.
+DEFAULT_ROWS = "1000,100000"
+
+CATEGORIES = ["north", "south", "east", "west", "central"]
+
+
+def dataset_sizes() -> List[int]:
+    """
+    Returns the number of rows of the benchmarked datasets.
+    """
+    sizes = os.environ.get("BENCHMARK_ROWS", DEFAULT_ROWS)
+    return [int(size) for size in sizes.split(",") if size.strip()]
+
+
+@cache
+def make_dataset(rows: int, shape: str = "narrow", seed: int = 0) -> pd.DataFrame:
+    """
+    Returns a dataset with columns of mixed types: integers, floats,
+    categories, strings, dates and booleans.
+
+    The datasets are cached, so the benchmarks must not modify them.
+
+    :param rows: The number of rows.
+    :param shape: "narrow" for 7 columns, "wide" for 60 columns.
+    :param seed: The seed of the generator.
+    :return: The dataset.
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown dataset shape: {shape}")
+
+    rng = np.random.default_rng(seed)
+    columns = {
+        "id": np.arange(rows, dtype="int64"),
+        "amount": rng.gamma(2.0, 50.0, rows).round(2),
+        "quantity": rng.integers(1, 100, rows, dtype="int32"),
+        "category": pd.Categorical.from_codes(
+            rng.integers(0, len(CATEGORIES), rows), CATEGORIES
+        ),
+        "label": pd.Series(rng.integers(0, 1000, rows)).map("item_{}".format),
+        "created_at": pd.Timestamp("2024-01-01")
+        + pd.to_timedelta(rng.integers(0, 365 * 24 * 3600, rows), unit="s"),
+        "active": rng.random(rows) < 0.7,
+    }
+
+    if shape == "wide":
+        for index in range(WIDE_COLUMNS - len(columns)):
+            if index % 2:
+                columns[f"metric_{index}"] = rng.normal(0.0, 1.0, rows)
+            else:
+                columns[f"code_{index}"] = rng.integers(0, 10_000, rows)
+
+    return pd.DataFrame(columns)
@@ -0,0 +1,54 @@
+"""
+Stub LLM of the benchmarks.
+
+It returns canned code for the benchmark queries, without any network call, so
+the benchmarks measure the pipeline and not the LLM.
+"""
+
+from pandasai.llm.base import LLM
+from pandasai.pipelines.pipeline_context import PipelineContext
+from pandasai.prompts.base import BasePrompt
+
+# The canned code works on any dataset of `benchmarks.datasets`
+QUERIES = {
+    "count": "How many rows are there?",
+    "aggregate": "What is the total amount by category?",
+    "top": "Which are the 10 rows with the largest amount?",
+    "plot": "Plot the total amount by category",
+}
+
+CANNED_CODE = {
+    "count": """df = dfs[0]
+result = {"type": "number", "value": len(df)}""",
+    "aggregate": """df = dfs[0]
+totals = df.groupby("category", observed=True)["amount"].sum().reset_index()
+result = {"type": "dataframe", "value": totals}""",
+    "top": """df = dfs[0]
+result = {"type": "dataframe", "value": df.nlargest(10, "amount")}""",
+    "plot": """import matplotlib.pyplot as plt
+df = dfs[0]
+df.groupby("category", observed=True)["amount"].sum().plot(kind="bar")
+plt.savefig("plot.png")
+result = {"type": "plot", "value": "plot.png"}""",
+}
+
+
+class StubLLM(LLM):
+    """Returns the canned code of the last query of the conversation"""
+
+    _responses = {QUERIES[name]: code for name, code in CANNED_CODE.items()}
+    _default = """result = {"type": "string", "value": "Unknown query"}"""
+
+    def call(self, instruction: BasePrompt, context: PipelineContext = None) -> str:
+        # Rendered like a real LLM would, the prompt is part of the pipeline cost
+        self.last_prompt = instruction.to_string()
+
+        query = ""
+        if context is not None and context.memory.count() > 0:
+            query = context.memory.last()["message"]
+
+        return self._responses.get(query, self._default)
+
+    @property
+    def type(self) -> str:
+        return "stub"
@@ -0,0 +1,181 @@
+"""
+End-to-end load test of the chat API.
+
+The application runs in process, behind an ASGI client, with the fakes of
+`benchmarks.server`. The latencies are written to a JSON report in the format
+of the pytest-benchmark reports, so both can be diffed with
+`benchmarks.compare`.
+
+Usage:
+    python -m benchmarks.load --rows 100000 --requests 200 --concurrency 8 \
+        --output load.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from collections import defaultdict
+from itertools import cycle
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.datasets import SHAPES
+from benchmarks.llm import QUERIES
+from benchmarks.server import WORKSPACE_ID, make_app, stub_chat_backends
+
+
+def percentile(values: List[float], percent: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(percent / 100 * len(values)) - 1))
+    return values[index]
+
+
+def get_stats(latencies: List[float], duration: float) -> Dict[str, float]:
+    return {
+        "min": min(latencies),
+        "max": max(latencies),
+        "mean": statistics.mean(latencies),
+        "median": statistics.median(latencies),
+        "stddev": statistics.stdev(latencies) if len(latencies) > 1 else 0.0,
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "rounds": len(latencies),
+        "ops": len(latencies) / duration,
+    }
+
+
+def get_commit_info() -> Dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"id": commit}
+
+
+async def run_load(
+    client: httpx.AsyncClient, requests: int, concurrency: int
+) -> Dict[str, List]:
+    """
+    Sends the benchmark queries in turn, from `concurrency` concurrent users.
+
+    :return: The latencies of the successful requests, by query, and the
+        status codes of the failed ones.
+    """
+    queries = cycle(QUERIES.items())
+    latencies = defaultdict(list)
+    errors = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(name: str, query: str) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(
+                "/v1/chat/", json={"workspace_id": WORKSPACE_ID, "query": query}
+            )
+            elapsed = time.perf_counter() - start
+
+        if response.status_code == 200:
+            latencies[name].append(elapsed)
+        else:
+            errors.append(response.status_code)
+
+    await asyncio.gather(*(send(*next(queries)) for _ in range(requests)))
+
+    return {"latencies": latencies, "errors": errors}
+
+
+async def main(args: argparse.Namespace) -> dict:
+    app = make_app(args.rows, args.shape)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # The first requests fill the caches, e.g. the code cache
+        await run_load(client, args.warmup, args.concurrency)
+
+        start = time.perf_counter()
+        result = await run_load(client, args.requests, args.concurrency)
+        duration = time.perf_counter() - start
+
+    params = {
+        "rows": args.rows,
+        "shape": args.shape,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+    }
+    latencies = result["latencies"]
+    benchmarks = [
+        {
+            "group": "load",
+            "name": f"load[{name}]",
+            "fullname": f"benchmarks/load.py::load[{args.shape}-{args.rows}-{name}]",
+            "params": params,
+            "stats": get_stats(latencies[name], duration),
+            "extra_info": {"query": name},
+        }
+        for name in QUERIES
+        if latencies[name]
+    ]
+    all_latencies = [latency for values in latencies.values() for latency in values]
+    if all_latencies:
+        benchmarks.append(
+            {
+                "group": "load",
+                "name": "load[all]",
+                "fullname": f"benchmarks/load.py::load[{args.shape}-{args.rows}-all]",
+                "params": params,
+                "stats": get_stats(all_latencies, duration),
+                "extra_info": {"errors": len(result["errors"])},
+            }
+        )
+
+    return {
+        "machine_info": {
+            "node": platform.node(),
+            "machine": platform.machine(),
+            "python_version": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "commit_info": get_commit_info(),
+        "datetime": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "benchmarks": benchmarks,
+        "errors": result["errors"],
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--shape", choices=SHAPES, default="narrow")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=len(QUERIES))
+    parser.add_argument("--output", help="File of the JSON report")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    with stub_chat_backends():
+        report = asyncio.run(main(arguments))
+
+    for benchmark in report["benchmarks"]:
+        stats = benchmark["stats"]
+        print(
+            f"{benchmark['name']:<20} median {stats['median'] * 1000:8.1f} ms"
+            f"  p95 {stats['p95'] * 1000:8.1f} ms  {stats['ops']:8.1f} req/s"
+        )
+    if report["errors"]:
+        print(f"{len(report['errors'])} failed requests: {set(report['errors'])}")
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,203 @@
+"""
+In-process chat server of the benchmarks.
+
+The repositories and the chat database are replaced by in-memory fakes over
+the synthetic datasets, and the LLM by the stub, so `ChatController.chat` and
+the API run without Postgres or OpenAI.
+"""
+
+import re
+import tempfile
+import uuid
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List
+from unittest.mock import patch
+
+import pandas as pd
+from fastapi import FastAPI
+
+from app.controllers.chat import ChatController
+from app.models import ConversationMessage, Dataset, DatasetStats, UserConversation
+from app.schemas.responses.users import UserInfo
+from app.utils.result_store import LocalBlobStore, ResultStore
+from benchmarks.datasets import make_dataset
+from benchmarks.llm import StubLLM
+from core.config import config
+from core.database.session import reset_session_context, set_session_context
+from core.fastapi.dependencies.current_user import get_current_user
+from core.utils.dataframe import convert_dataframe_to_dict
+
+# Fixed ids, so the requests of two runs are identical
+USER_ID = "9b1deb4d-3b7d-4bad-9bdd-2b0d7b3dcb6d"
+ORGANIZATION_ID = "1b9d6bcd-bbfd-4b2d-9b5d-ab8dfbbd4bed"
+WORKSPACE_ID = "6ec0bd7f-11c0-43da-975e-2a8ad9ebae0b"
+DATASET_ID = "16fd2706-8baf-433b-82eb-8c7fada847da"
+
+_TABLE_NAME = re.compile(r"^bench_(narrow|wide)_(\d+)$")
+
+
+def table_name(rows: int, shape: str) -> str:
+    return f"bench_{shape}_{rows}"
+
+
+def make_user() -> UserInfo:
+    return UserInfo(
+        email="bench@example.com",
+        first_name="bench",
+        id=USER_ID,
+        organizations=[{"name": "bench", "id": ORGANIZATION_ID}],
+        space={"name": "bench", "id": WORKSPACE_ID, "slug": "bench"},
+    )
+
+
+def make_workspace_datasets(rows: int, shape: str) -> List[Dataset]:
+    """
+    Returns the dataset of the workspace, described by its stored statistics
+    like the datasets of the catalog.
+    """
+    df = make_dataset(rows, shape)
+    head = convert_dataframe_to_dict(df.head(5))
+    return [
+        Dataset(
+            id=uuid.UUID(DATASET_ID),
+            name=table_name(rows, shape),
+            table_name=table_name(rows, shape),
+            description=f"Synthetic {shape} dataset of {rows} rows",
+            head=head,
+            stats=DatasetStats(
+                rows_count=rows,
+                columns=[
+                    {"name": name, "type": str(dtype)}
+                    for name, dtype in df.dtypes.items()
+                ],
+                sample=head,
+            ),
+        )
+    ]
+
+
+def load_table(query: str, **kwargs) -> pd.DataFrame:
+    """
+    Stands for the chat database, returning the synthetic dataset of the
+    queried table.
+    """
+    match = re.search(r"FROM (\w+)", query)
+    shape, rows = _TABLE_NAME.match(match.group(1)).groups()
+    df = make_dataset(int(rows), shape)
+
+    if "COUNT(*)" in query:
+        return pd.DataFrame({"count": [len(df)]})
+    if limit := re.search(r"LIMIT (\d+)", query):
+        return df.head(int(limit.group(1)))
+    return df
+
+
+class FakeWorkspaceRepository:
+    def __init__(self, datasets: List[Dataset]):
+        self.datasets = datasets
+
+    async def get_space_datasets(self, workspace_id: str) -> List[Dataset]:
+        return self.datasets
+
+
+class FakeConversationRepository:
+    def __init__(self):
+        self.messages: Dict[str, List[ConversationMessage]] = {}
+
+    async def create(self, attributes: dict) -> UserConversation:
+        conversation = UserConversation(id=uuid.uuid4(), **attributes)
+        self.messages[str(conversation.id)] = []
+        return conversation
+
+    async def get_conversation_messages(
+        self, conversation_id: str
+    ) -> List[ConversationMessage]:
+        return self.messages.get(str(conversation_id), [])
+
+    async def add_conversation_message(
+        self, conversation_id: str, query: str, response: list, code_generated: str
+    ) -> ConversationMessage:
+        message = ConversationMessage(
+            id=uuid.uuid4(),
+            conversation_id=conversation_id,
+            query=query,
+            response=response,
+            code_generated=code_generated,
+        )
+        self.messages.setdefault(str(conversation_id), []).append(message)
+        return message
+
+
+def make_chat_controller(rows: int, shape: str) -> ChatController:
+    return ChatController(
+        user_repository=None,
+        space_repository=FakeWorkspaceRepository(
+            make_workspace_datasets(rows, shape)
+        ),
+        conversation_repository=FakeConversationRepository(),
+    )
+
+
+@contextmanager
+def stub_chat_backends() -> Iterator[None]:
+    """
+    Replaces the chat database and OpenAI by the fakes, and stores the results
+    and the charts in temporary directories.
+    """
+    with ExitStack() as stack:
+        results_path = stack.enter_context(tempfile.TemporaryDirectory())
+        # The charts are saved in the exports directory of the project root
+        root_path = stack.enter_context(tempfile.TemporaryDirectory())
+        stack.enter_context(
+            patch("app.controllers.chat.find_project_root", lambda: root_path)
+        )
+        stack.enter_context(
+            patch("app.controllers.chat.load_data_from_db_threadsafe", load_table)
+        )
+        stack.enter_context(
+            patch("app.controllers.chat.OpenAI", lambda api_key: StubLLM())
+        )
+        stack.enter_context(patch.object(config, "OPENAI_API_KEY", "stub"))
+        stack.enter_context(patch.object(config, "CHAT_WRITE_BEHIND", False))
+        stack.enter_context(
+            patch(
+                "app.controllers.chat.result_store",
+                ResultStore(LocalBlobStore(results_path)),
+            )
+        )
+        yield
+
+
+@contextmanager
+def session_context() -> Iterator[None]:
+    """
+    Sets the database session context, like the SQLAlchemy middleware does
+    for the requests. The fakes run no query, so the commits are no-ops.
+    """
+    token = set_session_context(str(uuid.uuid4()))
+    try:
+        yield
+    finally:
+        reset_session_context(token)
+
+
+def make_app(rows: int, shape: str) -> FastAPI:
+    """
+    Returns the application serving the chats on the synthetic dataset.
+    """
+    from core.server import create_app
+
+    app = create_app()
+    controller = make_chat_controller(rows, shape)
+    user = make_user()
+
+    for route in app.routes:
+        if getattr(route, "path", None) != "/v1/chat/":
+            continue
+        for dependency in route.dependant.dependencies:
+            if dependency.name == "chat_controller":
+                app.dependency_overrides[dependency.call] = lambda: controller
+
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    return app
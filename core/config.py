@@ -1,4 +1,6 @@
 from enum import Enum
+from typing import List
+
 from pydantic import BaseSettings, PostgresDsn
 
 class EnvironmentType(str, Enum):
@@ -16,6 +18,59 @@ class Config(BaseConfig):
     ENVIRONMENT: str = EnvironmentType.DEVELOPMENT
     POSTGRES_URL: PostgresDsn
     CHAT_DB_URL: PostgresDsn
+    # JSON list of the read replicas, e.g. '["postgresql+asyncpg://..."]'
+    POSTGRES_READER_URLS: List[PostgresDsn] = []
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_RECYCLE: int = 3600
+    DATABASE_POOL_TIMEOUT: int = 30
+    # Milliseconds, 0 disables the timeout
+    DATABASE_STATEMENT_TIMEOUT: int = 30000
+    DATABASE_READER_RETRY_INTERVAL: int = 30
+    CHAT_DB_POOL_SIZE: int = 10
+    CHAT_DB_MAX_OVERFLOW: int = 10
+    CHAT_DB_POOL_TIMEOUT: int = 30
+    # Milliseconds, 0 disables the timeout
+    CHAT_DB_STATEMENT_TIMEOUT: int = 120000
+    CHAT_DB_FETCH_SIZE: int = 10000
+    # Insert the chat messages in batches in the background. The messages not
+    # inserted yet are kept by the worker which answered them: the follow-up
+    # questions it answers see them, but the other workers and the messages
+    # endpoint only see them once flushed, usually within the flush interval
+    CHAT_WRITE_BEHIND: bool = False
+    CHAT_WRITE_BEHIND_BATCH_SIZE: int = 100
+    CHAT_WRITE_BEHIND_FLUSH_INTERVAL: float = 0.5
+    # Suffixed with the pid of each worker, the messages which can't be
+    # inserted are moved to message_journal.dead.jsonl
+    CHAT_WRITE_BEHIND_JOURNAL_PATH: str = "cache/message_journal.jsonl"
+    # Directory of the dataframes and plots offloaded from the chat messages
+    RESULT_STORE_PATH: str = "cache/results"
+    RESULT_PREVIEW_ROWS: int = 20
+    # Seconds the signed URLs of the results are valid, at least
+    RESULT_URL_TTL: int = 3600
+    # Seconds after which the results not used are deleted, 0 keeps them.
+    # The blobs aren't reference counted, the plots of old messages are
+    # deleted as well, so it's opt-in
+    RESULT_STORE_TTL: int = 0
+    # Exporter of the request spans: "otlp", "file" or None to disable them.
+    # The OTLP exporter reads the standard OTEL_EXPORTER_OTLP_* variables
+    TRACING_EXPORTER: str = None
+    TRACING_FILE_PATH: str = "cache/spans.jsonl"
+    TRACING_SAMPLE_RATE: float = 1.0
+    TRACING_SERVICE_NAME: str = "pandasai-server"
+    # Prometheus metrics at /v1/monitoring/metrics, not authenticated so they
+    # can be scraped: enable them only where the endpoint isn't public
+    METRICS_ENABLED: bool = False
+    # Profiling of the chats, requested with the X-Profile header or sampled.
+    # The sampling can be changed at /v1/monitoring/profiling
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILE_STORE_PATH: str = "cache/profiles"
+    # Seconds after which the profiles not downloaded are deleted, 0 keeps them
+    PROFILE_STORE_TTL: int = 7 * 24 * 3600
+    # Token of the admin endpoints, sent in the X-Admin-Token header. The admin
+    # endpoints are disabled without it
+    ADMIN_TOKEN: str = None
     OPENAI_API_KEY: str = None
     RELEASE_VERSION: str = "0.1.0"
     SHOW_SQL_ALCHEMY_QUERIES: int = 0
@@ -26,5 +81,12 @@ class Config(BaseConfig):
     PASSWORD = "12345"
     DEFAULT_ORGANIZATION = "PandaBI"
     DEFAULT_SPACE = "pandasai"
+    DATASET_STATS_REFRESH_INTERVAL: int = 300
+    DATASET_STATS_SAMPLE_SIZE: int = 20
+    # Seconds before the stats of the tables whose changes can't be tracked
+    # are computed again
+    DATASET_STATS_MAX_AGE: int = 86400
+    VECTORSTORE_PATH: str = None
+    USER_INFO_CACHE_TTL: int = 60
 
 config = Config()
\ No newline at end of file
@@ -55,7 +55,11 @@ class BaseController(Generic[ModelType]):
         return db_obj
 
     async def get_all(
-        self, skip: int = 0, limit: int = 100, join_: set[str] | None = None
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        join_: set[str] | None = None,
+        cursor: str | None = None,
     ) -> list[ModelType]:
         """
         Returns a list of records based on pagination params.
@@ -63,12 +67,32 @@ class BaseController(Generic[ModelType]):
         :param skip: The number of records to skip.
         :param limit: The number of records to return.
         :param join_: The joins to make.
+        :param cursor: The cursor of the last record of the previous page.
         :return: A list of records.
         """
 
-        response = await self.repository.get_all(skip, limit, join_)
+        response = await self.repository.get_all(skip, limit, join_, cursor)
         return response
 
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        join_: set[str] | None = None,
+        order: str = "asc",
+    ) -> tuple[list[ModelType], str | None]:
+        """
+        Returns a page of records and the cursor of the next page.
+
+        :param limit: The number of records to return.
+        :param cursor: The cursor of the last record of the previous page.
+        :param join_: The joins to make.
+        :param order: The order of the records (asc or desc).
+        :return: The records and the cursor of the next page, or None.
+        """
+
+        return await self.repository.get_page(limit, cursor, join_, order)
+
     @Transactional(propagation=Propagation.REQUIRED)
     async def create(self, attributes: dict[str, Any]) -> ModelType:
         """
@@ -1,21 +1,100 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_scoped_session
-from sqlalchemy.orm import sessionmaker
-from contextvars import ContextVar
-import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
 
-chat_db_url = os.getenv("CHAT_DB_URL")
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
 
-chat_engine = create_async_engine(chat_db_url, pool_recycle=3600, echo=True)
+from core.config import config
 
-ChatSession = sessionmaker(
-    class_=AsyncSession,
-    expire_on_commit=False,
-    bind=chat_engine
+chat_engine = create_async_engine(
+    config.CHAT_DB_URL,
+    echo=bool(config.SHOW_SQL_ALCHEMY_QUERIES),
+    pool_size=config.CHAT_DB_POOL_SIZE,
+    max_overflow=config.CHAT_DB_MAX_OVERFLOW,
+    pool_recycle=config.DATABASE_POOL_RECYCLE,
+    pool_timeout=config.CHAT_DB_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    connect_args={
+        "server_settings": {
+            "statement_timeout": str(config.CHAT_DB_STATEMENT_TIMEOUT),
+            # The datasets are only read, whatever the query
+            "default_transaction_read_only": "on",
+        }
+    },
 )
 
-chat_session_context = ContextVar("chat_session_context")
 
-chat_session = async_scoped_session(
-    session_factory=ChatSession,
-    scopefunc=chat_session_context.get,
-)
\ No newline at end of file
+class ChatDatabasePool:
+    """
+    Hands out the connections of the chat data database, one per query, so
+    the datasets of parallel chats are loaded in parallel, and keeps the
+    metrics of the pool saturation.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @asynccontextmanager
+    async def connect(self) -> AsyncIterator[AsyncConnection]:
+        """
+        Checks out a connection of the pool, returned when the block exits.
+        """
+        with self._lock:
+            self._waiting += 1
+        start_time = time.perf_counter()
+
+        try:
+            connection = await self.engine.connect()
+        except PoolTimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        wait = time.perf_counter() - start_time
+        with self._lock:
+            self._checkouts += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+        try:
+            yield connection
+        finally:
+            await connection.close()
+
+    def get_status(self) -> Dict[str, float]:
+        """
+        Returns the state of the pool and the checkout metrics since start.
+        """
+        pool = self.engine.pool
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+
+        with self._lock:
+            return {
+                "size": pool.size(),
+                "checked_out": checked_out,
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "waiting": self._waiting,
+                "saturation": checked_out / capacity if capacity else 0.0,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "average_wait": (
+                    self._total_wait / self._checkouts if self._checkouts else 0.0
+                ),
+                "max_wait": self._max_wait,
+            }
+
+
+chat_pool = ChatDatabasePool(chat_engine)
@@ -0,0 +1,95 @@
+import asyncio
+import itertools
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class ReplicaSet:
+    """
+    Round-robin over the read replicas of the database.
+
+    A replica which fails to connect or drops its connections is skipped for
+    the retry interval, and reads fall back to the primary when no replica is
+    healthy.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: List[AsyncEngine],
+        retry_interval: int = 30,
+    ):
+        """
+        :param primary: The engine of the primary, used for the writes.
+        :param replicas: The engines of the read replicas.
+        :param retry_interval: The seconds an unhealthy replica is skipped.
+        """
+        self.primary = primary
+        self.replicas = replicas
+        self.retry_interval = retry_interval
+        self._unhealthy_until: Dict[Engine, float] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+        for replica in replicas:
+            event.listen(replica.sync_engine, "handle_error", self._on_error)
+
+    def get_reader(self) -> AsyncEngine:
+        """
+        Returns the next healthy replica, or the primary if there is none.
+        """
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                replica = self.replicas[next(self._counter) % len(self.replicas)]
+            if self._unhealthy_until.get(replica.sync_engine, 0) <= now:
+                return replica
+
+        return self.primary
+
+    def is_healthy(self, replica: AsyncEngine) -> bool:
+        return self._unhealthy_until.get(replica.sync_engine, 0) <= time.monotonic()
+
+    def mark_unhealthy(self, engine: Engine) -> None:
+        """
+        Skips the replica until the retry interval has elapsed.
+
+        :param engine: The sync engine of the replica.
+        """
+        with self._lock:
+            self._unhealthy_until[engine] = time.monotonic() + self.retry_interval
+
+    def mark_healthy(self, engine: Engine) -> None:
+        with self._lock:
+            self._unhealthy_until.pop(engine, None)
+
+    async def check_health(self, timeout: float = 5) -> None:
+        """
+        Pings every replica, marking the ones which don't answer as unhealthy
+        and the ones which recovered as healthy.
+
+        :param timeout: The seconds to wait for the answer of a replica.
+        """
+
+        async def ping(replica: AsyncEngine) -> None:
+            try:
+                async with replica.connect() as connection:
+                    await asyncio.wait_for(
+                        connection.execute(text("SELECT 1")), timeout
+                    )
+            except Exception:
+                self.mark_unhealthy(replica.sync_engine)
+            else:
+                self.mark_healthy(replica.sync_engine)
+
+        await asyncio.gather(*[ping(replica) for replica in self.replicas])
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        # Failed connection attempts have no connection
+        if context.is_disconnect or context.connection is None:
+            self.mark_unhealthy(context.engine)
@@ -1,7 +1,10 @@
+from contextlib import asynccontextmanager
 from contextvars import ContextVar, Token
-from typing import Union
+from typing import AsyncIterator, Union
 
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_scoped_session,
     create_async_engine,
@@ -10,6 +13,7 @@ from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from sqlalchemy.sql.expression import Delete, Insert, Update
 
 from core.config import config
+from core.database.replicas import ReplicaSet
 
 session_context: ContextVar[str] = ContextVar("session_context")
 
@@ -26,17 +30,88 @@ def reset_session_context(context: Token) -> None:
     session_context.reset(context)
 
 
-engines = {
-    "writer": create_async_engine(config.POSTGRES_URL, pool_recycle=3600),
-    "reader": create_async_engine(config.POSTGRES_URL, pool_recycle=3600, echo=True),
-}
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=bool(config.SHOW_SQL_ALCHEMY_QUERIES),
+        pool_size=config.DATABASE_POOL_SIZE,
+        max_overflow=config.DATABASE_MAX_OVERFLOW,
+        pool_recycle=config.DATABASE_POOL_RECYCLE,
+        pool_timeout=config.DATABASE_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        connect_args={
+            "server_settings": {
+                "statement_timeout": str(config.DATABASE_STATEMENT_TIMEOUT)
+            }
+        },
+    )
+
+
+writer_engine = _create_engine(config.POSTGRES_URL)
+
+replica_set = ReplicaSet(
+    primary=writer_engine,
+    replicas=[_create_engine(url) for url in config.POSTGRES_READER_URLS],
+    retry_interval=config.DATABASE_READER_RETRY_INTERVAL,
+)
 
 
 class RoutingSession(Session):
+    """
+    Session sending the writes to the primary and the reads to a replica.
+
+    Once the session has written, it reads from the primary until it is
+    closed, so a request always reads its own writes. The replica is picked
+    once per session, so the reads of a request see a consistent state.
+    """
+
     def get_bind(self, mapper=None, clause=None, **kwargs):
         if self._flushing or isinstance(clause, (Update, Delete, Insert)):
-            return engines["writer"].sync_engine
-        return engines["reader"].sync_engine
+            self.info["has_written"] = True
+
+        if self.info.get("has_written"):
+            return replica_set.primary.sync_engine
+
+        if "reader" not in self.info:
+            self.info["reader"] = replica_set.get_reader()
+
+        return self.info["reader"].sync_engine
+
+    def close(self) -> None:
+        super().close()
+        self.info.pop("has_written", None)
+        self.info.pop("reader", None)
+
+
+def use_primary(db_session: Union[Session, AsyncSession]) -> None:
+    """
+    Sends the reads of the session to the primary until it is closed, e.g.
+    to compute a value from the latest writes before writing it.
+
+    :param db_session: The session to route to the primary.
+    """
+    db_session.info["has_written"] = True
+
+
+@asynccontextmanager
+async def try_advisory_lock(key: int) -> AsyncIterator[bool]:
+    """
+    Tries to take a Postgres advisory lock on the primary, held until the
+    context exits, e.g. so a single worker runs a background job.
+
+    :param key: The key of the lock.
+    :return: Whether the lock was taken.
+    """
+    async with replica_set.primary.connect() as connection:
+        locked = await connection.scalar(select(func.pg_try_advisory_lock(key)))
+        # The lock belongs to the connection, not to the transaction
+        await connection.commit()
+        try:
+            yield locked
+        finally:
+            if locked:
+                await connection.scalar(select(func.pg_advisory_unlock(key)))
+                await connection.commit()
 
 
 async_session_factory = sessionmaker(
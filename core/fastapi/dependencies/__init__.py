@@ -1,3 +1,4 @@
+from .admin import AdminRequired
 from .authentication import AuthenticationRequired
 from .logging import Logging
 
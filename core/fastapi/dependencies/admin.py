@@ -0,0 +1,18 @@
+import hmac
+from typing import Optional
+
+from fastapi import Header
+
+from core.config import config
+from core.exceptions import ForbiddenException
+
+
+class AdminRequired:
+    def __init__(self, admin_token: Optional[str] = Header(None, alias="X-Admin-Token")):
+        if not config.ADMIN_TOKEN:
+            raise ForbiddenException("Admin endpoints are disabled")
+
+        if admin_token is None or not hmac.compare_digest(
+            admin_token, config.ADMIN_TOKEN
+        ):
+            raise ForbiddenException("Invalid admin token")
@@ -2,11 +2,23 @@ from fastapi import Depends, Request
 
 from app.controllers.user import UserController
 from app.schemas.responses.users import UserInfo
+from app.utils.user_info_cache import ANONYMOUS_USER_KEY, user_info_cache
 from core.factory import Factory
+from core.utils.telemetry import tracer
 
 
 async def get_current_user(
     request: Request,
     user_controller: UserController = Depends(Factory().get_user_controller),
 ) -> UserInfo:
-    return await user_controller.me()
+    user_id = request.user.id if "user" in request.scope else None
+    cache_key = str(user_id) if user_id else ANONYMOUS_USER_KEY
+
+    with tracer.start_as_current_span("auth.current_user") as span:
+        user_info = user_info_cache.get(cache_key)
+        span.set_attribute("cache_hit", user_info is not None)
+        if user_info is None:
+            user_info = await user_controller.me(user_id)
+            user_info_cache.set(cache_key, user_info)
+
+    return user_info
@@ -1,10 +1,12 @@
 from .authentication import AuthBackend, AuthenticationMiddleware
 from .response_logger import ResponseLoggerMiddleware
 from .sqlalchemy import SQLAlchemyMiddleware
+from .tracing import TracingMiddleware
 
 __all__ = [
     "SQLAlchemyMiddleware",
     "ResponseLoggerMiddleware",
     "AuthenticationMiddleware",
     "AuthBackend",
+    "TracingMiddleware",
 ]
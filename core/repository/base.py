@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import select
 
 from core.database import Base
+from core.repository.pagination import get_next_cursor, keyset_paginate
 
 ModelType = TypeVar("ModelType", bound=Base)
 
@@ -31,7 +32,11 @@ class BaseRepository(Generic[ModelType]):
         return model
 
     async def get_all(
-        self, skip: int = 0, limit: int = 100, join_: set[str] | None = None
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        join_: set[str] | None = None,
+        cursor: str | None = None,
     ) -> list[ModelType]:
         """
         Returns a list of model instances.
@@ -39,16 +44,49 @@ class BaseRepository(Generic[ModelType]):
         :param skip: The number of records to skip.
         :param limit: The number of record to return.
         :param join_: The joins to make.
+        :param cursor: The cursor of the last record of the previous page, to
+            start after it instead of skipping records.
         :return: A list of model instances.
         """
         query = self._query(join_)
-        query = query.offset(skip).limit(limit)
+        if cursor is not None:
+            query = self._keyset_paginate(query, cursor)
+        else:
+            query = query.offset(skip)
+        query = query.limit(limit)
 
         if join_ is not None:
             return await self._all_unique(query)
 
         return await self._all(query)
 
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        join_: set[str] | None = None,
+        order: str = "asc",
+    ) -> tuple[list[ModelType], str | None]:
+        """
+        Returns a page of model instances ordered by creation date.
+
+        :param limit: The number of record to return.
+        :param cursor: The cursor of the last record of the previous page.
+        :param join_: The joins to make.
+        :param order: The order of the records (asc or desc).
+        :return: The model instances and the cursor of the next page, or None
+            if it is the last page.
+        """
+        query = self._query(join_)
+        query = self._keyset_paginate(query, cursor, order).limit(limit + 1)
+
+        if join_ is not None:
+            items = await self._all_unique(query)
+        else:
+            items = await self._all(query)
+
+        return get_next_cursor(items, limit)
+
     async def get_by(
         self,
         field: str,
@@ -202,6 +240,25 @@ class BaseRepository(Generic[ModelType]):
         """
         return query.where(getattr(self.model_class, field) == value)
 
+    def _keyset_paginate(
+        self, query: Select, cursor: str | None = None, order: str = "asc"
+    ) -> Select:
+        """
+        Returns the query ordered by (created_at, id), starting after the cursor.
+
+        :param query: The query to paginate.
+        :param cursor: The cursor of the last record of the previous page.
+        :param order: The order of the records (asc or desc).
+        :return: The paginated query.
+        """
+        return keyset_paginate(
+            query,
+            self.model_class.id,
+            getattr(self.model_class, "created_at", None),
+            cursor,
+            order,
+        )
+
     def _maybe_join(self, query: Select, join_: set[str] | None = None) -> Select:
         """
         Returns the query with the given joins.
@@ -0,0 +1,95 @@
+import base64
+import datetime
+import json
+from typing import Any, Sequence, Tuple
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from core.exceptions import BadRequestException
+
+
+def encode_cursor(created_at: datetime.datetime | None, id_: Any) -> str:
+    """
+    Returns the opaque cursor pointing after the record.
+
+    :param created_at: The creation date of the record.
+    :param id_: The id of the record.
+    :return: The cursor.
+    """
+    payload = [created_at.isoformat() if created_at else None, str(id_)]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime | None, str]:
+    """
+    Returns the creation date and the id of the record of the cursor.
+
+    :param cursor: The cursor returned by `encode_cursor`.
+    :return: The creation date and the id.
+    """
+    try:
+        created_at, id_ = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if created_at is not None:
+            created_at = datetime.datetime.fromisoformat(created_at)
+        return created_at, id_
+    except (TypeError, ValueError) as e:
+        raise BadRequestException("Invalid pagination cursor") from e
+
+
+def keyset_paginate(
+    query: Select,
+    id_column: InstrumentedAttribute,
+    created_at_column: InstrumentedAttribute | None = None,
+    cursor: str | None = None,
+    order: str = "asc",
+) -> Select:
+    """
+    Returns the query ordered by (created_at, id), starting after the cursor.
+    Unlike an offset, the cursor is resolved with the index, so deep pages
+    are as fast as the first one.
+
+    :param query: The query to paginate.
+    :param id_column: The unique column breaking the ties.
+    :param created_at_column: The creation date column, if the model has one.
+    :param cursor: The cursor of the last record of the previous page.
+    :param order: The order of the records (asc or desc).
+    :return: The paginated query, without the limit.
+    """
+    columns = [id_column]
+    if created_at_column is not None:
+        columns.insert(0, created_at_column)
+
+    if cursor is not None:
+        created_at, id_ = decode_cursor(cursor)
+        try:
+            id_ = id_column.type.python_type(id_)
+        except (TypeError, ValueError) as e:
+            raise BadRequestException("Invalid pagination cursor") from e
+
+        key = tuple_(*columns)
+        values = tuple_(id_) if created_at_column is None else tuple_(created_at, id_)
+        query = query.where(key < values if order == "desc" else key > values)
+
+    if order == "desc":
+        return query.order_by(*[column.desc() for column in columns])
+
+    return query.order_by(*[column.asc() for column in columns])
+
+
+def get_next_cursor(items: Sequence[Any], limit: int) -> Tuple[list, str | None]:
+    """
+    Splits the records fetched with one more than the limit in the page and the
+    cursor of the next page, or None if it is the last page.
+
+    :param items: The records, fetched with a limit of `limit + 1`.
+    :param limit: The size of the page.
+    :return: The records of the page and the cursor of the next page.
+    """
+    items = list(items)
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(getattr(last, "created_at", None), last.id)
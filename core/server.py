@@ -1,5 +1,7 @@
+import asyncio
+import logging
 import os
-from typing import List
+from typing import Callable, List
 
 import pandas as pd
 from fastapi import Depends, FastAPI, Request
@@ -8,23 +10,36 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from api import router
+from app.controllers.dataset_stats import DatasetStatsController
 from app.controllers.workspace import WorkspaceController
 from app.controllers.user import UserController
-from app.models import Dataset, Workspace, User
+from app.models import Dataset, DatasetStats, Workspace, User
 from app.repositories.dataset import DatasetRepository
+from app.repositories.dataset_stats import DatasetStatsRepository
 from app.repositories.workspace import WorkspaceRepository
 from app.repositories.user import UserRepository
+from app.utils.message_writer import message_writer
+from app.utils.profiling import profile_store
+from app.utils.result_store import result_store
+from app.utils.schema_registry import schema_registry
 from core.config import config
-from core.database.session import session
+from core.database import standalone_session
+from core.database.session import replica_set, session, try_advisory_lock
 from core.exceptions import CustomException
 from core.fastapi.dependencies import Logging
 from core.fastapi.middlewares import (
     AuthBackend,
     AuthenticationMiddleware,
     SQLAlchemyMiddleware,
+    TracingMiddleware,
 )
 from core.utils.dataframe import convert_dataframe_to_dict
 from core.utils.database_utils import load_data_from_db 
+from core.utils.telemetry import setup_tracing
+from pandasai.ee.helpers.schema_registry import set_schema_registry
+
+# Key of the Postgres advisory lock electing the worker refreshing the stats
+DATASET_STATS_REFRESH_LOCK = 4_190_001
 
 
 def on_auth_error(request: Request, exc: Exception):
@@ -55,6 +70,7 @@ def init_listeners(app_: FastAPI) -> None:
 
 def make_middleware() -> List[Middleware]:
     middleware = [
+        Middleware(TracingMiddleware),
         Middleware(
             CORSMiddleware,
             allow_origins=["*"],
@@ -144,11 +160,10 @@ async def init_database():
     dataset_name = os.getenv("DATASET_NAME")
     if not dataset_name:
         raise ValueError("Environment variable DATASET_NAME is not set")
-    query = f"SELECT * FROM {dataset_name}"
-    
+    # Only the head of the dataset is stored, the data is loaded when needed
+    query = f"SELECT * FROM {dataset_name} LIMIT 5"
+
     df = await load_data_from_db(query)
-    # Convert DataFrame to list of dictionaries
-    datasets = df.to_dict(orient='records')
 
     #Convert DataFrame to list of dictionaries with 'head' key for consistency
     datasets = [{
@@ -156,11 +171,76 @@ async def init_database():
         "file_name": dataset_name,  # Placeholder, as you won't have actual file names
         "file_path": "database_query"       # Placeholder, as you won't have actual file paths
     }]
-    print(query)
+    logging.getLogger(__name__).debug("Loaded the dataset head with: %s", query)
     await space_controller.add_datasets_from_db(datasets, user, space.id)
 
 
+@standalone_session
+async def refresh_datasets_stats():
+    # Every worker schedules the refresh, only the one holding the lock runs it
+    async with try_advisory_lock(DATASET_STATS_REFRESH_LOCK) as locked:
+        if not locked:
+            return
+
+        dataset_stats_repository = DatasetStatsRepository(
+            DatasetStats, db_session=session
+        )
+        controller = DatasetStatsController(dataset_stats_repository)
+        await controller.refresh_all()
+
+
+async def schedule_datasets_stats_refresh():
+    """
+    Refreshes the statistics catalog of the datasets in the background, the
+    statistics are only computed again for the datasets whose data changed.
+    """
+    while True:
+        try:
+            await refresh_datasets_stats()
+        except Exception:
+            logging.getLogger(__name__).exception("Failed to refresh datasets stats")
+
+        await asyncio.sleep(config.DATASET_STATS_REFRESH_INTERVAL)
+
+
+async def schedule_replicas_health_check():
+    """
+    Checks the read replicas in the background, so the reads are routed away
+    from the unhealthy ones and back to them once they recovered.
+    """
+    while True:
+        try:
+            await replica_set.check_health()
+        except Exception:
+            logging.getLogger(__name__).exception("Failed to check read replicas")
+
+        await asyncio.sleep(config.DATABASE_READER_RETRY_INTERVAL)
+
+
+async def schedule_cleanup(name: str, cleanup: Callable[[float], int], ttl: int):
+    """
+    Deletes the stored files which were not used for ttl seconds, checking
+    every tenth of it.
+
+    :param name: The name of the files in the logs, e.g. "results".
+    :param cleanup: Deletes the files not used for the given seconds and
+        returns their number.
+    :param ttl: The seconds after which the files not used are deleted.
+    """
+    while True:
+        try:
+            deleted = await asyncio.to_thread(cleanup, ttl)
+            if deleted:
+                logging.getLogger(__name__).info(f"Deleted {deleted} {name}")
+        except Exception:
+            logging.getLogger(__name__).exception(f"Failed to clean up {name}")
+
+        await asyncio.sleep(ttl / 10)
+
+
 def create_app() -> FastAPI:
+    tracer_provider = setup_tracing()
+
     app_ = FastAPI(
         title="PandasAI Server",
         description="PandasAI Backend server",
@@ -176,6 +256,52 @@ def create_app() -> FastAPI:
     @app_.on_event("startup")
     async def on_startup():
         await init_database()
+        app_.state.datasets_stats_task = asyncio.create_task(
+            schedule_datasets_stats_refresh()
+        )
+        if config.CHAT_WRITE_BEHIND:
+            await message_writer.start()
+        try:
+            await schema_registry.warm()
+        except Exception:
+            logging.getLogger(__name__).exception("Failed to load semantic schemas")
+        set_schema_registry(schema_registry)
+        app_.state.results_cleanup_task = None
+        if result_store is not None and config.RESULT_STORE_TTL:
+            app_.state.results_cleanup_task = asyncio.create_task(
+                schedule_cleanup(
+                    "results", result_store.cleanup, config.RESULT_STORE_TTL
+                )
+            )
+        app_.state.profiles_cleanup_task = None
+        if config.PROFILE_STORE_TTL:
+            app_.state.profiles_cleanup_task = asyncio.create_task(
+                schedule_cleanup(
+                    "profiles",
+                    profile_store.blob_store.cleanup,
+                    config.PROFILE_STORE_TTL,
+                )
+            )
+        app_.state.replicas_health_task = None
+        if replica_set.replicas:
+            app_.state.replicas_health_task = asyncio.create_task(
+                schedule_replicas_health_check()
+            )
+
+    @app_.on_event("shutdown")
+    async def on_shutdown():
+        app_.state.datasets_stats_task.cancel()
+        if app_.state.replicas_health_task is not None:
+            app_.state.replicas_health_task.cancel()
+        if app_.state.results_cleanup_task is not None:
+            app_.state.results_cleanup_task.cancel()
+        if app_.state.profiles_cleanup_task is not None:
+            app_.state.profiles_cleanup_task.cancel()
+        if message_writer.is_running:
+            await message_writer.stop()
+        if tracer_provider is not None:
+            # Exports the spans left in the batch
+            tracer_provider.shutdown()
 
     return app_
 
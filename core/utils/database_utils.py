@@ -1,18 +1,73 @@
 # core/utils/database_utils.py
 
+import asyncio
+from typing import AsyncIterator, List, Tuple
+
 import pandas as pd
-from sqlalchemy.sql import text
-from core.database.chat_session import chat_session, chat_session_context
-
-async def load_data_from_db(query: str) -> pd.DataFrame:
-    # Set the context variable for chat session
-    token = chat_session_context.set("chat_session")
-    try:
-        async with chat_session() as conn:
-            result = await conn.execute(text(query))
-            print(result)
-            df = pd.DataFrame(result.fetchall(), columns=result.keys())
-    finally:
-        # Reset the context variable
-        chat_session_context.reset(token)
-    return df
\ No newline at end of file
+from opentelemetry import context as otel_context
+from sqlalchemy.sql import TextClause, text
+from core.config import config
+from core.database.chat_session import chat_pool
+from core.utils.metrics import DATASET_LOAD_BYTES, DATASET_LOAD_ROWS
+from core.utils.telemetry import run_in_context, tracer
+
+
+async def load_data_from_db(query: str | TextClause) -> pd.DataFrame:
+    """
+    Run a query on the chat database, on a connection of its own, and fetch
+    the result in batches.
+
+    :param query: The query to run on the chat database.
+    :return: The result of the query.
+    """
+    if isinstance(query, str):
+        query = text(query)
+
+    rows = []
+    with tracer.start_as_current_span(
+        "chat_db.query", attributes={"db.statement": query.text}
+    ) as span:
+        async with chat_pool.connect() as conn:
+            result = await conn.stream(query)
+            columns = list(result.keys())
+            async for partition in result.partitions(config.CHAT_DB_FETCH_SIZE):
+                rows.extend(partition)
+        span.set_attribute("db.rows_count", len(rows))
+
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    DATASET_LOAD_ROWS.observe(len(df))
+    # Shallow, the deep memory usage of the object columns is slow to compute
+    DATASET_LOAD_BYTES.observe(df.memory_usage(index=False).sum())
+
+    return df
+
+
+def load_data_from_db_threadsafe(
+    query: str, loop: asyncio.AbstractEventLoop
+) -> pd.DataFrame:
+    """
+    Load data from a worker thread, running the query on the event loop.
+
+    :param query: The query to run on the chat database.
+    :param loop: The event loop the chat database engine is bound to.
+    :return: The result of the query.
+    """
+    coroutine = run_in_context(load_data_from_db(query), otel_context.get_current())
+    return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+
+async def stream_data_from_db(
+    query: str, batch_size: int = 1000
+) -> AsyncIterator[Tuple[List[str], list]]:
+    """
+    Stream the result of a query in batches, without loading it in memory.
+
+    :param query: The query to run on the chat database.
+    :param batch_size: The number of rows of each batch.
+    :return: An iterator of the columns and the rows of each batch.
+    """
+    async with chat_pool.connect() as conn:
+        result = await conn.stream(text(query))
+        columns = list(result.keys())
+        async for rows in result.partitions(batch_size):
+            yield columns, rows
@@ -0,0 +1,109 @@
+import os
+from typing import Iterator, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.multiprocess import MultiProcessCollector
+from prometheus_client.registry import Collector
+
+from core.database.chat_session import chat_pool
+from core.database.session import replica_set
+
+ROWS_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9)
+
+DATASET_LOAD_ROWS = Histogram(
+    "dataset_load_rows",
+    "Rows of the datasets loaded from the chat database",
+    buckets=ROWS_BUCKETS,
+)
+DATASET_LOAD_BYTES = Histogram(
+    "dataset_load_bytes",
+    "Memory of the datasets loaded from the chat database",
+    buckets=BYTES_BUCKETS,
+)
+
+
+class DatabasePoolCollector(Collector):
+    """
+    Reports the usage of the connection pools when the metrics are scraped,
+    so the requests don't pay for it.
+    """
+
+    def collect(self) -> Iterator[Metric]:
+        size = GaugeMetricFamily(
+            "db_pool_size", "Connections kept in the pool", labels=["pool"]
+        )
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out", "Connections in use", labels=["pool"]
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow", "Connections opened above the pool size", labels=["pool"]
+        )
+
+        engines = [("primary", replica_set.primary)] + [
+            (f"replica_{index}", replica)
+            for index, replica in enumerate(replica_set.replicas)
+        ]
+        for name, engine in engines:
+            pool = engine.pool
+            size.add_metric([name], pool.size())
+            checked_out.add_metric([name], pool.checkedout())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+
+        status = chat_pool.get_status()
+        size.add_metric(["chat"], status["size"])
+        checked_out.add_metric(["chat"], status["checked_out"])
+        overflow.add_metric(["chat"], status["overflow"])
+
+        yield size
+        yield checked_out
+        yield overflow
+        yield GaugeMetricFamily(
+            "chat_db_pool_waiting",
+            "Queries waiting for a connection of the chat database",
+            value=status["waiting"],
+        )
+        yield CounterMetricFamily(
+            "chat_db_pool_checkouts",
+            "Connections checked out of the chat database pool",
+            value=status["checkouts"],
+        )
+        yield CounterMetricFamily(
+            "chat_db_pool_timeouts",
+            "Checkouts of the chat database pool which timed out",
+            value=status["timeouts"],
+        )
+        yield CounterMetricFamily(
+            "chat_db_pool_wait_seconds",
+            "Time spent waiting for a connection of the chat database",
+            value=status["average_wait"] * status["checkouts"],
+        )
+
+
+database_pool_collector = DatabasePoolCollector()
+REGISTRY.register(database_pool_collector)
+
+
+def generate_metrics() -> Tuple[bytes, str]:
+    """
+    Returns the metrics in the Prometheus text format, aggregated over the
+    worker processes when PROMETHEUS_MULTIPROC_DIR is set.
+
+    :return: The content and its media type.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    # The pools are only known by the current worker
+    registry.register(database_pool_collector)
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
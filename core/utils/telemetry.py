@@ -0,0 +1,85 @@
+import os
+from typing import Any, Coroutine, Optional
+
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+from core.config import config
+
+# Spans are no-ops until `setup_tracing` configures the tracer provider
+tracer = trace.get_tracer("pandasai-server")
+
+
+def get_span_exporter(exporter: str, file_path: Optional[str] = None) -> SpanExporter:
+    """
+    Returns the exporter of the spans.
+
+    :param exporter: "otlp" to send the spans to an OTLP collector, configured
+        with the OTEL_EXPORTER_OTLP_* variables, or "file" to append them to a
+        JSON lines file.
+    :param file_path: The file of the "file" exporter.
+    :return: The exporter.
+    """
+    if exporter == "otlp":
+        # Imported lazily, as the exporter is only needed with a collector
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter()
+
+    if exporter == "file":
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        return ConsoleSpanExporter(
+            out=open(file_path, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+
+    raise ValueError(f"Unknown tracing exporter: {exporter}")
+
+
+def setup_tracing() -> Optional[TracerProvider]:
+    """
+    Configures the tracer provider, which exports the spans in the background,
+    if the tracing is enabled.
+
+    :return: The tracer provider, or None if the tracing is disabled.
+    """
+    if not config.TRACING_EXPORTER:
+        return None
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": config.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(config.TRACING_SAMPLE_RATE)),
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(
+            get_span_exporter(config.TRACING_EXPORTER, config.TRACING_FILE_PATH)
+        )
+    )
+    trace.set_tracer_provider(provider)
+
+    return provider
+
+
+async def run_in_context(
+    coroutine: Coroutine[Any, Any, Any], context: otel_context.Context
+) -> Any:
+    """
+    Runs the coroutine in the tracing context, e.g. the context of the worker
+    thread which scheduled it on the event loop, so its spans have the right
+    parent.
+    """
+    token = otel_context.attach(context)
+    try:
+        return await coroutine
+    finally:
+        otel_context.detach(token)
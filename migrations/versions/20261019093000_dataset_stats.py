@@ -0,0 +1,48 @@
+"""dataset_stats
+
+Revision ID: 7c1d2e9a4b31
+Revises: 51e3880da98b
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "7c1d2e9a4b31"
+down_revision = "51e3880da98b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "dataset_stats",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("dataset_id", sa.UUID(), nullable=True),
+        sa.Column("rows_count", sa.BigInteger(), nullable=True),
+        sa.Column("columns", sa.JSON(), nullable=True),
+        sa.Column("sample", sa.JSON(), nullable=True),
+        sa.Column("change_marker", sa.String(), nullable=True),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["dataset_id"],
+            ["dataset.id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_dataset_stats_id"), "dataset_stats", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_dataset_stats_dataset_id"),
+        "dataset_stats",
+        ["dataset_id"],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_dataset_stats_dataset_id"), table_name="dataset_stats")
+    op.drop_index(op.f("ix_dataset_stats_id"), table_name="dataset_stats")
+    op.drop_table("dataset_stats")
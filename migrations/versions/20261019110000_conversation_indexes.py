@@ -0,0 +1,48 @@
+"""conversation_indexes
+
+Revision ID: 3b9e5d7f2a60
+Revises: 7c1d2e9a4b31
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "3b9e5d7f2a60"
+down_revision = "7c1d2e9a4b31"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_user_conversation_user_workspace_created_at",
+        "user_conversation",
+        ["user_id", "workspace_id", "valid", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_conversation_message_conversation_created_at",
+        "conversation_message",
+        ["conversation_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_dataset_space_workspace_dataset",
+        "dataset_space",
+        ["workspace_id", "dataset_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_dataset_space_workspace_dataset", table_name="dataset_space")
+    op.drop_index(
+        "ix_conversation_message_conversation_created_at",
+        table_name="conversation_message",
+    )
+    op.drop_index(
+        "ix_user_conversation_user_workspace_created_at",
+        table_name="user_conversation",
+    )
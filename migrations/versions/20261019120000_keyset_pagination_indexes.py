@@ -0,0 +1,47 @@
+"""keyset_pagination_indexes
+
+Revision ID: 8d4a1c6e0f27
+Revises: 3b9e5d7f2a60
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "8d4a1c6e0f27"
+down_revision = "3b9e5d7f2a60"
+branch_labels = None
+depends_on = None
+
+
+def _recreate_indexes(id_columns):
+    op.drop_index(
+        "ix_user_conversation_user_workspace_created_at",
+        table_name="user_conversation",
+    )
+    op.create_index(
+        "ix_user_conversation_user_workspace_created_at",
+        "user_conversation",
+        ["user_id", "workspace_id", "valid", "created_at", *id_columns],
+        unique=False,
+    )
+    op.drop_index(
+        "ix_conversation_message_conversation_created_at",
+        table_name="conversation_message",
+    )
+    op.create_index(
+        "ix_conversation_message_conversation_created_at",
+        "conversation_message",
+        ["conversation_id", "created_at", *id_columns],
+        unique=False,
+    )
+
+
+def upgrade():
+    # The pages are resolved with (created_at, id) row comparisons
+    _recreate_indexes(["id"])
+
+
+def downgrade():
+    _recreate_indexes([])
@@ -0,0 +1,46 @@
+"""semantic_schema
+
+Revision ID: 5f2b8e3c9d14
+Revises: 8d4a1c6e0f27
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5f2b8e3c9d14"
+down_revision = "8d4a1c6e0f27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "semantic_schema",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("definition", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "fingerprint", "version", name="uq_semantic_schema_fingerprint_version"
+        ),
+    )
+    op.create_index(
+        op.f("ix_semantic_schema_id"), "semantic_schema", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_semantic_schema_fingerprint"),
+        "semantic_schema",
+        ["fingerprint"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_semantic_schema_fingerprint"), table_name="semantic_schema")
+    op.drop_index(op.f("ix_semantic_schema_id"), table_name="semantic_schema")
+    op.drop_table("semantic_schema")
@@ -1,4 +1,5 @@
 import json
+import logging
 import os
 import uuid
 from typing import List, Optional, Union
@@ -10,20 +11,28 @@ from pandasai.pipelines.chat.chat_pipeline_input import ChatPipelineInput
 from pandasai.pipelines.chat.code_execution_pipeline_input import (
     CodeExecutionPipelineInput,
 )
+from pandasai.vectorstores.bulk_ingestion import BulkIngestion
 from pandasai.vectorstores.vectorstore import VectorStore
 
 from ..config import load_config_from_json
 from ..connectors import BaseConnector, PandasConnector
-from ..constants import DEFAULT_CACHE_DIRECTORY, DEFAULT_CHART_DIRECTORY
+from ..constants import (
+    DEFAULT_CACHE_DIRECTORY,
+    DEFAULT_CHART_DIRECTORY,
+    TRAINING_BATCH_SIZE,
+    TRAINING_MAX_WORKERS,
+)
 from ..exceptions import (
     InvalidLLMOutputType,
     MaliciousQueryError,
     MissingVectorStoreError,
 )
+from ..helpers.debug_trace import trace
 from ..helpers.df_info import df_type
 from ..helpers.folder import Folder
 from ..helpers.logger import Logger
 from ..helpers.memory import Memory
+from ..helpers.profiler import profiled
 from ..llm.base import LLM
 from ..llm.langchain import LangchainLLM, is_langchain_llm
 from ..pipelines.pipeline_context import PipelineContext
@@ -69,11 +78,8 @@ class BaseAgent:
         self.conversation_id = uuid.uuid4()
 
         self.dfs = self.get_dfs(dfs)
-        print(f"MY DataFrames: {self.dfs}")
-        for df in self.dfs:
-            if isinstance(df, PandasConnector):
-                print(f"PandasConnector NEW loaded with DataFrame of shape: {df.pandas_df.shape}")
-        
+        trace("agent.dataframes", "Dataframes: %s", self.dfs)
+
         # Instantiate the context
         self.config = self.get_config(config)
         self.context = PipelineContext(
@@ -83,15 +89,7 @@ class BaseAgent:
             vectorstore=vectorstore,
         )
 
-        print("context config")
-        print(self.config)
-        print("end config printing")
-
-
-        print("context printing")
-        print(self.context)
-        print("end context printing")
-
+        trace("agent.config", "Config: %s", self.config)
 
         # Instantiate the logger
         self.logger = Logger(
@@ -185,25 +183,19 @@ class BaseAgent:
         """
         # Inline import to avoid circular import
         from pandasai.smart_dataframe import SmartDataframe
-        print("NOW PRINT DFS")
-        print(dfs)
+
         # If only one dataframe is passed, convert it to a list
         if not isinstance(dfs, list):
             dfs = [dfs]
 
-        print("about to loop through")
         connectors = []
         for df in dfs:
             if isinstance(df, BaseConnector):
                 connectors.append(df)
-                print(f"BaseConnector DataFrame shape: {df.pandas_df.shape}")
             elif isinstance(df, (pd.DataFrame, pd.Series, list, dict, str)):
                 connectors.append(PandasConnector({"original_df": df}))
-                print("THIS IS THE PANAS DATAFRAME")
-                print(df.dataframe)
             elif df_type(df) == "modin":
                 connectors.append(PandasConnector({"original_df": df}))
-                print("THIS IS THE modin CONNECTOR")
             elif isinstance(df, SmartDataframe) and isinstance(
                 df.dataframe, BaseConnector
             ):
@@ -273,6 +265,7 @@ class BaseAgent:
         ]
         return any(module in query for module in dangerous_modules)
 
+    @profiled("agent.chat")
     def chat(self, query: str, output_type: Optional[str] = None):
         """
         Simulate a chat interaction with the assistant on Dataframe.
@@ -284,7 +277,7 @@ class BaseAgent:
             )
 
         try:
-            self.logger.log(f"Question: {query}")
+            self.logger.log("Question: %s", logging.INFO, query)
             self.logger.log(
                 f"Running PandasAI with {self.context.config.llm.type} LLM..."
             )
@@ -306,14 +299,15 @@ class BaseAgent:
             #return self.pipeline.run(pipeline_input)
 
             response = self.pipeline.run(pipeline_input)
-            self.logger.log(f"Agent response: {response}")
 
-            # Log detailed response
+            # The type and size only, the value can be a large table or plot
             if response['type'] == 'dataframe':
-                rows = response['value']['rows']
-                self.logger.log(f"YES Number of rows in response: {len(rows)}")
-                for row in rows:
-                    self.logger.log(f"Row: {row}")
+                size = f"{len(response['value']['rows'])} rows"
+            else:
+                size = f"{len(str(response['value']))} characters"
+            self.logger.log(
+                "Agent response: %s of %s", logging.INFO, response['type'], size
+            )
 
             return response
 
@@ -334,7 +328,7 @@ class BaseAgent:
                 "because of the following error: No pipeline exists"
             )
         try:
-            self.logger.log(f"Question: {query}")
+            self.logger.log("Question: %s", logging.INFO, query)
             self.logger.log(
                 f"Running PandasAI with {self.context.config.llm.type} LLM..."
             )
@@ -367,7 +361,7 @@ class BaseAgent:
         try:
             if code is None:
                 code = self.last_code_generated
-            self.logger.log(f"Code: {code}")
+            self.logger.log("Code: %s", logging.INFO, code)
             self.logger.log(
                 f"Running PandasAI with {self.context.config.llm.type} LLM..."
             )
@@ -391,6 +385,9 @@ class BaseAgent:
         queries: Optional[List[str]] = None,
         codes: Optional[List[str]] = None,
         docs: Optional[List[str]] = None,
+        batch_size: int = TRAINING_BATCH_SIZE,
+        max_workers: int = TRAINING_MAX_WORKERS,
+        checkpoint_path: Optional[str] = None,
     ) -> None:
         """
         Trains the context to be passed to model
@@ -398,6 +395,10 @@ class BaseAgent:
             queries (Optional[str], optional): user user
             codes (Optional[str], optional): generated code
             docs (Optional[List[str]], optional): additional docs
+            batch_size (int, optional): entries embedded and added together
+            max_workers (int, optional): batches added at the same time
+            checkpoint_path (Optional[str], optional): file recording the
+                added batches, to resume an interrupted training
         Raises:
             ImportError: if default vector db lib is not installed it raises an error
         """
@@ -411,11 +412,19 @@ class BaseAgent:
                 "If either queries or codes are provided, both must be provided."
             )
 
+        ingestion = BulkIngestion(
+            self._vectorstore,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            checkpoint_path=checkpoint_path,
+            logger=self.logger,
+        )
+
         if docs is not None:
-            self._vectorstore.add_docs(docs)
+            ingestion.add_docs(docs)
 
         if queries and codes:
-            self._vectorstore.add_question_answer(queries, codes)
+            ingestion.add_question_answer(queries, codes)
 
         self.logger.log("Agent successfully trained on the data")
 
@@ -0,0 +1,151 @@
+"""
+Engine registry
+
+Process-wide registry of the SQLAlchemy engines used by the SQL connectors,
+keyed by connection configuration. Connectors created with the same
+configuration share the same engine and its connection pool, so creating an
+agent doesn't open new connections to the database.
+
+Example:
+    ```python
+    from pandasai.connectors.engine_registry import engine_registry
+
+    engine = engine_registry.get_engine("postgresql+psycopg2://...")
+    with engine_registry.connect(engine, "orders") as connection:
+        connection.execute(query)
+    ```
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+from ..constants import (
+    DATASET_MAX_CONCURRENT_QUERIES,
+    ENGINE_MAX_OVERFLOW,
+    ENGINE_POOL_RECYCLE,
+    ENGINE_POOL_SIZE,
+    ENGINE_POOL_TIMEOUT,
+)
+
+
+class EngineRegistry:
+    """Thread-safe registry of the engines shared by the SQL connectors
+
+    Args:
+        pool_size (int): connections kept open by each engine.
+        max_overflow (int): connections opened above the pool size under load.
+        pool_recycle (int): seconds after which idle connections are replaced.
+        pool_timeout (int): seconds to wait for a connection of the pool.
+        max_concurrent_queries (int): queries run at the same time on a table.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = ENGINE_POOL_SIZE,
+        max_overflow: int = ENGINE_MAX_OVERFLOW,
+        pool_recycle: int = ENGINE_POOL_RECYCLE,
+        pool_timeout: int = ENGINE_POOL_TIMEOUT,
+        max_concurrent_queries: int = DATASET_MAX_CONCURRENT_QUERIES,
+    ):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_recycle = pool_recycle
+        self.pool_timeout = pool_timeout
+        self.max_concurrent_queries = max_concurrent_queries
+        self._engines: Dict[str, Engine] = {}
+        self._semaphores: Dict[Tuple[str, str], threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(url: str, kwargs: Dict[str, Any]) -> str:
+        return repr((url, sorted((key, repr(value)) for key, value in kwargs.items())))
+
+    def _get_pool_kwargs(self, url: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the pool arguments of `create_engine`. The size and timeout
+        only apply to queue pools, the other pools, e.g. the single
+        connection pool of in-memory SQLite databases, don't accept them.
+        """
+        pool_kwargs = {"pool_recycle": self.pool_recycle, "pool_pre_ping": True}
+
+        pool_class = kwargs.get("poolclass")
+        if pool_class is None and "pool" not in kwargs:
+            try:
+                url = make_url(url)
+                pool_class = url.get_dialect().get_pool_class(url)
+            except Exception:
+                # Unknown dialect, create_engine reports it
+                pool_class = None
+
+        if isinstance(pool_class, type) and issubclass(pool_class, QueuePool):
+            pool_kwargs.update(
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+            )
+
+        return {**pool_kwargs, **kwargs}
+
+    def get_engine(self, url: str, **kwargs) -> Engine:
+        """
+        Return the engine for the connection configuration, creating it on
+        first use.
+
+        Args:
+            url (str): database URL.
+            **kwargs: additional arguments of `create_engine`.
+
+        Returns:
+            Engine: the shared engine.
+        """
+        key = self._get_key(url, kwargs)
+
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = create_engine(url, **self._get_pool_kwargs(url, kwargs))
+                self._engines[key] = engine
+
+        return engine
+
+    def _get_semaphore(self, engine: Engine, table: str) -> threading.BoundedSemaphore:
+        key = (str(id(engine)), table)
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_concurrent_queries)
+                self._semaphores[key] = semaphore
+        return semaphore
+
+    @contextmanager
+    def connect(self, engine: Engine, table: str) -> Iterator[Connection]:
+        """
+        Check out a connection of the engine to query the table, waiting while
+        the maximum number of concurrent queries on the table is reached.
+
+        Args:
+            engine (Engine): engine returned by `get_engine`.
+            table (str): table queried with the connection.
+
+        Yields:
+            Connection: the connection, returned to the pool on exit.
+        """
+        with self._get_semaphore(engine, table):
+            with engine.connect() as connection:
+                yield connection
+
+    def dispose(self) -> None:
+        """Close the connections of every engine and empty the registry."""
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+            self._semaphores.clear()
+
+
+engine_registry = EngineRegistry()
@@ -14,6 +14,7 @@ import pandasai.pandas as pd
 from pandasai.exceptions import PandasConnectorTableNotFound
 
 from ..helpers.data_sampler import DataSampler
+from ..helpers.debug_trace import trace
 from ..helpers.file_importer import FileImporter
 from ..helpers.logger import Logger
 from .base import BaseConnector
@@ -77,8 +78,8 @@ class PandasConnector(BaseConnector):
             self.pandas_df = FileImporter.import_from_file(df)
         else:
             raise ValueError("Invalid input data. We cannot convert it to a dataframe.")
-        
-        print(f"PandasConnector loaded DataFrame with shape: {self.pandas_df.shape}")
+
+        trace("connector.load", "Loaded dataframe of shape %s", self.pandas_df.shape)
 
     def _load_connector_config(
         self, config: Union[PandasConnectorConfig, dict]
@@ -164,8 +165,6 @@ class PandasConnector(BaseConnector):
         return self._original_df.equals(other._original_df)
 
     def enable_sql_query(self, table_name=None):
-        print(f"enable_sql_query called with table_name: {table_name}")
-        print(f"self.name: {self.name}")
         if not table_name and not self.name:
             raise PandasConnectorTableNotFound("Table name not found!")
 
@@ -3,22 +3,82 @@ SQL connectors are used to connect to SQL databases in different dialects.
 """
 
 import hashlib
+import json
 import os
+import random
 import re
+import threading
 import time
+from collections import OrderedDict
 from functools import cache, cached_property
-from typing import Optional, Union
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple, Union
 
 import sqlglot
-from sqlalchemy import asc, create_engine, select, text
+from sqlalchemy import Integer, asc, inspect, select, text
 from sqlalchemy.engine import Connection
 
 import pandasai.pandas as pd
 from pandasai.exceptions import MaliciousQueryError
+from pandasai.helpers.data_sampler import DataSampler
+from pandasai.helpers.metrics import record_cache_lookup
 from pandasai.helpers.path import find_project_root
 
-from ..constants import DEFAULT_FILE_PERMISSIONS
+from ..constants import (
+    DEFAULT_FILE_PERMISSIONS,
+    HEAD_CACHE_SIZE,
+    HEAD_SAMPLE_BERNOULLI_MAX_ROWS,
+    HEAD_SAMPLE_OVERSAMPLING,
+)
 from .base import BaseConnector, BaseConnectorConfig
+from .engine_registry import engine_registry
+
+
+class HeadCache:
+    """
+    Process-wide LRU cache of the heads of the SQL connectors, keyed by the
+    fingerprint of the dataset, so connectors created for every request don't
+    sample the same table again.
+
+    Args:
+        maxsize (int): maximum number of heads kept in the cache.
+    """
+
+    def __init__(self, maxsize: int = HEAD_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, pd.DataFrame]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, ttl: int) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time() - ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1].copy()
+
+    def set(self, key: str, head: pd.DataFrame) -> None:
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.time(), head.copy())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+head_cache = HeadCache()
 
 
 class SQLBaseConnectorConfig(BaseConnectorConfig):
@@ -56,7 +116,6 @@ class SQLConnector(BaseConnector):
     """
 
     _engine = None
-    _connection: Connection = None
     _rows_count: int = None
     _columns_count: int = None
     _cache_interval: int = 600  # 10 minutes
@@ -108,26 +167,41 @@ class SQLConnector(BaseConnector):
         """
 
         if config.driver:
-            self._engine = create_engine(
+            self._engine = engine_registry.get_engine(
                 f"{config.dialect}+{config.driver}://{config.username}:{config.password}"
                 f"@{config.host}:{str(config.port)}/{config.database}",
                 connect_args=config.connect_args,
             )
         else:
-            self._engine = create_engine(
+            self._engine = engine_registry.get_engine(
                 f"{config.dialect}://{config.username}:{config.password}@{config.host}"
                 f":{str(config.port)}/{config.database}",
                 connect_args=config.connect_args,
             )
 
-        self._connection = self._engine.connect()
+    @contextmanager
+    def _connect(self) -> Iterator[Connection]:
+        """
+        Check out a connection from the pool of the shared engine.
+
+        Yields:
+            Connection: The connection, returned to the pool on exit.
+        """
+        with engine_registry.connect(self._engine, self.cs_table_name) as connection:
+            yield connection
 
-    def __del__(self):
+    def _read_sql(self, query) -> pd.DataFrame:
         """
-        Close the connection to the SQL database.
+        Run the query on a pooled connection and return the result.
+
+        Args:
+            query: The query to run.
+
+        Returns:
+            DataFrame: The result of the query.
         """
-        if self._connection:
-            self._connection.close()
+        with self._connect() as connection:
+            return pd.read_sql(query, connection)
 
     def __repr__(self):
         """
@@ -148,11 +222,11 @@ class SQLConnector(BaseConnector):
         if not re.match(regex, column_name):
             raise ValueError(f"Invalid column name: {column_name}")
 
-    def _build_query(self, limit=None, order=None):
-        base_query = select("*").select_from(text(self.cs_table_name))
-        if self.config.where or self._additional_filters:
+    def _build_query(self, limit=None, order=None, table=None, conditions=None):
+        base_query = select("*").select_from(text(table or self.cs_table_name))
+        if self.config.where or self._additional_filters or conditions:
             # conditions is the list of where + additional filters
-            conditions = []
+            conditions = list(conditions or [])
             if self.config.where:
                 conditions += self.config.where
             if self._additional_filters:
@@ -192,21 +266,117 @@ class SQLConnector(BaseConnector):
         Return the head of the data source that the connector is connected to.
         This information is passed to the LLM to provide the schema of the data source.
 
+        The head is selected from a sample of the table, so that the most
+        frequent values of the categorical columns are represented, and cached
+        for the whole process during the cache interval.
+
         Returns:
             DataFrame: The head of the data source.
         """
 
+        fingerprint = self._get_sample_fingerprint(n)
+        head = head_cache.get(fingerprint, self._cache_interval)
+        record_cache_lookup("schema", hit=head is not None)
+        if head is not None:
+            return head
+
         if self.logger:
             self.logger.log(
                 f"Getting head of {self.config.table} "
                 f"using dialect {self.config.dialect}"
             )
 
-        # Run a SQL query to get all the columns names and 5 random rows
-        query = self._build_query(limit=n, order="RAND()")
+        sample = self._sample(n)
+        head = DataSampler(sample).stratified_sample(n)
+
+        head_cache.set(fingerprint, head)
+        return head
 
-        # Return the head of the data source
-        return pd.read_sql(query, self._connection)
+    def _get_sample_fingerprint(self, n: int) -> str:
+        """
+        Return the fingerprint of the sampled dataset: the connector, its
+        configuration and the number of rows.
+
+        Args:
+            n (int): The number of rows of the head.
+
+        Returns:
+            str: The fingerprint.
+        """
+        config = json.dumps(self.config.dict(), sort_keys=True, default=str)
+        filters = json.dumps(self._additional_filters, default=str)
+        fingerprint = f"{self.__class__.__name__}{config}{filters}{n}"
+        return hashlib.sha256(fingerprint.encode()).hexdigest()
+
+    def _sample(self, n: int) -> pd.DataFrame:
+        """
+        Return a sample of the table to select the head from, without sorting
+        the whole table randomly.
+
+        A random range of the integer primary key is read when the table has
+        one. Otherwise the rows are read from a random offset, which skips the
+        rows before it without sorting the table like a random order would.
+
+        Args:
+            n (int): The number of rows of the head.
+
+        Returns:
+            DataFrame: The sample.
+        """
+        size = n * HEAD_SAMPLE_OVERSAMPLING
+
+        key = self._get_integer_primary_key()
+        if key is not None:
+            query = select(
+                text(f"MIN({key}), MAX({key})")
+            ).select_from(text(self.cs_table_name))
+            with self._connect() as connection:
+                min_key, max_key = connection.execute(query).fetchone()
+
+            if min_key is not None and max_key - min_key + 1 > size:
+                start = random.randint(min_key, max_key - size + 1)
+                query = self._build_query(
+                    limit=size, order=key, conditions=[[key, ">=", start]]
+                )
+                sample = self._read_sql(query)
+                if len(sample) >= n:
+                    return sample
+
+        rows_count = self.rows_count
+        offset = random.randint(0, rows_count - size) if rows_count > size else 0
+        sample = self._read_sql(self._build_query(limit=size).offset(offset))
+        if len(sample) < n and offset:
+            # The filters left fewer rows than the offset
+            sample = self._read_sql(self._build_query(limit=size))
+
+        return sample
+
+    def _get_integer_primary_key(self) -> Optional[str]:
+        """
+        Return the primary key of the table when it is a single integer column.
+
+        Returns:
+            str: The name of the primary key column, or None.
+        """
+        try:
+            with self._connect() as connection:
+                inspector = inspect(connection)
+                primary_key = inspector.get_pk_constraint(self.config.table)
+                columns = inspector.get_columns(self.config.table)
+
+            key_columns = primary_key.get("constrained_columns") or []
+            if len(key_columns) != 1:
+                return None
+
+            for column in columns:
+                if column["name"] == key_columns[0]:
+                    if isinstance(column["type"], Integer):
+                        self._validate_column_name(column["name"])
+                        return column["name"]
+        except Exception:
+            return None
+
+        return None
 
     def _get_cache_path(self, include_additional_filters: bool = False):
         """
@@ -289,7 +459,9 @@ class SQLConnector(BaseConnector):
             DataFrame: The result of the SQL query.
         """
 
-        if cached := self._cached() or self._cached(include_additional_filters=True):
+        cached = self._cached() or self._cached(include_additional_filters=True)
+        record_cache_lookup("connector", hit=bool(cached))
+        if cached:
             return pd.read_csv(cached)
 
         if self.logger:
@@ -302,7 +474,7 @@ class SQLConnector(BaseConnector):
         query = self._build_query()
 
         # Get the result of the query
-        result = pd.read_sql(query, self._connection)
+        result = self._read_sql(query)
 
         # Save the result to the cache
         self._save_cache(result)
@@ -333,7 +505,8 @@ class SQLConnector(BaseConnector):
         query = select(text("COUNT(*)")).select_from(text(self.cs_table_name))
 
         # Return the number of rows
-        self._rows_count = self._connection.execute(query).fetchone()[0]
+        with self._connect() as connection:
+            self._rows_count = connection.execute(query).fetchone()[0]
         return self._rows_count
 
     @cached_property
@@ -441,7 +614,7 @@ class SQLConnector(BaseConnector):
         if not self._is_sql_query_safe(sql_query):
             raise MaliciousQueryError("Malicious query is generated in code")
 
-        return pd.read_sql(sql_query, self._connection)
+        return self._read_sql(sql_query)
 
     @property
     def cs_table_name(self):
@@ -495,37 +668,9 @@ class SqliteConnector(SQLConnector):
             config (SQLConnectorConfig): Configurations to load database
 
         """
-        self._engine = create_engine(f"{config.dialect}:///{config.database}")
-        self._connection = self._engine.connect()
-
-    def __del__(self):
-        """
-        Close the connection to the SQL database.
-        """
-        if self._connection:
-            self._connection.close()
-
-    @cache
-    def head(self, n: int = 5) -> pd.DataFrame:
-        """
-        Return the head of the data source that the connector is connected to.
-        This information is passed to the LLM to provide the schema of the data source.
-
-        Returns:
-            DataFrame: The head of the data source.
-        """
-
-        if self.logger:
-            self.logger.log(
-                f"Getting head of {self.config.table} "
-                f"using dialect {self.config.dialect}"
-            )
-
-        # Run a SQL query to get all the columns names and 5 random rows
-        query = self._build_query(limit=n, order="RANDOM()")
-
-        # Return the head of the data source
-        return pd.read_sql(query, self._connection)
+        self._engine = engine_registry.get_engine(
+            f"{config.dialect}:///{config.database}"
+        )
 
     @property
     def cs_table_name(self):
@@ -546,8 +691,6 @@ class SqliteConnector(SQLConnector):
 
     def equals(self, other):
         if isinstance(other, self.__class__):
-            print(self.config.database)
-            print(other.config.database)
             return (
                 self.config.dialect,
                 self.config.driver,
@@ -625,27 +768,58 @@ class PostgreSQLConnector(SQLConnector):
 
         super().__init__(config, **kwargs)
 
-    @cache
-    def head(self, n: int = 5) -> pd.DataFrame:
+    def _sample(self, n: int) -> pd.DataFrame:
         """
-        Return the head of the data source that the connector is connected to.
-        This information is passed to the LLM to provide the schema of the data source.
+        Return a sample of the table using TABLESAMPLE, with a rate computed
+        from the rows estimate of the planner statistics. Rows are sampled
+        with BERNOULLI on small tables and pages with SYSTEM on large ones.
+
+        Args:
+            n (int): The number of rows of the head.
 
         Returns:
-            DataFrame: The head of the data source.
+            DataFrame: The sample.
         """
+        size = n * HEAD_SAMPLE_OVERSAMPLING
 
-        if self.logger:
-            self.logger.log(
-                f"Getting head of {self.config.table} "
-                f"using dialect {self.config.dialect}"
-            )
+        estimate = self._get_rows_estimate()
+        if estimate is None or estimate <= size * 10:
+            return super()._sample(n)
 
-        # Run a SQL query to get all the columns names and 5 random rows
-        query = self._build_query(limit=n, order="RANDOM()")
+        # Oversample to make up for the filters and the variance of the sampling
+        percent = min(100.0, 300.0 * size / estimate)
+        method = "BERNOULLI" if estimate <= HEAD_SAMPLE_BERNOULLI_MAX_ROWS else "SYSTEM"
 
-        # Return the head of the data source
-        return pd.read_sql(query, self._connection)
+        query = self._build_query(
+            limit=size,
+            table=f"{self.cs_table_name} TABLESAMPLE {method} ({percent:.6f})",
+        )
+        sample = self._read_sql(query)
+        if len(sample) < n:
+            return super()._sample(n)
+
+        return sample
+
+    def _get_rows_estimate(self) -> Optional[float]:
+        """
+        Return the number of rows of the table estimated by the planner.
+
+        Returns:
+            float: The estimate, or None if the table was never analyzed.
+        """
+        query = text(
+            "SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"
+        ).bindparams(table=self.cs_table_name)
+        try:
+            with self._connect() as connection:
+                row = connection.execute(query).fetchone()
+        except Exception:
+            return None
+
+        if row is None or row[0] is None or row[0] <= 0:
+            return None
+
+        return float(row[0])
 
     @property
     def cs_table_name(self):
@@ -687,28 +861,6 @@ class OracleConnector(SQLConnector):
 
         super().__init__(config, **kwargs)
 
-    @cache
-    def head(self, n: int = 5) -> pd.DataFrame:
-        """
-        Return the head of the data source that the connector is connected to.
-        This information is passed to the LLM to provide the schema of the data source.
-
-        Returns:
-            DataFrame: The head of the data source.
-        """
-
-        if self.logger:
-            self.logger.log(
-                f"Getting head of {self.config.table} "
-                f"using dialect {self.config.dialect}"
-            )
-
-        # Run a SQL query to get all the columns names and 5 random rows
-        query = self._build_query(limit=n, order="dbms_random.value")
-
-        # Return the head of the data source
-        return pd.read_sql(query, self._connection)
-
     @property
     def cs_table_name(self):
         return f'"{self.config.table}"'
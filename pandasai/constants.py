@@ -18,6 +18,66 @@ DEFAULT_FILE_PERMISSIONS = 0o755
 # Token needed to invalidate the cache after breaking changes
 CACHE_TOKEN = "pandasai1"
 
+# Maximum number of cleaned code entries kept in memory
+CODE_CACHE_SIZE = 256
+
+# Maximum number of retrieved training documents kept in memory, and for how
+# long they are served without querying the vector store again
+RETRIEVAL_CACHE_SIZE = 256
+RETRIEVAL_CACHE_TTL = 300  # 5 minutes
+
+# Maximum number of PII classifications of datasets kept in memory, and rows
+# sampled to classify the columns of a dataset
+PII_CACHE_SIZE = 1024
+PII_SAMPLE_SIZE = 1000
+
+# Query summaries waiting to be published to the log server, the newer ones
+# are dropped when it is full
+PUBLISH_QUEUE_SIZE = 1000
+
+# Semantic query builders kept compiled in memory, and SQL queries memoized by
+# each of them
+QUERY_BUILDER_CACHE_SIZE = 32
+QUERY_BUILDER_SQL_CACHE_SIZE = 1024
+
+# Semantic rollups: number of times a combination of measures and dimensions
+# is queried before it is materialized, rollups kept and their maximum age
+ROLLUP_HOT_THRESHOLD = 3
+ROLLUP_MAX_TABLES = 16
+ROLLUP_MAX_AGE = 600  # 10 minutes
+
+# Batches of the bulk ingestion of training data into the vector stores
+TRAINING_BATCH_SIZE = 256
+TRAINING_MAX_WORKERS = 4
+
+# Local vector store: dimensions of the default hashing embeddings, number of
+# vectors above which the approximate index is used and clusters it scans
+LOCAL_VECTORSTORE_DIMENSIONS = 512
+LOCAL_VECTORSTORE_INDEX_THRESHOLD = 50_000
+LOCAL_VECTORSTORE_NPROBE = 8
+
+# Maximum number of heads of SQL connectors cached in the process
+HEAD_CACHE_SIZE = 256
+
+# Number of rows fetched for each row of the head of SQL connectors, so the head
+# can be stratified over the values of the categorical columns
+HEAD_SAMPLE_OVERSAMPLING = 20
+
+# Above this number of rows, Postgres samples pages instead of rows
+HEAD_SAMPLE_BERNOULLI_MAX_ROWS = 1_000_000
+
+# Connection pool of the engines shared by the SQL connectors
+ENGINE_POOL_SIZE = 5
+ENGINE_MAX_OVERFLOW = 5
+ENGINE_POOL_RECYCLE = 1800  # 30 minutes
+ENGINE_POOL_TIMEOUT = 30
+
+# Maximum number of queries run at the same time on a table of a SQL connector
+DATASET_MAX_CONCURRENT_QUERIES = 4
+
+# Maximum number of logs kept in memory by a logger
+LOGGER_MAX_LOGS = 1000
+
 # List of Python builtin libraries that are added to the environment by default.
 WHITELISTED_BUILTINS = [
     "abs",
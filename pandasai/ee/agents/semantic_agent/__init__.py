@@ -16,6 +16,12 @@ from pandasai.ee.agents.semantic_agent.prompts.generate_df_schema import (
     GenerateDFSchemaPrompt,
 )
 from pandasai.ee.helpers.json_helper import extract_json_from_json_str
+from pandasai.ee.helpers.rollup_manager import RollupManager
+from pandasai.ee.helpers.schema_registry import (
+    SchemaRegistry,
+    get_schema_registry,
+    schema_fingerprint,
+)
 from pandasai.exceptions import InvalidConfigError, InvalidSchemaJson, InvalidTrainJson
 from pandasai.helpers.cache import Cache
 from pandasai.helpers.memory import Memory
@@ -44,29 +50,43 @@ class SemanticAgent(BaseAgent):
         vectorstore: Optional[VectorStore] = None,
         description: str = None,
         judge: BaseJudge = None,
+        schema_registry: Optional[SchemaRegistry] = None,
     ):
         super().__init__(dfs, config, memory_size, vectorstore, description)
 
         self._validate_config()
 
-        self._schema_cache = Cache("schema")
+        self._schema_registry = schema_registry or get_schema_registry()
+        self._schema_cache = Cache("schema") if self._schema_registry is None else None
         self._schema = schema or None
 
         self._create_schema()
 
         self._sort_dfs_according_to_schema()
 
+        self._rollup_manager = None
         self.init_duckdb_instance()
 
         # semantic agent works only with direct sql true
         self.config.direct_sql = True
 
+        initial_values = {"df_schema": self._schema}
+        # Rollups are materialized next to the dataframes, in DuckDB
+        if self.config.enable_rollups and all(
+            isinstance(df, PandasConnector) for df in self.dfs
+        ):
+            self._rollup_manager = RollupManager(
+                self._schema, self.dfs, logger=self.logger
+            )
+            initial_values["rollup_manager"] = self._rollup_manager
+            initial_values["execute_sql_query"] = self._rollup_manager.execute
+
         self.context = PipelineContext(
             dfs=self.dfs,
             config=self.config,
             memory=Memory(memory_size, agent_info=description),
             vectorstore=self._vectorstore,
-            initial_values={"df_schema": self._schema},
+            initial_values=initial_values,
         )
 
         self.pipeline = (
@@ -135,6 +155,10 @@ class SemanticAgent(BaseAgent):
                 self._sync_pandas_dataframe_schema(self.dfs[index], tables)
                 self.dfs[index].enable_sql_query(tables["table"])
 
+        # The rollups were aggregated from the previous tables
+        if self._rollup_manager is not None:
+            self._rollup_manager.invalidate()
+
     def _sync_pandas_dataframe_schema(self, df: PandasConnector, schema: dict):
         for dimension in schema["dimensions"]:
             if dimension["type"] in ["date", "datetime", "timestamp"]:
@@ -171,8 +195,16 @@ class SemanticAgent(BaseAgent):
             self.logger.log(f"using user provided schema: {self._schema}")
             return
 
+        if self._schema_registry is not None:
+            fingerprint = schema_fingerprint(self.context.dfs)
+            schema = self._schema_registry.get(fingerprint)
+            if schema is not None:
+                self._schema = schema
+                self.logger.log(f"using registered schema: {self._schema}")
+                return
+
         key = self._get_schema_cache_key()
-        if self.config.enable_cache:
+        if self.config.enable_cache and self._schema_cache is not None:
             value = self._schema_cache.get(key)
             if value is not None:
                 self._schema = json.loads(value)
@@ -192,8 +224,10 @@ class SemanticAgent(BaseAgent):
             schema_data = [schema_data]
 
         self._schema = schema_data
-        # save schema in the cache
-        if self.config.enable_cache:
+        # save schema in the registry, or else in the cache
+        if self._schema_registry is not None:
+            self._schema_registry.set(fingerprint, self._schema)
+        elif self.config.enable_cache:
             self._schema_cache.set(key, json.dumps(self._schema))
 
         self.logger.log(f"using schema: {self._schema}")
@@ -1,7 +1,7 @@
 import traceback
 from typing import Any, Callable
 
-from pandasai.ee.helpers.query_builder import QueryBuilder
+from pandasai.ee.helpers.query_builder import get_query_builder
 from pandasai.helpers.logger import Logger
 from pandasai.pipelines.base_logic_unit import BaseLogicUnit
 from pandasai.pipelines.logic_unit_output import LogicUnitOutput
@@ -39,12 +39,14 @@ class CodeGenerator(BaseLogicUnit):
         pipeline_context: PipelineContext = kwargs.get("context")
         logger: Logger = kwargs.get("logger")
         schema = pipeline_context.get("df_schema")
-        query_builder = QueryBuilder(schema)
+        query_builder = get_query_builder(schema)
 
         retry_count = 0
         while retry_count <= pipeline_context.config.max_retries:
             try:
                 sql_query = query_builder.generate_sql(input_data)
+                if rollup_manager := pipeline_context.get("rollup_manager", None):
+                    rollup_manager.record(input_data, sql_query)
 
                 response_type = self._get_type(input_data)
 
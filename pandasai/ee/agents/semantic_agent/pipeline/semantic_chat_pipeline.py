@@ -27,6 +27,7 @@ from pandasai.pipelines.chat.error_correction_pipeline.error_correction_pipeline
 )
 from pandasai.pipelines.chat.generate_chat_pipeline import GenerateChatPipeline
 from pandasai.pipelines.chat.result_validation import ResultValidation
+from pandasai.pipelines.chat.retrieval import Retrieval
 from pandasai.pipelines.pipeline import Pipeline
 from pandasai.pipelines.pipeline_context import PipelineContext
 
@@ -65,6 +66,7 @@ class SemanticChatPipeline(GenerateChatPipeline):
             steps=[
                 ValidatePipelineInput(),
                 CacheLookup(),
+                Retrieval(skip_if=self.is_cached),
                 SemanticPromptGeneration(
                     skip_if=self.is_cached,
                     on_execution=on_prompt_generation,
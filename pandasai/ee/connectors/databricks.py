@@ -5,10 +5,12 @@ Azure, AWS and GCP
 
 from typing import Union
 
-from sqlalchemy import create_engine
+import pandasai.pandas as pd
 
 from ...connectors.base import BaseConnectorConfig
+from ...connectors.engine_registry import engine_registry
 from ...connectors.sql import SQLBaseConnectorConfig, SQLConnector
+from ...constants import HEAD_SAMPLE_OVERSAMPLING
 
 
 class DatabricksConnectorConfig(SQLBaseConnectorConfig):
@@ -62,11 +64,30 @@ class DatabricksConnector(SQLConnector):
             config (DatabricksConnectorConfig): Configurations to load database
 
         """
-        self._engine = create_engine(
+        self._engine = engine_registry.get_engine(
             f"{config.dialect}://token:{config.token}@{config.host}:{config.port}?http_path={config.httpPath}"
         )
 
-        self._connection = self._engine.connect()
+    def _sample(self, n: int) -> pd.DataFrame:
+        """
+        Return a sample of the table using the fixed-size row sampling of
+        Databricks.
+
+        Args:
+            n (int): The number of rows of the head.
+
+        Returns:
+            DataFrame: The sample.
+        """
+        size = n * HEAD_SAMPLE_OVERSAMPLING
+        query = self._build_query(
+            limit=size, table=f"{self.cs_table_name} TABLESAMPLE ({size} ROWS)"
+        )
+        sample = self._read_sql(query)
+        if len(sample) < n:
+            return super()._sample(n)
+
+        return sample
 
     def __repr__(self):
         """
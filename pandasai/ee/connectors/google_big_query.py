@@ -5,11 +5,10 @@ google big query api.
 
 from typing import Union
 
-from sqlalchemy import create_engine
-
 from pandasai.exceptions import InvalidConfigError
 
 from ...connectors.base import BaseConnectorConfig
+from ...connectors.engine_registry import engine_registry
 from ...connectors.sql import SQLBaseConnectorConfig, SQLConnector
 
 
@@ -65,17 +64,15 @@ class GoogleBigQueryConnector(SQLConnector):
 
         """
         if config.credentials_path:
-            self._engine = create_engine(
+            self._engine = engine_registry.get_engine(
                 f"{config.dialect}://{config.projectID}/{config.database}",
                 credentials_path=config.credentials_path,
             )
         else:
-            self._engine = create_engine(
+            self._engine = engine_registry.get_engine(
                 f"{config.dialect}://{config.projectID}/{config.database}?credentials_base64={config.credentials_base64}"
             )
 
-        self._connection = self._engine.connect()
-
     def __repr__(self):
         """
         Return the string representation of the Google big query connector.
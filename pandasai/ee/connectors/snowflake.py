@@ -2,15 +2,14 @@
 SnowFlake connectors are used to connect to SnowFlake Data Cloud.
 """
 
-from functools import cache
 from typing import Union
 
-from sqlalchemy import create_engine
-
 import pandasai.pandas as pd
 
 from ...connectors.base import BaseConnectorConfig
+from ...connectors.engine_registry import engine_registry
 from ...connectors.sql import SQLBaseConnectorConfig, SQLConnector
+from ...constants import HEAD_SAMPLE_OVERSAMPLING
 
 
 class SnowFlakeConnectorConfig(SQLBaseConnectorConfig):
@@ -31,6 +30,8 @@ class SnowFlakeConnector(SQLConnector):
     SnowFlake connectors are used to connect to SnowFlake Data Cloud.
     """
 
+    _random_order = "RANDOM()"
+
     def __init__(
         self,
         config: Union[SnowFlakeConnectorConfig, dict],
@@ -68,33 +69,30 @@ class SnowFlakeConnector(SQLConnector):
             config (SQLConnectorConfig): Configurations to load database
 
         """
-        self._engine = create_engine(
+        self._engine = engine_registry.get_engine(
             f"{config.dialect}://{config.username}:{config.password}@{config.account}/?warehouse={config.warehouse}&database={config.database}&schema={config.dbSchema}"
         )
 
-        self._connection = self._engine.connect()
-
-    @cache
-    def head(self, n: int = 5) -> pd.DataFrame:
+    def _sample(self, n: int) -> pd.DataFrame:
         """
-        Return the head of the data source that the connector is connected to.
-        This information is passed to the LLM to provide the schema of the data source.
+        Return a sample of the table using the fixed-size row sampling of
+        SnowFlake.
+
+        Args:
+            n (int): The number of rows of the head.
 
         Returns:
-            DataFrame: The head of the data source.
+            DataFrame: The sample.
         """
+        size = n * HEAD_SAMPLE_OVERSAMPLING
+        query = self._build_query(
+            limit=size, table=f"{self.cs_table_name} SAMPLE ({size} ROWS)"
+        )
+        sample = self._read_sql(query)
+        if len(sample) < n:
+            return super()._sample(n)
 
-        if self.logger:
-            self.logger.log(
-                f"Getting head of {self.config.table} "
-                f"using dialect {self.config.dialect}"
-            )
-
-        # Run a SQL query to get all the columns names and 5 random rows
-        query = self._build_query(limit=n, order="RANDOM()")
-
-        # Return the head of the data source
-        return pd.read_sql(query, self._connection)
+        return sample
 
     def __repr__(self):
         """
@@ -1,18 +1,54 @@
+import copy
+import hashlib
+import json
 import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional
 
+from pandasai.constants import QUERY_BUILDER_CACHE_SIZE, QUERY_BUILDER_SQL_CACHE_SIZE
 from pandasai.exceptions import InvalidSchemaJson
+from pandasai.helpers.metrics import record_cache_lookup
 
 MISSING_TABLE_NAME_MESSAGE = "All measures, dimensions, timeDimensions, order and filters must have the format Table_Name.Dimension or Table_Name.Measure"
 TABLE_NOT_FOUND_MESSAGE = "Table {0} Doesn't exist"
 
+SINGLE_VALUE_OPERATORS = {
+    "equals": "=",
+    "notEquals": "!=",
+    "contains": "LIKE",
+    "notContains": "NOT LIKE",
+    "startsWith": "LIKE",
+    "endsWith": "LIKE",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+    "beforeDate": "<",
+    "afterDate": ">",
+    "in": "IN",
+}
+
+MULTI_VALUE_OPERATORS = {"equals": "IN", "notEquals": "NOT IN"}
+
 
 class QueryBuilder:
     """
     Creates query from json structure
+
+    The schema is compiled once into indexes of the tables, of their members
+    and of their joins, so the lookups don't scan it. The generated SQL is
+    memoized by the normalized JSON query. The schema must not be changed
+    once the builder is created, `get_query_builder` compiles a copy of it.
     """
 
-    def __init__(self, schema):
+    def __init__(self, schema, sql_cache_size: int = QUERY_BUILDER_SQL_CACHE_SIZE):
         self.schema = schema
+        self._compile_schema()
+        self.sql_cache_size = sql_cache_size
+        self._sql_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._join_clauses = {}
+        self._lock = threading.Lock()
         self.supported_aggregations = {"sum", "count", "avg", "min", "max"}
         self.supported_granularities = {
             "year",
@@ -32,7 +68,83 @@ class QueryBuilder:
             "last year",
         }
 
+    def _compile_schema(self):
+        """
+        Index the tables by name, their dimensions and measures by qualified
+        name, the tables owning each member name and the joins of each table.
+        Like the scans they replace, the first match in schema order wins.
+        """
+        self._tables = {}
+        self._dimensions = {}
+        self._measures = {}
+        self._dimension_tables = {}
+        self._measure_tables = {}
+        self._member_tables = {}
+        self._join_graph = {}
+
+        for table in self.schema:
+            name = table["name"]
+            dimensions = table.get("dimensions", [])
+            measures = table.get("measures", [])
+
+            for dimension in dimensions:
+                self._dimension_tables.setdefault(dimension.get("name"), name)
+                self._member_tables.setdefault(dimension.get("name"), name)
+            for measure in measures:
+                self._measure_tables.setdefault(measure.get("name"), name)
+                self._member_tables.setdefault(measure.get("name"), name)
+
+            # Only the first table of a name is looked up
+            if name in self._tables:
+                continue
+            self._tables[name] = table
+
+            for dimension in dimensions:
+                self._dimensions.setdefault((name, dimension.get("name")), dimension)
+            for measure in measures:
+                self._measures.setdefault((name, measure.get("name")), measure)
+
+            joins = {}
+            for index, join in enumerate(table.get("joins") or []):
+                joins.setdefault(join["name"], (index, join))
+            self._join_graph[name] = joins
+
+    def _find_join(self, table_name: str, main_table: str) -> Optional[dict]:
+        """
+        Return the first join of the table either with the main table or
+        with itself.
+        """
+        joins = self._join_graph.get(table_name, {})
+        candidates = [joins[name] for name in (main_table, table_name) if name in joins]
+        return min(candidates, key=lambda item: item[0])[1] if candidates else None
+
     def generate_sql(self, query):
+        """
+        Generate the SQL of a JSON query, memoized by the normalized query.
+        """
+        try:
+            key = json.dumps(query, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return self._generate_sql(query)
+
+        with self._lock:
+            sql = self._sql_cache.get(key)
+            record_cache_lookup("semantic_sql", hit=sql is not None)
+            if sql is not None:
+                self._sql_cache.move_to_end(key)
+                return sql
+
+        sql = self._generate_sql(query)
+
+        if self.sql_cache_size > 0:
+            with self._lock:
+                self._sql_cache[key] = sql
+                while len(self._sql_cache) > self.sql_cache_size:
+                    self._sql_cache.popitem(last=False)
+
+        return sql
+
+    def _generate_sql(self, query):
         self._validate_query(query)
         measures = query.get("measures", [])
         dimensions = query.get("dimensions", [])
@@ -199,49 +311,25 @@ class QueryBuilder:
         """
         Find and add table name if not exists in Measure
         """
-        for table in self.schema:
-            for dimension in table["dimensions"]:
-                if dimension["name"] == filter_name:
-                    return table["name"]
-
-        return None
+        return self._dimension_tables.get(filter_name)
 
     def _find_table_name_in_measure_if_not_exists(self, measure_name: str):
         """
         Find and add table name if not exists in Measure
         """
-        for table in self.schema:
-            for measure in table["measures"]:
-                if measure["name"] == measure_name:
-                    return table["name"]
-
-        return None
+        return self._measure_tables.get(measure_name)
 
     def _find_table_name_in_dimension_if_not_exists(self, dimension_name: str):
         """
         Find and add table name if not exists in Measure
         """
-        for table in self.schema:
-            for dimension in table["dimensions"]:
-                if dimension["name"] == dimension_name:
-                    return table["name"]
-
-        return None
+        return self._dimension_tables.get(dimension_name)
 
     def _find_table_name_in_orders_if_not_exists(self, dimension_name: str):
         """
         Find and add table name if not exists in Measure
         """
-        for table in self.schema:
-            for dimension in table["dimensions"]:
-                if dimension["name"] == dimension_name:
-                    return table["name"]
-
-            for measure in table["measures"]:
-                if measure["name"] == dimension_name:
-                    return table["name"]
-
-        return None
+        return self._member_tables.get(dimension_name)
 
     def _generate_time_dimension_column(self, time_dimension):
         dimension = time_dimension["dimension"]
@@ -284,9 +372,7 @@ class QueryBuilder:
         main_table = (
             measures[0].split(".")[0] if measures else dimensions[0].split(".")[0]
         )
-        return next(
-            (table for table in self.schema if table["name"] == main_table), None
-        )
+        return self._tables.get(main_table)
 
     def _build_select_clause(self, columns):
         return "SELECT " + ", ".join(columns)
@@ -300,27 +386,27 @@ class QueryBuilder:
 
         for table_name in referenced_tables:
             if table_name != main_table:
-                table_entry = next(
-                    (table for table in self.schema if table["name"] == table_name),
-                    None,
-                )
-                if not table_entry:
-                    raise ValueError(f"Table '{table_name}' not found in schema.")
-                if "joins" in table_entry and (
-                    join := next(
-                        (
-                            j
-                            for j in table_entry["joins"]
-                            if j["name"] in {main_table, table_name}
-                        ),
-                        None,
-                    )
-                ):
-                    join_condition = self.resolve_template_literals(join["sql"])
-                    sql += f" {join['join_type'].upper()} JOIN `{table_entry['table']}` ON {join_condition}"
+                sql += self._build_join_clause(table_name, main_table)
 
         return sql
 
+    def _build_join_clause(self, table_name, main_table):
+        clause = self._join_clauses.get((table_name, main_table))
+        if clause is not None:
+            return clause
+
+        table_entry = self._tables.get(table_name)
+        if not table_entry:
+            raise ValueError(f"Table '{table_name}' not found in schema.")
+
+        clause = ""
+        if join := self._find_join(table_name, main_table):
+            join_condition = self.resolve_template_literals(join["sql"])
+            clause = f" {join['join_type'].upper()} JOIN `{table_entry['table']}` ON {join_condition}"
+
+        self._join_clauses[(table_name, main_table)] = clause
+        return clause
+
     def _build_where_clause(self, filters, time_dimensions):
         filter_statements = [
             self.process_filter(filter)
@@ -455,30 +541,12 @@ class QueryBuilder:
         operator = filter["operator"]
         values = filter["values"]
 
-        single_value_operators = {
-            "equals": "=",
-            "notEquals": "!=",
-            "contains": "LIKE",
-            "notContains": "NOT LIKE",
-            "startsWith": "LIKE",
-            "endsWith": "LIKE",
-            "gt": ">",
-            "gte": ">=",
-            "lt": "<",
-            "lte": "<=",
-            "beforeDate": "<",
-            "afterDate": ">",
-            "in": "IN",
-        }
-
-        multi_value_operators = {"equals": "IN", "notEquals": "NOT IN"}
-
         return self._build_query_condition(
             operator,
             table_column,
             values,
-            single_value_operators,
-            multi_value_operators,
+            SINGLE_VALUE_OPERATORS,
+            MULTI_VALUE_OPERATORS,
         )
 
     def _build_query_condition(
@@ -537,9 +605,7 @@ class QueryBuilder:
             new_table = self.find_table(table)
             if not new_table:
                 raise ValueError(f"Table '{table}' not found in schema.")
-            new_column = next(
-                (dim for dim in new_table["dimensions"] if dim["name"] == column), None
-            )
+            new_column = self._dimensions.get((table, column))
             if not new_column:
                 raise ValueError(f"Column '{column}' not found in schema.")
             return f"`{new_table['table']}`.`{new_column['sql']}`"
@@ -547,26 +613,54 @@ class QueryBuilder:
         return re.sub(r"\$\{([^}]+)\}", replace_column, template)
 
     def find_table(self, table_name):
-        return next((table for table in self.schema if table["name"] == table_name), {})
+        return self._tables.get(table_name, {})
 
     def find_dimension(self, dimension):
         table_name, dim_name = dimension.split(".")
-        table = self.find_table(table_name)
-        dim = next(
-            (dim for dim in table.get("dimensions", []) if dim.get("name") == dim_name),
-            {},
-        )
-        return dim
+        return self._dimensions.get((table_name, dim_name), {})
 
     def find_measure(self, measure):
         table_name, measure_name = measure.split(".")
-        table = self.find_table(table_name)
-        meas = next(
-            (
-                meas
-                for meas in table.get("measures", [])
-                if meas.get("name") == measure_name
-            ),
-            {},
-        )
-        return meas
+        return self._measures.get((table_name, measure_name), {})
+
+
+_query_builders: "OrderedDict[str, QueryBuilder]" = OrderedDict()
+_query_builders_lock = threading.Lock()
+
+
+def _schema_fingerprint(schema: List[dict]) -> str:
+    return hashlib.sha256(
+        json.dumps(schema, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def get_query_builder(schema: List[dict]) -> QueryBuilder:
+    """
+    Return the query builder of the schema, compiling it on first use. The
+    builders are shared by the queries on the same schema, e.g. the schema of
+    a SemanticAgent, and keyed by its content: a changed schema gets a new
+    builder, and so new memoized queries.
+
+    Args:
+        schema (List[dict]): semantic schema of the tables.
+
+    Returns:
+        QueryBuilder: the compiled query builder.
+    """
+    key = _schema_fingerprint(schema)
+    with _query_builders_lock:
+        query_builder = _query_builders.get(key)
+        if query_builder is not None:
+            _query_builders.move_to_end(key)
+            record_cache_lookup("semantic_schema", hit=True)
+            return query_builder
+
+    record_cache_lookup("semantic_schema", hit=False)
+    # Compiled from a copy, so the caller changing its schema doesn't change it
+    query_builder = QueryBuilder(copy.deepcopy(schema))
+    with _query_builders_lock:
+        _query_builders[key] = query_builder
+        while len(_query_builders) > QUERY_BUILDER_CACHE_SIZE:
+            _query_builders.popitem(last=False)
+
+    return query_builder
@@ -0,0 +1,367 @@
+"""
+Rollup manager
+
+Pre-aggregated rollup tables of the semantic queries. The manager counts how
+often each combination of measures, dimensions and time granularities is
+queried, materializes the hot ones in DuckDB, next to the tables of the
+dataframes, and answers the queries they cover by re-aggregating the rollup
+instead of the raw tables.
+
+A rollup is refreshed when the dataframes change, when it gets older than
+`max_age` or after `invalidate`.
+
+Example:
+    ```python
+    from pandasai.ee.helpers.rollup_manager import RollupManager
+
+    rollup_manager = RollupManager(schema, dfs)
+    rollup_manager.record(query, sql)
+    df = rollup_manager.execute(sql)
+    ```
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+import duckdb
+import pandas as pd
+import sqlglot
+
+from pandasai.connectors.pandas import PandasConnector
+from pandasai.constants import (
+    QUERY_BUILDER_SQL_CACHE_SIZE,
+    ROLLUP_HOT_THRESHOLD,
+    ROLLUP_MAX_AGE,
+    ROLLUP_MAX_TABLES,
+)
+from pandasai.ee.helpers.query_builder import (
+    MULTI_VALUE_OPERATORS,
+    SINGLE_VALUE_OPERATORS,
+    get_query_builder,
+)
+from pandasai.helpers.logger import Logger
+from pandasai.helpers.metrics import record_cache_lookup
+
+# Aggregation of the rollup rows for each type of measure. The other types,
+# e.g. the averages or the distinct counts, can't be re-aggregated exactly, so
+# their queries run on the raw tables.
+REAGGREGATIONS = {"sum": "SUM", "count": "SUM", "min": "MIN", "max": "MAX"}
+
+
+class RollupKey(NamedTuple):
+    """Combination of members that a rollup is grouped by"""
+
+    main_table: str
+    tables: FrozenSet[str]
+    measures: FrozenSet[str]
+    dimensions: FrozenSet[str]
+    time_dimensions: FrozenSet[Tuple[str, str]]
+
+    def covers(self, other: "RollupKey") -> bool:
+        # Joining other tables could change the rows that are aggregated
+        return (
+            self.main_table == other.main_table
+            and self.tables == other.tables
+            and other.measures <= self.measures
+            and other.dimensions <= self.dimensions
+            and other.time_dimensions <= self.time_dimensions
+        )
+
+
+class Rollup:
+    def __init__(self, key: RollupKey, table_name: str):
+        self.key = key
+        self.table_name = table_name
+        self.version = None
+        self.created_at = 0.0
+
+
+class RollupManager:
+    """Materializes and queries the rollups of the semantic queries
+
+    Args:
+        schema (List[dict]): semantic schema of the tables.
+        dfs (List[PandasConnector]): dataframes of the schema, queried with
+            DuckDB.
+        logger (Logger, optional): logger of the agent.
+        threshold (int): number of queries of a combination before it is
+            materialized.
+        max_rollups (int): maximum number of rollups kept, the least recently
+            used one being dropped.
+        max_age (float): seconds after which a rollup is refreshed.
+    """
+
+    def __init__(
+        self,
+        schema: List[dict],
+        dfs: List[PandasConnector],
+        logger: Optional[Logger] = None,
+        threshold: int = ROLLUP_HOT_THRESHOLD,
+        max_rollups: int = ROLLUP_MAX_TABLES,
+        max_age: float = ROLLUP_MAX_AGE,
+    ):
+        self.schema = schema
+        self.dfs = dfs
+        self.logger = logger
+        self.threshold = threshold
+        self.max_rollups = max_rollups
+        self.max_age = max_age
+        self._queries: "OrderedDict[str, dict]" = OrderedDict()
+        self._hits: Dict[RollupKey, int] = {}
+        self._rollups: "OrderedDict[RollupKey, Rollup]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def rollups(self) -> List[Rollup]:
+        return list(self._rollups.values())
+
+    def record(self, query: dict, sql: str) -> None:
+        """
+        Remember the semantic query of the generated SQL, so the rollups can
+        answer it when the SQL is executed.
+
+        Args:
+            query (dict): JSON query.
+            sql (str): SQL generated by the query builder.
+        """
+        sql = self._normalize(sql)
+        with self._lock:
+            self._queries[sql] = query
+            self._queries.move_to_end(sql)
+            while len(self._queries) > QUERY_BUILDER_SQL_CACHE_SIZE:
+                self._queries.popitem(last=False)
+
+    def execute(self, sql: str) -> pd.DataFrame:
+        """
+        Execute the SQL of a semantic query on a rollup covering it, the
+        query being materialized if it is hot, or on the raw tables.
+
+        Args:
+            sql (str): SQL generated by the query builder.
+
+        Returns:
+            pd.DataFrame: result of the query.
+        """
+        query = self._queries.get(self._normalize(sql))
+        key = self._get_key(query) if query is not None else None
+        if key is None:
+            return self.dfs[0].execute_direct_sql_query(sql)
+
+        rollup = self._get_rollup(key)
+        record_cache_lookup("rollup", hit=rollup is not None)
+        if rollup is not None:
+            try:
+                return self.dfs[0].execute_direct_sql_query(
+                    self._rewrite(query, rollup)
+                )
+            except Exception as e:
+                # The raw tables still answer the query
+                self._log(f"Rollup {rollup.table_name} failed: {e}")
+
+        return self.dfs[0].execute_direct_sql_query(sql)
+
+    def invalidate(self) -> None:
+        """Drop the rollups, e.g. after the dataframes were changed."""
+        with self._lock:
+            for rollup in self._rollups.values():
+                self._drop(rollup)
+            self._rollups.clear()
+            self._hits.clear()
+
+    @staticmethod
+    def _normalize(sql: str) -> str:
+        return " ".join(sql.rstrip().rstrip(";").split())
+
+    def _log(self, message: str) -> None:
+        if self.logger is not None:
+            self.logger.log(message)
+
+    def _get_key(self, query: dict) -> Optional[RollupKey]:
+        """
+        Return the members a rollup needs to answer the query, None if no
+        rollup can answer it.
+        """
+        query_builder = get_query_builder(self.schema)
+        measures = set(query.get("measures", []))
+        dimensions = set(query.get("dimensions", []))
+        time_dimensions = set()
+
+        for time_dimension in query.get("timeDimensions", []):
+            # The date ranges filter the raw timestamps
+            if "dateRange" in time_dimension:
+                return None
+            time_dimensions.add(
+                (time_dimension["dimension"], time_dimension.get("granularity", "day"))
+            )
+
+        for filter in query.get("filters", []):
+            if query_builder.find_dimension(filter["member"]):
+                dimensions.add(filter["member"])
+            elif query_builder.find_measure(filter["member"]):
+                measures.add(filter["member"])
+
+        for measure in measures:
+            measure_type = query_builder.find_measure(measure).get("type")
+            if measure_type not in REAGGREGATIONS:
+                return None
+
+        if not measures and not dimensions:
+            return None
+
+        main_table = next(iter(query.get("measures") or query["dimensions"]))
+        members = measures | dimensions | {dim for dim, _ in time_dimensions}
+        return RollupKey(
+            main_table=main_table.split(".")[0],
+            tables=frozenset(member.split(".")[0] for member in members),
+            measures=frozenset(measures),
+            dimensions=frozenset(dimensions),
+            time_dimensions=frozenset(time_dimensions),
+        )
+
+    def _get_rollup(self, key: RollupKey) -> Optional[Rollup]:
+        """
+        Return a fresh rollup covering the key, materializing the key if it
+        is hot.
+        """
+        with self._lock:
+            rollup = next(
+                (rollup for rollup in self._rollups.values() if rollup.key.covers(key)),
+                None,
+            )
+            if rollup is None:
+                self._hits[key] = self._hits.get(key, 0) + 1
+                if self._hits[key] < self.threshold:
+                    return None
+                rollup = Rollup(key, self._get_table_name(key))
+                self._rollups[key] = rollup
+
+            self._rollups.move_to_end(rollup.key)
+            if not self._is_fresh(rollup):
+                try:
+                    self._materialize(rollup)
+                except Exception as e:
+                    self._log(f"Rollup {rollup.table_name} not materialized: {e}")
+                    self._drop(rollup)
+                    del self._rollups[rollup.key]
+                    return None
+
+            while len(self._rollups) > self.max_rollups:
+                _, evicted = self._rollups.popitem(last=False)
+                self._drop(evicted)
+
+            return rollup
+
+    @staticmethod
+    def _get_table_name(key: RollupKey) -> str:
+        members = [sorted(field) for field in key[1:]]
+        hash_object = hashlib.sha256(repr(members).encode())
+        return f"rollup_{key.main_table}_{hash_object.hexdigest()[:12]}".lower()
+
+    def _get_version(self) -> tuple:
+        """Return the version of the dataframes, changed when one is replaced"""
+        return tuple((id(df.pandas_df), len(df.pandas_df)) for df in self.dfs)
+
+    def _is_fresh(self, rollup: Rollup) -> bool:
+        return (
+            rollup.version == self._get_version()
+            and time.time() - rollup.created_at < self.max_age
+        )
+
+    def _materialize(self, rollup: Rollup) -> None:
+        """Create or replace the rollup table in DuckDB"""
+        query_builder = get_query_builder(self.schema)
+        key = rollup.key
+        dimensions = sorted(key.dimensions)
+        time_dimensions = [
+            {"dimension": dimension, "granularity": granularity}
+            for dimension, granularity in sorted(key.time_dimensions)
+        ]
+
+        columns = query_builder._generate_columns(dimensions, time_dimensions, [])
+        for measure in sorted(key.measures):
+            table = query_builder.find_table(measure.split(".")[0])["table"]
+            measure_info = query_builder.find_measure(measure)
+            name = measure_info["name"]
+            sql_expr = f"`{table}`.`{measure_info.get('sql') or name}`"
+            columns.append(f"{measure_info['type'].upper()}({sql_expr}) AS `{name}`")
+
+        main_table_entry = query_builder.find_table(key.main_table)
+        sql = query_builder._build_select_clause(columns)
+        sql += query_builder._build_from_clause(main_table_entry)
+        sql += query_builder._build_joins_clause(main_table_entry, key.tables)
+        sql += query_builder._build_group_by_clause(dimensions, time_dimensions)
+
+        version = self._get_version()
+        sql = sqlglot.transpile(sql, read="mysql", write="duckdb")[0]
+        duckdb.execute(f'CREATE OR REPLACE TABLE "{rollup.table_name}" AS {sql}')
+
+        rollup.version = version
+        rollup.created_at = time.time()
+        self._log(f"Rollup {rollup.table_name} materialized: {sql}")
+
+    def _drop(self, rollup: Rollup) -> None:
+        try:
+            duckdb.execute(f'DROP TABLE IF EXISTS "{rollup.table_name}"')
+        except duckdb.Error as e:
+            self._log(f"Rollup {rollup.table_name} not dropped: {e}")
+
+    def _reaggregate(self, measure: str, rollup: Rollup) -> Tuple[str, str]:
+        """Return the name of the measure and its aggregation of the rollup"""
+        measure_info = get_query_builder(self.schema).find_measure(measure)
+        name = measure_info["name"]
+        column = f"`{rollup.table_name}`.`{name}`"
+        if measure_info["type"] == "count":
+            return name, f"CAST(SUM({column}) AS BIGINT)"
+        return name, f"{REAGGREGATIONS[measure_info['type']]}({column})"
+
+    def _rewrite(self, query: dict, rollup: Rollup) -> str:
+        """
+        Return the SQL of the query on the rollup, with the columns, the
+        filters and the order of the SQL on the raw tables.
+        """
+        query_builder = get_query_builder(self.schema)
+        table = f"`{rollup.table_name}`"
+        dimensions = query.get("dimensions", [])
+        time_dimensions = query.get("timeDimensions", [])
+
+        columns = []
+        for dimension in dict.fromkeys(dimensions):
+            name = query_builder.find_dimension(dimension)["name"]
+            columns.append(f"{table}.`{name}` AS {name}")
+        for measure in query.get("measures", []):
+            name, aggregation = self._reaggregate(measure, rollup)
+            columns.append(f"{aggregation} AS {name}")
+        for time_dimension in time_dimensions:
+            name = query_builder.find_dimension(time_dimension["dimension"])["name"]
+            alias = f"{name}_by_{time_dimension.get('granularity', 'day')}"
+            columns.append(f"{table}.`{alias}` AS {alias}")
+
+        where, having = [], []
+        for filter in query.get("filters", []):
+            if dimension := query_builder.find_dimension(filter["member"]):
+                column = f"{table}.`{dimension['name']}`"
+                statements = where
+            else:
+                _, column = self._reaggregate(filter["member"], rollup)
+                statements = having
+            statements.append(
+                query_builder._build_query_condition(
+                    filter["operator"],
+                    column,
+                    filter["values"],
+                    SINGLE_VALUE_OPERATORS,
+                    MULTI_VALUE_OPERATORS,
+                )
+            )
+
+        sql = query_builder._build_select_clause(list(dict.fromkeys(columns)))
+        sql += f" FROM {table}"
+        sql += f" WHERE {' AND '.join(where)}" if where else ""
+        sql += query_builder._build_group_by_clause(dimensions, time_dimensions)
+        sql += f" HAVING {' AND '.join(having)}" if having else ""
+        sql += query_builder._build_order_clause(query)
+        sql += query_builder._build_limit_clause(query)
+        return sql
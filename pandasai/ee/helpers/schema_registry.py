@@ -0,0 +1,118 @@
+"""
+Schema registry
+
+Semantic schemas generated by the LLM for the dataframes, by fingerprint of
+the dataframes, so a SemanticAgent created on the same dataframes looks the
+schema up instead of generating it again. Each generation of a fingerprint is
+a new version, the latest one being used.
+
+The registry of the process is set with `set_schema_registry`, e.g. by an
+application keeping the schemas in its database for all its workers.
+
+Example:
+    ```python
+    from pandasai.ee.helpers.schema_registry import (
+        InMemorySchemaRegistry,
+        set_schema_registry,
+    )
+
+    set_schema_registry(InMemorySchemaRegistry())
+    agent = SemanticAgent(dfs)  # generates the schema
+    agent = SemanticAgent(dfs)  # reuses it
+    ```
+"""
+
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+from pandasai.connectors.base import BaseConnector
+from pandasai.connectors.pandas import PandasConnector
+
+# Changes the fingerprints when the generated schemas change format
+SCHEMA_FORMAT_VERSION = 1
+
+
+def schema_fingerprint(dfs: List[BaseConnector]) -> str:
+    """
+    Return the fingerprint of the dataframes a schema is generated for: their
+    columns and, for the pandas dataframes, the types of the columns.
+
+    Args:
+        dfs (List[BaseConnector]): dataframes of the agent.
+
+    Returns:
+        str: sha256 of the dataframes.
+    """
+    hash_object = hashlib.sha256(f"v{SCHEMA_FORMAT_VERSION}".encode())
+    for df in dfs:
+        hash_object.update(b"\x00")
+        hash_object.update(f"{df.type}\x00{df.column_hash}".encode())
+        if isinstance(df, PandasConnector):
+            for name, dtype in df.pandas_df.dtypes.items():
+                hash_object.update(f"\x00{name}:{dtype}".encode())
+    return hash_object.hexdigest()
+
+
+class SchemaRegistry:
+    """Base class of the schema registries"""
+
+    def get(self, fingerprint: str) -> Optional[List[dict]]:
+        """
+        Return the latest schema of the fingerprint, None if none was
+        generated.
+
+        Args:
+            fingerprint (str): fingerprint of the dataframes.
+        """
+        raise NotImplementedError("get method must be implemented")
+
+    def set(self, fingerprint: str, schema: List[dict]) -> None:
+        """
+        Store a new version of the schema of the fingerprint.
+
+        Args:
+            fingerprint (str): fingerprint of the dataframes.
+            schema (List[dict]): generated schema.
+        """
+        raise NotImplementedError("set method must be implemented")
+
+
+class InMemorySchemaRegistry(SchemaRegistry):
+    """Schema registry of the process"""
+
+    def __init__(self):
+        self._schemas: Dict[str, List[dict]] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str) -> Optional[List[dict]]:
+        return self._schemas.get(fingerprint)
+
+    def set(self, fingerprint: str, schema: List[dict]) -> None:
+        with self._lock:
+            self._schemas[fingerprint] = schema
+            self._versions[fingerprint] = self._versions.get(fingerprint, 0) + 1
+
+    def get_version(self, fingerprint: str) -> int:
+        return self._versions.get(fingerprint, 0)
+
+
+_schema_registry: Optional[SchemaRegistry] = None
+
+
+def get_schema_registry() -> Optional[SchemaRegistry]:
+    """Return the schema registry of the process, if one is set"""
+    return _schema_registry
+
+
+def set_schema_registry(registry: Optional[SchemaRegistry]) -> None:
+    """
+    Set the schema registry used by the SemanticAgents which are not given
+    one.
+
+    Args:
+        registry (SchemaRegistry, optional): registry, None to not use one.
+    """
+    global _schema_registry
+    _schema_registry = registry
@@ -1,6 +1,7 @@
 import os
 import uuid
-from typing import Callable, Iterable, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple, Union
 
 import chromadb
 from chromadb import config
@@ -29,14 +30,20 @@ class ChromaDB(VectorStore):
         max_samples: int = 1,
         similary_threshold: int = 1.5,
         logger: Optional[Logger] = None,
+        in_memory: bool = False,
     ) -> None:
         self._logger = logger or Logger()
         self._max_samples = max_samples
         self._similarity_threshold = similary_threshold
 
         # Initialize Chromadb Client
+        # keep the data in memory only, e.g. for tests
+        if in_memory:
+            _client_settings = config.Settings(
+                is_persistent=False, anonymized_telemetry=False
+            )
         # initialize from client settings if exists
-        if client_settings:
+        elif client_settings:
             client_settings.persist_directory = (
                 persist_path or client_settings.persist_directory
             )
@@ -61,7 +68,10 @@ class ChromaDB(VectorStore):
         self._client = chromadb.Client(_client_settings)
         self._persist_directory = _client_settings.persist_directory
 
-        self._logger.log(f"Persisting Agent Training data in {self._persist_directory}")
+        if not in_memory:
+            self._logger.log(
+                f"Persisting Agent Training data in {self._persist_directory}"
+            )
 
         self._embedding_function = embedding_function or DEFAULT_EMBEDDING_FUNCTION
 
@@ -107,6 +117,7 @@ class ChromaDB(VectorStore):
             metadatas=metadatas,
             ids=ids,
         )
+        self._increment_version()
 
     def add_docs(
         self,
@@ -132,6 +143,7 @@ class ChromaDB(VectorStore):
             metadatas=metadatas,
             ids=ids,
         )
+        self._increment_version()
 
     def update_question_answer(
         self,
@@ -162,6 +174,7 @@ class ChromaDB(VectorStore):
             metadatas=metadatas,
             ids=ids,
         )
+        self._increment_version()
 
     def update_docs(
         self,
@@ -185,6 +198,7 @@ class ChromaDB(VectorStore):
             metadatas=metadatas,
             ids=ids,
         )
+        self._increment_version()
 
     def delete_question_and_answers(
         self, ids: Optional[List[str]] = None
@@ -199,6 +213,7 @@ class ChromaDB(VectorStore):
             False otherwise
         """
         self._qa_collection.delete(ids=ids)
+        self._increment_version()
         return True
 
     def delete_docs(self, ids: Optional[List[str]] = None) -> Optional[bool]:
@@ -212,6 +227,7 @@ class ChromaDB(VectorStore):
             False otherwise
         """
         self._docs_collection.delete(ids=ids)
+        self._increment_version()
         return True
 
     def get_relevant_question_answers(
@@ -248,6 +264,28 @@ class ChromaDB(VectorStore):
             relevant_data, self._similarity_threshold
         )
 
+    def get_relevant_documents(self, question: str) -> Tuple[List[str], List[str]]:
+        """
+        Returns relevant question answers documents and docs documents, embedding
+        the question once and querying both collections concurrently
+        """
+        embeddings = self._embedding_function([question])
+
+        def query(collection: chromadb.Collection) -> List[str]:
+            relevant_data: chromadb.QueryResult = collection.query(
+                query_embeddings=embeddings,
+                n_results=self._max_samples,
+                include=["metadatas", "documents", "distances"],
+            )
+            return self._filter_docs_based_on_distance(
+                relevant_data, self._similarity_threshold
+            )["documents"][0]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            qa_documents = executor.submit(query, self._qa_collection)
+            docs_documents = executor.submit(query, self._docs_collection)
+            return qa_documents.result(), docs_documents.result()
+
     def get_relevant_question_answers_by_id(self, ids: Iterable[str]) -> List[dict]:
         """
         Returns relevant question answers based on ids
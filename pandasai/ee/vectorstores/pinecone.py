@@ -1,5 +1,6 @@
 import uuid
-from typing import Callable, Iterable, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple, Union
 
 import pinecone
 
@@ -94,6 +95,7 @@ class Pinecone(VectorStore):
         ]
 
         self._index.upsert(vectors=vector_data, namespace="qa")
+        self._increment_version()
 
         return ids
 
@@ -133,6 +135,7 @@ class Pinecone(VectorStore):
         ]
 
         self._index.upsert(vectors=vector_data, namespace="docs")
+        self._increment_version()
 
         return ids
 
@@ -170,6 +173,7 @@ class Pinecone(VectorStore):
             self._index.update(
                 id=ids[index], values=qa, set_metadata=metadatas[index], namespace="qa"
             )
+        self._increment_version()
 
     def update_docs(
         self,
@@ -203,6 +207,7 @@ class Pinecone(VectorStore):
                 set_metadata=metadatas[index],
                 namespace="docs",
             )
+        self._increment_version()
 
     def delete_question_and_answers(
         self, ids: Optional[List[str]] = None
@@ -218,6 +223,7 @@ class Pinecone(VectorStore):
         """
 
         self._index.delete(ids=ids, namespace="qa")
+        self._increment_version()
         return True
 
     def delete_docs(self, ids: Optional[List[str]] = None) -> Optional[bool]:
@@ -231,6 +237,7 @@ class Pinecone(VectorStore):
             False otherwise
         """
         self._index.delete(ids=ids, namespace="docs")
+        self._increment_version()
         return True
 
     def get_relevant_question_answers(
@@ -271,6 +278,30 @@ class Pinecone(VectorStore):
 
         return self._filter_docs_based_on_distance(results, self._similarity_threshold)
 
+    def get_relevant_documents(self, question: str) -> Tuple[List[str], List[str]]:
+        """
+        Returns relevant question answers documents and docs documents, embedding
+        the question once and querying both namespaces concurrently
+        """
+        questions = self._embedding_function([question])
+
+        def query(namespace: str) -> List[str]:
+            results = self._index.query(
+                vector=questions,
+                top_k=self._max_samples,
+                include_metadata=True,
+                namespace=namespace,
+                include_values=True,
+            )
+            return self._filter_docs_based_on_distance(
+                results, self._similarity_threshold
+            )["documents"][0]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            qa_documents = executor.submit(query, "qa")
+            docs_documents = executor.submit(query, "docs")
+            return qa_documents.result(), docs_documents.result()
+
     def get_relevant_question_answers_by_id(self, ids: Iterable[str]) -> List[dict]:
         """
         Returns relevant question answers based on ids
@@ -117,12 +117,14 @@ class Qdrant(VectorStore):
         qa_str = [self._format_qa(query, code) for query, code in zip(queries, codes)]
 
         # If IDs are not provided(None), qdrant_client generates random UUIDs
-        return self._client.add(
+        added_ids = self._client.add(
             self._qa_collection_name,
             documents=qa_str,
             metadata=metadatas,
             ids=qdrant_ids,
         )
+        self._increment_version()
+        return added_ids
 
     def add_docs(
         self,
@@ -144,12 +146,14 @@ class Qdrant(VectorStore):
         qdrant_ids = self._convert_ids(ids) if ids else None
 
         # If IDs are not provided(None), qdrant_client generates random UUIDs
-        return self._client.add(
+        added_ids = self._client.add(
             self._docs_collection_name,
             documents=docs,
             metadata=metadatas,
             ids=qdrant_ids,
         )
+        self._increment_version()
+        return added_ids
 
     def update_question_answer(
         self,
@@ -184,12 +188,14 @@ class Qdrant(VectorStore):
         qa_str = [self._format_qa(query, code) for query, code in zip(queries, codes)]
 
         # Entries with same IDs will be overwritten. Essentially updating them.
-        return self._client.add(
+        added_ids = self._client.add(
             self._qa_collection_name,
             documents=qa_str,
             metadata=metadatas,
             ids=qdrant_ids,
         )
+        self._increment_version()
+        return added_ids
 
     def update_docs(
         self,
@@ -221,12 +227,14 @@ class Qdrant(VectorStore):
             return []
 
         # Entries with same IDs will be overwritten. Essentially updating them.
-        return self._client.add(
+        added_ids = self._client.add(
             self._docs_collection_name,
             documents=docs,
             metadata=metadatas,
             ids=qdrant_ids,
         )
+        self._increment_version()
+        return added_ids
 
     def delete_question_and_answers(
         self, ids: Optional[List[str]] = None
@@ -245,6 +253,7 @@ class Qdrant(VectorStore):
             response = self._client.delete(
                 self._qa_collection_name, points_selector=ids
             )
+            self._increment_version()
             return response.status == models.UpdateStatus.COMPLETED
 
     def delete_docs(self, ids: Optional[List[str]] = None) -> Optional[bool]:
@@ -262,11 +271,13 @@ class Qdrant(VectorStore):
             response = self._client.delete(
                 self._docs_collection_name, points_selector=ids
             )
+            self._increment_version()
             return response.status == models.UpdateStatus.COMPLETED
 
     def delete_collection(self, collection_name: str) -> Optional[bool]:
         self._client.delete_collection(f"{collection_name}-qa")
         self._client.delete_collection(f"{collection_name}-docs")
+        self._increment_version()
 
     def get_relevant_question_answers(self, question: str, k: int = 1) -> List[dict]:
         """
@@ -1,106 +1,328 @@
 """
-Helper class to anonymize a dataframe head by replacing the values of the columns
-that contain personal or sensitive information with random values.
+Helper class to anonymize a dataframe by replacing the values that contain
+personal or sensitive information with random values.
+
+The columns are classified over a sample of the dataframe: each kind of
+personal information is scored with the share of the sampled values containing
+it. The classification is cached per dataset fingerprint, so the samples of a
+dataset sent to the LLM are classified once. The personal information found in
+the values of the classified columns, whole values or embedded in text, is
+then masked with vectorized generators, which can be seeded for reproducible
+outputs.
+
+Example:
+    ```python
+    from pandasai.helpers.anonymizer import Anonymizer
+
+    anonymizer = Anonymizer(seed=42)
+    classification = anonymizer.classify_columns(df)
+    masked_df = anonymizer.anonymize_dataframe(df, classification)
+    ```
 """
 
-import random
-import re
+import hashlib
 import string
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+from pandas.util import hash_pandas_object
 
 import pandasai.pandas as pd
 
+from ..constants import PII_CACHE_SIZE, PII_SAMPLE_SIZE
+from .metrics import record_cache_lookup
 
-class Anonymizer:
-    @staticmethod
-    def _is_valid_email(email) -> bool:
-        """Check if the given email is valid based on regex pattern.
+# Patterns of the personal information, searched in the values, e.g. the phone
+# number of "call 555-123-4567". They are masked in this order, so the digits of
+# a credit card aren't taken for a phone number.
+PII_PATTERNS = {
+    "credit_card": r"(?<![\w+])\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}(?!\w)",
+    "phone_number": (
+        r"(?<![\w+(])(?:\+?\d{1,3}[- ]?)?\(?\d{3}\)?[- ]?\d{3}[- ]?\d{4}(?!\w)"
+    ),
+    "email": r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+}
 
-        Args:
-            email (str): email address to be checked.
+EMAIL_DOMAINS = [
+    "gmail.com",
+    "yahoo.com",
+    "hotmail.com",
+    "outlook.com",
+    "icloud.com",
+    "aol.com",
+    "protonmail.com",
+    "zoho.com",
+]
 
-        Returns (bool): True if the email is valid, otherwise False.
-        """
+# Rows of the dataframe hashed in its fingerprint
+FINGERPRINT_ROWS = 100
 
-        email_regex = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        return re.match(email_regex, email) is not None
+# Classification of the columns: the score of each kind of personal
+# information found in a column
+Classification = Dict[str, Dict[str, float]]
 
-    @staticmethod
-    def _is_valid_phone_number(phone_number) -> bool:
-        """Check if the given phone number is valid based on regex pattern.
 
-        Args:
-            phone_number (str): phone number to be checked.
+def _is_text_column(column: pd.Series) -> bool:
+    """Whether the values of the column can hold personal information."""
+    return (
+        pd.api.types.is_object_dtype(column)
+        or pd.api.types.is_string_dtype(column)
+        or pd.api.types.is_integer_dtype(column)
+        or isinstance(column.dtype, pd.CategoricalDtype)
+    ) and not pd.api.types.is_bool_dtype(column)
 
-        Returns (bool): True if the phone number is valid, otherwise False.
-        """
 
-        pattern = r"\b(?:\+?\d{1,3}[- ]?)?\(?\d{3}\)?[- ]?\d{3}[- ]?\d{4}\b"
-        return re.search(pattern, phone_number) is not None
+def _as_text(column: pd.Series) -> pd.Series:
+    """Return the values of the column as stripped strings, None if null."""
+    return column.astype(str).str.strip().where(column.notna())
 
-    @staticmethod
-    def _is_valid_credit_card(card_number) -> bool:
-        """Check if the given credit card number is valid based on regex pattern.
 
-        Args:
-            card_number (str): credit card number to be checked.
+def _match(values: pd.Series, kind: str) -> pd.Series:
+    """Return the mask of the values containing the personal information."""
+    return values.str.contains(PII_PATTERNS[kind]).fillna(False).astype(bool)
 
-        Returns (str): True if the credit card number is valid, otherwise False.
-        """
 
-        pattern = r"^\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}$"
-        return re.search(pattern, card_number) is not None
+class ClassificationCache:
+    """Thread-safe LRU cache of the classifications, by dataset fingerprint
 
-    @staticmethod
-    def _generate_random_email() -> str:
-        """Generates a random email address using predefined domains.
+    Args:
+        maxsize (int): maximum number of classifications kept in the cache.
+    """
 
-        Returns (str): generated random email address.
-        """
+    def __init__(self, maxsize: int = PII_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Classification]" = OrderedDict()
+        self._lock = threading.Lock()
 
-        domains = [
-            "gmail.com",
-            "yahoo.com",
-            "hotmail.com",
-            "outlook.com",
-            "icloud.com",
-            "aol.com",
-            "protonmail.com",
-            "zoho.com",
-        ]
-        name_length = random.randint(6, 12)
-        domain = random.choice(domains)
-        letters = string.ascii_lowercase + string.digits + "-_"
-        username = "".join(random.choice(letters) for _ in range(name_length))
-        return f"{username}@{domain}"
+    def get(self, fingerprint: str) -> Optional[Classification]:
+        with self._lock:
+            classification = self._entries.get(fingerprint)
+            record_cache_lookup("pii", hit=classification is not None)
+            if classification is not None:
+                self._entries.move_to_end(fingerprint)
+            return classification
+
+    def set(self, fingerprint: str, classification: Classification) -> None:
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[fingerprint] = classification
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+classification_cache = ClassificationCache()
+
+
+class Anonymizer:
+    """Anonymizer of the personal information of dataframes
+
+    Args:
+        seed (int, optional): seed of the generated values.
+        sample_size (int, optional): number of rows sampled to classify the
+            columns.
+    """
+
+    def __init__(self, seed: Optional[int] = None, sample_size: int = PII_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self._rng = np.random.default_rng(seed)
 
     @staticmethod
-    def _generate_random_phone_number(original: str) -> str:
-        """Generate a random phone number with country code if originally present.
+    def dataset_fingerprint(df: pd.DataFrame) -> str:
+        """
+        Return the fingerprint of a dataframe: its columns, their types, its
+        number of rows and the values of its first rows.
 
         Args:
-            original (str): original phone number field.
+            df (pd.DataFrame): Dataframe to fingerprint.
 
-        Returns (str): generated random phone number.
+        Returns:
+            str: sha256 of the dataframe.
+        """
+        hash_object = hashlib.sha256()
+        for name, dtype in df.dtypes.items():
+            hash_object.update(f"{name}\x00{dtype}\x00".encode())
+        hash_object.update(str(len(df)).encode())
+        head = df.head(FINGERPRINT_ROWS)
+        try:
+            row_hashes = hash_pandas_object(head, index=False)
+            hash_object.update(row_hashes.to_numpy().tobytes())
+        except (TypeError, ValueError):
+            # Unhashable values, e.g. lists
+            hash_object.update(head.to_csv(index=False).encode())
+        return hash_object.hexdigest()
+
+    def classify_columns(
+        self, df: pd.DataFrame, fingerprint: Optional[str] = None
+    ) -> Classification:
         """
+        Score each column with the share of the sampled values matching each
+        kind of personal information, keeping the kinds found in the column.
 
-        country_code = original.split()[0] if original.startswith("+") else ""
-        number = "".join(random.choices("0123456789", k=10))
+        Args:
+            df (pd.DataFrame): Dataframe to classify.
+            fingerprint (str, optional): Fingerprint of the dataset, computed
+                with `dataset_fingerprint` if not given.
 
-        return f"{country_code} {number}" if country_code else number
+        Returns:
+            Classification: Scores of the kinds found, by column.
+        """
+        if fingerprint is None:
+            fingerprint = self.dataset_fingerprint(df)
+        classification = classification_cache.get(fingerprint)
+        if classification is not None:
+            return classification
+
+        sample = df
+        if len(df) > self.sample_size:
+            # Random positions rather than `df.sample`, which shuffles the
+            # whole index; the same seed keeps the classification stable
+            positions = np.random.default_rng(0).integers(
+                0, len(df), self.sample_size
+            )
+            sample = df.iloc[positions]
+
+        classification = {}
+        for col in sample.columns:
+            column = sample[col]
+            if isinstance(column, pd.DataFrame) or not _is_text_column(column):
+                continue
+
+            non_null = column.notna().sum()
+            if non_null == 0:
+                continue
+
+            values = _as_text(column)
+            scores = {
+                kind: _match(values, kind).sum() / non_null for kind in PII_PATTERNS
+            }
+            scores = {kind: float(score) for kind, score in scores.items() if score}
+            if scores:
+                classification[col] = scores
+
+        classification_cache.set(fingerprint, classification)
+        return classification
+
+    def anonymize_dataframe(
+        self, df: pd.DataFrame, classification: Optional[Classification] = None
+    ) -> pd.DataFrame:
+        """
+        Anonymize a dataframe by replacing the personal or sensitive
+        information found in the values of the classified columns with random
+        values, e.g. "call 555-123-4567" becomes "call 8015937264". The other
+        values are kept as they are.
 
-    @staticmethod
-    def _generate_random_credit_card() -> str:
-        """Generate a random credit card number.
+        Args:
+            df (pd.DataFrame): Dataframe to anonymize.
+            classification (Classification, optional): Classification of the
+                columns, computed with `classify_columns` if not given.
 
-        Returns (str): generated random credit card number.
+        Returns:
+            pd.DataFrame: Anonymized copy of the dataframe.
         """
+        if len(df) == 0:
+            return df
 
-        groups = []
-        for _i in range(4):
-            group = "".join(random.choices("0123456789", k=4))
-            groups.append(group)
-        separator = random.choice(["-", " "])
-        return separator.join(groups)
+        if classification is None:
+            classification = self.classify_columns(df)
+
+        df = df.copy()
+        for col, scores in classification.items():
+            if col not in df.columns:
+                continue
+
+            column = df[col]
+            values = _as_text(column)
+            masked = None
+            for kind in scores:
+                mask = _match(values, kind)
+                if not mask.any():
+                    continue
+
+                if masked is None:
+                    masked = column.astype(object)
+                replaced = self._mask(kind, values[mask]).to_numpy()
+                values = values.copy()
+                values[mask] = replaced
+                masked[mask] = replaced
+
+            if masked is not None:
+                df[col] = masked
+
+        return df
+
+    def _mask(self, kind: str, values: pd.Series) -> pd.Series:
+        """Replace each match of the kind in the values with a random value."""
+        pattern = PII_PATTERNS[kind]
+        originals = values.str.findall(pattern).explode().reset_index(drop=True)
+        generated = iter(self._generate(kind, originals))
+        return values.str.replace(pattern, lambda _: next(generated), regex=True)
+
+    def _generate(self, kind: str, originals: pd.Series) -> np.ndarray:
+        """Generate a random value of the kind for each original value."""
+        if kind == "email":
+            return self._generate_emails(len(originals))
+        if kind == "phone_number":
+            return self._generate_phone_numbers(originals)
+        return self._generate_credit_cards(len(originals))
+
+    def _random_strings(
+        self, n: int, alphabet: str, length: int, min_length: Optional[int] = None
+    ) -> np.ndarray:
+        """Generate n random strings of min_length to length characters."""
+        chars = np.array(list(alphabet), dtype="<U1")
+        codes = self._rng.integers(0, len(chars), size=(n, length))
+        chars = chars[codes]
+        if min_length is not None:
+            lengths = self._rng.integers(min_length, length + 1, size=(n, 1))
+            # Trailing empty characters are dropped from the strings
+            chars[np.arange(length) >= lengths] = ""
+        # The characters of each row are contiguous, so they read as a string
+        return chars.view(f"<U{length}").ravel()
+
+    def _generate_emails(self, n: int) -> np.ndarray:
+        """Generate n random email addresses using predefined domains."""
+        letters = string.ascii_lowercase + string.digits + "-_"
+        usernames = self._random_strings(n, letters, 12, min_length=6)
+        domains = self._rng.choice(EMAIL_DOMAINS, n)
+        return (
+            pd.Series(usernames, dtype=object) + "@" + pd.Series(domains, dtype=object)
+        ).to_numpy()
+
+    def _generate_phone_numbers(self, originals: pd.Series) -> np.ndarray:
+        """Generate random phone numbers with the country code if originally
+        present."""
+        numbers = pd.Series(
+            self._random_strings(len(originals), string.digits, 10),
+            index=originals.index,
+            dtype=object,
+        )
+        country_codes = originals.str.extract(r"^(\+\d{1,3})[- ]", expand=False)
+        has_country_code = country_codes.notna()
+        numbers[has_country_code] = (
+            country_codes[has_country_code] + " " + numbers[has_country_code]
+        )
+        return numbers.to_numpy()
+
+    def _generate_credit_cards(self, n: int) -> np.ndarray:
+        """Generate n random credit card numbers."""
+        groups = self._random_strings(n, string.digits, 16).view("<U4").reshape(n, 4)
+        separators = pd.Series(self._rng.choice(["-", " "], n), dtype=object)
+        numbers = pd.Series(groups[:, 0], dtype=object)
+        for i in range(1, 4):
+            numbers = numbers + separators + pd.Series(groups[:, i], dtype=object)
+        return numbers.to_numpy()
 
     # static method to anonymize a dataframe head
     @staticmethod
@@ -119,23 +341,4 @@ class Anonymizer:
         if len(df) == 0:
             return df
 
-        # create a copy of the dataframe head
-        df_head = df.head().copy()
-
-        # for each column, check if it contains personal or sensitive information
-        # and if so, replace the values with random values
-        for col in df_head.columns:
-            if Anonymizer._is_valid_email(str(df_head[col].iloc[0])):
-                df_head[col] = df_head[col].apply(
-                    lambda x: Anonymizer._generate_random_email()
-                )
-            elif Anonymizer._is_valid_phone_number(str(df_head[col].iloc[0])):
-                df_head[col] = df_head[col].apply(
-                    lambda x: Anonymizer._generate_random_phone_number(str(x))
-                )
-            elif Anonymizer._is_valid_credit_card(str(df_head[col].iloc[0])):
-                df_head[col] = df_head[col].apply(
-                    lambda x: Anonymizer._generate_random_credit_card()
-                )
-
-        return df_head
+        return Anonymizer().anonymize_dataframe(df.head())
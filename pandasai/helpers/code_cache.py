@@ -0,0 +1,144 @@
+"""
+Code cache
+
+In-memory, bounded LRU cache that maps the raw code generated by the LLM to the
+result of the code cleaning stage (cleaned source, compiled code object and
+the list of dataframes required to run it). It is shared by every agent in the
+process, so the same generated code doesn't go through the malicious keywords
+scan, the AST rewriting and the `astor` regeneration more than once.
+
+Example:
+    ```python
+    from pandasai.helpers.code_cache import code_cache
+
+    entry = code_cache.get(key)
+    if entry is None:
+        entry = CleanedCode(code=clean(raw_code))
+        code_cache.set(key, entry)
+    ```
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional
+
+from ..constants import CODE_CACHE_SIZE
+from .metrics import record_cache_lookup
+
+
+class CleanedCode:
+    """Result of the code cleaning stage for a given raw code"""
+
+    def __init__(
+        self,
+        code: str,
+        current_code_executed: str = None,
+        additional_dependencies: List[dict] = None,
+        used_skills: List[str] = None,
+    ):
+        """
+        Args:
+            code (str): Cleaned code, ready to be executed
+            current_code_executed (str): Code before the AST cleaning
+            additional_dependencies (List[dict]): Whitelisted imports of the code
+            used_skills (List[str]): Skills called by the code
+        """
+        self.code = code
+        self.current_code_executed = current_code_executed
+        self.additional_dependencies = additional_dependencies or []
+        self.used_skills = used_skills or []
+        self.required_dfs: Optional[List[int]] = None
+        self._compiled = None
+
+    @property
+    def compiled(self) -> Any:
+        """Return the compiled code object, compiling it on first access"""
+        if self._compiled is None:
+            self._compiled = compile(self.code, "<string>", "exec")
+        return self._compiled
+
+
+class CodeCache:
+    """Thread-safe LRU cache of cleaned code
+
+    Args:
+        maxsize (int): maximum number of entries kept in the cache.
+    """
+
+    def __init__(self, maxsize: int = CODE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, CleanedCode]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_cache_key(code: str, knobs: Iterable[Any]) -> str:
+        """
+        Return the cache key for the raw code and the settings that affect
+        the cleaning.
+
+        Args:
+            code (str): raw code returned by the LLM or the cache.
+            knobs (Iterable[Any]): settings that change the cleaned code.
+
+        Returns:
+            str: the cache key.
+        """
+        hash_object = hashlib.sha256(code.encode())
+        for knob in knobs:
+            hash_object.update(b"\x00")
+            hash_object.update(str(knob).encode())
+        return hash_object.hexdigest()
+
+    def get(self, key: str) -> Optional[CleanedCode]:
+        """Get an entry from the cache, marking it as recently used.
+
+        Args:
+            key (str): key of the entry.
+
+        Returns:
+            CleanedCode: the cached entry or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                record_cache_lookup("code", hit=False)
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            record_cache_lookup("code", hit=True)
+            return entry
+
+    def set(self, key: str, entry: CleanedCode) -> None:
+        """Store an entry in the cache, evicting the least recently used one
+        if the cache is full.
+
+        Args:
+            key (str): key of the entry.
+            entry (CleanedCode): entry to store.
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all the entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+code_cache = CodeCache()
@@ -41,11 +41,78 @@ class DataSampler:
                 col_sample = self._sample_column(col, n)
                 sampled_df[col] = col_sample
 
-        # anonymize the sampled dataframe head
-        sampled_df = Anonymizer.anonymize_dataframe_head(sampled_df)
+        # anonymize the sampled dataframe head, the columns being classified
+        # over the whole dataframe
+        anonymizer = Anonymizer()
+        classification = anonymizer.classify_columns(self.df)
+        sampled_df = anonymizer.anonymize_dataframe(sampled_df.head(), classification)
 
         return sampled_df
 
+    def stratified_sample(self, n: int = 5, seed: int = None) -> pd.DataFrame:
+        """Select n rows of the dataframe so that the most frequent values of
+        the categorical columns are represented, filling the remaining rows
+        randomly. Unlike `sample`, the rows are kept as they are.
+
+        Args:
+            n (int, optional): Number of rows to select. Defaults to 5.
+            seed (int, optional): Seed of the random selection.
+
+        Returns:
+            pd.DataFrame: Selected rows.
+        """
+        df = self.df.reset_index(drop=True)
+        if len(df) <= n:
+            return df
+
+        rng = random.Random(seed)
+        columns = [col for col in df.columns if self._is_categorical(df[col])]
+        ranked_values = [df[col].value_counts().index.tolist() for col in columns]
+        covered_values = [set() for _ in columns]
+        selected = []
+
+        # Pick a row for each column's most frequent value, then for the
+        # second most frequent one, and so on
+        rank = 0
+        while len(selected) < n and any(rank < len(v) for v in ranked_values):
+            for i, col in enumerate(columns):
+                if len(selected) >= n:
+                    break
+                if rank >= len(ranked_values[i]):
+                    continue
+
+                value = ranked_values[i][rank]
+                if value in covered_values[i]:
+                    continue
+
+                candidates = [
+                    idx for idx in df.index[df[col] == value] if idx not in selected
+                ]
+                if not candidates:
+                    continue
+
+                idx = rng.choice(candidates)
+                selected.append(idx)
+                for j, other in enumerate(columns):
+                    covered_values[j].add(df.at[idx, other])
+            rank += 1
+
+        remaining = [idx for idx in df.index if idx not in selected]
+        selected.extend(rng.sample(remaining, n - len(selected)))
+
+        return df.loc[sorted(selected)].reset_index(drop=True)
+
+    @staticmethod
+    def _is_categorical(column: pd.Series) -> bool:
+        """Whether the column holds labels repeated across rows."""
+        if not (
+            pd.api.types.is_object_dtype(column)
+            or pd.api.types.is_bool_dtype(column)
+            or isinstance(column.dtype, pd.CategoricalDtype)
+        ):
+            return False
+        return column.nunique() <= len(column) // 2
+
     def _sample_column(self, col: str, n: int) -> list:
         """Sample a column.
 
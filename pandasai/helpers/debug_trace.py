@@ -0,0 +1,211 @@
+"""
+Debug tracing
+
+Named trace points for debugging the pipelines, e.g. the dataframes loaded, the
+code executed or the results. The trace points are disabled by default and
+cost a single check then, their messages being formatted only when they are
+emitted. They are enabled by name, with shell-style patterns, through the
+`PANDASAI_TRACE` environment variable or `debug_tracer.configure`.
+
+The emitted traces are logged with the `pandasai.trace` logger and can be
+captured as steps of the query exec tracker.
+
+Example:
+    ```python
+    from pandasai.helpers.debug_trace import debug_tracer, trace
+
+    debug_tracer.configure("code_execution.*", sample_rate=0.1)
+    trace("code_execution.result", "Execution result: %s", result)
+    ```
+
+Environment variables:
+    PANDASAI_TRACE: comma separated patterns of the trace points to enable.
+    PANDASAI_TRACE_LEVEL: minimum level of the emitted traces, e.g. DEBUG.
+    PANDASAI_TRACE_SAMPLE_RATE: fraction of the pipeline runs traced.
+    PANDASAI_TRACE_CAPTURE: set to 1 to add the traces to the query tracker.
+"""
+
+import fnmatch
+import logging
+import os
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Union
+
+_sampled: ContextVar[Optional[bool]] = ContextVar("debug_trace_sampled", default=None)
+_tracker: ContextVar[Optional[Any]] = ContextVar("debug_trace_tracker", default=None)
+
+
+def _parse_level(level: str) -> int:
+    """
+    Return the logging level of a name, e.g. "debug", or of a number
+
+    Raises:
+        ValueError: if the name is not a logging level.
+    """
+    level = level.strip().upper()
+    if level.lstrip("-").isdigit():
+        return int(level)
+
+    levels = logging.getLevelNamesMapping()
+    if level not in levels:
+        raise ValueError(
+            f"Invalid trace level {level!r}, expected a number or one of "
+            + ", ".join(levels)
+        )
+    return levels[level]
+
+
+class DebugTracer:
+    """Registry of the enabled trace points
+
+    Args:
+        patterns (str | List[str], optional): patterns of the trace points to
+            enable, none are enabled by default.
+        level (int): minimum level of the emitted traces.
+        sample_rate (float): fraction of the pipeline runs traced.
+        capture (bool): whether to add the traces to the query tracker.
+    """
+
+    def __init__(
+        self,
+        patterns: Union[str, List[str], None] = None,
+        level: int = logging.DEBUG,
+        sample_rate: float = 1.0,
+        capture: bool = False,
+    ):
+        self._logger = logging.getLogger("pandasai.trace")
+        self.configure(patterns, level, sample_rate, capture)
+
+    @classmethod
+    def from_env(cls) -> "DebugTracer":
+        """Return a tracer configured from the environment variables"""
+        try:
+            level = _parse_level(os.getenv("PANDASAI_TRACE_LEVEL", "DEBUG"))
+        except ValueError as e:
+            # The default tracer is created on import, which must not fail
+            logging.getLogger("pandasai.trace").warning("%s, using DEBUG", e)
+            level = logging.DEBUG
+
+        return cls(
+            patterns=os.getenv("PANDASAI_TRACE"),
+            level=level,
+            sample_rate=float(os.getenv("PANDASAI_TRACE_SAMPLE_RATE", "1")),
+            capture=os.getenv("PANDASAI_TRACE_CAPTURE", "0") == "1",
+        )
+
+    def configure(
+        self,
+        patterns: Union[str, List[str], None] = "*",
+        level: Union[int, str] = logging.DEBUG,
+        sample_rate: float = 1.0,
+        capture: bool = False,
+    ) -> None:
+        """
+        Enable the trace points matching the patterns, or disable all of them
+        if there is none.
+
+        Args:
+            patterns (str | List[str], optional): comma separated or list of
+                shell-style patterns of the trace point names.
+            level (int | str): minimum level of the emitted traces, or its
+                name, e.g. "DEBUG".
+            sample_rate (float): fraction of the pipeline runs traced.
+            capture (bool): whether to add the traces to the query tracker.
+
+        Raises:
+            ValueError: if the level is not a logging level.
+        """
+        if isinstance(level, str):
+            level = _parse_level(level)
+
+        if isinstance(patterns, str):
+            patterns = [pattern.strip() for pattern in patterns.split(",")]
+
+        self._patterns = [pattern for pattern in patterns or [] if pattern]
+        self.level = level
+        self.sample_rate = sample_rate
+        self.capture_enabled = capture
+        self._enabled_points: Dict[str, bool] = {}
+        self.enabled = bool(self._patterns)
+
+        # Make sure the emitted traces are written
+        if self.enabled and self._logger.getEffectiveLevel() > level:
+            self._logger.setLevel(level)
+
+    def is_enabled(self, name: str, level: int = logging.DEBUG) -> bool:
+        """
+        Return whether the trace point is enabled for the current run
+
+        Args:
+            name (str): name of the trace point.
+            level (int): level of the trace.
+        """
+        if not self.enabled or level < self.level:
+            return False
+
+        enabled = self._enabled_points.get(name)
+        if enabled is None:
+            enabled = any(fnmatch.fnmatchcase(name, p) for p in self._patterns)
+            self._enabled_points[name] = enabled
+
+        return enabled and self._is_sampled()
+
+    def _is_sampled(self) -> bool:
+        sampled = _sampled.get()
+        if sampled is None:
+            return random.random() < self.sample_rate
+        return sampled
+
+    def start_run(self, tracker: Optional[Any] = None) -> None:
+        """
+        Start a pipeline run, sampled as a whole, whose traces are added to the
+        steps of the query tracker when the capture is enabled. The run lasts
+        until the next one is started in the same context.
+
+        Args:
+            tracker (QueryExecTracker, optional): tracker of the run.
+        """
+        if not self.enabled:
+            return
+
+        _sampled.set(random.random() < self.sample_rate)
+        _tracker.set(tracker if self.capture_enabled else None)
+
+    def trace(
+        self, name: str, message: str, *args: Any, level: int = logging.DEBUG
+    ) -> None:
+        """
+        Emit a trace, if its trace point is enabled
+
+        Args:
+            name (str): name of the trace point, e.g. "code_execution.result".
+            message (str): message, formatted with `args` when emitted.
+            *args: arguments of the message.
+            level (int): level of the trace.
+        """
+        if not self.enabled or not self.is_enabled(name, level):
+            return
+
+        self._logger.log(level, f"[{name}] {message}", *args)
+
+        tracker = _tracker.get()
+        if tracker is not None:
+            tracker.add_step(
+                {
+                    "type": "Trace",
+                    "name": name,
+                    "message": message % args if args else message,
+                    "time": time.time(),
+                }
+            )
+
+
+debug_tracer = DebugTracer.from_env()
+
+
+def trace(name: str, message: str, *args: Any, level: int = logging.DEBUG) -> None:
+    """Emit a trace with the default tracer, see `DebugTracer.trace`"""
+    if debug_tracer.enabled:
+        debug_tracer.trace(name, message, *args, level=level)
@@ -3,6 +3,12 @@ Logger class
 
 This class is used to log messages to the console and/or a file.
 
+The messages are formatted once, when they are logged, and the debug messages
+only when debug logging is enabled, so large debug values such as prompts and
+code should be passed as arguments instead of being formatted in the message.
+The records are written by a background thread, and the formatted logs of a
+logger are kept in a bounded buffer.
+
 Example:
     ```python
     from pandasai.helpers.logger import Logger
@@ -11,22 +17,69 @@ Example:
     logger.log("Hello, world!")
     # 2021-08-01 12:00:00 [INFO] Hello, world!
 
+    logger.log("Using prompt: %s", logging.INFO, prompt)
+
     logger.logs
     #["Hello, world!"]
     ```
 """
 
-import inspect
+import atexit
 import logging
+import queue
 import sys
+import threading
 import time
-from typing import List
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Deque, List, Optional, Tuple
 
 from pandasai.helpers.telemetry import scarf_analytics
 from pandasai.pydantic import BaseModel
 
+from ..constants import LOGGER_MAX_LOGS
 from .path import find_closest
 
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def configure_handlers(handlers: List[logging.Handler]) -> None:
+    """
+    Configure the root logger, like `logging.basicConfig`, with the handlers
+    running on a background thread, so writing the logs to a file or the
+    console doesn't block the callers.
+
+    Args:
+        handlers (List[logging.Handler]): handlers writing the records.
+    """
+    global _listener
+
+    with _listener_lock:
+        root = logging.getLogger()
+        if root.handlers:
+            return
+
+        root.setLevel(logging.INFO)
+        if not handlers:
+            return
+
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        # Formats the message on the caller thread, the arguments of the
+        # records of any logger can be changed once logged
+        root.addHandler(QueueHandler(log_queue))
+
 
 class Log(BaseModel):
     """Log class"""
@@ -38,14 +91,19 @@ class Log(BaseModel):
 class Logger:
     """Logger class"""
 
-    _logs: List[Log]
+    _logs: Deque[Tuple[str, int, float, Optional[str]]]
     _logger: logging.Logger
     _verbose: bool
     _last_time: float
 
-    def __init__(self, save_logs: bool = True, verbose: bool = False):
+    def __init__(
+        self,
+        save_logs: bool = True,
+        verbose: bool = False,
+        max_logs: int = LOGGER_MAX_LOGS,
+    ):
         """Initialize the logger"""
-        self._logs = []
+        self._logs = deque(maxlen=max_logs)
         self._verbose = verbose
         self._last_time = time.time()
 
@@ -61,59 +119,83 @@ class Logger:
         if verbose:
             handlers.append(logging.StreamHandler(sys.stdout))
 
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s [%(levelname)s] %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-            handlers=handlers,
-        )
+        configure_handlers(handlers)
         self._logger = logging.getLogger(__name__)
 
-    def log(self, message: str, level: int = logging.INFO):
-        """Log a message"""
-
-        if level == logging.INFO:
-            self._logger.info(message)
-        elif level == logging.WARNING:
-            self._logger.warning(message)
-        elif level == logging.ERROR:
-            self._logger.error(message)
-        elif level == logging.CRITICAL:
-            self._logger.critical(message)
+    def log(
+        self,
+        message: str,
+        level: int = logging.INFO,
+        *args: Any,
+        source: Optional[str] = None,
+    ):
+        """
+        Log a message
+
+        Args:
+            message (str): message, formatted with `args` unless it is a
+                debug message and debug logging is disabled.
+            level (int): level of the message.
+            *args: arguments of the message.
+            source (str, optional): component logging the message, defaults
+                to the class of the caller.
+        """
+        # The logs of the agent keep the info messages and above, the debug
+        # messages are only formatted and kept when debug logging is enabled
+        if level < logging.INFO and not self._logger.isEnabledFor(level):
+            return
+
+        # Formatted once, so the logs don't keep the arguments alive nor
+        # change with them
+        message = message % args if args else message
+        if level in (logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL):
+            self._logger.log(level, message)
 
         self._logs.append(
-            {
-                "msg": message,
-                "level": logging.getLevelName(level),
-                "time": self._calculate_time_diff(),
-                "source": self._invoked_from(),
-            }
+            (
+                message,
+                level,
+                self._calculate_time_diff(),
+                source or self._invoked_from(),
+            )
         )
 
-    def _invoked_from(self, level: int = 5) -> str:
-        """Return the name of the class that invoked the logger"""
-        calling_class = None
-        for frame_info in inspect.stack()[1:]:
-            frame_locals = frame_info[0].f_locals
-            calling_instance = frame_locals.get("self")
-            if calling_instance and calling_instance.__class__ != self.__class__:
-                calling_class = calling_instance.__class__.__name__
-                break
+    def _invoked_from(self, level: int = 2) -> Optional[str]:
+        """
+        Return the name of the class that invoked the logger, looking at the
+        closest frames only
+        """
+        # Skip the frames of `_invoked_from` and `log`
+        frame = sys._getframe(2)
+        while frame is not None and level > 0:
+            calling_instance = frame.f_locals.get("self")
+            if calling_instance is not None and not isinstance(
+                calling_instance, Logger
+            ):
+                return calling_instance.__class__.__name__
+            frame = frame.f_back
             level -= 1
-            if level <= 0:
-                break
-        return calling_class
+        return None
 
     def _calculate_time_diff(self):
         """Calculate the time difference since the last log"""
-        time_diff = time.time() - self._last_time
-        self._last_time = time.time()
+        now = time.time()
+        time_diff = now - self._last_time
+        self._last_time = now
         return time_diff
 
     @property
-    def logs(self) -> List[str]:
+    def logs(self) -> List[dict]:
         """Return the logs"""
-        return self._logs
+        return [
+            {
+                "msg": message,
+                "level": logging.getLevelName(level),
+                "time": time_diff,
+                "source": source,
+            }
+            for message, level, time_diff, source in self._logs
+        ]
 
     @property
     def verbose(self) -> bool:
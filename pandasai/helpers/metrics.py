@@ -0,0 +1,115 @@
+"""
+Metrics
+
+Prometheus metrics of the pipelines, e.g. the duration of the steps and of the
+LLM calls or the hit ratio of the caches, registered in the default registry
+to be exposed by the application.
+
+prometheus_client is optional: without it, the metrics are no-ops.
+
+Example:
+    ```python
+    from pandasai.helpers.metrics import STEP_DURATION, record_cache_lookup
+
+    STEP_DURATION.labels("CodeExecution").observe(0.1)
+    record_cache_lookup("code", hit=True)
+    ```
+"""
+
+from typing import Any, Sequence
+
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:
+    Counter = Histogram = None
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TOKENS_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000)
+
+
+class _NoopMetric:
+    """Stands for the metrics when prometheus_client is not installed"""
+
+    def labels(self, *args: Any, **kwargs: Any) -> "_NoopMetric":
+        return self
+
+    def observe(self, amount: float) -> None:
+        pass
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+
+def _histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DURATION_BUCKETS,
+):
+    if Histogram is None:
+        return _NoopMetric()
+    return Histogram(name, documentation, labelnames, buckets=buckets)
+
+
+def _counter(name: str, documentation: str, labelnames: Sequence[str] = ()):
+    if Counter is None:
+        return _NoopMetric()
+    return Counter(name, documentation, labelnames)
+
+
+STEP_DURATION = _histogram(
+    "pandasai_step_duration_seconds", "Duration of the pipeline steps", ["step"]
+)
+LLM_DURATION = _histogram(
+    "pandasai_llm_duration_seconds", "Duration of the LLM calls", ["llm"]
+)
+LLM_TOKENS = _histogram(
+    "pandasai_llm_tokens",
+    "Tokens of the LLM calls",
+    ["model", "type"],
+    buckets=TOKENS_BUCKETS,
+)
+CODE_EXECUTION_DURATION = _histogram(
+    "pandasai_code_execution_duration_seconds",
+    "Duration of the execution of the generated code",
+)
+CACHE_LOOKUPS = _counter(
+    "pandasai_cache_lookups_total", "Lookups of the caches", ["cache", "result"]
+)
+CODE_EXECUTION_RETRIES = _counter(
+    "pandasai_code_execution_retries_total",
+    "Executions of the generated code retried after an error",
+)
+ERROR_CORRECTIONS = _counter(
+    "pandasai_error_corrections_total",
+    "Runs of the error correction pipeline",
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """
+    Count a lookup of a cache
+
+    Args:
+        cache (str): name of the cache, e.g. "code".
+        hit (bool): whether the entry was found.
+    """
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_llm_usage(model: str, usage: Any) -> None:
+    """
+    Record the tokens of an LLM call
+
+    Args:
+        model (str): name of the model.
+        usage (Any): usage of the response, with the `prompt_tokens` and
+            `completion_tokens` of the OpenAI API.
+    """
+    if usage is None:
+        return
+
+    for token_type in ("prompt", "completion"):
+        tokens = getattr(usage, f"{token_type}_tokens", None)
+        if tokens is not None:
+            LLM_TOKENS.labels(model, token_type).observe(tokens)
@@ -0,0 +1,346 @@
+"""
+Profiler
+
+On demand profiling of the pipeline runs: the functions decorated with
+`profiled` are profiled with cProfile and their allocations traced with
+tracemalloc, when they run within `profiling(profile)`. Otherwise the
+decorated functions only pay for a context variable lookup.
+
+The first profiled section of a run, e.g. `agent.chat`, is CPU profiled as a
+whole with its top allocations, and the sections it calls, e.g. the code
+execution, record their own duration and allocated memory. tracemalloc is
+global to the process, so the allocations are only traced for one run at a
+time: the runs profiled concurrently only record their durations. When the run
+is tracked, the profile is added to the summary of the query tracker, which is
+published once the run ends.
+
+Example:
+    ```python
+    from pandasai.helpers.profiler import Profile, profiling
+
+    profile = Profile()
+    with profiling(profile):
+        agent.chat("What is the total amount by category?")
+
+    with open("stacks.folded", "w") as file:
+        file.write(profile.collapsed_stacks())
+    ```
+"""
+
+import cProfile
+import functools
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Stacks below this time are left out of the collapsed stacks
+MIN_STACK_SECONDS = 5e-5
+MAX_STACK_DEPTH = 128
+
+_current_profile: ContextVar[Optional["Profile"]] = ContextVar(
+    "current_profile", default=None
+)
+
+# tracemalloc is global to the process, held by the profile tracing it
+_tracemalloc_lock = threading.Lock()
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+Function = Tuple[str, int, str]
+
+
+def _start_tracemalloc() -> bool:
+    """Start tracing the allocations, unless they are already traced"""
+    if not _tracemalloc_lock.acquire(blocking=False):
+        return False
+    # Traced outside of the profiler, e.g. with python -X tracemalloc
+    if tracemalloc.is_tracing():
+        _tracemalloc_lock.release()
+        return False
+
+    tracemalloc.start()
+    return True
+
+
+def _stop_tracemalloc() -> None:
+    tracemalloc.stop()
+    _tracemalloc_lock.release()
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+
+def _short_path(path: str) -> str:
+    """Return the path relative to the longest matching entry of sys.path"""
+    prefixes = [entry for entry in sys.path if entry and path.startswith(entry)]
+    if not prefixes:
+        return path
+    return os.path.relpath(path, max(prefixes, key=len))
+
+
+def _function_label(function: Function) -> str:
+    filename, lineno, name = function
+    # Built-ins have no file
+    if filename == "~":
+        return name.replace(";", ",")
+    return f"{name} ({_short_path(filename)}:{lineno})".replace(";", ",")
+
+
+class Profile:
+    """Profile of a pipeline run
+
+    Args:
+        top (int): number of allocations and functions kept in the summary.
+    """
+
+    def __init__(self, top: int = 20):
+        self.top = top
+        self.sections: List[Dict[str, Any]] = []
+        self.stats: Optional[pstats.Stats] = None
+        self.tracker = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._traces_memory = False
+        self._depth = 0
+        self._collapsed_stacks: Optional[str] = None
+
+    @property
+    def is_recording(self) -> bool:
+        """Whether the profiled run is still running"""
+        return self._depth > 0
+
+    def section(self, name: str) -> "_Section":
+        """
+        Profile a section of the run, the first one being CPU profiled
+
+        Args:
+            name (str): name of the section, e.g. "agent.chat".
+        """
+        return _Section(self, name)
+
+    def _get_allocations(
+        self, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+    ) -> List[Dict[str, Any]]:
+        """Return the lines which allocated the most memory between snapshots"""
+        allocations = []
+        for statistic in after.compare_to(before, "lineno"):
+            if statistic.size_diff <= 0:
+                continue
+            frame = statistic.traceback[0]
+            allocations.append(
+                {
+                    "file": _short_path(frame.filename),
+                    "line": frame.lineno,
+                    "size": statistic.size_diff,
+                    "count": statistic.count_diff,
+                }
+            )
+            if len(allocations) == self.top:
+                break
+        return allocations
+
+    def top_functions(self) -> List[Dict[str, Any]]:
+        """Return the functions with the highest cumulative time"""
+        if self.stats is None:
+            return []
+
+        functions = sorted(
+            self.stats.stats.items(), key=lambda item: item[1][3], reverse=True
+        )[: self.top]
+        return [
+            {
+                "function": _function_label(function),
+                "calls": calls,
+                "total_time": total_time,
+                "cumulative_time": cumulative_time,
+            }
+            for function, (_, calls, total_time, cumulative_time, _) in functions
+        ]
+
+    def collapsed_stacks(self) -> str:
+        """
+        Return the CPU profile as collapsed stacks, one "frame;frame;... time"
+        line per stack with the time in microseconds, the input format of
+        flamegraph.pl and speedscope.
+
+        cProfile records the callers of each function but not the full stacks,
+        so the time of a function is split between its callers in proportion of
+        the time spent in each of them.
+        """
+        if self.stats is None:
+            return ""
+        if self._collapsed_stacks is not None:
+            return self._collapsed_stacks
+
+        stats: Dict[Function, tuple] = self.stats.stats
+        callees: Dict[Function, Dict[Function, tuple]] = {}
+        for function, (*_, callers) in stats.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, {})[function] = edge
+
+        stacks: Dict[str, float] = {}
+
+        def walk(function: Function, path: List[Function], scale: float) -> None:
+            _, _, total_time, _, _ = stats[function]
+            stack = ";".join(map(_function_label, path))
+            stacks[stack] = stacks.get(stack, 0.0) + total_time * scale
+            if len(path) == MAX_STACK_DEPTH:
+                return
+
+            for callee, edge in callees.get(function, {}).items():
+                cumulative_time = stats[callee][3]
+                # Recursive calls are counted in the first call
+                if callee in path or cumulative_time <= 0:
+                    continue
+                callee_scale = scale * edge[3] / cumulative_time
+                if cumulative_time * callee_scale >= MIN_STACK_SECONDS:
+                    walk(callee, path + [callee], callee_scale)
+
+        # The profiler calls, before it is enabled and disabled, are left out
+        roots = [
+            function
+            for function, (*_, callers) in stats.items()
+            if not callers
+            and function[0] != __file__
+            and "_lsprof.Profiler" not in function[2]
+        ]
+        for root in roots:
+            walk(root, [root], 1.0)
+
+        self._collapsed_stacks = "".join(
+            f"{stack} {round(seconds * 1e6)}\n"
+            for stack, seconds in stacks.items()
+            if round(seconds * 1e6) > 0
+        )
+        return self._collapsed_stacks
+
+    def dump_stats(self) -> bytes:
+        """Return the CPU profile in the pstats format, e.g. for snakeviz"""
+        if self.stats is None:
+            return b""
+        return marshal.dumps(self.stats.stats)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sections": self.sections,
+            "top_functions": self.top_functions(),
+            "collapsed_stacks": self.collapsed_stacks(),
+        }
+
+
+class _Section:
+    """
+    Section of a profile. The root section is CPU profiled and snapshots the
+    allocations, the nested ones only measure their duration and memory, so
+    they don't disturb the CPU profile.
+    """
+
+    def __init__(self, profile: Profile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self) -> None:
+        profile = self.profile
+        self.is_root = profile._depth == 0
+        profile._depth += 1
+
+        if self.is_root:
+            profile._traces_memory = _start_tracemalloc()
+            if profile._traces_memory:
+                self.snapshot = _take_snapshot()
+            profile._profiler = cProfile.Profile()
+            try:
+                profile._profiler.enable()
+            except ValueError:
+                # Another profiler is active, e.g. for a concurrent run
+                profile._profiler = None
+
+        if profile._traces_memory:
+            self.memory = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        duration = time.perf_counter() - self.start
+        profile = self.profile
+        profiler = profile._profiler if self.is_root else None
+        if profiler is not None:
+            profiler.disable()
+            profile._profiler = None
+
+        section = {"name": self.name, "duration": duration}
+        if profile._traces_memory:
+            memory, peak_memory = tracemalloc.get_traced_memory()
+            section["memory"] = memory - self.memory
+        profile._depth -= 1
+
+        if self.is_root:
+            if profile._traces_memory:
+                section["peak_memory"] = peak_memory
+                section["allocations"] = profile._get_allocations(
+                    self.snapshot, _take_snapshot()
+                )
+                _stop_tracemalloc()
+                profile._traces_memory = False
+            if profiler is not None:
+                profile.stats = pstats.Stats(profiler)
+
+        profile.sections.append(section)
+        if self.is_root and profile.tracker is not None:
+            profile.tracker.add_profile(profile.to_dict())
+
+
+def current_profile() -> Optional[Profile]:
+    """Return the profile of the current run, if it is profiled"""
+    return _current_profile.get()
+
+
+@contextmanager
+def profiling(profile: Optional[Profile]) -> Iterator[Optional[Profile]]:
+    """
+    Profile the runs within the context, the worker threads started with a
+    copy of the context included
+
+    Args:
+        profile (Profile, optional): profile to record, None to not profile.
+    """
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def profiled(name: str) -> Callable:
+    """
+    Decorator profiling the function as a section, when it runs within
+    `profiling`
+
+    Args:
+        name (str): name of the section, e.g. "agent.chat".
+    """
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None:
+                return function(*args, **kwargs)
+
+            with profile.section(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
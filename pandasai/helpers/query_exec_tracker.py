@@ -1,20 +1,90 @@
 import base64
 import json
+import logging
 import os
+import queue
+import threading
 import time
 from collections import defaultdict
-from typing import Any, List, TypedDict, Union
+from concurrent.futures import Future
+from typing import Any, List, Optional, TypedDict, Union
 
 import requests
 
 from pandasai.__version__ import __version__
+from pandasai.constants import PUBLISH_QUEUE_SIZE
 from pandasai.connectors import BaseConnector
+from pandasai.helpers.debug_trace import debug_tracer
 from pandasai.helpers.encoder import CustomEncoder
+from pandasai.helpers.profiler import current_profile
 from pandasai.pipelines.chat.chat_pipeline_input import (
     ChatPipelineInput,
 )
 from pandasai.pipelines.pipeline_context import PipelineContext
 
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the log server
+PUBLISH_TIMEOUT = 10
+
+
+
+class _Publisher:
+    """
+    Sends the summaries to the log server in a background thread, so the
+    queries don't wait for it. The queue is bounded: when the log server can't
+    keep up, the new summaries are dropped and counted instead of piling up in
+    memory.
+    """
+
+    def __init__(self, maxsize: int = PUBLISH_QUEUE_SIZE):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def submit(self, fn, *args) -> Optional[Future]:
+        """
+        Queue the call and return its future, or None if the queue is full
+        """
+        self._start()
+
+        future = Future()
+        try:
+            self._queue.put_nowait((future, fn, args))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                dropped = self.dropped
+            logger.warning(
+                "Query summary not published, the queue is full (%d dropped)",
+                dropped,
+            )
+            return None
+
+        return future
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="query-publisher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            future, fn, args = self._queue.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+            self._queue.task_done()
+
+
+_publisher = _Publisher()
+
 
 class ResponseType(TypedDict):
     type: str
@@ -41,6 +111,9 @@ class QueryExecTracker:
     _success: bool
     _server_config: dict
     _last_log_id: int
+    _publish_future: Optional[Future]
+    _profile: Optional[dict]
+    _publish_pending: bool
 
     def __init__(
         self,
@@ -49,14 +122,18 @@ class QueryExecTracker:
         self._success = False
         self._start_time = None
         self._last_log_id = None
+        self._publish_future = None
         self._server_config = server_config
         self._query_info = {}
+        self._profile = None
+        self._publish_pending = False
 
     def start_new_track(self, input: ChatPipelineInput):
         """
         Resets tracking variables to start new track
         """
         self._last_log_id = None
+        self._publish_future = None
         self._start_time = time.time()
         self._dataframes: List = []
         self._skills: List = []
@@ -64,6 +141,8 @@ class QueryExecTracker:
         self._steps: List = []
         self._query_info = {}
         self._func_exec_count: dict = defaultdict(int)
+        self._profile = None
+        self._publish_pending = False
 
         self._query_info = {
             "conversation_id": str(input.conversation_id),
@@ -73,6 +152,13 @@ class QueryExecTracker:
             "pandasai_version": __version__,
         }
 
+        debug_tracer.start_run(self)
+
+        # The profile of the run is added once the profiled section ends, the
+        # summary is published then
+        if (profile := current_profile()) is not None:
+            profile.tracker = self
+
     def convert_dataframe_to_dict(self, df):
         json_data = json.loads(
             df.to_json(
@@ -108,6 +194,16 @@ class QueryExecTracker:
 
         self._steps.append(step)
 
+    def add_profile(self, profile: dict) -> None:
+        """
+        Adds the profile of the run, with its collapsed stacks and top
+        allocations, to the summary
+        """
+        self._profile = profile
+        if self._publish_pending:
+            self._publish_pending = False
+            self.publish()
+
     def set_final_response(self, response: Any):
         self._response = response
 
@@ -223,7 +319,7 @@ class QueryExecTracker:
             raise RuntimeError("[QueryExecTracker]: Tracking not started")
 
         execution_time = time.time() - self._start_time
-        return {
+        summary = {
             "query_info": self._query_info,
             "skills": self._skills,
             "dataframes": self._dataframes,
@@ -232,14 +328,23 @@ class QueryExecTracker:
             "execution_time": execution_time,
             "success": self._success,
         }
+        if self._profile is not None:
+            summary["profile"] = self._profile
+        return summary
 
     def get_execution_time(self) -> float:
         return time.time() - self._start_time
 
     def publish(self) -> None:
         """
-        Publish Query Summary to remote logging server
+        Publish Query Summary to remote logging server, in the background
         """
+        # Deferred until the profiled run ends, so the summary has its profile
+        profile = current_profile()
+        if profile is not None and profile.tracker is self and profile.is_recording:
+            self._publish_pending = True
+            return
+
         api_key = None
         server_url = None
 
@@ -257,9 +362,18 @@ class QueryExecTracker:
         if api_key is None:
             return
 
+        self._publish_future = _publisher.submit(
+            self._send_summary, server_url, api_key, self.get_summary()
+        )
+
+    @staticmethod
+    def _send_summary(server_url: str, api_key: str, summary: dict) -> Optional[int]:
+        """
+        Send the summary to the log server and return the id of the log
+        """
         try:
             log_data = {
-                "json_log": self.get_summary(),
+                "json_log": summary,
             }
 
             encoder = CustomEncoder()
@@ -270,6 +384,7 @@ class QueryExecTracker:
                 f"{server_url}/api/log/add",
                 json=json.loads(ecoded_json_str),
                 headers=headers,
+                timeout=PUBLISH_TIMEOUT,
             )
             if response.status_code != 200:
                 raise Exception(response.text)
@@ -277,10 +392,12 @@ class QueryExecTracker:
             json_data = json.loads(response.text)
 
             if "data" in json_data and json_data["data"] is not None:
-                self._last_log_id = json_data["data"]["log_id"]
+                return json_data["data"]["log_id"]
 
         except Exception as e:
-            print(f"Exception in APILogger: {e}")
+            logger.warning("Exception in APILogger: %s", e)
+
+        return None
 
     @property
     def success(self) -> bool:
@@ -292,4 +409,9 @@ class QueryExecTracker:
 
     @property
     def last_log_id(self) -> int:
+        # The log id is only known once the summary is published
+        if self._publish_future is not None:
+            self._last_log_id = self._publish_future.result()
+            self._publish_future = None
+
         return self._last_log_id
@@ -0,0 +1,118 @@
+"""
+Retrieval cache
+
+In-memory, bounded LRU cache of the training documents retrieved from the
+vector store for a question. Entries are keyed by the vector store, the version
+of its collections and the question, so adding or removing training data
+invalidates them, and expire after a while to pick up the changes made by
+other processes.
+
+Example:
+    ```python
+    from pandasai.helpers.retrieval_cache import retrieval_cache
+
+    key = retrieval_cache.get_cache_key(vectorstore, question)
+    documents = retrieval_cache.get(key)
+    if documents is None:
+        documents = vectorstore.get_relevant_documents(question)
+        retrieval_cache.set(key, documents)
+    ```
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from ..constants import RETRIEVAL_CACHE_SIZE, RETRIEVAL_CACHE_TTL
+from ..vectorstores.vectorstore import VectorStore
+from .metrics import record_cache_lookup
+
+RetrievedDocuments = Tuple[List[str], List[str]]
+
+
+class RetrievalCache:
+    """Thread-safe LRU cache of retrieved documents
+
+    Args:
+        maxsize (int): maximum number of entries kept in the cache.
+        ttl (int): seconds after which an entry expires.
+    """
+
+    def __init__(
+        self, maxsize: int = RETRIEVAL_CACHE_SIZE, ttl: int = RETRIEVAL_CACHE_TTL
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[tuple, Tuple[float, RetrievedDocuments]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_cache_key(vectorstore: VectorStore, question: str) -> tuple:
+        """
+        Return the cache key for the question asked to the vector store.
+
+        Args:
+            vectorstore (VectorStore): vector store queried.
+            question (str): question asked.
+
+        Returns:
+            tuple: the cache key.
+        """
+        return (vectorstore.cache_id, vectorstore.version, question)
+
+    def get(self, key: tuple) -> Optional[RetrievedDocuments]:
+        """Get an entry from the cache, marking it as recently used.
+
+        Args:
+            key (tuple): key of the entry.
+
+        Returns:
+            RetrievedDocuments: the question answers and docs documents or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time() - self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                record_cache_lookup("retrieval", hit=False)
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            record_cache_lookup("retrieval", hit=True)
+            return entry[1]
+
+    def set(self, key: tuple, documents: RetrievedDocuments) -> None:
+        """Store an entry in the cache, evicting the least recently used one
+        if the cache is full.
+
+        Args:
+            key (tuple): key of the entry.
+            documents (RetrievedDocuments): question answers and docs documents.
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.time(), documents)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all the entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+retrieval_cache = RetrievalCache()
@@ -0,0 +1,52 @@
+"""
+Spans
+
+Spans of the pipeline stages, e.g. the prompt generation, the LLM call or the
+code execution, recorded with OpenTelemetry. The spans are children of the
+current span of the application, e.g. the span of the server request.
+
+OpenTelemetry is optional: without it, or without a tracer provider configured
+by the application, the spans are no-ops.
+
+Example:
+    ```python
+    from pandasai.helpers.spans import start_span
+
+    with start_span("pandasai.llm.generate_code", llm=llm.__class__.__name__):
+        code = llm.generate_code(prompt, context)
+    ```
+"""
+
+from contextlib import nullcontext
+from typing import Any, ContextManager
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+_tracer = otel_trace.get_tracer("pandasai") if otel_trace is not None else None
+
+
+def start_span(name: str, /, **attributes: Any) -> ContextManager:
+    """
+    Start a span, ended when the context manager exits, as the current span.
+
+    Args:
+        name (str): name of the span, e.g. "pandasai.step.CodeExecution".
+        **attributes: attributes of the span, the None values are skipped.
+
+    Returns:
+        ContextManager: the context manager of the span.
+    """
+    if _tracer is None:
+        return nullcontext()
+
+    return _tracer.start_as_current_span(
+        name,
+        attributes={
+            key: value if isinstance(value, (bool, int, float)) else str(value)
+            for key, value in attributes.items()
+            if value is not None
+        },
+    )
@@ -29,6 +29,7 @@ from ..exceptions import (
     MethodNotImplementedError,
     NoCodeFoundError,
 )
+from ..helpers.metrics import record_llm_usage
 from ..helpers.openai import is_openai_v1
 from ..helpers.openai_info import openai_callback_var
 from ..prompts.base import BasePrompt
@@ -306,6 +307,11 @@ class BaseOpenAI(LLM):
             "http_client": self.http_client,
         }
 
+    @property
+    def _model_name(self) -> str:
+        """Name of the model, e.g. for the metrics"""
+        return getattr(self, "model", None) or self.type
+
     def completion(self, prompt: str, memory: Memory) -> str:
         """
         Query the completion API
@@ -325,6 +331,7 @@ class BaseOpenAI(LLM):
             params["stop"] = [self.stop]
 
         response = self.client.create(**params)
+        record_llm_usage(self._model_name, getattr(response, "usage", None))
 
         if openai_handler := openai_callback_var.get():
             openai_handler(response)
@@ -363,6 +370,7 @@ class BaseOpenAI(LLM):
             params["stop"] = [self.stop]
 
         response = self.client.create(**params)
+        record_llm_usage(self._model_name, getattr(response, "usage", None))
 
         if openai_handler := openai_callback_var.get():
             openai_handler(response)
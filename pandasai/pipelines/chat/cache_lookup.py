@@ -3,6 +3,7 @@ from typing import Any
 from pandasai.pipelines.logic_unit_output import LogicUnitOutput
 
 from ...helpers.logger import Logger
+from ...helpers.metrics import record_cache_lookup
 from ..base_logic_unit import BaseLogicUnit
 from ..pipeline_context import PipelineContext
 
@@ -29,19 +30,16 @@ class CacheLookup(BaseLogicUnit):
         """
         pipeline_context: PipelineContext = kwargs.get("context")
         logger: Logger = kwargs.get("logger")
-        if (
-            pipeline_context.config.enable_cache
-            and pipeline_context.cache
-            and pipeline_context.cache.get(
-                pipeline_context.cache.get_cache_key(pipeline_context)
-            )
-        ):
+        if not pipeline_context.config.enable_cache or not pipeline_context.cache:
+            return
+
+        code = pipeline_context.cache.get(
+            pipeline_context.cache.get_cache_key(pipeline_context)
+        )
+        record_cache_lookup("response", hit=bool(code))
+        if code:
             logger.log("Using cached response")
 
-            code = pipeline_context.cache.get(
-                pipeline_context.cache.get_cache_key(pipeline_context)
-            )
-
             pipeline_context.add("found_in_cache", True)
 
             return LogicUnitOutput(code, True, "Cache Hit")
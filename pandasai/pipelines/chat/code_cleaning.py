@@ -1,5 +1,6 @@
 import ast
 import copy
+import logging
 import re
 import traceback
 import uuid
@@ -8,6 +9,7 @@ from typing import Any, List, Union
 import astor
 
 from pandasai.connectors.pandas import PandasConnector
+from pandasai.helpers.code_cache import CleanedCode, code_cache
 from pandasai.helpers.optional import get_environment
 from pandasai.helpers.path import find_project_root
 from pandasai.helpers.skills_manager import SkillsManager
@@ -74,6 +76,7 @@ class CodeCleaning(BaseLogicUnit):
     _logger: Logger = None
     _additional_dependencies: List[dict] = []
     _current_code_executed: str = None
+    _cleaned_code: CleanedCode = None
 
     def __init__(self, on_failure=None, on_retry=None, **kwargs):
         super().__init__(**kwargs)
@@ -103,6 +106,7 @@ class CodeCleaning(BaseLogicUnit):
 
         context.add("additional_dependencies", self._additional_dependencies)
         context.add("current_code_executed", self._current_code_executed)
+        context.add("cleaned_code", self._cleaned_code)
 
         return LogicUnitOutput(
             code_to_run,
@@ -120,7 +124,48 @@ class CodeCleaning(BaseLogicUnit):
         """
         return re.sub(r"""(['"])([^'"]*\.png)\1""", r"\1temp_chart.png\1", code)
 
+    def _get_code_cache_key(self, code: str, context: CodeExecutionContext) -> str:
+        """
+        Return the code cache key for the raw code, including every setting
+        that changes the output of the cleaning.
+
+        Args:
+            code (str): Raw code returned by the LLM
+            context (CodeExecutionContext): Code Execution Context
+
+        Returns:
+            str: The code cache key
+        """
+        knobs = [
+            self._config.direct_sql,
+            self._config.save_charts,
+            self._config.save_charts_path if self._config.save_charts else None,
+            sorted(self._config.custom_whitelisted_dependencies),
+            sorted(skill.name for skill in context.skills_manager.skills),
+            # The direct SQL queries are rewritten with the case-sensitive names
+            [(df.name, df.cs_table_name, df.column_hash) for df in self._dfs],
+        ]
+
+        # Saved charts are named after the prompt id, the temporary chart
+        # has the same name for every prompt
+        if self._config.save_charts and "temp_chart.png" in self._replace_plot_png(
+            code
+        ):
+            knobs.append(context.prompt_id)
+
+        return code_cache.get_cache_key(code, knobs)
+
     def get_code_to_run(self, code: str, context: CodeExecutionContext) -> Any:
+        cache_key = self._get_code_cache_key(code, context)
+        if cleaned_code := code_cache.get(cache_key):
+            self._logger.log("Using cleaned code from the code cache")
+            self._cleaned_code = cleaned_code
+            self._current_code_executed = cleaned_code.current_code_executed
+            self._additional_dependencies = list(cleaned_code.additional_dependencies)
+            context.skills_manager.used_skills = list(cleaned_code.used_skills)
+            self._log_code_to_run(cleaned_code.code)
+            return cleaned_code.code
+
         if self._is_malicious_code(code):
             raise MaliciousQueryError(
                 "Code shouldn't use 'os', 'io' or 'chr', 'b64decode' functions as this could lead to malicious code execution."
@@ -150,16 +195,30 @@ class CodeCleaning(BaseLogicUnit):
 
         # Get the code to run removing unsafe imports and df overwrites
         code_to_run = self._clean_code(code, context)
+
+        self._cleaned_code = CleanedCode(
+            code=code_to_run,
+            current_code_executed=self._current_code_executed,
+            additional_dependencies=list(self._additional_dependencies),
+            used_skills=list(context.skills_manager.used_skills),
+        )
+        code_cache.set(cache_key, self._cleaned_code)
+
+        self._log_code_to_run(code_to_run)
+
+        return code_to_run
+
+    def _log_code_to_run(self, code_to_run: str):
         self._logger.log(
-            f"""
+            """
 Code running:
 ```
-{code_to_run}
-        ```"""
+%s
+        ```""",
+            logging.INFO,
+            code_to_run,
         )
 
-        return code_to_run
-
     def _is_malicious_code(self, code) -> bool:
         dangerous_modules = [
             " os",
@@ -1,5 +1,6 @@
 import ast
 import logging
+import time
 import traceback
 from collections import defaultdict
 from typing import Any, Callable, Generator, List, Union
@@ -9,10 +10,15 @@ from pandasai.pipelines.logic_unit_output import LogicUnitOutput
 from pandasai.responses.response_serializer import ResponseSerializer
 
 from ...exceptions import NoResultFoundError
+from ...helpers.code_cache import CleanedCode
+from ...helpers.debug_trace import trace
 from ...helpers.logger import Logger
+from ...helpers.metrics import CODE_EXECUTION_DURATION, CODE_EXECUTION_RETRIES
 from ...helpers.node_visitors import AssignmentVisitor, CallVisitor
 from ...helpers.optional import get_environment
 from ...helpers.output_validator import OutputValidator
+from ...helpers.profiler import profiled
+from ...helpers.spans import start_span
 from ...schemas.df_config import Config
 from ..base_logic_unit import BaseLogicUnit
 from ..pipeline_context import PipelineContext
@@ -71,85 +77,76 @@ class CodeExecution(BaseLogicUnit):
         self._current_code_executed = self.context.get("current_code_executed")
         self.logger: Logger = kwargs.get("logger")
 
-        print(f"Starting execution with input: {input}")
-        print(f"Context: {self.context}")
-        print(f"Number of dataframes: {len(self._dfs)}")
-        print(f"Config: {self._config}")
-        print(f"Additional dependencies: {self._additional_dependencies}")
-        print(f"Current code executed: {self._current_code_executed}")
+        trace(
+            "code_execution.start",
+            "Executing code on %s dataframes, additional dependencies: %s",
+            len(self._dfs),
+            self._additional_dependencies,
+        )
+        trace("code_execution.config", "Config: %s", self._config)
 
         # Execute the code
         code_context = CodeExecutionContext(
             self.context.get("last_prompt_id"), self.context.skills_manager
         )
-        print(f"Code context: {code_context}")
 
         retry_count = 0
         code_to_run = input
         result = None
         while retry_count <= self.context.config.max_retries:
-            print(f"Attempt {retry_count + 1} to execute code:")
-            print(f"Code to run:\n{code_to_run}")
+            trace(
+                "code_execution.code",
+                "Attempt %s, code to run:\n%s",
+                retry_count + 1,
+                code_to_run,
+            )
             try:
                 result = self.execute_code(code_to_run, code_context)
-                print(f"Execution result: {result}")
+                trace("code_execution.result", "Execution result: %s", result)
 
                 if self.context.get("output_type") != "" and (
                     output_helper := self.context.get("output_type")
                 ):
-                    print(f"Validating output with type: {output_helper}")
                     (validation_ok, validation_errors) = OutputValidator.validate(
                         output_helper, result
                     )
 
                     if not validation_ok:
-                        print(f"Validation failed with errors: {validation_errors}")
                         raise InvalidLLMOutputType(validation_errors)
-                    else:
-                        print("Output validation successful")
 
                 if not OutputValidator.validate_result(result):
-                    print(f"Result validation failed. Result: {result}")
                     raise InvalidOutputValueMismatch(
                         f'Value type {type(result["value"])} must match with type {result["type"]}'
                     )
-                else:
-                    print("Result validation successful")
 
                 break
 
             except Exception as e:
                 traceback_errors = traceback.format_exc()
                 self.logger.log(f"Failed with error: {traceback_errors}", logging.ERROR)
-                print(f"Execution failed with error: {e}")
-                print(f"Traceback:\n{traceback_errors}")
 
                 if self.on_failure:
-                    print("Calling on_failure callback")
                     self.on_failure(code_to_run, traceback_errors)
 
                 if (
                     not self.context.config.use_error_correction_framework
                     or retry_count >= self.context.config.max_retries
                 ):
-                    print("Max retries reached or error correction framework disabled. Raising exception.")
                     raise e
 
                 retry_count += 1
+                CODE_EXECUTION_RETRIES.inc()
 
                 self.logger.log(
                     f"Failed to execute code retrying with a correction framework "
                     f"[retry number: {retry_count}]",
                     level=logging.WARNING
                 )
-                print(f"Retrying with correction framework. Retry number: {retry_count}")
 
                 code_to_run = self._retry_run_code(
                     code_to_run, self.context, self.logger, e
                 )
-                print(f"New code after retry:\n{code_to_run}")
 
-        print(f"Final result: {result}")
         return LogicUnitOutput(
             result,
             True,
@@ -158,6 +155,7 @@ class CodeExecution(BaseLogicUnit):
             final_track_output=True,
         )
 
+    @profiled("code_execution.execute_code")
     def execute_code(self, code: str, context: CodeExecutionContext) -> Any:
         """
         Execute the python code generated by LLMs to answer the question
@@ -174,16 +172,39 @@ class CodeExecution(BaseLogicUnit):
                 on the generated code.
 
         """
+        # Reuse the compiled code and the required dfs of the code cleaning
+        # stage when the code hasn't been changed since then
+        cleaned_code: CleanedCode = self.context.get("cleaned_code", None)
+        if cleaned_code is not None and cleaned_code.code != code:
+            cleaned_code = None
+
         # List the required dfs, so we can avoid to run the connectors
         # if the code does not need them
-        dfs = self._required_dfs(code)
+        if cleaned_code is None:
+            dfs = self._required_dfs(code)
+        else:
+            if cleaned_code.required_dfs is None:
+                cleaned_code.required_dfs = [
+                    index
+                    for index, df in enumerate(self._required_dfs(code))
+                    if df is not None
+                ]
+            dfs = [
+                df if index in cleaned_code.required_dfs else None
+                for index, df in enumerate(self._dfs)
+            ]
+
         environment: dict = get_environment(self._additional_dependencies)
         environment["dfs"] = self._get_originals(dfs)
         if len(environment["dfs"]) == 1:
             environment["df"] = environment["dfs"][0]
 
         if self._config.direct_sql:
-            environment["execute_sql_query"] = self._dfs[0].execute_direct_sql_query
+            # The agents can route the queries, e.g. to the semantic rollups
+            environment["execute_sql_query"] = (
+                self.context.get("execute_sql_query", None)
+                or self._dfs[0].execute_direct_sql_query
+            )
 
         # Add skills to the env
         if context.skills_manager.used_skills:
@@ -192,7 +213,10 @@ class CodeExecution(BaseLogicUnit):
                 environment[skill_func_name] = skill
 
         # Execute the code
-        exec(code, environment)
+        start_time = time.perf_counter()
+        with start_span("pandasai.code.exec"):
+            exec(code if cleaned_code is None else cleaned_code.compiled, environment)
+        CODE_EXECUTION_DURATION.observe(time.perf_counter() - start_time)
 
         # Get the result
         if "result" not in environment:
@@ -246,7 +270,12 @@ class CodeExecution(BaseLogicUnit):
             filters = extracted_filters.get(f"dfs[{index}]", [])
             df.set_additional_filters(filters)
 
-            df.execute()
+            with start_span(
+                "pandasai.connector.execute",
+                connector=df.__class__.__name__,
+                dataframe=df.name,
+            ):
+                df.execute()
             # df.load_connector(partial=len(filters) > 0)
 
             original_dfs.append(df.pandas_df)
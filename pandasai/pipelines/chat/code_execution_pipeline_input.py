@@ -1,6 +1,8 @@
 import uuid
 from dataclasses import dataclass
 
+from pandasai.helpers.debug_trace import trace
+
 
 @dataclass
 class CodeExecutionPipelineInput:
@@ -31,4 +33,12 @@ class CodeExecutionPipelineInput:
         self.log_input_details()
 
     def log_input_details(self):
-        print(f"CodeExecutionPipelineInput initialized with code={self.code}, output_type={self.output_type}, conversation_id={self.conversation_id}, prompt_id={self.prompt_id}, query={self.query}")
\ No newline at end of file
+        trace(
+            "code_execution.input",
+            "Code execution input: code=%s, output_type=%s, conversation_id=%s, "
+            "prompt_id=%s",
+            self.code,
+            self.output_type,
+            self.conversation_id,
+            self.prompt_id,
+        )
\ No newline at end of file
@@ -1,8 +1,13 @@
+import logging
+import time
 from typing import Any
 
 from pandasai.pipelines.logic_unit_output import LogicUnitOutput
 
+from ...helpers.debug_trace import trace
 from ...helpers.logger import Logger
+from ...helpers.metrics import LLM_DURATION
+from ...helpers.spans import start_span
 from ..base_logic_unit import BaseLogicUnit
 from ..pipeline_context import PipelineContext
 
@@ -30,21 +35,30 @@ class CodeGenerator(BaseLogicUnit):
         pipeline_context: PipelineContext = kwargs.get("context")
         logger: Logger = kwargs.get("logger")
 
-        code = pipeline_context.config.llm.generate_code(input, pipeline_context)
-        print("CODE EXECUTION", code)
-        print("CODE end")
+        llm = pipeline_context.config.llm
+        start_time = time.perf_counter()
+        with start_span("pandasai.llm.generate_code", llm=llm.__class__.__name__):
+            code = llm.generate_code(input, pipeline_context)
+        LLM_DURATION.labels(llm.__class__.__name__).observe(
+            time.perf_counter() - start_time
+        )
+        trace("code_generator.code", "Generated code:\n%s", code)
         pipeline_context.add("last_code_generated", code)
         logger.log(
-            f"""Prompt used:
-            {pipeline_context.config.llm.last_prompt}
-            """
+            """Prompt used:
+            %s
+            """,
+            logging.INFO,
+            pipeline_context.config.llm.last_prompt,
         )
         logger.log(
-            f"""Code generated:
+            """Code generated:
             ```
-            {code}
+            %s
             ```
-            """
+            """,
+            logging.INFO,
+            code,
         )
 
         return LogicUnitOutput(
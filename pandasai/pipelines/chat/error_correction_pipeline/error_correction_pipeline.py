@@ -1,6 +1,7 @@
 from typing import Optional
 
 from pandasai.helpers.logger import Logger
+from pandasai.helpers.metrics import ERROR_CORRECTIONS
 from pandasai.helpers.query_exec_tracker import QueryExecTracker
 from pandasai.pipelines.chat.code_cleaning import CodeCleaning
 from pandasai.pipelines.chat.code_generator import CodeGenerator
@@ -45,4 +46,5 @@ class ErrorCorrectionPipeline:
 
     def run(self, input: ErrorCorrectionPipelineInput):
         self._logger.log(f"Executing Pipeline: {self.__class__.__name__}")
+        ERROR_CORRECTIONS.inc()
         return self.pipeline.run(input)
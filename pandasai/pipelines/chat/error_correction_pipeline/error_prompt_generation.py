@@ -1,3 +1,4 @@
+import logging
 import traceback
 from typing import Any, Callable
 
@@ -53,7 +54,7 @@ class ErrorPromptGeneration(BaseLogicUnit):
         if self.on_prompt_generation:
             self.on_prompt_generation(prompt)
 
-        self.logger.log(f"Using prompt: {prompt}")
+        self.logger.log("Using prompt: %s", logging.INFO, prompt)
 
         return LogicUnitOutput(
             prompt,
@@ -1,3 +1,4 @@
+import logging
 from typing import Any, Union
 
 from pandasai.pipelines.logic_unit_output import LogicUnitOutput
@@ -34,7 +35,7 @@ class PromptGeneration(BaseLogicUnit):
         self.logger: Logger = kwargs.get("logger")
 
         prompt = self.get_chat_prompt(self.context)
-        self.logger.log(f"Using prompt: {prompt}")
+        self.logger.log("Using prompt: %s", logging.INFO, prompt)
 
         return LogicUnitOutput(
             prompt,
@@ -0,0 +1,63 @@
+from typing import Any
+
+from pandasai.pipelines.logic_unit_output import LogicUnitOutput
+
+from ...helpers.logger import Logger
+from ...helpers.retrieval_cache import retrieval_cache
+from ..base_logic_unit import BaseLogicUnit
+from ..pipeline_context import PipelineContext
+
+
+class Retrieval(BaseLogicUnit):
+    """
+    Training Data Retrieval Stage
+
+    Retrieves the question answers and the docs relevant to the question from
+    the vector store before the prompt is rendered, so the prompt templates
+    don't query the vector store themselves.
+    """
+
+    pass
+
+    def execute(self, input: Any, **kwargs) -> Any:
+        """
+        This method will return output according to
+        Implementation.
+
+        :param input: Your input data.
+        :param kwargs: A dictionary of keyword arguments.
+            - 'logger' (any): The logger for logging.
+            - 'config' (Config): Global configurations for the test
+            - 'context' (any): The execution context.
+
+        :return: The result of the execution.
+        """
+        context: PipelineContext = kwargs.get("context")
+        logger: Logger = kwargs.get("logger")
+
+        if context.vectorstore is None:
+            return LogicUnitOutput(input, True, "No vector store to retrieve from")
+
+        question = context.memory.get_last_message()
+        cache_key = retrieval_cache.get_cache_key(context.vectorstore, question)
+
+        documents = retrieval_cache.get(cache_key)
+        if documents is None:
+            documents = context.vectorstore.get_relevant_documents(question)
+            retrieval_cache.set(cache_key, documents)
+        else:
+            logger.log("Using cached training data")
+
+        qa_documents, docs_documents = documents
+        context.add("relevant_qa_documents", qa_documents)
+        context.add("relevant_docs_documents", docs_documents)
+
+        return LogicUnitOutput(
+            input,
+            True,
+            "Training data retrieved successfully",
+            {
+                "content_type": "training_data",
+                "value": {"qa": qa_documents, "docs": docs_documents},
+            },
+        )
@@ -5,7 +5,9 @@ from typing import Any, List, Optional, Union
 from pandasai.config import load_config_from_json
 from pandasai.exceptions import PipelineConcatenationError, UnSupportedLogicUnit
 from pandasai.helpers.logger import Logger
+from pandasai.helpers.metrics import STEP_DURATION
 from pandasai.helpers.query_exec_tracker import QueryExecTracker
+from pandasai.helpers.spans import start_span
 from pandasai.pipelines.base_logic_unit import BaseLogicUnit
 from pandasai.pipelines.logic_unit_output import LogicUnitOutput
 from pandasai.pipelines.pipeline_context import PipelineContext
@@ -98,14 +100,16 @@ class Pipeline(AbstractPipeline):
                 start_time = time.time()
 
                 # Execute the logic unit
-                step_output = logic.execute(
-                    data,
-                    logger=self._logger,
-                    config=self._context.config,
-                    context=self._context,
-                )
+                with start_span(f"pandasai.step.{logic.__class__.__name__}"):
+                    step_output = logic.execute(
+                        data,
+                        logger=self._logger,
+                        config=self._context.config,
+                        context=self._context,
+                    )
 
                 execution_time = time.time() - start_time
+                STEP_DURATION.labels(logic.__class__.__name__).observe(execution_time)
 
                 # Track the execution step of pipeline
                 if isinstance(step_output, LogicUnitOutput):
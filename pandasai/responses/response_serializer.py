@@ -2,6 +2,7 @@ import base64
 import json
 
 import pandasai.pandas as pd
+from pandasai.helpers.spans import start_span
 from pandasai.responses.response_type import ResponseType
 
 
@@ -32,12 +33,13 @@ class ResponseSerializer:
             if "data:image/png;base64" in result["value"]:
                 return result
 
-            with open(result["value"], "rb") as image_file:
-                image_data = image_file.read()
-            # Encode the image data to Base64
-            base64_image = (
-                f"data:image/png;base64,{base64.b64encode(image_data).decode()}"
-            )
+            with start_span("pandasai.chart.encode"):
+                with open(result["value"], "rb") as image_file:
+                    image_data = image_file.read()
+                # Encode the image data to Base64
+                base64_image = (
+                    f"data:image/png;base64,{base64.b64encode(image_data).decode()}"
+                )
             return {
                 "type": result["type"],
                 "value": base64_image,
@@ -3,6 +3,14 @@ Vector stores to store data for training purpose
 """
 
 from .bamboo_vectorstore import BambooVectorStore
+from .bulk_ingestion import BulkIngestion, IngestionReport
+from .local_vectorstore import LocalVectorStore
 from .vectorstore import VectorStore
 
-__all__ = ["VectorStore", "BambooVectorStore"]
+__all__ = [
+    "VectorStore",
+    "BambooVectorStore",
+    "BulkIngestion",
+    "IngestionReport",
+    "LocalVectorStore",
+]
@@ -1,3 +1,4 @@
+import hashlib
 from typing import Iterable, List, Optional, Union
 
 from pandasai.helpers.logger import Logger
@@ -23,29 +24,50 @@ class BambooVectorStore(VectorStore):
         self._logger = logger or Logger()
         self._session = Session(endpoint_url, api_key, logger)
 
-    def add_question_answer(self, queries: Iterable[str], codes: Iterable[str]) -> bool:
+        # Instances with the same endpoint and key query the same training data
+        api_key_hash = hashlib.sha256(self._session._api_key.encode()).hexdigest()
+        self._cache_id = (
+            f"bamboo-{self._session._endpoint_url}-{api_key_hash}-{max_samples}"
+        )
+
+    def add_question_answer(
+        self,
+        queries: Iterable[str],
+        codes: Iterable[str],
+        ids: Optional[Iterable[str]] = None,
+        metadatas: Optional[List[dict]] = None,
+    ) -> bool:
         """
         Add question and answer(code) to the training set
         Args:
             queries: string of question
             codes: str
+            ids: Not supported, the ids are assigned by the server.
+            metadatas: Not supported.
         """
         self._session.post("/training-data", json={"query": queries, "code": codes})
+        self._increment_version()
         return True
 
-    def add_docs(self, docs: Iterable[str]) -> bool:
+    def add_docs(
+        self,
+        docs: Iterable[str],
+        ids: Optional[Iterable[str]] = None,
+        metadatas: Optional[List[dict]] = None,
+    ) -> bool:
         """
         Add docs to the training set
         Args:
             docs: Iterable of strings to add to the vectorstore.
-            ids: Optional Iterable of ids associated with the texts.
-            metadatas: Optional list of metadatas associated with the texts.
+            ids: Not supported, the ids are assigned by the server.
+            metadatas: Not supported.
             kwargs: vectorstore specific parameters
 
         Returns:
             List of ids from adding the texts into the vectorstore.
         """
         self._session.post("/training-docs", json={"docs": docs})
+        self._increment_version()
         return True
 
     def get_relevant_qa_documents(self, question: str, k: int = None) -> List[dict]:
@@ -0,0 +1,257 @@
+"""
+Bulk ingestion of training data into a vector store.
+
+The question answers and docs are split in batches which are embedded and
+upserted by worker threads, with a bounded number of batches in flight so large
+inputs can be streamed. Every entry gets an id derived from its content, so
+ingesting the same data again doesn't create duplicates, and the completed
+batches can be recorded in a checkpoint file to resume an interrupted
+ingestion.
+
+Example:
+    ```python
+    from pandasai.vectorstores.bulk_ingestion import BulkIngestion
+
+    ingestion = BulkIngestion(vectorstore, checkpoint_path="training.ckpt")
+    report = ingestion.add_question_answer(queries, codes)
+    print(report.throughput)
+    ```
+"""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..constants import TRAINING_BATCH_SIZE, TRAINING_MAX_WORKERS
+from ..helpers.logger import Logger
+from .vectorstore import VectorStore
+
+
+class IngestionReport:
+    """Summary of a bulk ingestion
+
+    Attributes:
+        ingested (int): entries written to the vector store.
+        duplicates (int): entries not written because the same content was
+            already in the input.
+        skipped (int): entries of the batches completed by a previous run.
+        batches (int): batches written to the vector store.
+        elapsed (float): seconds of the ingestion.
+    """
+
+    def __init__(self):
+        self.ingested = 0
+        self.duplicates = 0
+        self.skipped = 0
+        self.batches = 0
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Number of entries ingested per second"""
+        return self.ingested / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} ingested={self.ingested} "
+            f"duplicates={self.duplicates} skipped={self.skipped} "
+            f"batches={self.batches} "
+            f"elapsed={self.elapsed:.2f}s throughput={self.throughput:.1f}/s>"
+        )
+
+
+class BulkIngestion:
+    """Ingests training data in parallel batches into a vector store
+
+    Args:
+        vectorstore (VectorStore): vector store to ingest into.
+        batch_size (int): number of entries embedded and upserted together.
+        max_workers (int): number of batches ingested at the same time.
+        checkpoint_path (str, optional): file recording the completed batches,
+            to skip them when the ingestion is run again.
+        logger (Logger, optional): logger for the progress.
+    """
+
+    def __init__(
+        self,
+        vectorstore: VectorStore,
+        batch_size: int = TRAINING_BATCH_SIZE,
+        max_workers: int = TRAINING_MAX_WORKERS,
+        checkpoint_path: Optional[str] = None,
+        logger: Optional[Logger] = None,
+    ):
+        if batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer")
+
+        self._vectorstore = vectorstore
+        self._batch_size = batch_size
+        self._max_workers = max(1, max_workers)
+        self._checkpoint_path = checkpoint_path
+        self._logger = logger or Logger()
+        self._checkpoint_lock = threading.Lock()
+        self._completed_batches = self._load_checkpoint()
+
+    @staticmethod
+    def get_content_id(content: str, suffix: str) -> str:
+        """
+        Return the id of an entry, derived from its content.
+
+        Args:
+            content (str): the question answer or the doc.
+            suffix (str): suffix of the ids of the collection.
+
+        Returns:
+            str: the id.
+        """
+        return f"{hashlib.sha256(content.encode()).hexdigest()[:32]}-{suffix}"
+
+    def add_question_answer(
+        self, queries: Iterable[str], codes: Iterable[str]
+    ) -> IngestionReport:
+        """
+        Add question and answer(code) pairs to the training set in batches
+        Args:
+            queries: questions
+            codes: codes answering the questions
+
+        Returns:
+            IngestionReport: summary of the ingestion.
+        """
+        if hasattr(queries, "__len__") and hasattr(codes, "__len__"):
+            if len(queries) != len(codes):
+                raise ValueError(
+                    f"Queries and codes dimension doesn't match {len(queries)} != {len(codes)}"
+                )
+
+        def add_batch(ids: List[str], batch: List[Tuple[str, str]]) -> None:
+            self._vectorstore.add_question_answer(
+                [query for query, _ in batch], [code for _, code in batch], ids=ids
+            )
+
+        return self._ingest(
+            zip(queries, codes),
+            add_batch,
+            lambda entry: self._vectorstore._format_qa(*entry),
+            "qa",
+        )
+
+    def add_docs(self, docs: Iterable[str]) -> IngestionReport:
+        """
+        Add docs to the training set in batches
+        Args:
+            docs: docs to add
+
+        Returns:
+            IngestionReport: summary of the ingestion.
+        """
+
+        def add_batch(ids: List[str], batch: List[str]) -> None:
+            self._vectorstore.add_docs(batch, ids=ids)
+
+        return self._ingest(iter(docs), add_batch, lambda entry: entry, "docs")
+
+    def _ingest(
+        self,
+        entries: Iterator,
+        add_batch: Callable[[List[str], list], None],
+        get_content: Callable[[object], str],
+        suffix: str,
+    ) -> IngestionReport:
+        report = IngestionReport()
+        start_time = time.time()
+        pending: Set[Future] = set()
+        # Ids of the entries of this run, each content is written once
+        seen_ids: Set[str] = set()
+
+        def on_done(futures: Set[Future]) -> None:
+            for future in futures:
+                # Raise the error of the batch, if any
+                batch_id, batch_length = future.result()
+                self._save_checkpoint(batch_id)
+                report.ingested += batch_length
+                report.batches += 1
+
+            report.elapsed = time.time() - start_time
+            self._logger.log(
+                f"Ingested {report.ingested} entries "
+                f"({report.throughput:.1f} entries/s)"
+            )
+
+        def run(ids: List[str], batch: list, batch_id: str) -> Tuple[str, int]:
+            add_batch(ids, batch)
+            return batch_id, len(batch)
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for batch in self._batches(entries):
+                contents = [get_content(entry) for entry in batch]
+                batch_id = self._get_batch_id(contents)
+                if batch_id in self._completed_batches:
+                    report.skipped += len(batch)
+                    continue
+
+                unique_entries = {}
+                for entry, content in zip(batch, contents):
+                    id = self.get_content_id(content, suffix)
+                    if id in seen_ids:
+                        report.duplicates += 1
+                        continue
+                    seen_ids.add(id)
+                    unique_entries[id] = entry
+
+                if not unique_entries:
+                    self._save_checkpoint(batch_id)
+                    continue
+
+                # Keep a bounded number of batches in memory
+                if len(pending) >= self._max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    on_done(done)
+
+                pending.add(
+                    executor.submit(
+                        run,
+                        list(unique_entries.keys()),
+                        list(unique_entries.values()),
+                        batch_id,
+                    )
+                )
+
+            if pending:
+                done, _ = wait(pending)
+                on_done(done)
+
+        report.elapsed = time.time() - start_time
+        self._logger.log(f"Training data ingestion completed: {report}")
+        return report
+
+    def _batches(self, entries: Iterator) -> Iterator[list]:
+        while batch := list(islice(entries, self._batch_size)):
+            yield batch
+
+    @staticmethod
+    def _get_batch_id(contents: List[str]) -> str:
+        hash_object = hashlib.sha256()
+        for content in contents:
+            hash_object.update(content.encode())
+            hash_object.update(b"\x00")
+        return hash_object.hexdigest()
+
+    def _load_checkpoint(self) -> Set[str]:
+        if not self._checkpoint_path or not os.path.exists(self._checkpoint_path):
+            return set()
+
+        with open(self._checkpoint_path, "r", encoding="utf-8") as file:
+            return {line.strip() for line in file if line.strip()}
+
+    def _save_checkpoint(self, batch_id: str) -> None:
+        if not self._checkpoint_path:
+            return
+
+        with self._checkpoint_lock:
+            self._completed_batches.add(batch_id)
+            with open(self._checkpoint_path, "a", encoding="utf-8") as file:
+                file.write(f"{batch_id}\n")
@@ -0,0 +1,689 @@
+"""
+Local vector store
+
+Embedded vector store that needs no external service. The vectors of each
+collection are kept normalized in a float32 matrix, memory-mapped from disk
+when the store is persisted, so a query is a single matrix-vector product
+followed by a top-k selection. Large collections are searched through an
+inverted file index: the vectors are clustered and only the clusters closest to
+the question are scanned.
+
+The data is persisted in append-only files, one for the vectors and one for
+the documents and the deletions, so adding training data doesn't rewrite the
+collection.
+
+Example:
+    ```python
+    from pandasai.vectorstores.local_vectorstore import LocalVectorStore
+
+    vectorstore = LocalVectorStore(persist_path="vectorstore")
+    agent = Agent(dfs, vectorstore=vectorstore)
+    agent.train(queries=queries, codes=codes)
+    ```
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..constants import (
+    LOCAL_VECTORSTORE_DIMENSIONS,
+    LOCAL_VECTORSTORE_INDEX_THRESHOLD,
+    LOCAL_VECTORSTORE_NPROBE,
+)
+from ..helpers.logger import Logger
+from .vectorstore import VectorStore
+
+
+class HashingEmbeddingFunction:
+    """
+    Embeds texts by hashing their words and pairs of consecutive words into a
+    fixed number of dimensions, so no embedding model is needed.
+
+    Args:
+        dimensions (int): number of dimensions of the embeddings.
+    """
+
+    _token_pattern = re.compile(r"\w+")
+
+    def __init__(self, dimensions: int = LOCAL_VECTORSTORE_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> Iterable[str]:
+        words = self._token_pattern.findall(text.lower())
+        yield from words
+        yield from (f"{first} {second}" for first, second in zip(words, words[1:]))
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        embeddings = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+                value = int.from_bytes(digest, "big")
+                sign = 1.0 if value & 1 else -1.0
+                embeddings[row, (value >> 1) % self.dimensions] += sign
+        return embeddings
+
+
+class InvertedIndex:
+    """
+    Approximate nearest neighbours index clustering the vectors with k-means
+    and scanning only the clusters closest to the query.
+
+    Args:
+        nprobe (int): number of clusters scanned for a query.
+    """
+
+    def __init__(self, nprobe: int = LOCAL_VECTORSTORE_NPROBE):
+        self.nprobe = nprobe
+        self.size = 0
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+
+    def build(self, vectors: np.ndarray, rows: np.ndarray, seed: int = 0) -> None:
+        """
+        Cluster the vectors of the rows.
+
+        Args:
+            vectors (np.ndarray): normalized vectors of the collection.
+            rows (np.ndarray): rows to index.
+            seed (int): seed of the initialization of the clusters.
+        """
+        rng = np.random.default_rng(seed)
+        nlist = max(1, int(np.sqrt(len(rows))))
+
+        # Train the centroids on a sample of the vectors
+        sample_rows = rng.choice(rows, size=min(len(rows), nlist * 64), replace=False)
+        sample = vectors[np.sort(sample_rows)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(10):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = sample[assignments == cluster]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[cluster] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+        self._centroids = centroids
+        self._lists = [[] for _ in range(nlist)]
+        self.size = 0
+        self.add(vectors, rows)
+
+    def add(self, vectors: np.ndarray, rows: np.ndarray) -> None:
+        """
+        Assign the rows to their closest cluster.
+
+        Args:
+            vectors (np.ndarray): normalized vectors of the collection.
+            rows (np.ndarray): rows to add.
+        """
+        for start in range(0, len(rows), 8192):
+            block = rows[start : start + 8192]
+            assignments = np.argmax(vectors[block] @ self._centroids.T, axis=1)
+            for row, cluster in zip(block.tolist(), assignments.tolist()):
+                self._lists[cluster].append(row)
+        self.size += len(rows)
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        """
+        Return the rows of the clusters closest to the query.
+
+        Args:
+            query (np.ndarray): normalized query vector.
+
+        Returns:
+            np.ndarray: the candidate rows.
+        """
+        scores = self._centroids @ query
+        nprobe = min(self.nprobe, len(scores))
+        clusters = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        return np.fromiter(
+            (row for cluster in clusters for row in self._lists[cluster]),
+            dtype=np.int64,
+        )
+
+
+class LocalCollection:
+    """
+    Collection of documents and their vectors, kept in memory or persisted in
+    append-only files.
+
+    Args:
+        name (str): name of the collection.
+        path (str, optional): directory of the collection files, in memory only
+            if not provided.
+        index_threshold (int): number of vectors above which queries use the
+            approximate index.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: Optional[str] = None,
+        index_threshold: int = LOCAL_VECTORSTORE_INDEX_THRESHOLD,
+    ):
+        self.name = name
+        self.dimensions: Optional[int] = None
+        self._path = path
+        self._index_threshold = index_threshold
+        self._lock = threading.RLock()
+        self._reset()
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._load()
+
+    def _reset(self) -> None:
+        self._ids: List[Optional[str]] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Optional[dict]] = []
+        self._rows: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._vectors: Optional[np.ndarray] = None
+        self._count = 0
+        self._index: Optional[InvertedIndex] = None
+
+    def _file(self, extension: str) -> str:
+        return os.path.join(self._path, f"{self.name}.{extension}")
+
+    def _load(self) -> None:
+        if os.path.exists(self._file("meta.json")):
+            with open(self._file("meta.json"), "r", encoding="utf-8") as file:
+                self.dimensions = json.load(file)["dimensions"]
+
+        if self.dimensions is None or not os.path.exists(self._file("jsonl")):
+            return
+
+        # End of the last complete entry
+        end = 0
+        with open(self._file("jsonl"), "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # Incomplete write, the entries after it were never written
+                    break
+
+                if entry["op"] == "add":
+                    self._append_entry(
+                        entry["id"], entry["document"], entry["metadata"]
+                    )
+                else:
+                    self._delete_entry(entry["id"])
+                end += len(line)
+
+        # Drop the incomplete entry, so the next entries aren't appended to it
+        if os.path.getsize(self._file("jsonl")) > end:
+            os.truncate(self._file("jsonl"), end)
+
+        # Drop the vectors written without their entry
+        row_size = self.dimensions * np.dtype(np.float32).itemsize
+        if os.path.getsize(self._file("vectors")) > len(self._ids) * row_size:
+            os.truncate(self._file("vectors"), len(self._ids) * row_size)
+
+        self._count = len(self._ids)
+        self._map_vectors()
+
+    def _map_vectors(self) -> None:
+        if self._count:
+            self._vectors = np.memmap(
+                self._file("vectors"),
+                dtype=np.float32,
+                mode="r",
+                shape=(self._count, self.dimensions),
+            )
+
+    def _append_entry(self, id: str, document: str, metadata: Optional[dict]) -> None:
+        if id in self._rows:
+            self._delete_entry(id)
+
+        self._rows[id] = len(self._ids)
+        self._ids.append(id)
+        self._documents.append(document)
+        self._metadatas.append(metadata)
+        if len(self._alive) < len(self._ids):
+            self._alive = np.concatenate(
+                [self._alive, np.zeros(max(len(self._alive), 1024), dtype=bool)]
+            )
+        self._alive[len(self._ids) - 1] = True
+
+    def _delete_entry(self, id: str) -> bool:
+        row = self._rows.pop(id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(
+        self,
+        ids: List[str],
+        documents: List[str],
+        vectors: np.ndarray,
+        metadatas: Optional[List[dict]] = None,
+    ) -> List[str]:
+        """
+        Add or replace documents and their normalized vectors.
+
+        Args:
+            ids (List[str]): ids of the documents.
+            documents (List[str]): documents.
+            vectors (np.ndarray): normalized vectors of the documents.
+            metadatas (List[dict], optional): metadatas of the documents.
+
+        Returns:
+            List[str]: the ids of the documents.
+        """
+        metadatas = metadatas or [None] * len(ids)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+        with self._lock:
+            if self.dimensions is None:
+                self.dimensions = vectors.shape[1]
+                if self._path:
+                    with open(self._file("meta.json"), "w", encoding="utf-8") as file:
+                        json.dump({"dimensions": self.dimensions}, file)
+            elif vectors.shape[1] != self.dimensions:
+                raise ValueError(
+                    f"Embeddings dimension doesn't match {vectors.shape[1]} != {self.dimensions}"
+                )
+
+            start = len(self._ids)
+            for id, document, metadata in zip(ids, documents, metadatas):
+                self._append_entry(id, document, metadata)
+
+            if self._path:
+                # Vectors first, so the log never references missing vectors
+                with open(self._file("vectors"), "ab") as file:
+                    file.write(vectors.tobytes())
+                with open(self._file("jsonl"), "a", encoding="utf-8") as file:
+                    for id, document, metadata in zip(ids, documents, metadatas):
+                        entry = {
+                            "op": "add",
+                            "id": id,
+                            "document": document,
+                            "metadata": metadata,
+                        }
+                        file.write(json.dumps(entry) + "\n")
+                self._count = len(self._ids)
+                self._map_vectors()
+            else:
+                self._append_vectors(vectors)
+
+            if self._index is not None:
+                self._index.add(self._vectors, np.arange(start, len(self._ids)))
+
+        return ids
+
+    def _append_vectors(self, vectors: np.ndarray) -> None:
+        required = self._count + len(vectors)
+        if self._vectors is None or len(self._vectors) < required:
+            current = len(self._vectors) if self._vectors is not None else 256
+            capacity = max(required, 2 * current)
+            grown = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            if self._vectors is not None:
+                grown[: self._count] = self._vectors[: self._count]
+            self._vectors = grown
+
+        self._vectors[self._count : required] = vectors
+        self._count = required
+
+    def delete(self, ids: Iterable[str]) -> None:
+        """
+        Delete the documents.
+
+        Args:
+            ids (Iterable[str]): ids of the documents to delete.
+        """
+        with self._lock:
+            deleted = [id for id in ids if self._delete_entry(id)]
+            if self._path and deleted:
+                with open(self._file("jsonl"), "a", encoding="utf-8") as file:
+                    for id in deleted:
+                        file.write(json.dumps({"op": "delete", "id": id}) + "\n")
+
+    def drop(self) -> None:
+        """Delete every document of the collection and its files."""
+        with self._lock:
+            self._reset()
+            if self._path:
+                for extension in ["vectors", "jsonl", "meta.json"]:
+                    if os.path.exists(self._file(extension)):
+                        os.remove(self._file(extension))
+            self.dimensions = None
+
+    def get(self, ids: Iterable[str]) -> dict:
+        """
+        Return the documents with the given ids.
+
+        Args:
+            ids (Iterable[str]): ids of the documents.
+
+        Returns:
+            dict: the documents, metadatas and ids found.
+        """
+        rows = [self._rows[id] for id in ids if id in self._rows]
+        return {
+            "documents": [self._documents[row] for row in rows],
+            "metadatas": [self._metadatas[row] for row in rows],
+            "ids": [self._ids[row] for row in rows],
+        }
+
+    def query(
+        self, vector: np.ndarray, k: int, max_distance: Optional[float] = None
+    ) -> dict:
+        """
+        Return the k documents closest to the normalized vector.
+
+        Args:
+            vector (np.ndarray): normalized query vector.
+            k (int): number of documents.
+            max_distance (float, optional): maximum cosine distance.
+
+        Returns:
+            dict: the documents, cosine distances, metadatas and ids found.
+        """
+        with self._lock:
+            count = self._count
+            vectors = self._vectors
+            alive = self._alive[:count]
+            rows = self._get_candidate_rows(vector)
+
+        if not count or k <= 0:
+            return {"documents": [], "distances": [], "metadatas": [], "ids": []}
+
+        if rows is None:
+            scores = vectors[:count] @ vector
+            scores[~alive] = -np.inf
+            rows = np.arange(count)
+        else:
+            rows = rows[alive[rows]]
+            scores = vectors[rows] @ vector
+
+        k = min(k, len(rows))
+        if k == 0:
+            return {"documents": [], "distances": [], "metadatas": [], "ids": []}
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = [
+            (rows[position], 1.0 - float(scores[position]))
+            for position in top
+            if np.isfinite(scores[position])
+            and (max_distance is None or 1.0 - scores[position] < max_distance)
+        ]
+
+        return {
+            "documents": [self._documents[row] for row, _ in results],
+            "distances": [distance for _, distance in results],
+            "metadatas": [self._metadatas[row] for row, _ in results],
+            "ids": [self._ids[row] for row, _ in results],
+        }
+
+    def _get_candidate_rows(self, vector: np.ndarray) -> Optional[np.ndarray]:
+        if len(self._rows) < self._index_threshold:
+            self._index = None
+            return None
+
+        # Build the index again when the collection doubled since it was built
+        if self._index is None or len(self._rows) > 2 * self._index.size:
+            self._index = InvertedIndex()
+            rows = np.flatnonzero(self._alive[: self._count])
+            self._index.build(self._vectors, rows)
+
+        return self._index.candidates(vector)
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Implementation of an embedded vector store with NumPy
+
+    Args:
+        collection_name (str): name of the collections, stored as
+            `<collection_name>-qa` and `<collection_name>-docs`.
+        persist_path (str, optional): directory of the collections, in memory
+            only if not provided.
+        embedding_function (Callable, optional): function returning the
+            embeddings of a list of texts, words hashing by default.
+        max_samples (int): number of documents returned by a search.
+        similary_threshold (float, optional): maximum cosine distance of the
+            documents returned by a search.
+        logger (Logger, optional): logger.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = "pandasai",
+        persist_path: Optional[str] = None,
+        embedding_function: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        max_samples: int = 1,
+        similary_threshold: Optional[float] = None,
+        logger: Optional[Logger] = None,
+    ) -> None:
+        self._logger = logger or Logger()
+        self._max_samples = max_samples
+        self._similarity_threshold = similary_threshold
+        self._embedding_function = embedding_function or HashingEmbeddingFunction()
+
+        self._qa_collection = LocalCollection(f"{collection_name}-qa", persist_path)
+        self._docs_collection = LocalCollection(f"{collection_name}-docs", persist_path)
+
+        if persist_path:
+            self._logger.log(f"Persisting Agent Training data in {persist_path}")
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        embeddings = np.asarray(self._embedding_function(texts), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+
+    def add_question_answer(
+        self,
+        queries: Iterable[str],
+        codes: Iterable[str],
+        ids: Optional[Iterable[str]] = None,
+        metadatas: Optional[List[dict]] = None,
+    ) -> List[str]:
+        """
+        Add question and answer(code) to the training set
+        Args:
+            query: string of question
+            code: str
+            ids: Optional Iterable of ids associated with the texts.
+            metadatas: Optional list of metadatas associated with the texts.
+        Returns:
+            List of ids from adding the texts into the vectorstore.
+        """
+        if len(queries) != len(codes):
+            raise ValueError(
+                f"Queries and codes dimension doesn't match {len(queries)} != {len(codes)}"
+            )
+
+        if ids is None:
+            ids = [f"{str(uuid.uuid4())}-qa" for _ in queries]
+        qa_str = [self._format_qa(query, code) for query, code in zip(queries, codes)]
+
+        ids = self._qa_collection.add(list(ids), qa_str, self._embed(qa_str), metadatas)
+        self._increment_version()
+        return ids
+
+    def add_docs(
+        self,
+        docs: Iterable[str],
+        ids: Optional[Iterable[str]] = None,
+        metadatas: Optional[List[dict]] = None,
+    ) -> List[str]:
+        """
+        Add docs to the training set
+        Args:
+            docs: Iterable of strings to add to the vectorstore.
+            ids: Optional Iterable of ids associated with the texts.
+            metadatas: Optional list of metadatas associated with the texts.
+
+        Returns:
+            List of ids from adding the texts into the vectorstore.
+        """
+        docs = list(docs)
+        if ids is None:
+            ids = [f"{str(uuid.uuid4())}-docs" for _ in docs]
+
+        ids = self._docs_collection.add(list(ids), docs, self._embed(docs), metadatas)
+        self._increment_version()
+        return ids
+
+    def update_question_answer(
+        self,
+        ids: Iterable[str],
+        queries: Iterable[str],
+        codes: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+    ) -> List[str]:
+        """
+        Update question and answer(code) to the training set
+        Args:
+            ids: Iterable of ids associated with the texts.
+            queries: string of question
+            codes: str
+            metadatas: Optional list of metadatas associated with the texts.
+        Returns:
+            List of ids from updating the texts into the vectorstore.
+        """
+        return self.add_question_answer(queries, codes, ids, metadatas)
+
+    def update_docs(
+        self,
+        ids: Iterable[str],
+        docs: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+    ) -> List[str]:
+        """
+        Update docs to the training set
+        Args:
+            ids: Iterable of ids associated with the texts.
+            docs: Iterable of strings to update to the vectorstore.
+            metadatas: Optional list of metadatas associated with the texts.
+
+        Returns:
+            List of ids from adding the texts into the vectorstore.
+        """
+        return self.add_docs(docs, ids, metadatas)
+
+    def delete_question_and_answers(
+        self, ids: Optional[List[str]] = None
+    ) -> Optional[bool]:
+        """
+        Delete by vector ID to delete question and answers
+        Args:
+            ids: List of ids to delete
+
+        Returns:
+            Optional[bool]: True if deletion is successful,
+            False otherwise
+        """
+        self._qa_collection.delete(ids or [])
+        self._increment_version()
+        return True
+
+    def delete_docs(self, ids: Optional[List[str]] = None) -> Optional[bool]:
+        """
+        Delete by vector ID to delete docs
+        Args:
+            ids: List of ids to delete
+
+        Returns:
+            Optional[bool]: True if deletion is successful,
+            False otherwise
+        """
+        self._docs_collection.delete(ids or [])
+        self._increment_version()
+        return True
+
+    def delete_collection(self, collection_name: str) -> Optional[bool]:
+        """
+        Delete the collection
+        Args:
+            collection_name (str): name of the collection
+
+        Returns:
+            Optional[bool]: True if the collection was deleted
+        """
+        deleted = False
+        for collection in [self._qa_collection, self._docs_collection]:
+            if collection.name in [f"{collection_name}-qa", f"{collection_name}-docs"]:
+                collection.drop()
+                deleted = True
+
+        self._increment_version()
+        return deleted
+
+    def get_relevant_question_answers(self, question: str, k: int = None) -> dict:
+        """
+        Returns relevant question answers based on search
+        """
+        k = k or self._max_samples
+        return self._qa_collection.query(
+            self._embed([question])[0], k, self._similarity_threshold
+        )
+
+    def get_relevant_docs(self, question: str, k: int = None) -> dict:
+        """
+        Returns relevant documents based search
+        """
+        k = k or self._max_samples
+        return self._docs_collection.query(
+            self._embed([question])[0], k, self._similarity_threshold
+        )
+
+    def get_relevant_question_answers_by_id(self, ids: Iterable[str]) -> dict:
+        """
+        Returns relevant question answers based on ids
+        """
+        return self._qa_collection.get(ids)
+
+    def get_relevant_docs_by_id(self, ids: Iterable[str]) -> dict:
+        """
+        Returns relevant documents based on ids
+        """
+        return self._docs_collection.get(ids)
+
+    def get_relevant_qa_documents(self, question: str, k: int = None) -> List[str]:
+        """
+        Returns relevant question answers documents only
+        Args:
+            question (_type_): list of documents
+        """
+        return self.get_relevant_question_answers(question, k)["documents"]
+
+    def get_relevant_docs_documents(self, question: str, k: int = None) -> List[str]:
+        """
+        Returns relevant question answers documents only
+        Args:
+            question (_type_): list of documents
+        """
+        return self.get_relevant_docs(question, k)["documents"]
+
+    def get_relevant_documents(self, question: str) -> Tuple[List[str], List[str]]:
+        """
+        Returns relevant question answers documents and docs documents,
+        embedding the question once
+        """
+        vector = self._embed([question])[0]
+        return (
+            self._qa_collection.query(
+                vector, self._max_samples, self._similarity_threshold
+            )["documents"],
+            self._docs_collection.query(
+                vector, self._max_samples, self._similarity_threshold
+            )["documents"],
+        )
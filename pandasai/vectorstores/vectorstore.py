@@ -1,10 +1,35 @@
+import uuid
 from abc import ABC, abstractmethod
-from typing import Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
 
 
 class VectorStore(ABC):
     """Interface for vector store."""
 
+    _version: int = 0
+    _cache_id: Optional[str] = None
+
+    @property
+    def version(self) -> int:
+        """
+        Version of the collections, incremented every time training data is
+        added, updated or deleted through the vector store.
+        """
+        return self._version
+
+    def _increment_version(self) -> None:
+        self._version += 1
+
+    @property
+    def cache_id(self) -> str:
+        """
+        Identifier of the collections of the vector store in the retrieval cache.
+        """
+        if self._cache_id is None:
+            self._cache_id = str(uuid.uuid4())
+        return self._cache_id
+
     @abstractmethod
     def add_question_answer(
         self,
@@ -175,5 +200,20 @@ class VectorStore(ABC):
             "get_relevant_docs_documents method must be implemented by subclass."
         )
 
+    def get_relevant_documents(self, question: str) -> Tuple[List[str], List[str]]:
+        """
+        Returns relevant question answers documents and docs documents, querying
+        both collections concurrently
+        Args:
+            question (str): question to search for
+
+        Returns:
+            Tuple[List[str], List[str]]: question answers and docs documents
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            qa_documents = executor.submit(self.get_relevant_qa_documents, question)
+            docs_documents = executor.submit(self.get_relevant_docs_documents, question)
+            return qa_documents.result(), docs_documents.result()
+
     def _format_qa(self, query: str, code: str) -> str:
         return f"Q: {query}\n A: {code}"
@@ -0,0 +1,146 @@
+import datetime
+import unittest
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.controllers.dataset_stats import DatasetStatsController
+from app.models import Dataset, DatasetStats
+from app.repositories.dataset_stats import DatasetStatsRepository
+from core.database import Base
+
+
+class TestDatasetStatsController(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.repository = MagicMock()
+        self.repository.upsert = AsyncMock()
+        self.repository.session.commit = AsyncMock()
+        self.repository.session.rollback = AsyncMock()
+        self.controller = DatasetStatsController(self.repository)
+
+    def _dataset(self, table_name="orders", stats=None):
+        return Dataset(id=uuid.uuid4(), table_name=table_name, stats=stats)
+
+    def _patch(self, change_marker=None, compute_side_effect=None):
+        get_change_marker = patch(
+            "app.controllers.dataset_stats.get_change_marker",
+            new_callable=AsyncMock,
+            return_value=change_marker,
+        )
+        compute_dataset_stats = patch(
+            "app.controllers.dataset_stats.compute_dataset_stats",
+            new_callable=AsyncMock,
+            return_value={"rows_count": 1, "columns": [], "sample": None},
+            side_effect=compute_side_effect,
+        )
+        return get_change_marker, compute_dataset_stats
+
+    async def test_unchanged_marker_is_not_refreshed(self):
+        stats = DatasetStats(change_marker="10", refreshed_at=datetime.datetime.now())
+        get_change_marker, compute_dataset_stats = self._patch("10")
+
+        with get_change_marker, compute_dataset_stats as compute:
+            refreshed = await self.controller.refresh_dataset_stats(
+                self._dataset(stats=stats)
+            )
+
+        self.assertFalse(refreshed)
+        compute.assert_not_called()
+
+    async def test_unknown_marker_is_refreshed_only_when_stale(self):
+        fresh = DatasetStats(refreshed_at=datetime.datetime.now())
+        stale = DatasetStats(
+            refreshed_at=datetime.datetime.now() - datetime.timedelta(days=2)
+        )
+        get_change_marker, compute_dataset_stats = self._patch(None)
+
+        with get_change_marker, compute_dataset_stats as compute:
+            self.assertFalse(
+                await self.controller.refresh_dataset_stats(self._dataset(stats=fresh))
+            )
+            self.assertTrue(
+                await self.controller.refresh_dataset_stats(self._dataset(stats=stale))
+            )
+            self.assertTrue(await self.controller.refresh_dataset_stats(self._dataset()))
+
+        self.assertEqual(compute.await_count, 2)
+
+    async def test_refresh_all_continues_after_a_failure(self):
+        datasets = [self._dataset("missing"), self._dataset("orders")]
+        self.repository.get_datasets_with_stats = AsyncMock(return_value=datasets)
+
+        async def compute(table_name, sample_size):
+            if table_name == "missing":
+                raise RuntimeError("relation does not exist")
+            return {"rows_count": 1, "columns": [], "sample": None}
+
+        get_change_marker, compute_dataset_stats = self._patch(
+            "1", compute_side_effect=compute
+        )
+        with get_change_marker, compute_dataset_stats, self.assertLogs(
+            "app.controllers.dataset_stats"
+        ):
+            refreshed = await self.controller.refresh_all()
+
+        self.assertEqual(refreshed, 1)
+        self.repository.session.rollback.assert_awaited_once()
+        self.assertEqual(self.repository.upsert.call_args[0][0], datasets[1].id)
+
+
+class TestDatasetStatsControllerSession(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        self.session = AsyncSession(self.engine, expire_on_commit=False)
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.engine.dispose()
+
+    async def test_refresh_all_continues_after_a_rollback(self):
+        stale = DatasetStats(
+            change_marker="0",
+            refreshed_at=datetime.datetime.now() - datetime.timedelta(days=2),
+        )
+        # Fails in the transaction which loaded the datasets
+        self.session.add(Dataset(table_name="missing"))
+        await self.session.flush()
+        self.session.add_all(
+            [Dataset(table_name="orders", stats=stale), Dataset(table_name="customers")]
+        )
+        await self.session.commit()
+        controller = DatasetStatsController(
+            DatasetStatsRepository(DatasetStats, db_session=self.session)
+        )
+
+        async def compute(table_name, sample_size):
+            if table_name == "missing":
+                raise RuntimeError("relation does not exist")
+            return {"rows_count": 1, "columns": [], "sample": None}
+
+        with patch(
+            "app.controllers.dataset_stats.get_change_marker",
+            new_callable=AsyncMock,
+            return_value="1",
+        ), patch(
+            "app.controllers.dataset_stats.compute_dataset_stats",
+            side_effect=compute,
+        ), self.assertLogs("app.controllers.dataset_stats"):
+            refreshed = await controller.refresh_all()
+
+        self.assertEqual(refreshed, 2)
+        result = await self.session.execute(
+            select(Dataset.table_name, DatasetStats.change_marker).join(
+                DatasetStats
+            )
+        )
+        self.assertEqual(
+            sorted(result.all()), [("customers", "1"), ("orders", "1")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.models import ConversationMessage, UserConversation
+from app.repositories.conversation import ConversationRepository
+
+
+class TestConversationRepository(unittest.IsolatedAsyncioTestCase):
+    async def test_get_conversations_reads_first_message_laterally(self):
+        session_mock = AsyncMock()
+        repository = ConversationRepository(UserConversation, session_mock)
+
+        conversation = UserConversation(id=uuid.uuid4())
+        message = ConversationMessage(id=uuid.uuid4(), query="first")
+        empty_conversation = UserConversation(id=uuid.uuid4())
+
+        result_mock = MagicMock()
+        result_mock.all.return_value = [
+            (conversation, message),
+            (empty_conversation, None),
+        ]
+        session_mock.execute.return_value = result_mock
+
+        conversations = await repository.get_conversations("user", "workspace")
+
+        query = str(
+            session_mock.execute.call_args[0][0].compile(
+                dialect=postgresql.dialect()
+            )
+        )
+        self.assertIn("LEFT OUTER JOIN LATERAL", query)
+        self.assertEqual(conversations, [conversation, empty_conversation])
+        self.assertEqual(conversation.messages, [message])
+        self.assertEqual(empty_conversation.messages, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
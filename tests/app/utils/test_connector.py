@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import MagicMock, call, patch
+
+import pandas as pd
+
+from app.models import Dataset, DatasetStats
+from app.utils.connector import DatasetConnector, get_dataset_connector
+
+
+class TestDatasetConnector(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+        self.loader = MagicMock(return_value=self.df)
+        self.dataset = Dataset(
+            name="loans",
+            table_name="loans",
+            description="Loans",
+            head={"headers": ["a", "b"], "rows": [[1, "x"], [2, "y"]]},
+        )
+
+    def test_head_is_served_from_stored_head(self):
+        connector = get_dataset_connector(self.dataset, self.loader)
+
+        head = connector.get_head()
+
+        self.assertEqual(list(head.columns), ["a", "b"])
+        self.assertEqual(connector.columns_count, 2)
+        self.assertFalse(connector.is_loaded)
+        self.loader.assert_not_called()
+
+    def test_data_is_loaded_on_execute(self):
+        connector = get_dataset_connector(self.dataset, self.loader)
+
+        df = connector.execute()
+
+        self.assertTrue(connector.is_loaded)
+        self.assertEqual(connector.rows_count, 3)
+        self.loader.assert_called_once_with("SELECT * FROM loans")
+        pd.testing.assert_frame_equal(df, self.df)
+
+    def test_rows_count_without_loading_data(self):
+        loader = MagicMock(return_value=pd.DataFrame({"count": [42]}))
+        connector = DatasetConnector({"table": "loans"}, loader=loader)
+
+        self.assertEqual(connector.rows_count, 42)
+        self.assertFalse(connector.is_loaded)
+        loader.assert_called_once_with("SELECT COUNT(*) FROM loans")
+
+    def test_stats_are_used_when_available(self):
+        self.dataset.stats = DatasetStats(
+            rows_count=1000,
+            columns=[{"name": "a", "type": "int64"}, {"name": "b", "type": "object"}],
+            sample={"headers": ["a", "b"], "rows": [[3, "z"]]},
+        )
+        connector = get_dataset_connector(self.dataset, self.loader)
+
+        self.assertEqual(connector.rows_count, 1000)
+        self.assertEqual(connector.get_head()["a"].tolist(), [3])
+        self.loader.assert_not_called()
+
+    @patch("app.utils.connector.record_cache_lookup")
+    def test_head_lookups_count_hits_and_misses(self, record_cache_lookup):
+        connector = DatasetConnector({"table": "loans"}, loader=self.loader)
+
+        connector.head()
+        connector.head()
+
+        self.loader.assert_called_once_with("SELECT * FROM loans LIMIT 5")
+        self.assertEqual(
+            record_cache_lookup.call_args_list,
+            [call("schema", hit=False), call("schema", hit=True)],
+        )
+
+    @patch("app.utils.connector.record_cache_lookup")
+    def test_stored_head_lookups_count_only_memoized_heads(self, record_cache_lookup):
+        connector = DatasetConnector(
+            {"table": "loans"}, loader=self.loader, head=pd.DataFrame({"a": [1]})
+        )
+
+        connector.head()
+        connector.head()
+        connector.head(3)
+
+        self.loader.assert_not_called()
+        self.assertEqual(
+            record_cache_lookup.call_args_list,
+            [
+                call("schema", hit=False),
+                call("schema", hit=True),
+                call("schema", hit=False),
+            ],
+        )
+
+    @patch("app.utils.connector.record_cache_lookup")
+    def test_data_lookups_are_counted_once_per_execute(self, record_cache_lookup):
+        connector = DatasetConnector({"table": "loans"}, loader=self.loader)
+
+        connector.execute()
+        connector.pandas_df
+        connector.execute()
+
+        self.loader.assert_called_once_with("SELECT * FROM loans")
+        self.assertEqual(
+            record_cache_lookup.call_args_list,
+            [call("connector", hit=False), call("connector", hit=True)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
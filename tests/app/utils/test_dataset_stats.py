@@ -0,0 +1,51 @@
+import unittest
+
+from app.utils.dataset_stats import ColumnStatsCollector, DatasetStatsCollector
+
+
+class TestDatasetStatsCollector(unittest.TestCase):
+    def test_collects_rows_count_nulls_and_distinct_values(self):
+        collector = DatasetStatsCollector(["id", "status"], sample_size=5, seed=1)
+
+        collector.add_rows([(i, None if i % 4 == 0 else "paid") for i in range(100)])
+        stats = collector.to_dict()
+
+        self.assertEqual(stats["rows_count"], 100)
+        id_stats, status_stats = stats["columns"]
+        self.assertEqual(id_stats["name"], "id")
+        self.assertEqual(id_stats["type"], "int64")
+        self.assertEqual(id_stats["null_fraction"], 0.0)
+        self.assertEqual(id_stats["distinct_count"], 100)
+        self.assertEqual(status_stats["null_fraction"], 0.25)
+        self.assertEqual(status_stats["distinct_count"], 1)
+
+    def test_sample_is_bounded(self):
+        collector = DatasetStatsCollector(["id"], sample_size=5, seed=1)
+
+        collector.add_rows([(i,) for i in range(1000)])
+        stats = collector.to_dict()
+
+        self.assertEqual(stats["sample"]["headers"], ["id"])
+        self.assertEqual(len(stats["sample"]["rows"]), 5)
+
+    def test_empty_dataset(self):
+        stats = DatasetStatsCollector(["id"], sample_size=5).to_dict()
+
+        self.assertEqual(stats["rows_count"], 0)
+        self.assertEqual(stats["columns"][0]["null_fraction"], 0.0)
+        self.assertEqual(stats["sample"]["rows"], [])
+
+
+class TestColumnStatsCollector(unittest.TestCase):
+    def test_distinct_count_estimate(self):
+        column_stats = ColumnStatsCollector(sketch_size=256)
+
+        for value in range(20000):
+            column_stats.add(value % 10000)
+
+        estimate = column_stats.distinct_count()
+        self.assertTrue(8000 < estimate < 12000)
+
+
+if __name__ == "__main__":
+    unittest.main()
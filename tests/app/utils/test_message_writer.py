@@ -0,0 +1,173 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import uuid
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from app.models import UserConversation
+from app.repositories.conversation import ConversationRepository
+from app.utils.message_writer import ConversationMessageWriter
+
+
+class TestConversationMessageWriter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal_path = os.path.join(self.directory.name, "journal.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def _enqueue(self, writer, conversation_id, query="query"):
+        return await writer.enqueue(
+            conversation_id=conversation_id,
+            query=query,
+            response=[{"type": "string", "value": "1", "message": "1"}],
+            code_generated="result = 1",
+        )
+
+    def _patch_session(self):
+        return patch("app.utils.message_writer.async_session_factory")
+
+    async def test_flush_inserts_batches(self):
+        writer = ConversationMessageWriter(
+            batch_size=2, journal_path=self.journal_path
+        )
+        conversation_id = uuid.uuid4()
+        for i in range(3):
+            await self._enqueue(writer, conversation_id, f"query {i}")
+
+        with patch(
+            "app.utils.message_writer.ConversationRepository.add_conversation_messages",
+            new_callable=AsyncMock,
+        ) as add_messages, self._patch_session() as session_factory:
+            session_factory.return_value.__aenter__.return_value.commit = AsyncMock()
+            await writer.flush()
+
+            self.assertEqual(len(add_messages.call_args[0][0]), 2)
+            self.assertEqual(len(writer.get_pending_messages(conversation_id)), 1)
+            self.assertEqual(len(writer._read_journal()), 1)
+
+    async def test_journal_is_per_process(self):
+        writer = ConversationMessageWriter(journal_path=self.journal_path)
+        await self._enqueue(writer, uuid.uuid4())
+
+        self.assertEqual(
+            os.listdir(self.directory.name), [f"journal-{os.getpid()}.jsonl"]
+        )
+
+    async def test_concurrent_messages_are_journaled_together(self):
+        writer = ConversationMessageWriter(journal_path=self.journal_path)
+        conversation_id = uuid.uuid4()
+
+        with patch.object(
+            writer, "_append_journal_lines", wraps=writer._append_journal_lines
+        ) as append:
+            await asyncio.gather(
+                *[self._enqueue(writer, conversation_id) for _ in range(10)]
+            )
+
+        self.assertLess(append.call_count, 10)
+        self.assertEqual(len(writer._read_journal()), 10)
+
+    async def test_failed_flush_keeps_messages(self):
+        writer = ConversationMessageWriter(journal_path=self.journal_path)
+        conversation_id = uuid.uuid4()
+        await self._enqueue(writer, conversation_id)
+
+        with patch(
+            "app.utils.message_writer.async_session_factory",
+            side_effect=ConnectionError,
+        ):
+            with self.assertRaises(ConnectionError):
+                await writer.flush()
+
+        self.assertEqual(len(writer.get_pending_messages(conversation_id)), 1)
+
+    async def test_message_which_cant_be_inserted_is_dead_lettered(self):
+        writer = ConversationMessageWriter(journal_path=self.journal_path)
+        conversation_id = uuid.uuid4()
+        invalid = await self._enqueue(writer, conversation_id, "invalid")
+        await self._enqueue(writer, conversation_id, "valid")
+
+        async def add_messages(messages):
+            if any(message["query"] == "invalid" for message in messages):
+                raise IntegrityError("INSERT", {}, Exception("violation"))
+
+        with patch(
+            "app.utils.message_writer.ConversationRepository.add_conversation_messages",
+            side_effect=add_messages,
+        ) as add_messages_mock, self._patch_session() as session_factory:
+            session_factory.return_value.__aenter__.return_value.commit = AsyncMock()
+            with self.assertLogs("app.utils.message_writer"):
+                await writer.flush()
+
+        self.assertEqual(add_messages_mock.call_count, 3)
+        self.assertEqual(writer.get_pending_messages(conversation_id), [])
+        self.assertEqual(writer._read_journal(), [])
+        dead_letters = writer._read_journal(writer.dead_letter_path)
+        self.assertEqual([message["id"] for message in dead_letters], [invalid.id])
+
+    async def test_journal_is_recovered(self):
+        writer = ConversationMessageWriter(journal_path=self.journal_path)
+        conversation_id = uuid.uuid4()
+        message = await self._enqueue(writer, conversation_id)
+
+        recovered = ConversationMessageWriter(journal_path=self.journal_path)
+        with patch.object(recovered, "_run", new_callable=AsyncMock):
+            await recovered.start()
+
+        pending = recovered.get_pending_messages(conversation_id)
+        self.assertEqual(len(pending), 1)
+        self.assertEqual(pending[0].id, message.id)
+        self.assertEqual(pending[0].created_at, message.created_at)
+
+    async def test_journal_of_a_stopped_process_is_taken_over(self):
+        writer = ConversationMessageWriter(journal_path=self.journal_path)
+        conversation_id = uuid.uuid4()
+        message = await self._enqueue(writer, conversation_id)
+        # Journal of a process which is not running anymore, and a message
+        # journaled twice
+        stopped_path = os.path.join(self.directory.name, "journal-999999999.jsonl")
+        writer._write_lines(stopped_path, writer._pending * 2, "w")
+        os.remove(writer.process_journal_path)
+
+        recovered = ConversationMessageWriter(journal_path=self.journal_path)
+        with patch.object(recovered, "_run", new_callable=AsyncMock):
+            await recovered.start()
+
+        pending = recovered.get_pending_messages(conversation_id)
+        self.assertEqual(len(pending), 1)
+        self.assertEqual(pending[0].id, message.id)
+        self.assertFalse(os.path.exists(stopped_path))
+        self.assertEqual(len(recovered._read_journal()), 1)
+
+    async def test_journal_of_a_running_process_is_left(self):
+        running_path = os.path.join(
+            self.directory.name, f"journal-{os.getppid()}.jsonl"
+        )
+        with open(running_path, "w", encoding="utf-8"):
+            pass
+
+        writer = ConversationMessageWriter(journal_path=self.journal_path)
+        with patch.object(writer, "_run", new_callable=AsyncMock):
+            await writer.start()
+
+        self.assertTrue(os.path.exists(running_path))
+
+    async def test_insert_skips_inserted_messages(self):
+        session = AsyncMock()
+        repository = ConversationRepository(UserConversation, db_session=session)
+        await repository.add_conversation_messages([])
+
+        statement = str(
+            session.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+        )
+        self.assertIn("ON CONFLICT (id) DO NOTHING", statement)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import json
+import marshal
+import tempfile
+import tracemalloc
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pandasai.helpers.profiler import Profile, current_profile, profiled, profiling
+from pandasai.helpers.query_exec_tracker import QueryExecTracker
+
+from app.utils.profiling import ProfileSampler, ProfileStore
+from app.utils.result_store import LocalBlobStore
+
+
+@profiled("test.inner")
+def inner():
+    return sum(range(10000))
+
+
+@profiled("test.outer")
+def outer():
+    data = [str(i) for i in range(10000)]
+    return inner() + len(data)
+
+
+class TestProfile(unittest.TestCase):
+    def test_not_profiled_outside_of_the_context(self):
+        self.assertIsNone(current_profile())
+        self.assertEqual(outer(), sum(range(10000)) + 10000)
+
+    def test_sections_are_recorded(self):
+        profile = Profile()
+        profile.tracker = MagicMock()
+
+        with profiling(profile):
+            outer()
+
+        self.assertIsNone(current_profile())
+        self.assertEqual([s["name"] for s in profile.sections], ["test.inner", "test.outer"])
+        self.assertIn("peak_memory", profile.sections[1])
+        self.assertTrue(profile.sections[1]["allocations"])
+        profile.tracker.add_profile.assert_called_once_with(profile.to_dict())
+
+    def test_concurrent_profile_does_not_trace_memory(self):
+        first, second = Profile(), Profile()
+
+        with profiling(first), first.section("first"):
+            with profiling(second):
+                outer()
+            self.assertTrue(tracemalloc.is_tracing())
+
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertIn("allocations", first.sections[0])
+        self.assertEqual([s["name"] for s in second.sections], ["test.inner", "test.outer"])
+        for section in second.sections:
+            self.assertNotIn("memory", section)
+            self.assertNotIn("allocations", section)
+
+    @patch("pandasai.helpers.query_exec_tracker._publisher")
+    @patch.dict("os.environ", {"PANDASAI_API_KEY": "key"})
+    def test_summary_is_published_with_the_profile(self, publisher):
+        tracker = QueryExecTracker()
+        profile = Profile()
+
+        @profiled("test.chat")
+        def chat():
+            tracker.start_new_track(MagicMock(conversation_id="1"))
+            tracker.publish()
+            publisher.submit.assert_not_called()
+
+        with profiling(profile):
+            chat()
+
+        publisher.submit.assert_called_once()
+        summary = publisher.submit.call_args.args[3]
+        self.assertEqual(summary["profile"], profile.to_dict())
+
+    def test_collapsed_stacks(self):
+        profile = Profile()
+
+        with profiling(profile):
+            outer()
+
+        stacks = profile.collapsed_stacks().splitlines()
+        self.assertTrue(stacks)
+        for line in stacks:
+            stack, microseconds = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith("outer ("))
+            self.assertGreater(int(microseconds), 0)
+        self.assertTrue(any("inner (" in line for line in stacks))
+
+
+class TestProfileSampler(unittest.TestCase):
+    def test_disabled(self):
+        sampler = ProfileSampler(enabled=False, sample_rate=1.0)
+
+        self.assertIsNone(sampler.sample("1"))
+
+    def test_requested_with_header(self):
+        sampler = ProfileSampler(enabled=True, sample_rate=0.0)
+
+        self.assertIsNone(sampler.sample())
+        self.assertIsNone(sampler.sample("0"))
+        self.assertIsInstance(sampler.sample("true"), Profile)
+
+    def test_sampled(self):
+        sampler = ProfileSampler(enabled=True, sample_rate=1.0)
+
+        self.assertIsInstance(sampler.sample(), Profile)
+
+
+class TestProfileStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ProfileStore(LocalBlobStore(self.directory.name))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_profile_files_are_stored(self):
+        profile = Profile()
+        with profiling(profile):
+            outer()
+
+        profile_id = self.store.save(profile)
+
+        content, media_type = self.store.load(profile_id, "stacks.folded")
+        self.assertEqual(media_type, "text/plain")
+        self.assertEqual(content.decode(), profile.collapsed_stacks())
+
+        content, _ = self.store.load(profile_id, "profile.pstats")
+        self.assertEqual(marshal.loads(content), profile.stats.stats)
+
+        content, _ = self.store.load(profile_id, "sections.json")
+        self.assertEqual(len(json.loads(content)["sections"]), 2)
+
+    def test_unknown_file(self):
+        with self.assertRaises(KeyError):
+            self.store.load("0" * 32, "secrets.txt")
+        with self.assertRaises(KeyError):
+            self.store.load("../results", "stacks.folded")
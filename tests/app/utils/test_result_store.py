@@ -0,0 +1,146 @@
+import base64
+import json
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from app.utils.result_store import LocalBlobStore, ResultStore
+
+# 1x1 transparent PNG
+PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ResultStore(
+            LocalBlobStore(self.directory.name), preview_rows=2, secret_key="secret"
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_large_dataframe_is_offloaded(self):
+        value = {"headers": ["a", "b"], "rows": [[i, f"v{i}"] for i in range(10)]}
+        response = [{"type": "dataframe", "message": "df", "value": value}]
+
+        [item] = self.store.offload(response)
+
+        self.assertEqual(item["value"]["rows"], value["rows"][:2])
+        self.assertTrue(item["truncated"])
+        self.assertEqual(item["blob"]["rows_count"], 10)
+
+        content, media_type = self.store.load(item["blob"]["key"])
+        self.assertEqual(media_type, "application/json")
+        self.assertEqual(json.loads(content)["rows"], value["rows"])
+
+    def test_small_dataframe_is_kept(self):
+        response = [
+            {"type": "dataframe", "message": "df", "value": {"headers": ["a"], "rows": [[1]]}}
+        ]
+
+        self.assertEqual(self.store.offload(response), response)
+
+    def test_plot_is_offloaded(self):
+        plot = f"data:image/png;base64,{base64.b64encode(PNG).decode()}"
+        response = [{"type": "plot", "message": "plot", "value": plot}]
+
+        [item] = self.store.offload(response)
+
+        key = item["blob"]["key"]
+        self.assertEqual(item["value"], f"/v1/results/{key}")
+        content, media_type = self.store.load(key)
+        self.assertTrue(media_type.startswith("image/"))
+        self.assertEqual(self.store.offload([item]), [item])
+
+    def test_same_content_gives_same_key(self):
+        value = {"headers": ["a"], "rows": [[i] for i in range(5)]}
+        response = [{"type": "dataframe", "message": "df", "value": value}]
+
+        first = self.store.offload(response)[0]["blob"]["key"]
+        second = self.store.offload(response)[0]["blob"]["key"]
+
+        self.assertEqual(first, second)
+
+    def test_resolve_signs_the_urls(self):
+        plot = f"data:image/png;base64,{base64.b64encode(PNG).decode()}"
+        value = {"headers": ["a"], "rows": [[i] for i in range(5)]}
+        response = self.store.offload(
+            [
+                {"type": "plot", "message": "plot", "value": plot},
+                {"type": "dataframe", "message": "df", "value": value},
+            ]
+        )
+
+        plot_item, dataframe_item = self.store.resolve(response)
+
+        for url, key in [
+            (plot_item["value"], response[0]["blob"]["key"]),
+            (dataframe_item["blob"]["url"], response[1]["blob"]["key"]),
+        ]:
+            url = urlparse(url)
+            params = parse_qs(url.query)
+            self.assertEqual(url.path, f"/v1/results/{key}")
+            self.assertTrue(
+                self.store.verify_url(
+                    key, int(params["expires"][0]), params["signature"][0]
+                )
+            )
+        # The stored response is left as is
+        self.assertNotIn("url", response[1]["blob"])
+
+    def test_verify_url(self):
+        key = "a" * 64 + ".png"
+        params = parse_qs(urlparse(self.store.get_url(key)).query)
+        expires, signature = int(params["expires"][0]), params["signature"][0]
+
+        self.assertTrue(self.store.verify_url(key, expires, signature))
+        self.assertFalse(self.store.verify_url("b" * 64 + ".png", expires, signature))
+        self.assertFalse(self.store.verify_url(key, expires + 1, signature))
+        self.assertFalse(self.store.verify_url(key, None, None))
+        with patch("app.utils.result_store.time.time", return_value=expires + 1):
+            self.assertFalse(self.store.verify_url(key, expires, signature))
+
+    def test_cleanup_deletes_unused_blobs(self):
+        old, recent = self.store.offload(
+            [
+                {
+                    "type": "dataframe",
+                    "message": "df",
+                    "value": {"headers": ["a"], "rows": [[i + j] for i in range(5)]},
+                }
+                for j in range(2)
+            ]
+        )
+        old_path = self.store.blob_store._get_path(old["blob"]["key"])
+        os.utime(old_path, (time.time() - 3600, time.time() - 3600))
+
+        self.assertEqual(self.store.cleanup(max_age=60), 1)
+        self.assertFalse(self.store.blob_store.exists(old["blob"]["key"]))
+        self.assertTrue(self.store.blob_store.exists(recent["blob"]["key"]))
+
+    def test_concurrent_puts_of_the_same_blob(self):
+        blob_store = self.store.blob_store
+        key = "ab" + "0" * 62 + ".png"
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: blob_store.put(key, PNG), range(32)))
+
+        self.assertEqual(blob_store.get(key), PNG)
+        self.assertEqual(
+            os.listdir(os.path.dirname(blob_store._get_path(key))), [key]
+        )
+
+    def test_invalid_key(self):
+        with self.assertRaises(KeyError):
+            self.store.load("../../etc/passwd")
+
+
+if __name__ == "__main__":
+    unittest.main()
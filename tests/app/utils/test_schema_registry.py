@@ -0,0 +1,149 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import anyio
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from app.models import SemanticSchema
+from app.repositories.semantic_schema import SemanticSchemaRepository
+from app.utils.schema_registry import DatabaseSchemaRegistry
+
+SCHEMA = [{"name": "Orders", "table": "orders", "measures": [], "dimensions": []}]
+
+
+class TestDatabaseSchemaRegistry(unittest.IsolatedAsyncioTestCase):
+    def _patch_repository(self, method: str, return_value=None):
+        return patch(
+            f"app.utils.schema_registry.SemanticSchemaRepository.{method}",
+            new_callable=AsyncMock,
+            return_value=return_value,
+        )
+
+    async def test_warm_loads_latest_schemas(self):
+        registry = DatabaseSchemaRegistry()
+        schemas = [SemanticSchema(fingerprint="a", version=2, definition=SCHEMA)]
+
+        with self._patch_repository("get_latest_schemas", schemas), patch(
+            "app.utils.schema_registry.async_session_factory"
+        ):
+            self.assertEqual(await registry.warm(), 1)
+
+        with self._patch_repository("get_latest_schema") as get_latest_schema:
+            schema = await anyio.to_thread.run_sync(registry.get, "a")
+
+        self.assertEqual(schema, SCHEMA)
+        get_latest_schema.assert_not_called()
+
+    async def test_miss_loads_schema_from_database(self):
+        registry = DatabaseSchemaRegistry()
+        stored = SemanticSchema(fingerprint="a", version=1, definition=SCHEMA)
+
+        with self._patch_repository("get_latest_schema", stored), patch(
+            "app.utils.schema_registry.async_session_factory"
+        ):
+            self.assertEqual(await anyio.to_thread.run_sync(registry.get, "a"), SCHEMA)
+
+        with self._patch_repository("get_latest_schema") as get_latest_schema:
+            self.assertEqual(await anyio.to_thread.run_sync(registry.get, "a"), SCHEMA)
+        get_latest_schema.assert_not_called()
+
+    async def test_set_saves_new_version(self):
+        registry = DatabaseSchemaRegistry()
+
+        with self._patch_repository("add_version") as add_version, patch(
+            "app.utils.schema_registry.async_session_factory"
+        ) as session_factory:
+            session_factory.return_value.__aenter__.return_value.commit = AsyncMock()
+            await anyio.to_thread.run_sync(registry.set, "a", SCHEMA)
+
+        add_version.assert_awaited_once_with("a", SCHEMA)
+        self.assertEqual(registry.get("a"), SCHEMA)
+
+    async def test_outside_worker_thread_keeps_schema_in_memory(self):
+        registry = DatabaseSchemaRegistry()
+
+        with self._patch_repository("add_version") as add_version:
+            registry.set("a", SCHEMA)
+
+        add_version.assert_not_called()
+        self.assertEqual(registry.get("a"), SCHEMA)
+
+    async def test_latest_schemas_query(self):
+        session_mock = AsyncMock()
+        session_mock.execute.return_value = MagicMock()
+        repository = SemanticSchemaRepository(SemanticSchema, session_mock)
+        await repository.get_latest_schemas()
+
+        query = str(
+            session_mock.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+        )
+        self.assertNotIn("DISTINCT", query)
+        self.assertIn("max(semantic_schema.version)", query)
+        self.assertIn("GROUP BY semantic_schema.fingerprint", query)
+        self.assertIn(
+            "semantic_schema.fingerprint = anon_1.fingerprint"
+            " AND semantic_schema.version = anon_1.version",
+            query,
+        )
+
+
+class TestSemanticSchemaRepository(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.session = AsyncMock()
+        self.session.add = MagicMock()
+        self.session.info = {}
+        savepoint = MagicMock()
+        savepoint.__aexit__.return_value = False
+        self.session.begin_nested = MagicMock(return_value=savepoint)
+        self.repository = SemanticSchemaRepository(SemanticSchema, self.session)
+
+    def _results(self, *values):
+        results = []
+        for value in values:
+            result = MagicMock()
+            result.scalar.return_value = value
+            result.scalars.return_value.first.return_value = value
+            results.append(result)
+        self.session.execute.side_effect = results
+
+    async def test_add_version_reads_from_primary(self):
+        self._results(2)
+
+        schema = await self.repository.add_version("a", SCHEMA)
+
+        self.assertTrue(self.session.info["has_written"])
+        self.assertEqual((schema.fingerprint, schema.version), ("a", 3))
+        self.session.add.assert_called_once_with(schema)
+        self.session.flush.assert_awaited_once()
+
+    async def test_add_version_retries_after_conflict(self):
+        other = SemanticSchema(fingerprint="a", version=3, definition=[])
+        self._results(2, other, 3)
+        self.session.flush.side_effect = [IntegrityError("", {}, Exception()), None]
+
+        schema = await self.repository.add_version("a", SCHEMA)
+
+        self.assertEqual(schema.version, 4)
+        self.assertEqual(self.session.flush.await_count, 2)
+
+    async def test_add_version_returns_same_schema_saved_concurrently(self):
+        saved = SemanticSchema(fingerprint="a", version=3, definition=SCHEMA)
+        self._results(2, saved)
+        self.session.flush.side_effect = IntegrityError("", {}, Exception())
+
+        self.assertIs(await self.repository.add_version("a", SCHEMA), saved)
+        self.session.flush.assert_awaited_once()
+
+    async def test_add_version_gives_up_after_attempts(self):
+        other = SemanticSchema(fingerprint="a", version=3, definition=[])
+        self._results(*[2, other] * 3)
+        self.session.flush.side_effect = IntegrityError("", {}, Exception())
+
+        with self.assertRaises(IntegrityError):
+            await self.repository.add_version("a", SCHEMA)
+        self.assertEqual(self.session.flush.await_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import uuid
+from unittest.mock import patch
+
+from app.schemas.responses.organization import OrganizationBase
+from app.schemas.responses.space import SpaceBase
+from app.schemas.responses.users import UserInfo
+from app.utils.user_info_cache import UserInfoCache
+
+
+def _user_info(user_id=None, space_id=None) -> UserInfo:
+    return UserInfo(
+        email="john.doe@example.com",
+        first_name="john",
+        id=user_id or uuid.uuid4(),
+        organizations=[OrganizationBase(id=uuid.uuid4(), name="org")],
+        space=SpaceBase(id=space_id or uuid.uuid4(), name="space", slug="space"),
+    )
+
+
+class TestUserInfoCache(unittest.TestCase):
+    def test_returns_cached_user_info(self):
+        cache = UserInfoCache(ttl=60)
+        user_info = _user_info()
+
+        cache.set("user", user_info)
+
+        self.assertIs(cache.get("user"), user_info)
+        self.assertIsNone(cache.get("other"))
+
+    def test_entries_expire(self):
+        cache = UserInfoCache(ttl=60)
+
+        with patch("app.utils.user_info_cache.time.time", return_value=1000):
+            cache.set("user", _user_info())
+        with patch("app.utils.user_info_cache.time.time", return_value=1061):
+            self.assertIsNone(cache.get("user"))
+
+    def test_invalidate_user(self):
+        cache = UserInfoCache(ttl=60)
+        user_info = _user_info()
+        cache.set(str(user_info.id), user_info)
+        cache.set("anonymous", user_info)
+        cache.set("other", _user_info())
+
+        cache.invalidate_user(user_info.id)
+
+        self.assertIsNone(cache.get(str(user_info.id)))
+        self.assertIsNone(cache.get("anonymous"))
+        self.assertIsNotNone(cache.get("other"))
+
+    def test_invalidate_workspace(self):
+        cache = UserInfoCache(ttl=60)
+        space_id = uuid.uuid4()
+        cache.set("user", _user_info(space_id=space_id))
+        cache.set("other", _user_info())
+
+        cache.invalidate_workspace(space_id)
+
+        self.assertIsNone(cache.get("user"))
+        self.assertIsNotNone(cache.get("other"))
@@ -82,7 +82,7 @@ class TestBaseController:
 
         result = await base_controller.get_all(skip=0, limit=10)
         assert result == [mock_instance]
-        mock_repository.get_all.assert_called_once_with(0, 10, None)
+        mock_repository.get_all.assert_called_once_with(0, 10, None, None)
 
     @pytest.mark.asyncio
     @patch(
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.database.chat_session import ChatDatabasePool
+
+
+@pytest.fixture
+def chat_pool(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'chat.db'}", pool_size=2, max_overflow=0
+    )
+    yield ChatDatabasePool(engine)
+    asyncio.run(engine.dispose())
+
+
+class TestChatDatabasePool:
+    def test_connections_are_checked_out_per_query(self, chat_pool):
+        async def query(pool_status):
+            async with chat_pool.connect() as connection:
+                pool_status.append(chat_pool.get_status()["checked_out"])
+                await connection.execute(text("SELECT 1"))
+                await asyncio.sleep(0.01)
+
+        async def run():
+            pool_status = []
+            await asyncio.gather(query(pool_status), query(pool_status))
+            return pool_status
+
+        pool_status = asyncio.run(run())
+
+        assert max(pool_status) == 2
+        status = chat_pool.get_status()
+        assert status["checkouts"] == 2
+        assert status["checked_out"] == 0
+        assert status["waiting"] == 0
+        assert status["saturation"] == 0.0
@@ -0,0 +1,93 @@
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import Column, Integer, insert, select
+
+from core.database import Base
+from core.database.replicas import ReplicaSet
+from core.database.session import RoutingSession, use_primary
+
+
+class MockReplicatedModel(Base):
+    __tablename__ = "mock_table_replicas"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+
+def _engine():
+    engine = MagicMock()
+    engine.sync_engine = MagicMock()
+    return engine
+
+
+class TestReplicaSet:
+    @patch("core.database.replicas.event.listen", MagicMock())
+    def test_round_robin_skips_unhealthy_replicas(self):
+        primary, first, second = _engine(), _engine(), _engine()
+        replica_set = ReplicaSet(primary, [first, second])
+
+        assert [replica_set.get_reader() for _ in range(4)] == [
+            first,
+            second,
+            first,
+            second,
+        ]
+
+        replica_set.mark_unhealthy(first.sync_engine)
+        assert replica_set.get_reader() == second
+        assert replica_set.get_reader() == second
+
+        replica_set.mark_unhealthy(second.sync_engine)
+        assert replica_set.get_reader() == primary
+
+    @patch("core.database.replicas.event.listen", MagicMock())
+    def test_primary_without_replicas(self):
+        primary = _engine()
+        replica_set = ReplicaSet(primary, [])
+
+        assert replica_set.get_reader() == primary
+
+    @patch("core.database.replicas.event.listen", MagicMock())
+    def test_disconnect_marks_replica_unhealthy(self):
+        primary, replica = _engine(), _engine()
+        replica_set = ReplicaSet(primary, [replica])
+
+        replica_set._on_error(
+            MagicMock(is_disconnect=True, engine=replica.sync_engine)
+        )
+
+        assert not replica_set.is_healthy(replica)
+        assert replica_set.get_reader() == primary
+
+
+class TestRoutingSession:
+    def test_reads_own_writes_after_write(self):
+        primary, replica = _engine(), _engine()
+        with patch("core.database.replicas.event.listen", MagicMock()):
+            replica_set = ReplicaSet(primary, [replica])
+
+        with patch("core.database.session.replica_set", replica_set):
+            routing_session = RoutingSession()
+            read = select(MockReplicatedModel)
+
+            assert routing_session.get_bind(clause=read) == replica.sync_engine
+
+            write = insert(MockReplicatedModel)
+            assert routing_session.get_bind(clause=write) == primary.sync_engine
+            assert routing_session.get_bind(clause=read) == primary.sync_engine
+
+            routing_session.close()
+            assert routing_session.get_bind(clause=read) == replica.sync_engine
+
+    def test_use_primary_routes_reads_to_primary(self):
+        primary, replica = _engine(), _engine()
+        with patch("core.database.replicas.event.listen", MagicMock()):
+            replica_set = ReplicaSet(primary, [replica])
+
+        with patch("core.database.session.replica_set", replica_set):
+            routing_session = RoutingSession()
+            read = select(MockReplicatedModel)
+
+            use_primary(routing_session)
+            assert routing_session.get_bind(clause=read) == primary.sync_engine
+
+            routing_session.close()
+            assert routing_session.get_bind(clause=read) == replica.sync_engine
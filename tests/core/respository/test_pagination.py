@@ -0,0 +1,86 @@
+import datetime
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.future import select
+
+from core.database import Base
+from core.exceptions import BadRequestException
+from core.repository.pagination import (
+    decode_cursor,
+    encode_cursor,
+    get_next_cursor,
+    keyset_paginate,
+)
+
+
+class MockPaginatedModel(Base):
+    __tablename__ = "mock_table_pagination"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    created_at = Column(DateTime)
+
+
+def _compile(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+class TestPagination:
+    def test_cursor_round_trip(self):
+        created_at = datetime.datetime(2024, 6, 3, 14, 21, 18, 123456)
+        id_ = uuid.uuid4()
+
+        assert decode_cursor(encode_cursor(created_at, id_)) == (
+            created_at,
+            str(id_),
+        )
+
+    def test_invalid_cursor(self):
+        with pytest.raises(BadRequestException):
+            decode_cursor("not a cursor")
+
+    def test_first_page_is_only_ordered(self):
+        query = keyset_paginate(
+            select(MockPaginatedModel),
+            MockPaginatedModel.id,
+            MockPaginatedModel.created_at,
+            order="desc",
+        )
+
+        sql = _compile(query)
+        assert "WHERE" not in sql
+        assert (
+            "ORDER BY mock_table_pagination.created_at DESC, "
+            "mock_table_pagination.id DESC" in sql
+        )
+
+    def test_next_page_starts_after_cursor(self):
+        cursor = encode_cursor(datetime.datetime(2024, 6, 3), 42)
+
+        query = keyset_paginate(
+            select(MockPaginatedModel),
+            MockPaginatedModel.id,
+            MockPaginatedModel.created_at,
+            cursor,
+        )
+
+        assert (
+            "WHERE (mock_table_pagination.created_at, mock_table_pagination.id) > "
+            in _compile(query)
+        )
+
+    def test_get_next_cursor(self):
+        items = [
+            SimpleNamespace(id=i, created_at=datetime.datetime(2024, 6, i + 1))
+            for i in range(3)
+        ]
+
+        page, cursor = get_next_cursor(items, 2)
+        assert page == items[:2]
+        assert decode_cursor(cursor) == (items[1].created_at, "1")
+
+        page, cursor = get_next_cursor(items, 3)
+        assert page == items
+        assert cursor is None
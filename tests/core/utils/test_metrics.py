@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from prometheus_client import CollectorRegistry, generate_latest
+
+from core.utils.metrics import DatabasePoolCollector, generate_metrics
+
+
+def chat_pool_status():
+    return {
+        "size": 4,
+        "checked_out": 1,
+        "overflow": 0,
+        "waiting": 2,
+        "checkouts": 10,
+        "timeouts": 1,
+        "average_wait": 0.5,
+    }
+
+
+def engine(size, checked_out, overflow):
+    engine = MagicMock()
+    engine.pool.size.return_value = size
+    engine.pool.checkedout.return_value = checked_out
+    engine.pool.overflow.return_value = overflow
+    return engine
+
+
+class TestDatabasePoolCollector(unittest.TestCase):
+    def setUp(self):
+        replica_set = MagicMock()
+        replica_set.primary = engine(10, 3, -2)
+        replica_set.replicas = [engine(5, 1, 1)]
+
+        chat_pool = MagicMock()
+        chat_pool.get_status.return_value = chat_pool_status()
+
+        for name, value in [("replica_set", replica_set), ("chat_pool", chat_pool)]:
+            patcher = patch(f"core.utils.metrics.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.registry = CollectorRegistry()
+        self.registry.register(DatabasePoolCollector())
+
+    def test_pool_gauges(self):
+        get = self.registry.get_sample_value
+
+        self.assertEqual(get("db_pool_size", {"pool": "primary"}), 10)
+        self.assertEqual(get("db_pool_checked_out", {"pool": "primary"}), 3)
+        # Negative while the pool is filling up
+        self.assertEqual(get("db_pool_overflow", {"pool": "primary"}), 0)
+        self.assertEqual(get("db_pool_overflow", {"pool": "replica_0"}), 1)
+        self.assertEqual(get("db_pool_size", {"pool": "chat"}), 4)
+        self.assertEqual(get("chat_db_pool_waiting"), 2)
+
+    def test_chat_pool_counters(self):
+        get = self.registry.get_sample_value
+
+        self.assertEqual(get("chat_db_pool_checkouts_total"), 10)
+        self.assertEqual(get("chat_db_pool_timeouts_total"), 1)
+        self.assertEqual(get("chat_db_pool_wait_seconds_total"), 5)
+
+    def test_text_format(self):
+        content = generate_latest(self.registry).decode()
+
+        self.assertIn('db_pool_size{pool="replica_0"} 5.0', content)
+
+
+class TestGenerateMetrics(unittest.TestCase):
+    def test_pipeline_metrics_are_exposed(self):
+        from pandasai.helpers.metrics import record_cache_lookup
+
+        record_cache_lookup("code", hit=True)
+
+        with patch("core.utils.metrics.chat_pool") as chat_pool:
+            chat_pool.get_status.return_value = chat_pool_status()
+            content, media_type = generate_metrics()
+
+        self.assertTrue(media_type.startswith("text/plain"))
+        self.assertIn(
+            b'pandasai_cache_lookups_total{cache="code",result="hit"}', content
+        )
+        self.assertIn(b"dataset_load_rows_bucket", content)
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from core.fastapi.middlewares import TracingMiddleware
+from core.utils.telemetry import get_span_exporter
+
+
+app = FastAPI()
+
+
+@app.get("/items/{item_id}")
+async def get_item(item_id: str):
+    return PlainTextResponse(item_id)
+
+
+@app.get("/fail")
+async def fail():
+    return PlainTextResponse("error", status_code=500)
+
+
+def request(app, path, headers=None):
+    """Sends a GET request to the ASGI app and returns the response messages."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (key.encode("latin-1"), value.encode("latin-1"))
+            for key, value in (headers or {}).items()
+        ],
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages
+
+
+class TestTracingMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+
+        patcher = patch(
+            "core.fastapi.middlewares.tracing.tracer", provider.get_tracer("test")
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.app = TracingMiddleware(app)
+
+    def test_span_is_named_after_the_route(self):
+        messages = request(self.app, "/items/42")
+
+        self.assertEqual(messages[-1]["body"], b"42")
+        [span] = self.exporter.get_finished_spans()
+        self.assertEqual(span.name, "GET /items/{item_id}")
+        self.assertEqual(span.attributes["http.target"], "/items/42")
+        self.assertEqual(span.attributes["http.status_code"], 200)
+        self.assertTrue(span.status.is_ok)
+
+    def test_server_error_sets_error_status(self):
+        request(self.app, "/fail")
+
+        [span] = self.exporter.get_finished_spans()
+        self.assertEqual(span.attributes["http.status_code"], 500)
+        self.assertFalse(span.status.is_ok)
+
+    def test_trace_of_the_caller_is_continued(self):
+        trace_id = "0af7651916cd43dd8448eb211c80319c"
+        request(
+            self.app,
+            "/items/1",
+            headers={"traceparent": f"00-{trace_id}-b7ad6b7169203331-01"},
+        )
+
+        [span] = self.exporter.get_finished_spans()
+        self.assertEqual(format(span.context.trace_id, "032x"), trace_id)
+
+
+class TestSpanExporter(unittest.TestCase):
+    def test_file_exporter_appends_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spans", "spans.jsonl")
+            exporter = get_span_exporter("file", path)
+            provider = TracerProvider()
+            provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+            tracer = provider.get_tracer("test")
+            with tracer.start_as_current_span("parent"):
+                with tracer.start_as_current_span("child"):
+                    pass
+            provider.shutdown()
+            exporter.out.close()
+
+            with open(path, encoding="utf-8") as file:
+                spans = [json.loads(line) for line in file]
+
+        self.assertEqual([span["name"] for span in spans], ["child", "parent"])
+        self.assertEqual(spans[0]["parent_id"], spans[1]["context"]["span_id"])
+
+    def test_unknown_exporter(self):
+        with self.assertRaises(ValueError):
+            get_span_exporter("unknown")
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool, SingletonThreadPool
+
+from pandasai.connectors.engine_registry import EngineRegistry
+
+
+class TestEngineRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = EngineRegistry(pool_size=3, max_overflow=1)
+        self.directory = tempfile.TemporaryDirectory()
+        self.url = f"sqlite:///{os.path.join(self.directory.name, 'data.db')}"
+
+    def tearDown(self):
+        self.registry.dispose()
+        self.directory.cleanup()
+
+    def test_engine_is_reused(self):
+        engine = self.registry.get_engine(self.url)
+
+        self.assertIs(self.registry.get_engine(self.url), engine)
+
+    def test_engines_are_isolated_by_url_and_arguments(self):
+        engine = self.registry.get_engine(self.url)
+        other_url = f"sqlite:///{os.path.join(self.directory.name, 'other.db')}"
+
+        self.assertIsNot(self.registry.get_engine(other_url), engine)
+        self.assertIsNot(self.registry.get_engine(self.url, echo=True), engine)
+
+    def test_queue_pool_is_sized(self):
+        engine = self.registry.get_engine(self.url)
+
+        self.assertIsInstance(engine.pool, QueuePool)
+        self.assertEqual(engine.pool.size(), 3)
+
+    def test_in_memory_sqlite_engine(self):
+        engine = self.registry.get_engine("sqlite:///:memory:")
+
+        self.assertIsInstance(engine.pool, SingletonThreadPool)
+        with self.registry.connect(engine, "table") as connection:
+            self.assertEqual(connection.execute(text("SELECT 1")).scalar(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
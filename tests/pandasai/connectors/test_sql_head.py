@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from pandasai.connectors.sql import HeadCache, SqliteConnector, head_cache
+
+
+class TestHeadCache(unittest.TestCase):
+    def test_least_recently_used_head_is_evicted(self):
+        cache = HeadCache(maxsize=2)
+        head = pd.DataFrame({"id": [1]})
+
+        cache.set("a", head)
+        cache.set("b", head)
+        cache.get("a", ttl=60)
+        cache.set("c", head)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get("a", ttl=60))
+        self.assertIsNone(cache.get("b", ttl=60))
+
+    def test_expired_head_is_removed(self):
+        cache = HeadCache()
+        cache.set("a", pd.DataFrame({"id": [1]}))
+
+        with patch("pandasai.connectors.sql.time.time", return_value=time.time() + 61):
+            self.assertIsNone(cache.get("a", ttl=60))
+        self.assertEqual(len(cache), 0)
+
+    def test_returns_copies(self):
+        cache = HeadCache()
+        cache.set("a", pd.DataFrame({"id": [1]}))
+
+        head = cache.get("a", ttl=60)
+        head.loc[0, "id"] = 2
+
+        self.assertEqual(cache.get("a", ttl=60).loc[0, "id"], 1)
+
+
+class TestSqliteConnectorHead(unittest.TestCase):
+    def setUp(self):
+        head_cache.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.directory.name, "data.db")
+        with sqlite3.connect(self.database) as connection:
+            connection.execute("CREATE TABLE keyed (id INTEGER PRIMARY KEY, v TEXT)")
+            connection.execute("CREATE TABLE unkeyed (v INTEGER)")
+            connection.executemany(
+                "INSERT INTO keyed VALUES (?, ?)", [(i, f"v{i}") for i in range(500)]
+            )
+            connection.executemany(
+                "INSERT INTO unkeyed VALUES (?)", [(i,) for i in range(500)]
+            )
+
+    def tearDown(self):
+        head_cache.clear()
+        self.directory.cleanup()
+
+    def _connector(self, table):
+        return SqliteConnector({"database": self.database, "table": table})
+
+    def test_head_of_a_keyed_table(self):
+        head = self._connector("keyed").head(5)
+
+        self.assertEqual(list(head.columns), ["id", "v"])
+        self.assertEqual(len(head), 5)
+
+    def test_sample_without_primary_key_is_read_from_a_random_offset(self):
+        connector = self._connector("unkeyed")
+
+        with patch.object(
+            connector, "_read_sql", wraps=connector._read_sql
+        ) as read, patch("pandasai.connectors.sql.random.randint", return_value=250):
+            sample = connector._sample(5)
+
+        query = str(read.call_args[0][0])
+        self.assertIn("OFFSET", query)
+        self.assertNotIn("ORDER BY", query)
+        self.assertEqual(sample["v"].tolist(), list(range(250, 350)))
+
+    def test_filtered_sample_falls_back_to_the_first_rows(self):
+        connector = self._connector("unkeyed")
+        connector.set_additional_filters([["v", "<", 50]])
+
+        with patch("pandasai.connectors.sql.random.randint", return_value=250):
+            sample = connector._sample(5)
+
+        self.assertEqual(sample["v"].tolist(), list(range(50)))
+
+    def test_head_is_cached_across_connectors(self):
+        self._connector("keyed").head(5)
+
+        connector = self._connector("keyed")
+        with patch.object(connector, "_sample") as sample:
+            head = connector.head(5)
+
+        sample.assert_not_called()
+        self.assertEqual(len(head), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
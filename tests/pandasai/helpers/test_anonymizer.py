@@ -0,0 +1,141 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from pandasai.helpers.anonymizer import (
+    PII_PATTERNS,
+    Anonymizer,
+    _match,
+    classification_cache,
+)
+
+
+class TestAnonymizer(unittest.TestCase):
+    def setUp(self):
+        classification_cache.clear()
+        self.addCleanup(classification_cache.clear)
+        self.anonymizer = Anonymizer(seed=42)
+
+    def test_exact_values_are_masked(self):
+        df = pd.DataFrame(
+            {
+                "email": ["john.doe@example.com", "jane@example.org"],
+                "phone": ["555-123-4567", "+44 555 123 4567"],
+                "card": ["1234-5678-9012-3456", "1234 5678 9012 3456"],
+            }
+        )
+
+        classification = self.anonymizer.classify_columns(df)
+        masked = self.anonymizer.anonymize_dataframe(df, classification)
+
+        self.assertEqual(
+            classification,
+            {
+                "email": {"email": 1.0},
+                "phone": {"phone_number": 1.0},
+                "card": {"credit_card": 1.0},
+            },
+        )
+        for col, kind in [
+            ("email", "email"),
+            ("phone", "phone_number"),
+            ("card", "credit_card"),
+        ]:
+            for original, value in zip(df[col], masked[col]):
+                self.assertNotEqual(value, original)
+                self.assertRegex(value, f"^{PII_PATTERNS[kind]}$")
+        self.assertTrue(masked["phone"][1].startswith("+44 "))
+
+    def test_embedded_values_are_masked(self):
+        df = pd.DataFrame(
+            {
+                "note": [
+                    "call 555-123-4567 after 5pm",
+                    "write to john@example.com or jane@example.org",
+                    "card 1234 5678 9012 3456 expired",
+                    "nothing to hide",
+                ]
+            }
+        )
+
+        masked = self.anonymizer.anonymize_dataframe(df)["note"]
+
+        self.assertRegex(masked[0], r"^call \d{10} after 5pm$")
+        self.assertNotIn("555-123-4567", masked[0])
+        self.assertRegex(masked[1], r"^write to \S+@\S+ or \S+@\S+$")
+        self.assertNotIn("john@example.com", masked[1])
+        self.assertNotIn("jane@example.org", masked[1])
+        self.assertRegex(masked[2], r"^card \d{4}[- ]\d{4}[- ]\d{4}[- ]\d{4} expired$")
+        self.assertNotIn("1234 5678 9012 3456", masked[2])
+        self.assertEqual(masked[3], "nothing to hide")
+
+    def test_longer_numbers_are_not_masked(self):
+        df = pd.DataFrame({"id": ["order 12345678901234", "call 555-123-4567"]})
+
+        masked = self.anonymizer.anonymize_dataframe(df)["id"]
+
+        self.assertEqual(masked[0], "order 12345678901234")
+        self.assertNotEqual(masked[1], "call 555-123-4567")
+
+    def test_nan_and_non_string_columns(self):
+        df = pd.DataFrame(
+            {
+                "phone": ["555-123-4567", None, np.nan],
+                "number": [5551234567, 1, 2],
+                "amount": [1.5, np.nan, 3.0],
+                "flag": [True, False, True],
+            }
+        )
+
+        classification = self.anonymizer.classify_columns(df)
+        masked = self.anonymizer.anonymize_dataframe(df, classification)
+
+        self.assertEqual(set(classification), {"phone", "number"})
+        self.assertEqual(classification["phone"], {"phone_number": 1.0})
+        self.assertTrue(masked["phone"][1:].isna().all())
+        self.assertNotEqual(masked["number"][0], 5551234567)
+        self.assertEqual(masked["number"][1:].tolist(), [1, 2])
+        pd.testing.assert_series_equal(masked["amount"], df["amount"])
+        pd.testing.assert_series_equal(masked["flag"], df["flag"])
+
+    def test_empty_dataframe(self):
+        df = pd.DataFrame({"email": []})
+
+        self.assertIs(self.anonymizer.anonymize_dataframe(df), df)
+
+    def test_seeded_outputs_are_reproducible(self):
+        df = pd.DataFrame({"email": ["a@example.com", "b@example.com"]})
+
+        first = Anonymizer(seed=1).anonymize_dataframe(df)
+        second = Anonymizer(seed=1).anonymize_dataframe(df)
+
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_classification_is_cached_by_fingerprint(self):
+        df = pd.DataFrame({"email": ["a@example.com", "b@example.com"]})
+
+        with patch("pandasai.helpers.anonymizer._match", wraps=_match) as match:
+            first = self.anonymizer.classify_columns(df)
+            calls = match.call_count
+            second = self.anonymizer.classify_columns(df.copy())
+
+        self.assertGreater(calls, 0)
+        self.assertEqual(match.call_count, calls)
+        self.assertIs(first, second)
+        self.assertEqual(len(classification_cache), 1)
+
+    def test_changed_data_is_classified_again(self):
+        df = pd.DataFrame({"contact": ["a@example.com", "b@example.com"]})
+        self.anonymizer.classify_columns(df)
+
+        df["contact"] = ["555-123-4567", "555-765-4321"]
+        classification = self.anonymizer.classify_columns(df)
+
+        self.assertEqual(classification, {"contact": {"phone_number": 1.0}})
+        self.assertEqual(len(classification_cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+import unittest
+import uuid
+from unittest.mock import PropertyMock, patch
+
+import duckdb
+import pandas as pd
+
+from pandasai.connectors.pandas import PandasConnector
+from pandasai.helpers.code_cache import code_cache
+from pandasai.helpers.logger import Logger
+from pandasai.llm.fake import FakeLLM
+from pandasai.pipelines.chat.code_cleaning import CodeCleaning
+from pandasai.pipelines.pipeline_context import PipelineContext
+from pandasai.schemas.df_config import Config
+from pandasai.skills import skill
+
+CODE = """
+import pandas as pd
+df = dfs[0]
+result = {"type": "number", "value": len(df)}
+"""
+
+PLOT_CODE = """
+import matplotlib.pyplot as plt
+dfs[0].plot()
+plt.savefig("plot.png")
+result = {"type": "plot", "value": "plot.png"}
+"""
+
+SQL_CODE = """
+df = execute_sql_query("SELECT COUNT(*) AS count FROM orders")
+result = {"type": "dataframe", "value": df}
+"""
+
+SKILL_CODE = """
+import numpy as np
+total = count_orders(dfs[0])
+result = {"type": "number", "value": np.int64(total)}
+"""
+
+
+@skill
+def count_orders(df):
+    """Counts the orders of the dataframe"""
+    return len(df)
+
+
+def get_dfs(columns=("id", "amount")):
+    return [
+        PandasConnector(
+            {"original_df": pd.DataFrame({column: [1, 2] for column in columns})},
+            name="orders",
+        )
+    ]
+
+
+class TestCodeCache(unittest.TestCase):
+    def setUp(self):
+        code_cache.clear()
+        self.addCleanup(code_cache.clear)
+
+    def clean(self, code, dfs=None, skills=(), prompt_id=None, **config):
+        context = PipelineContext(dfs or get_dfs(), Config(llm=FakeLLM(), **config))
+        context.add("last_prompt_id", prompt_id or uuid.uuid4())
+        if skills:
+            context.skills_manager.add_skills(*skills)
+
+        output = CodeCleaning().execute(
+            code, context=context, logger=Logger(save_logs=False)
+        )
+        return output.output, context
+
+    def assert_miss(self, code, **kwargs):
+        misses = code_cache.misses
+        self.clean(code, **kwargs)
+        self.assertEqual(code_cache.misses, misses + 1)
+
+    def test_same_code_is_a_hit(self):
+        first, first_context = self.clean(CODE)
+        second, second_context = self.clean(CODE)
+
+        self.assertEqual(second, first)
+        self.assertEqual((code_cache.hits, code_cache.misses), (1, 1))
+        self.assertIs(
+            second_context.get("cleaned_code"), first_context.get("cleaned_code")
+        )
+
+    def test_changed_code_is_a_miss(self):
+        self.clean(CODE)
+
+        self.assert_miss(CODE.replace("len(df)", "len(df) + 1"))
+        self.assertEqual(len(code_cache), 2)
+
+    def test_direct_sql_is_part_of_the_key(self):
+        self.clean(SQL_CODE)
+
+        dfs = get_dfs()
+        dfs[0].enable_sql_query()
+        self.addCleanup(duckdb.execute, 'DROP TABLE IF EXISTS "orders"')
+        self.assert_miss(SQL_CODE, dfs=dfs, direct_sql=True)
+
+    def test_table_name_is_part_of_the_key(self):
+        dfs = get_dfs()
+        dfs[0].enable_sql_query()
+        self.addCleanup(duckdb.execute, 'DROP TABLE IF EXISTS "orders"')
+        code, _ = self.clean(SQL_CODE, dfs=dfs, direct_sql=True)
+
+        with patch.object(
+            PandasConnector,
+            "cs_table_name",
+            new_callable=PropertyMock,
+            return_value='"orders_v2"',
+        ):
+            misses = code_cache.misses
+            renamed, _ = self.clean(SQL_CODE, dfs=dfs, direct_sql=True)
+
+        self.assertEqual(code_cache.misses, misses + 1)
+        self.assertIn("FROM orders", code)
+        self.assertIn('FROM "orders_v2"', renamed)
+
+    def test_save_charts_and_path_are_part_of_the_key(self):
+        prompt_id = uuid.uuid4()
+        temporary, _ = self.clean(PLOT_CODE, prompt_id=prompt_id)
+
+        misses = code_cache.misses
+        first, _ = self.clean(
+            PLOT_CODE, prompt_id=prompt_id, save_charts=True, save_charts_path="a"
+        )
+        second, _ = self.clean(
+            PLOT_CODE, prompt_id=prompt_id, save_charts=True, save_charts_path="b"
+        )
+
+        self.assertEqual(code_cache.misses, misses + 2)
+        self.assertEqual(len({temporary, first, second}), 3)
+
+    def test_saved_charts_are_named_after_the_prompt(self):
+        first, _ = self.clean(PLOT_CODE, save_charts=True, save_charts_path="a")
+        second, _ = self.clean(PLOT_CODE, save_charts=True, save_charts_path="a")
+
+        self.assertEqual(code_cache.misses, 2)
+        self.assertNotEqual(first, second)
+
+    def test_whitelist_is_part_of_the_key(self):
+        self.clean(CODE)
+
+        self.assert_miss(CODE, custom_whitelisted_dependencies=["seaborn"])
+
+    def test_skills_are_part_of_the_key(self):
+        self.clean(SKILL_CODE)
+
+        self.assert_miss(SKILL_CODE, skills=[count_orders])
+
+    def test_dataframes_are_part_of_the_key(self):
+        self.clean(CODE)
+
+        self.assert_miss(CODE, dfs=get_dfs(columns=("id", "total")))
+
+    def test_hit_restores_the_cleaning_results(self):
+        _, first_context = self.clean(SKILL_CODE, skills=[count_orders])
+        cleaned_code = first_context.get("cleaned_code")
+        # Set by the code execution, once it listed the dataframes used
+        cleaned_code.required_dfs = [0]
+
+        _, context = self.clean(SKILL_CODE, skills=[count_orders])
+
+        self.assertEqual(code_cache.hits, 1)
+        self.assertEqual(context.skills_manager.used_skills, ["count_orders"])
+        self.assertEqual(
+            context.get("additional_dependencies"),
+            first_context.get("additional_dependencies"),
+        )
+        self.assertIn(
+            "numpy",
+            [
+                dependency["module"]
+                for dependency in context.get("additional_dependencies")
+            ],
+        )
+        self.assertEqual(context.get("cleaned_code").required_dfs, [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
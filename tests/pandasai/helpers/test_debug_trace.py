@@ -0,0 +1,114 @@
+import logging
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pandasai.helpers import debug_trace
+from pandasai.helpers.debug_trace import DebugTracer
+
+
+class TestDebugTracer(unittest.TestCase):
+    def setUp(self):
+        # The runs are kept in context variables, reset them after each test
+        self.addCleanup(debug_trace._sampled.reset, debug_trace._sampled.set(None))
+        self.addCleanup(debug_trace._tracker.reset, debug_trace._tracker.set(None))
+        logger = logging.getLogger("pandasai.trace")
+        self.addCleanup(logger.setLevel, logger.level)
+
+    def traced(self, tracer, names, level=logging.DEBUG):
+        """Trace the points, return the emitted messages"""
+        with patch.object(tracer._logger, "log") as log:
+            for name in names:
+                tracer.trace(name, "value: %s", name, level=level)
+
+        return [call.args[1] % call.args[2:] for call in log.call_args_list]
+
+    def test_disabled_by_default(self):
+        tracer = DebugTracer()
+
+        self.assertFalse(tracer.enabled)
+        self.assertEqual(self.traced(tracer, ["code_execution.result"]), [])
+
+    def test_points_are_enabled_by_pattern(self):
+        tracer = DebugTracer("code_execution.*, agent.response")
+
+        traced = self.traced(
+            tracer, ["code_execution.result", "code_generator.code", "agent.response"]
+        )
+
+        self.assertEqual(
+            traced,
+            [
+                "[code_execution.result] value: code_execution.result",
+                "[agent.response] value: agent.response",
+            ],
+        )
+
+    def test_points_below_the_level_are_not_emitted(self):
+        tracer = DebugTracer("*", level=logging.INFO)
+
+        self.assertFalse(tracer.is_enabled("agent.response", logging.DEBUG))
+        self.assertTrue(tracer.is_enabled("agent.response", logging.INFO))
+        self.assertEqual(self.traced(tracer, ["agent.response"]), [])
+        self.assertEqual(
+            len(self.traced(tracer, ["agent.response"], logging.WARNING)), 1
+        )
+
+    def test_runs_are_sampled_as_a_whole(self):
+        tracer = DebugTracer("*", sample_rate=0.5)
+
+        with patch("pandasai.helpers.debug_trace.random.random", return_value=0.9):
+            tracer.start_run()
+        with patch("pandasai.helpers.debug_trace.random.random", return_value=0.1):
+            self.assertFalse(tracer.is_enabled("agent.response"))
+            self.assertFalse(tracer.is_enabled("code_execution.result"))
+
+            tracer.start_run()
+
+        with patch("pandasai.helpers.debug_trace.random.random", return_value=0.9):
+            self.assertTrue(tracer.is_enabled("agent.response"))
+            self.assertTrue(tracer.is_enabled("code_execution.result"))
+
+    def test_traces_are_captured_in_the_tracker(self):
+        tracer = DebugTracer("*", capture=True)
+        tracker = MagicMock()
+
+        tracer.start_run(tracker)
+        with self.assertLogs("pandasai.trace", level=logging.DEBUG):
+            tracer.trace("agent.response", "Agent response: %s", "42")
+
+        tracker.add_step.assert_called_once()
+        step = tracker.add_step.call_args.args[0]
+        self.assertEqual(step["type"], "Trace")
+        self.assertEqual(step["name"], "agent.response")
+        self.assertEqual(step["message"], "Agent response: 42")
+
+    def test_traces_are_not_captured_by_default(self):
+        tracer = DebugTracer("*")
+        tracker = MagicMock()
+
+        tracer.start_run(tracker)
+        with self.assertLogs("pandasai.trace", level=logging.DEBUG):
+            tracer.trace("agent.response", "Agent response: %s", "42")
+
+        tracker.add_step.assert_not_called()
+
+    def test_level_from_env(self):
+        for value, level in [("info", logging.INFO), ("15", 15), (" WARNING ", 30)]:
+            with patch.dict(os.environ, {"PANDASAI_TRACE_LEVEL": value}):
+                self.assertEqual(DebugTracer.from_env().level, level)
+
+    def test_invalid_level_from_env(self):
+        with patch.dict(os.environ, {"PANDASAI_TRACE_LEVEL": "verbose"}):
+            with self.assertLogs("pandasai.trace", level=logging.WARNING):
+                tracer = DebugTracer.from_env()
+
+        self.assertEqual(tracer.level, logging.DEBUG)
+
+    def test_invalid_level(self):
+        with self.assertRaises(ValueError):
+            DebugTracer("*", level="verbose")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import logging
+import unittest
+
+from pandasai.helpers.logger import Logger
+
+
+class _Unformattable:
+    def __str__(self):
+        raise AssertionError("formatted")
+
+
+class TestLogger(unittest.TestCase):
+    def setUp(self):
+        self.logger = Logger(save_logs=False)
+
+    def test_logs_keep_the_formatted_message(self):
+        response = {"value": [1, 2]}
+
+        self.logger.log("Response: %s", logging.INFO, response)
+        response["value"].append(3)
+
+        self.assertEqual(self.logger.logs[0]["msg"], "Response: {'value': [1, 2]}")
+        self.assertEqual(self.logger.logs[0]["level"], "INFO")
+        self.assertIsInstance(self.logger._logs[0][0], str)
+
+    def test_disabled_level_is_not_formatted(self):
+        self.logger.log("Value: %s", logging.DEBUG, _Unformattable())
+
+        self.assertEqual(self.logger.logs, [])
+
+    def test_logs_are_bounded(self):
+        logger = Logger(save_logs=False, max_logs=3)
+
+        for i in range(5):
+            logger.log(f"message {i}")
+
+        self.assertEqual(
+            [log["msg"] for log in logger.logs], ["message 2", "message 3", "message 4"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
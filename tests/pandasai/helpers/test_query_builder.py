@@ -0,0 +1,160 @@
+import copy
+import unittest
+
+from pandasai.ee.helpers import query_builder as query_builder_module
+from pandasai.ee.helpers.query_builder import QueryBuilder, get_query_builder
+
+
+def get_schema():
+    return [
+        {
+            "name": "Orders",
+            "table": "orders",
+            "measures": [
+                {"name": "total_amount", "type": "sum", "sql": "amount"},
+                {"name": "order_count", "type": "count", "sql": "id"},
+            ],
+            "dimensions": [
+                {"name": "id", "type": "int", "sql": "id"},
+                {"name": "status", "type": "string", "sql": "status"},
+                {"name": "customer_id", "type": "int", "sql": "customer_id"},
+                {"name": "created_at", "type": "time", "sql": "created_at"},
+            ],
+        },
+        {
+            "name": "Customers",
+            "table": "customers",
+            "measures": [],
+            "dimensions": [
+                {"name": "id", "type": "int", "sql": "id"},
+                {"name": "country", "type": "string", "sql": "country"},
+            ],
+            "joins": [
+                {
+                    "name": "Orders",
+                    "join_type": "left",
+                    "sql": "${Orders.customer_id} = ${Customers.id}",
+                }
+            ],
+        },
+    ]
+
+
+QUERIES = [
+    {"measures": ["Orders.total_amount"], "dimensions": ["Orders.status"]},
+    {
+        "measures": ["Orders.total_amount", "Orders.order_count"],
+        "dimensions": ["Customers.country"],
+        "filters": [
+            {"member": "Orders.status", "operator": "equals", "values": ["paid"]}
+        ],
+        "order": [{"id": "Orders.total_amount", "direction": "desc"}],
+        "limit": 10,
+    },
+    {
+        "measures": ["Orders.order_count"],
+        "timeDimensions": [
+            {
+                "dimension": "Orders.created_at",
+                "granularity": "month",
+                "dateRange": ["2024-01-01", "2024-12-31"],
+            }
+        ],
+    },
+    {
+        "measures": ["Orders.total_amount"],
+        "filters": [
+            {"member": "Orders.total_amount", "operator": "gt", "values": [100]}
+        ],
+    },
+]
+
+
+class TestQueryBuilderMemo(unittest.TestCase):
+    def setUp(self):
+        query_builder_module._query_builders.clear()
+        self.addCleanup(query_builder_module._query_builders.clear)
+
+    def test_memoized_sql_matches_generated_sql(self):
+        query_builder = QueryBuilder(get_schema())
+        unmemoized = QueryBuilder(get_schema())
+
+        for query in QUERIES:
+            expected = unmemoized._generate_sql(copy.deepcopy(query))
+            self.assertEqual(query_builder.generate_sql(copy.deepcopy(query)), expected)
+            # Served from the memo
+            self.assertEqual(query_builder.generate_sql(copy.deepcopy(query)), expected)
+
+        self.assertEqual(len(query_builder._sql_cache), len(QUERIES))
+
+    def test_memo_is_keyed_by_normalized_query(self):
+        query_builder = QueryBuilder(get_schema())
+        query = QUERIES[1]
+        reordered = dict(reversed(list(copy.deepcopy(query).items())))
+
+        sql = query_builder.generate_sql(query)
+
+        self.assertEqual(query_builder.generate_sql(reordered), sql)
+        self.assertEqual(len(query_builder._sql_cache), 1)
+
+    def test_changed_query_invalidates_memo(self):
+        query_builder = QueryBuilder(get_schema())
+        query = copy.deepcopy(QUERIES[1])
+        sql = query_builder.generate_sql(query)
+
+        query["filters"][0]["values"] = ["refunded"]
+        changed = query_builder.generate_sql(query)
+
+        self.assertNotEqual(changed, sql)
+        self.assertIn("LEFT JOIN `customers`", changed)
+        self.assertIn("'refunded'", changed)
+        self.assertEqual(changed, QueryBuilder(get_schema())._generate_sql(query))
+
+    def test_memo_is_bounded(self):
+        query_builder = QueryBuilder(get_schema(), sql_cache_size=2)
+
+        for query in QUERIES:
+            query_builder.generate_sql(query)
+
+        self.assertEqual(len(query_builder._sql_cache), 2)
+
+    def test_same_schema_shares_builder(self):
+        schema = get_schema()
+
+        query_builder = get_query_builder(schema)
+
+        self.assertIs(get_query_builder(schema), query_builder)
+        self.assertIs(get_query_builder(get_schema()), query_builder)
+
+    def test_changed_schema_invalidates_memo(self):
+        schema = get_schema()
+        query = QUERIES[0]
+        sql = get_query_builder(schema).generate_sql(query)
+
+        schema[0]["table"] = "orders_v2"
+        schema[0]["measures"][0]["sql"] = "net_amount"
+        changed = get_query_builder(schema).generate_sql(query)
+
+        self.assertNotEqual(changed, sql)
+        self.assertIn("`orders_v2`.`net_amount`", changed)
+        self.assertEqual(
+            changed, QueryBuilder(copy.deepcopy(schema))._generate_sql(query)
+        )
+
+    def test_builder_is_not_changed_with_the_schema(self):
+        schema = get_schema()
+        query_builder = get_query_builder(schema)
+        sql = query_builder.generate_sql(QUERIES[0])
+
+        schema[0]["table"] = "orders_v2"
+
+        self.assertEqual(query_builder.find_table("Orders")["table"], "orders")
+        self.assertEqual(
+            query_builder.generate_sql(QUERIES[0]),
+            QueryBuilder(get_schema())._generate_sql(QUERIES[0]),
+        )
+        self.assertEqual(query_builder.generate_sql(QUERIES[0]), sql)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import threading
+import unittest
+
+from pandasai.helpers.query_exec_tracker import _Publisher
+
+
+class TestQueryPublisher(unittest.TestCase):
+    def test_returns_the_result(self):
+        publisher = _Publisher(maxsize=2)
+
+        future = publisher.submit(lambda a, b: a + b, 1, 2)
+
+        self.assertEqual(future.result(timeout=5), 3)
+        self.assertEqual(publisher.dropped, 0)
+
+    def test_drops_and_counts_when_full(self):
+        publisher = _Publisher(maxsize=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        running = publisher.submit(block)
+        started.wait(5)
+        queued = publisher.submit(lambda: 1)
+
+        self.assertIsNone(publisher.submit(lambda: 2))
+        self.assertIsNone(publisher.submit(lambda: 3))
+        self.assertEqual(publisher.dropped, 2)
+
+        release.set()
+        running.result(timeout=5)
+        self.assertEqual(queued.result(timeout=5), 1)
+
+    def test_exception_is_set_on_the_future(self):
+        publisher = _Publisher(maxsize=1)
+
+        future = publisher.submit(lambda: 1 / 0)
+
+        with self.assertRaises(ZeroDivisionError):
+            future.result(timeout=5)
@@ -0,0 +1,148 @@
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from pandasai.connectors.pandas import PandasConnector
+from pandasai.helpers.logger import Logger
+from pandasai.helpers.retrieval_cache import RetrievalCache, retrieval_cache
+from pandasai.llm.fake import FakeLLM
+from pandasai.pipelines.chat.retrieval import Retrieval
+from pandasai.pipelines.pipeline_context import PipelineContext
+from pandasai.prompts.generate_python_code import GeneratePythonCodePrompt
+from pandasai.schemas.df_config import Config
+from pandasai.vectorstores.local_vectorstore import LocalVectorStore
+
+QUESTION = "What is the revenue by country?"
+
+
+def get_vectorstore():
+    vectorstore = LocalVectorStore(logger=Logger(save_logs=False))
+    vectorstore.add_question_answer(
+        [QUESTION], ["result = df.groupby('country')['revenue'].sum()"]
+    )
+    vectorstore.add_docs(["The revenue is in euros"])
+    return vectorstore
+
+
+class TestRetrieval(unittest.TestCase):
+    def setUp(self):
+        retrieval_cache.clear()
+        self.addCleanup(retrieval_cache.clear)
+
+    def retrieve(self, vectorstore, question=QUESTION):
+        dfs = [
+            PandasConnector(
+                {"original_df": pd.DataFrame({"country": ["FR"], "revenue": [1]})}
+            )
+        ]
+        context = PipelineContext(
+            dfs, Config(llm=FakeLLM(), enable_cache=False), vectorstore=vectorstore
+        )
+        context.memory.add(question, True)
+
+        Retrieval().execute(None, context=context, logger=Logger(save_logs=False))
+        return context
+
+    def test_documents_are_added_to_the_context(self):
+        context = self.retrieve(get_vectorstore())
+
+        self.assertEqual(len(context.get("relevant_qa_documents")), 1)
+        self.assertIn(QUESTION, context.get("relevant_qa_documents")[0])
+        self.assertEqual(
+            context.get("relevant_docs_documents"), ["The revenue is in euros"]
+        )
+
+    def test_documents_are_rendered_in_the_prompt(self):
+        context = self.retrieve(get_vectorstore())
+
+        prompt = GeneratePythonCodePrompt(
+            context=context,
+            last_code_generated=None,
+            viz_lib="",
+            output_type=None,
+        ).to_string()
+
+        self.assertIn(context.get("relevant_qa_documents")[0], prompt)
+        self.assertIn("The revenue is in euros", prompt)
+
+    def test_without_vectorstore(self):
+        context = self.retrieve(None)
+
+        self.assertNotIn("relevant_qa_documents", context.intermediate_values)
+        self.assertEqual(len(retrieval_cache), 0)
+
+    def test_same_question_is_retrieved_once(self):
+        vectorstore = get_vectorstore()
+
+        with patch.object(
+            vectorstore,
+            "get_relevant_documents",
+            wraps=vectorstore.get_relevant_documents,
+        ) as get_relevant_documents:
+            first = self.retrieve(vectorstore)
+            second = self.retrieve(vectorstore)
+            self.retrieve(vectorstore, "How many employees are there?")
+
+        self.assertEqual(get_relevant_documents.call_count, 2)
+        self.assertEqual(
+            second.get("relevant_qa_documents"), first.get("relevant_qa_documents")
+        )
+        self.assertEqual((retrieval_cache.hits, retrieval_cache.misses), (1, 2))
+
+    def test_training_invalidates_the_documents(self):
+        vectorstore = get_vectorstore()
+        self.retrieve(vectorstore)
+        version = vectorstore.version
+
+        vectorstore.add_docs(["The revenue by country excludes the taxes"])
+        context = self.retrieve(vectorstore)
+
+        self.assertEqual(vectorstore.version, version + 1)
+        self.assertEqual(retrieval_cache.misses, 2)
+        self.assertIn(
+            "The revenue by country excludes the taxes",
+            context.get("relevant_docs_documents"),
+        )
+
+    def test_vectorstores_have_their_own_entries(self):
+        vectorstore = get_vectorstore()
+        other = LocalVectorStore(logger=Logger(save_logs=False))
+        other.add_docs(["The revenue includes the taxes"])
+
+        self.retrieve(vectorstore)
+        context = self.retrieve(other)
+
+        self.assertNotEqual(other.cache_id, vectorstore.cache_id)
+        self.assertEqual(other.version, vectorstore.version - 1)
+        self.assertEqual(retrieval_cache.misses, 2)
+        self.assertEqual(context.get("relevant_qa_documents"), [])
+        self.assertEqual(
+            context.get("relevant_docs_documents"), ["The revenue includes the taxes"]
+        )
+
+
+class TestRetrievalCache(unittest.TestCase):
+    def test_entries_expire(self):
+        cache = RetrievalCache(ttl=60)
+        cache.set("key", ([], []))
+
+        with patch("pandasai.helpers.retrieval_cache.time.time") as time:
+            time.return_value = cache._entries["key"][0] + 61
+            self.assertIsNone(cache.get("key"))
+
+        self.assertEqual(len(cache), 0)
+
+    def test_cache_is_bounded(self):
+        cache = RetrievalCache(maxsize=2)
+
+        for key in ("a", "b", "c"):
+            cache.set(key, ([key], []))
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), (["c"], []))
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+import unittest
+from unittest.mock import patch
+
+import duckdb
+import pandas as pd
+
+from pandasai.connectors.pandas import PandasConnector
+from pandasai.ee.helpers import query_builder as query_builder_module
+from pandasai.ee.helpers.query_builder import get_query_builder
+from pandasai.ee.helpers.rollup_manager import RollupManager
+from pandasai.schemas.df_config import Config
+
+SCHEMA = [
+    {
+        "name": "Orders",
+        "table": "orders",
+        "measures": [
+            {"name": "total_amount", "type": "sum", "sql": "amount"},
+            {"name": "order_count", "type": "count", "sql": "id"},
+            {"name": "max_amount", "type": "max", "sql": "amount"},
+            {"name": "min_amount", "type": "min", "sql": "amount"},
+            {"name": "average_amount", "type": "avg", "sql": "amount"},
+            {"name": "customer_count", "type": "countDistinct", "sql": "customer_id"},
+        ],
+        "dimensions": [
+            {"name": "id", "type": "int", "sql": "id"},
+            {"name": "status", "type": "string", "sql": "status"},
+            {"name": "customer_id", "type": "int", "sql": "customer_id"},
+            {"name": "created_at", "type": "time", "sql": "created_at"},
+        ],
+    },
+    {
+        "name": "Customers",
+        "table": "customers",
+        "measures": [],
+        "dimensions": [
+            {"name": "id", "type": "int", "sql": "id"},
+            {"name": "country", "type": "string", "sql": "country"},
+        ],
+        # Joined to the main table of the query
+        "joins": [
+            {
+                "name": "Orders",
+                "join_type": "left",
+                "sql": "${Orders.customer_id} = ${Customers.id}",
+            }
+        ],
+    },
+]
+
+
+def get_dfs():
+    orders = pd.DataFrame(
+        {
+            "id": range(1, 13),
+            "status": pd.Series(
+                ["paid", "refunded", "paid", "pending"] * 3, dtype=object
+            ),
+            "customer_id": [1, 2, 3, 1, 2, 3, 1, 2, 3, 1, 2, 3],
+            "amount": [
+                *(10.5, 20.0, 35.25, 5.0, 80.0, 12.0),
+                *(7.5, 60.0, 3.0, 44.0, 9.0, 18.0),
+            ],
+            "created_at": pd.to_datetime(
+                [
+                    f"2024-{month:02d}-{day:02d}"
+                    for month in (1, 2, 3)
+                    for day in (3, 10, 17, 24)
+                ]
+            ),
+        }
+    )
+    customers = pd.DataFrame(
+        {"id": [1, 2, 3], "country": pd.Series(["FR", "US", "FR"], dtype=object)}
+    )
+    return [
+        PandasConnector({"original_df": orders}, name="orders"),
+        PandasConnector({"original_df": customers}, name="customers"),
+    ]
+
+
+class TestRollupManager(unittest.TestCase):
+    def setUp(self):
+        query_builder_module._query_builders.clear()
+        self.dfs = get_dfs()
+        for df in self.dfs:
+            df.enable_sql_query()
+        self.manager = RollupManager(SCHEMA, self.dfs, threshold=2)
+
+    def tearDown(self):
+        self.manager.invalidate()
+        for df in self.dfs:
+            duckdb.execute(f'DROP TABLE IF EXISTS "{df.name}"')
+        query_builder_module._query_builders.clear()
+
+    def execute(self, query: dict):
+        """Run the query until it is hot, return the raw and rollup results"""
+        sql = get_query_builder(SCHEMA).generate_sql(query)
+        self.manager.record(query, sql)
+        raw = self.dfs[0].execute_direct_sql_query(sql)
+
+        with patch.object(
+            self.dfs[0],
+            "execute_direct_sql_query",
+            wraps=self.dfs[0].execute_direct_sql_query,
+        ) as execute:
+            for _ in range(self.manager.threshold):
+                result = self.manager.execute(sql)
+            executed = execute.call_args.args[0]
+
+        return raw, result, executed
+
+    def assert_rewritten(self, query: dict):
+        raw, result, executed = self.execute(query)
+
+        self.assertIn("rollup_orders_", executed)
+        self.assertEqual(list(result.columns), list(raw.columns))
+        if not query.get("order"):
+            raw = raw.sort_values(list(raw.columns)).reset_index(drop=True)
+            result = result.sort_values(list(result.columns)).reset_index(drop=True)
+        pd.testing.assert_frame_equal(result, raw, check_dtype=False)
+        return result
+
+    def assert_not_rewritten(self, query: dict):
+        raw, result, executed = self.execute(query)
+
+        self.assertNotIn("rollup_", executed)
+        self.assertEqual(self.manager.rollups, [])
+        pd.testing.assert_frame_equal(result, raw)
+
+    def test_grouped_query(self):
+        result = self.assert_rewritten(
+            {
+                "measures": [
+                    "Orders.total_amount",
+                    "Orders.order_count",
+                    "Orders.max_amount",
+                    "Orders.min_amount",
+                ],
+                "dimensions": ["Orders.status"],
+            }
+        )
+
+        self.assertEqual(len(result), 3)
+
+    def test_joined_query(self):
+        self.assert_rewritten(
+            {
+                "measures": ["Orders.total_amount", "Orders.order_count"],
+                "dimensions": ["Customers.country"],
+                "order": [{"id": "Orders.total_amount", "direction": "desc"}],
+            }
+        )
+
+    def test_filtered_query(self):
+        result = self.assert_rewritten(
+            {
+                "measures": ["Orders.total_amount", "Orders.order_count"],
+                "dimensions": ["Customers.country"],
+                "filters": [
+                    {
+                        "member": "Orders.status",
+                        "operator": "equals",
+                        "values": ["paid", "pending"],
+                    },
+                    {
+                        "member": "Orders.total_amount",
+                        "operator": "gt",
+                        "values": [100],
+                    },
+                ],
+            }
+        )
+
+        self.assertEqual(len(result), 1)
+
+    def test_time_bucketed_query(self):
+        result = self.assert_rewritten(
+            {
+                "measures": ["Orders.total_amount", "Orders.order_count"],
+                "timeDimensions": [
+                    {"dimension": "Orders.created_at", "granularity": "month"}
+                ],
+                "order": [{"id": "Orders.created_at", "direction": "asc"}],
+            }
+        )
+
+        self.assertEqual(
+            result["created_at_by_month"].tolist(), ["2024-01", "2024-02", "2024-03"]
+        )
+
+    def test_covering_rollup_answers_coarser_query(self):
+        self.assert_rewritten(
+            {
+                "measures": ["Orders.total_amount", "Orders.order_count"],
+                "dimensions": ["Orders.status", "Orders.customer_id"],
+            }
+        )
+        sql = get_query_builder(SCHEMA).generate_sql(
+            {"measures": ["Orders.total_amount"], "dimensions": ["Orders.status"]}
+        )
+        self.manager.record(
+            {"measures": ["Orders.total_amount"], "dimensions": ["Orders.status"]}, sql
+        )
+
+        result = self.manager.execute(sql)
+        raw = self.dfs[0].execute_direct_sql_query(sql)
+
+        self.assertEqual(len(self.manager.rollups), 1)
+        pd.testing.assert_frame_equal(
+            result.sort_values("status").reset_index(drop=True),
+            raw.sort_values("status").reset_index(drop=True),
+            check_dtype=False,
+        )
+
+    def test_average_is_not_rewritten(self):
+        self.assert_not_rewritten(
+            {
+                "measures": ["Orders.average_amount", "Orders.total_amount"],
+                "dimensions": ["Orders.status"],
+            }
+        )
+
+    def test_count_distinct_is_not_rewritten(self):
+        query = {
+            "measures": ["Orders.customer_count"],
+            "dimensions": ["Orders.status"],
+        }
+        # The query builder doesn't generate distinct counts
+        sql = (
+            "SELECT `orders`.`status` AS status,"
+            " COUNT(DISTINCT `orders`.`customer_id`) AS customer_count"
+            " FROM `orders` GROUP BY status"
+        )
+        self.manager.record(query, sql)
+        raw = self.dfs[0].execute_direct_sql_query(sql)
+
+        for _ in range(self.manager.threshold):
+            result = self.manager.execute(sql)
+
+        self.assertEqual(self.manager.rollups, [])
+        pd.testing.assert_frame_equal(result, raw)
+
+    def test_date_range_is_not_rewritten(self):
+        self.assert_not_rewritten(
+            {
+                "measures": ["Orders.total_amount"],
+                "timeDimensions": [
+                    {
+                        "dimension": "Orders.created_at",
+                        "granularity": "month",
+                        "dateRange": ["2024-01-01", "2024-02-15"],
+                    }
+                ],
+            }
+        )
+
+    def test_rollups_are_disabled_by_default(self):
+        self.assertFalse(Config.__fields__["enable_rollups"].default)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+import uuid
+
+from pandasai.vectorstores.bulk_ingestion import BulkIngestion
+from pandasai.vectorstores.local_vectorstore import (
+    HashingEmbeddingFunction,
+    LocalVectorStore,
+)
+
+
+class TestBulkIngestion(unittest.TestCase):
+    def setUp(self):
+        self.vectorstore = LocalVectorStore()
+
+    def test_question_answers_are_ingested_in_batches(self):
+        queries = [f"query {i}" for i in range(25)]
+        codes = [f"result = {i}" for i in range(25)]
+
+        report = BulkIngestion(self.vectorstore, batch_size=10).add_question_answer(
+            queries, codes
+        )
+
+        self.assertEqual(report.ingested, 25)
+        self.assertEqual(report.batches, 3)
+        self.assertEqual(len(self.vectorstore._qa_collection), 25)
+
+    def test_duplicates_are_reported_separately(self):
+        docs = ["first doc", "second doc"] * 20
+
+        report = BulkIngestion(self.vectorstore, batch_size=8).add_docs(docs)
+
+        self.assertEqual(report.ingested, 2)
+        self.assertEqual(report.duplicates, 38)
+        self.assertEqual(len(self.vectorstore._docs_collection), 2)
+
+    def test_ingesting_again_doesnt_duplicate_entries(self):
+        docs = [f"doc {i}" for i in range(10)]
+
+        BulkIngestion(self.vectorstore, batch_size=4).add_docs(docs)
+        BulkIngestion(self.vectorstore, batch_size=4).add_docs(docs)
+
+        self.assertEqual(len(self.vectorstore._docs_collection), 10)
+
+    def test_checkpoint_skips_completed_batches(self):
+        docs = [f"doc {i}" for i in range(10)]
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint_path = os.path.join(directory, "training.ckpt")
+
+            BulkIngestion(
+                self.vectorstore, batch_size=4, checkpoint_path=checkpoint_path
+            ).add_docs(docs)
+            report = BulkIngestion(
+                self.vectorstore, batch_size=4, checkpoint_path=checkpoint_path
+            ).add_docs(docs)
+
+        self.assertEqual(report.ingested, 0)
+        self.assertEqual(report.skipped, 10)
+
+    def test_mismatched_queries_and_codes(self):
+        with self.assertRaises(ValueError):
+            BulkIngestion(self.vectorstore).add_question_answer(["query"], [])
+
+
+class _Embeddings:
+    def __call__(self, input):
+        return HashingEmbeddingFunction(64)(list(input)).tolist()
+
+
+@unittest.skipUnless(importlib.util.find_spec("chromadb"), "chromadb not installed")
+class TestBulkIngestionChromaDB(unittest.TestCase):
+    def test_in_memory_chromadb(self):
+        from pandasai.ee.vectorstores.chroma import ChromaDB
+
+        vectorstore = ChromaDB(
+            collection_name=f"test-{uuid.uuid4().hex}",
+            embedding_function=_Embeddings(),
+            in_memory=True,
+        )
+        docs = ["first doc", "second doc", "first doc"]
+
+        report = BulkIngestion(vectorstore, batch_size=2).add_docs(docs)
+
+        self.assertEqual(report.ingested, 2)
+        self.assertEqual(report.duplicates, 1)
+        self.assertEqual(vectorstore._docs_collection.count(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from pandasai.vectorstores.local_vectorstore import (
+    HashingEmbeddingFunction,
+    LocalCollection,
+    LocalVectorStore,
+)
+
+
+class TestLocalVectorStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "vectorstore")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _vectorstore(self, **kwargs):
+        return LocalVectorStore(persist_path=self.path, **kwargs)
+
+    def test_search_returns_the_closest_documents(self):
+        vectorstore = LocalVectorStore(max_samples=2)
+        vectorstore.add_docs(
+            ["revenue by country", "number of employees", "revenue by month"],
+            ids=["country", "employees", "month"],
+        )
+
+        result = vectorstore.get_relevant_docs("revenue by country")
+
+        self.assertEqual(result["ids"][0], "country")
+        self.assertAlmostEqual(result["distances"][0], 0.0, places=5)
+        self.assertEqual(len(result["ids"]), 2)
+        self.assertNotIn("employees", result["ids"])
+
+    def test_question_answers_round_trip(self):
+        vectorstore = self._vectorstore()
+        ids = vectorstore.add_question_answer(
+            ["total revenue"], ["result = df.revenue.sum()"]
+        )
+
+        self.assertEqual(
+            vectorstore.get_relevant_qa_documents("total revenue"),
+            [vectorstore._format_qa("total revenue", "result = df.revenue.sum()")],
+        )
+        self.assertEqual(
+            vectorstore.get_relevant_question_answers_by_id(ids)["ids"], ids
+        )
+
+    def test_persisted_store_is_reloaded(self):
+        vectorstore = self._vectorstore()
+        vectorstore.add_docs(["first doc", "second doc"], ids=["a", "b"])
+        vectorstore.add_docs(["third doc"], ids=["c"], metadatas=[{"source": "x"}])
+        vectorstore.delete_docs(["b"])
+
+        reloaded = self._vectorstore(max_samples=3)
+
+        self.assertEqual(len(reloaded._docs_collection), 2)
+        self.assertEqual(
+            reloaded.get_relevant_docs_by_id(["a", "b", "c"]),
+            {
+                "documents": ["first doc", "third doc"],
+                "metadatas": [None, {"source": "x"}],
+                "ids": ["a", "c"],
+            },
+        )
+        self.assertEqual(sorted(reloaded.get_relevant_docs("doc")["ids"]), ["a", "c"])
+
+    def test_update_replaces_the_document(self):
+        vectorstore = self._vectorstore()
+        vectorstore.add_docs(["old doc"], ids=["a"])
+        vectorstore.update_docs(["a"], ["new doc"])
+
+        for store in [vectorstore, self._vectorstore()]:
+            self.assertEqual(len(store._docs_collection), 1)
+            self.assertEqual(store.get_relevant_docs_documents("doc"), ["new doc"])
+
+    def test_deleted_documents_are_not_returned(self):
+        vectorstore = LocalVectorStore(max_samples=5)
+        vectorstore.add_docs(["first doc", "second doc"], ids=["a", "b"])
+
+        vectorstore.delete_docs(["a"])
+
+        self.assertEqual(vectorstore.get_relevant_docs("first doc")["ids"], ["b"])
+
+    def test_delete_collection_removes_the_files(self):
+        vectorstore = self._vectorstore()
+        vectorstore.add_docs(["doc"], ids=["a"])
+
+        self.assertTrue(vectorstore.delete_collection("pandasai"))
+
+        self.assertEqual(len(vectorstore._docs_collection), 0)
+        self.assertEqual(len(self._vectorstore()._docs_collection), 0)
+
+    def test_similarity_threshold(self):
+        vectorstore = LocalVectorStore(max_samples=2, similary_threshold=0.5)
+        vectorstore.add_docs(["revenue by country", "number of employees"])
+
+        self.assertEqual(
+            vectorstore.get_relevant_docs_documents("revenue by country"),
+            ["revenue by country"],
+        )
+
+    def test_incomplete_write_is_ignored_on_reload(self):
+        vectorstore = self._vectorstore()
+        vectorstore.add_docs(["first doc"], ids=["a"])
+        with open(os.path.join(self.path, "pandasai-docs.jsonl"), "a") as file:
+            file.write('{"op": "add", "id": "b"')
+
+        self.assertEqual(len(self._vectorstore()._docs_collection), 1)
+
+    def test_writes_after_incomplete_write_are_kept(self):
+        vectorstore = self._vectorstore()
+        vectorstore.add_docs(["first doc"], ids=["a"])
+        with open(os.path.join(self.path, "pandasai-docs.vectors"), "ab") as file:
+            file.write(b"\0" * 16)
+        with open(os.path.join(self.path, "pandasai-docs.jsonl"), "a") as file:
+            file.write('{"op": "add", "id": "b"')
+
+        recovered = self._vectorstore()
+        recovered.add_docs(["third doc", "fourth doc"], ids=["c", "d"])
+        recovered.delete_docs(["a"])
+
+        reloaded = self._vectorstore(max_samples=3)
+        self.assertEqual(len(reloaded._docs_collection), 2)
+        self.assertEqual(
+            reloaded.get_relevant_docs_by_id(["a", "b", "c", "d"])["ids"], ["c", "d"]
+        )
+        self.assertEqual(sorted(reloaded.get_relevant_docs("doc")["ids"]), ["c", "d"])
+
+
+class TestLocalCollectionIndex(unittest.TestCase):
+    def test_indexed_search_finds_the_exact_match(self):
+        embeddings = HashingEmbeddingFunction(64)
+        documents = [f"document number {i}" for i in range(300)]
+        vectors = embeddings(documents)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        collection = LocalCollection("test", index_threshold=100)
+        collection.add([str(i) for i in range(300)], documents, vectors)
+        result = collection.query(vectors[42], k=1)
+
+        self.assertIsNotNone(collection._index)
+        self.assertEqual(result["ids"], ["42"])
+
+
+if __name__ == "__main__":
+    unittest.main()